@@ -0,0 +1,45 @@
+"""Add shard columns to broadcast jobs.
+
+Revision ID: 3b8d5e7f1a42
+Revises: 7e1a9c4b2d30
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8d5e7f1a42"
+down_revision: str | Sequence[str] | None = "7e1a9c4b2d30"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("broadcast_jobs") as batch_op:
+        batch_op.add_column(sa.Column("range_end_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("parent_job_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("shard_count", sa.Integer(), server_default="0", nullable=False))
+        batch_op.create_index("ix_broadcast_jobs_parent_job_id", ["parent_job_id"], unique=False)
+        batch_op.create_foreign_key(
+            "fk_broadcast_jobs_parent_job_id_broadcast_jobs",
+            "broadcast_jobs",
+            ["parent_job_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("broadcast_jobs") as batch_op:
+        batch_op.drop_constraint("fk_broadcast_jobs_parent_job_id_broadcast_jobs", type_="foreignkey")
+        batch_op.drop_index("ix_broadcast_jobs_parent_job_id")
+        batch_op.drop_column("shard_count")
+        batch_op.drop_column("parent_job_id")
+        batch_op.drop_column("range_end_id")
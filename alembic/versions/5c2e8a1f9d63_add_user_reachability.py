@@ -0,0 +1,57 @@
+"""Track unreachable broadcast recipients.
+
+Revision ID: 5c2e8a1f9d63
+Revises: 3b8d5e7f1a42
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8a1f9d63"
+down_revision: str | Sequence[str] | None = "3b8d5e7f1a42"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_OLD_DELIVERY_STATUSES = ("SENT", "FAILED_TEMPORARY", "FAILED_PERMANENT", "SKIPPED_INVALID")
+_NEW_DELIVERY_STATUSES = ("SENT", "FAILED_TEMPORARY", "FAILED_PERMANENT", "RECIPIENT_UNREACHABLE", "SKIPPED_INVALID")
+
+
+def _delivery_status_enum(values: Sequence[str]) -> sa.Enum:
+    return sa.Enum(*values, name="broadcast_delivery_status_enum", native_enum=False, create_constraint=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("unreachable_since", sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column("reachability_checked_at", sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table("broadcast_deliveries") as batch_op:
+        batch_op.alter_column(
+            "status",
+            existing_type=_delivery_status_enum(_OLD_DELIVERY_STATUSES),
+            type_=_delivery_status_enum(_NEW_DELIVERY_STATUSES),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE broadcast_deliveries SET status = 'FAILED_PERMANENT' WHERE status = 'RECIPIENT_UNREACHABLE'")
+    with op.batch_alter_table("broadcast_deliveries") as batch_op:
+        batch_op.alter_column(
+            "status",
+            existing_type=_delivery_status_enum(_NEW_DELIVERY_STATUSES),
+            type_=_delivery_status_enum(_OLD_DELIVERY_STATUSES),
+            existing_nullable=False,
+        )
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("reachability_checked_at")
+        batch_op.drop_column("unreachable_since")
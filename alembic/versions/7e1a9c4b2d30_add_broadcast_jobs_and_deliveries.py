@@ -0,0 +1,95 @@
+"""Add broadcast jobs and per-recipient delivery ledger.
+
+Revision ID: 7e1a9c4b2d30
+Revises: f2c3d4e5a6b7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7e1a9c4b2d30"
+down_revision: str | Sequence[str] | None = "f2c3d4e5a6b7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "broadcast_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column(
+            "audience_kind",
+            sa.Enum(
+                "ALL",
+                "ROLE",
+                "COMPETENCE",
+                name="broadcast_audience_kind_enum",
+                native_enum=False,
+                create_constraint=True,
+            ),
+            nullable=False,
+        ),
+        sa.Column("audience_role_name", sa.Text(), nullable=True),
+        sa.Column("audience_competence_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "PENDING",
+                "RUNNING",
+                "COMPLETED",
+                "FAILED",
+                name="broadcast_job_status_enum",
+                native_enum=False,
+                create_constraint=True,
+            ),
+            nullable=False,
+        ),
+        sa.Column("last_user_id", sa.Integer(), nullable=False),
+        sa.Column("attempted", sa.Integer(), nullable=False),
+        sa.Column("sent", sa.Integer(), nullable=False),
+        sa.Column("failed_temporary", sa.Integer(), nullable=False),
+        sa.Column("failed_permanent", sa.Integer(), nullable=False),
+        sa.Column("skipped_invalid_user", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "broadcast_deliveries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "SENT",
+                "FAILED_TEMPORARY",
+                "FAILED_PERMANENT",
+                "SKIPPED_INVALID",
+                name="broadcast_delivery_status_enum",
+                native_enum=False,
+                create_constraint=True,
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["broadcast_jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_id", "user_id", name="uq_broadcast_deliveries_job_user"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("broadcast_deliveries")
+    op.drop_table("broadcast_jobs")
@@ -0,0 +1,37 @@
+"""Add progress columns to broadcast jobs.
+
+Revision ID: 9d4f2b6a8c15
+Revises: 5c2e8a1f9d63
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f2b6a8c15"
+down_revision: str | Sequence[str] | None = "5c2e8a1f9d63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("broadcast_jobs") as batch_op:
+        batch_op.add_column(sa.Column("total_recipients", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("progress", sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column("status_chat_id", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("status_message_id", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("broadcast_jobs") as batch_op:
+        batch_op.drop_column("status_message_id")
+        batch_op.drop_column("status_chat_id")
+        batch_op.drop_column("progress")
+        batch_op.drop_column("total_recipients")
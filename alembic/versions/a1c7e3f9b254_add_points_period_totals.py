@@ -0,0 +1,48 @@
+"""Add weekly points totals rollup table.
+
+Revision ID: a1c7e3f9b254
+Revises: 9d4f2b6a8c15
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c7e3f9b254"
+down_revision: str | Sequence[str] | None = "9d4f2b6a8c15"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The table starts empty; deploys fill it from the ledger right after the migration
+    with ``rebuild_points_rollups.py --if-empty``.
+    """
+    op.create_table(
+        "points_period_totals",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("points_type", sa.String(length=50), nullable=False),
+        sa.Column("period_start", sa.DateTime(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "points_type", "period_start"),
+    )
+    op.create_index(
+        "ix_points_period_totals_top",
+        "points_period_totals",
+        ["points_type", "period_start", "total", "user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_points_period_totals_top", table_name="points_period_totals")
+    op.drop_table("points_period_totals")
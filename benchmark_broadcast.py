@@ -0,0 +1,590 @@
+"""Broadcast throughput benchmark against a simulated Telegram endpoint.
+
+The script drives the real ``BroadcastService`` send pipeline (worker pool, re-queued
+retries, optional token-bucket pacing) with in-memory audience and job
+storage and a fake ``NotificationPort``. The fake models per-message latency,
+flood-control ``retry_after`` bursts and permanent failures.
+
+Time is virtual by default: sleeps advance a simulated clock instead of waiting,
+so a 100k-recipient run finishes in seconds while reporting the throughput the
+same settings would reach against Telegram. Results are printed as JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import math
+import random
+import selectors
+import statistics
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import tyro
+from loguru import logger as loguru_logger
+
+from src.pybot.core.config import settings
+from src.pybot.core.constants import BroadcastAudienceKind, BroadcastDeliveryStatus, BroadcastJobStatus
+from src.pybot.db.models import BroadcastJob
+from src.pybot.dto import BroadcastDTO, BroadcastRecipient, BroadcastResult, NotifyDTO
+from src.pybot.infrastructure.broadcast_job_repository import BroadcastJobRepository
+from src.pybot.infrastructure.ports import (
+    InMemoryBroadcastLock,
+    PacedNotificationService,
+    SendRateLimits,
+    SendScheduler,
+)
+from src.pybot.infrastructure.user_repository import UserRepository
+from src.pybot.services.broadcast import BroadcastService
+from src.pybot.services.ports import (
+    NotificationPermanentError,
+    NotificationPort,
+    NotificationTemporaryError,
+)
+
+BENCHMARK_FIRST_TELEGRAM_ID = 1_000_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class SimulatedTelegramConfig:
+    """Behaviour of the simulated Telegram endpoint.
+
+    Attributes:
+        latency_median_ms: Median of the log-normal per-request latency.
+        latency_sigma: Shape of the log-normal latency; larger values give a heavier tail.
+        permanent_failure_rate: Share of requests failing permanently (blocked bot, deleted chat).
+        temporary_error_rate: Share of requests failing with a retryable error without ``retry_after``.
+        flood_limit_per_s: Accepted requests per sliding second before flood control kicks in.
+        flood_retry_after_s: ``retry_after`` returned while flood control is active.
+    """
+
+    latency_median_ms: float = 60.0
+    latency_sigma: float = 0.5
+    permanent_failure_rate: float = 0.02
+    temporary_error_rate: float = 0.005
+    flood_limit_per_s: int = 30
+    flood_retry_after_s: float = 5.0
+
+    def __post_init__(self) -> None:
+        """Validate simulation parameters early.
+
+        Raises:
+            ValueError: If one of the rates or limits is out of range.
+        """
+
+        if self.latency_median_ms <= 0:
+            raise ValueError("latency_median_ms must be greater than 0")
+        if self.latency_sigma < 0:
+            raise ValueError("latency_sigma must be greater than or equal to 0")
+        if not 0 <= self.permanent_failure_rate <= 1:
+            raise ValueError("permanent_failure_rate must be between 0 and 1")
+        if not 0 <= self.temporary_error_rate <= 1:
+            raise ValueError("temporary_error_rate must be between 0 and 1")
+        if self.flood_limit_per_s < 1:
+            raise ValueError("flood_limit_per_s must be greater than 0")
+        if self.flood_retry_after_s < 0:
+            raise ValueError("flood_retry_after_s must be greater than or equal to 0")
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkCLIConfig:
+    """Public CLI configuration for the broadcast benchmark.
+
+    Broadcast options left unset keep the values from the current settings (``.env``).
+
+    Attributes:
+        recipients: Audience sizes to benchmark, one scenario per value.
+        bulk_size: Override for ``BROADCAST_BULK_SIZE``.
+        max_concurrency: Override for ``BROADCAST_MAX_CONCURRENCY``.
+        batch_pause_ms: Override for ``BROADCAST_BATCH_PAUSE_MS``.
+        retry_attempts: Override for ``BROADCAST_RETRY_ATTEMPTS``.
+        pacing: Override for ``NOTIFICATION_PACING_ENABLED``.
+        global_rate_per_s: Override for ``NOTIFICATION_GLOBAL_RATE_PER_S``.
+        telegram: Simulated Telegram endpoint behaviour.
+        seed: Seed for latency, failures and broadcast jitter.
+        real_time: Sleep for real instead of advancing a virtual clock.
+        output: Optional file for the JSON report; stdout is used when omitted.
+    """
+
+    recipients: tuple[int, ...] = (1_000, 10_000, 100_000)
+    bulk_size: int | None = None
+    max_concurrency: int | None = None
+    batch_pause_ms: int | None = None
+    retry_attempts: int | None = None
+    pacing: bool | None = None
+    global_rate_per_s: float | None = None
+    telegram: SimulatedTelegramConfig = SimulatedTelegramConfig()
+    seed: int = 42
+    real_time: bool = False
+    output: Path | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyPercentiles:
+    """Per-message latency percentiles in milliseconds."""
+
+    p50: float
+    p95: float
+    p99: float
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioReport:
+    """Machine-readable result of one benchmark scenario.
+
+    Attributes:
+        recipients: Audience size.
+        result: Broadcast counters returned by ``BroadcastService``.
+        requests: Requests that reached the simulated endpoint.
+        retries: Requests beyond the first one per recipient.
+        retry_after_responses: Flood-control responses carrying ``retry_after``.
+        duration_s: Broadcast duration on the benchmark clock (virtual or real).
+        messages_per_s: Delivered messages per second of ``duration_s``.
+        latency_ms: Per-message latency from the first attempt to the final outcome, retries included.
+        harness_wall_s: Real time spent by the harness itself.
+    """
+
+    recipients: int
+    result: BroadcastResult
+    requests: int
+    retries: int
+    retry_after_responses: int
+    duration_s: float
+    messages_per_s: float
+    latency_ms: LatencyPercentiles
+    harness_wall_s: float
+
+
+class VirtualClock:
+    """Monotonic clock advanced explicitly by the event loop."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class VirtualTimeSelector(selectors.BaseSelector):
+    """Selector that advances the virtual clock instead of blocking until the next timer."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self._clock = clock
+        self._selector = selectors.DefaultSelector()
+
+    def register(self, fileobj: Any, events: int, data: Any = None) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj: Any) -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+    def select(self, timeout: float | None = None) -> list[tuple[selectors.SelectorKey, int]]:
+        if timeout is None:
+            return self._selector.select(None)
+        if timeout > 0:
+            self._clock.advance(timeout)
+        return self._selector.select(0)
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def get_map(self) -> Mapping[Any, selectors.SelectorKey]:
+        return self._selector.get_map()
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose ``time()`` follows :class:`VirtualClock`; ``asyncio.sleep`` costs no real time."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__(VirtualTimeSelector(clock))
+        self._virtual_clock = clock
+
+    def time(self) -> float:
+        return self._virtual_clock()
+
+
+class SimulatedTelegramPort(NotificationPort):
+    """Fake Telegram endpoint with log-normal latency, flood control and failures."""
+
+    def __init__(self, config: SimulatedTelegramConfig, *, rng: random.Random, clock: Callable[[], float]) -> None:
+        self.config = config
+        self._rng = rng
+        self._clock = clock
+        self._latency_mu = math.log(config.latency_median_ms / 1000)
+        self._accepted_at: deque[float] = deque()
+        self.requests = 0
+        self.retry_after_responses = 0
+
+    async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
+        await asyncio.sleep(self._latency())
+
+    async def send_message(self, message_data: NotifyDTO) -> None:
+        self.requests += 1
+        is_flooded = self._register_request()
+        await asyncio.sleep(self._latency())
+
+        if is_flooded:
+            self.retry_after_responses += 1
+            raise NotificationTemporaryError(
+                "Flood control exceeded",
+                retry_after_seconds=self.config.flood_retry_after_s,
+            )
+        outcome = self._rng.random()
+        if outcome < self.config.permanent_failure_rate:
+            raise NotificationPermanentError("Forbidden: bot was blocked by the user", recipient_unreachable=True)
+        if outcome < self.config.permanent_failure_rate + self.config.temporary_error_rate:
+            raise NotificationTemporaryError("Bad Gateway")
+
+    def _latency(self) -> float:
+        return self._rng.lognormvariate(self._latency_mu, self.config.latency_sigma)
+
+    def _register_request(self) -> bool:
+        now = self._clock()
+        while self._accepted_at and self._accepted_at[0] <= now - 1.0:
+            self._accepted_at.popleft()
+        if len(self._accepted_at) >= self.config.flood_limit_per_s:
+            return True
+        self._accepted_at.append(now)
+        return False
+
+
+class MeasuringNotificationPort(NotificationPort):
+    """Outermost port decorator recording the first attempt and the final outcome per recipient."""
+
+    def __init__(self, inner: NotificationPort, clock: Callable[[], float]) -> None:
+        self.inner = inner
+        self._clock = clock
+        self.first_attempt_at: dict[int, float] = {}
+        self.finished_at: dict[int, float] = {}
+
+    async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
+        await self.inner.send_role_request_to_admin(request_id, requester_user_id, role_name)
+
+    async def send_message(self, message_data: NotifyDTO) -> None:
+        self.first_attempt_at.setdefault(message_data.user_id, self._clock())
+        try:
+            await self.inner.send_message(message_data)
+        finally:
+            self.finished_at[message_data.user_id] = self._clock()
+
+    def latencies(self) -> list[float]:
+        return [
+            finished_at - self.first_attempt_at[user_id]
+            for user_id, finished_at in self.finished_at.items()
+            if user_id in self.first_attempt_at
+        ]
+
+
+class SyntheticAudienceRepository(UserRepository):
+    """Audience of ``size`` synthetic recipients streamed in keyset pages without a database."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.unreachable_marked = 0
+
+    async def iter_all_recipients(
+        self,
+        db: Any,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        last_id = self.size if until_id is None else min(until_id, self.size)
+        for page_start in range(after_id + 1, last_id + 1, page_size):
+            page_end = min(page_start + page_size, last_id + 1)
+            yield [
+                BroadcastRecipient(user_id=user_id, telegram_id=BENCHMARK_FIRST_TELEGRAM_ID + user_id)
+                for user_id in range(page_start, page_end)
+            ]
+
+    async def count_all_recipients(self, db: Any, *, after_id: int = 0, until_id: int | None = None) -> int:
+        last_id = self.size if until_id is None else min(until_id, self.size)
+        return max(last_id - after_id, 0)
+
+    async def mark_recipients_unreachable(self, db: Any, user_ids: Sequence[int]) -> None:
+        self.unreachable_marked += len(user_ids)
+
+
+class InMemoryBroadcastJobRepository(BroadcastJobRepository):
+    """Job storage kept in memory; the delivery ledger is reduced to per-status counters."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[int, BroadcastJob] = {}
+        self.delivery_counts: dict[BroadcastDeliveryStatus, int] = dict.fromkeys(BroadcastDeliveryStatus, 0)
+
+    async def create_job(
+        self,
+        db: Any,
+        *,
+        message: str,
+        audience_kind: BroadcastAudienceKind,
+        role_name: str | None = None,
+        competence_id: int | None = None,
+    ) -> BroadcastJob:
+        job = BroadcastJob(
+            id=len(self.jobs) + 1,
+            message=message,
+            audience_kind=audience_kind,
+            audience_role_name=role_name,
+            audience_competence_id=competence_id,
+            status=BroadcastJobStatus.PENDING,
+            last_user_id=0,
+            shard_count=0,
+            attempted=0,
+            sent=0,
+            failed_temporary=0,
+            failed_permanent=0,
+            skipped_invalid_user=0,
+        )
+        self.jobs[job.id] = job
+        return job
+
+    async def get_by_id(self, db: Any, job_id: int) -> BroadcastJob:
+        return self.jobs[job_id]
+
+    async def find_recorded_user_ids(self, db: Any, job_id: int, user_ids: Sequence[int]) -> set[int]:
+        return set()
+
+    async def add_deliveries(
+        self,
+        db: Any,
+        job_id: int,
+        deliveries: Sequence[tuple[int, BroadcastDeliveryStatus]],
+    ) -> None:
+        for _, status in deliveries:
+            self.delivery_counts[status] += 1
+
+
+class NullSession:
+    """Session stand-in: the benchmark keeps jobs in memory, so there is nothing to commit."""
+
+    async def commit(self) -> None:
+        return None
+
+    async def rollback(self) -> None:
+        return None
+
+    async def refresh(self, instance: object) -> None:
+        return None
+
+
+def build_settings_overrides(cli_config: BenchmarkCLIConfig) -> dict[str, object]:
+    """Map CLI overrides to ``BotSettings`` attribute names, skipping unset options.
+
+    Args:
+        cli_config: Public CLI configuration parsed by tyro.
+
+    Returns:
+        Settings attributes to override for the benchmark run.
+    """
+
+    candidates: dict[str, object | None] = {
+        "broadcast_bulk_size": cli_config.bulk_size,
+        "broadcast_max_concurrency": cli_config.max_concurrency,
+        "broadcast_batch_pause_ms": cli_config.batch_pause_ms,
+        "broadcast_retry_attempts": cli_config.retry_attempts,
+        "notification_pacing_enabled": cli_config.pacing,
+        "notification_global_rate_per_s": cli_config.global_rate_per_s,
+    }
+    return {name: value for name, value in candidates.items() if value is not None}
+
+
+@contextmanager
+def override_settings(overrides: Mapping[str, object]) -> Iterator[None]:
+    """Temporarily apply settings overrides and restore the previous values afterwards."""
+
+    previous = {name: getattr(settings, name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+def latency_percentiles(latencies: Sequence[float]) -> LatencyPercentiles:
+    """Compute p50/p95/p99 in milliseconds.
+
+    Args:
+        latencies: Per-message latencies in seconds.
+
+    Returns:
+        Percentiles rounded to 0.1 ms; zeros for an empty sample.
+    """
+
+    if not latencies:
+        return LatencyPercentiles(p50=0.0, p95=0.0, p99=0.0)
+    if len(latencies) == 1:
+        single = round(latencies[0] * 1000, 1)
+        return LatencyPercentiles(p50=single, p95=single, p99=single)
+
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    return LatencyPercentiles(
+        p50=round(cut_points[49] * 1000, 1),
+        p95=round(cut_points[94] * 1000, 1),
+        p99=round(cut_points[98] * 1000, 1),
+    )
+
+
+async def run_scenario(
+    recipients: int,
+    telegram_config: SimulatedTelegramConfig,
+    *,
+    seed: int,
+    clock: Callable[[], float],
+) -> ScenarioReport:
+    """Broadcast to ``recipients`` synthetic users and measure the run.
+
+    Args:
+        recipients: Audience size.
+        telegram_config: Simulated Telegram endpoint behaviour.
+        seed: Seed for latency, failures and broadcast jitter.
+        clock: Benchmark clock; must follow the running event loop time.
+
+    Returns:
+        Machine-readable scenario report.
+    """
+
+    random.seed(seed)
+    telegram_port = SimulatedTelegramPort(telegram_config, rng=random.Random(seed), clock=clock)  # noqa: S311
+    notification_port: NotificationPort = telegram_port
+    if settings.notification_pacing_enabled:
+        scheduler = SendScheduler(
+            SendRateLimits(
+                global_rate=settings.notification_global_rate_per_s,
+                global_burst=settings.notification_global_burst,
+                per_chat_rate=settings.notification_per_chat_rate_per_s,
+                per_chat_burst=settings.notification_per_chat_burst,
+            ),
+            clock=clock,
+        )
+        notification_port = PacedNotificationService(telegram_port, scheduler)
+    measuring_port = MeasuringNotificationPort(notification_port, clock)
+
+    service = BroadcastService(
+        NullSession(),  # type: ignore[arg-type]
+        SyntheticAudienceRepository(recipients),
+        measuring_port,
+        InMemoryBroadcastJobRepository(),
+        InMemoryBroadcastLock(clock=clock),
+    )
+
+    harness_started = time.perf_counter()
+    started = clock()
+    result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="Benchmark broadcast"))
+    duration = clock() - started
+    harness_wall = time.perf_counter() - harness_started
+
+    return ScenarioReport(
+        recipients=recipients,
+        result=result,
+        requests=telegram_port.requests,
+        retries=telegram_port.requests - len(measuring_port.first_attempt_at),
+        retry_after_responses=telegram_port.retry_after_responses,
+        duration_s=round(duration, 3),
+        messages_per_s=round(result.sent / duration, 2) if duration > 0 else 0.0,
+        latency_ms=latency_percentiles(measuring_port.latencies()),
+        harness_wall_s=round(harness_wall, 3),
+    )
+
+
+def run_benchmark(cli_config: BenchmarkCLIConfig) -> dict[str, Any]:
+    """Run every scenario from the CLI configuration.
+
+    Args:
+        cli_config: Public CLI configuration parsed by tyro.
+
+    Returns:
+        JSON-serialisable report with the effective settings and one entry per scenario.
+    """
+
+    if any(recipients < 1 for recipients in cli_config.recipients):
+        raise ValueError("recipients must contain only positive values")
+
+    scenarios: list[ScenarioReport] = []
+    with override_settings(build_settings_overrides(cli_config)):
+        effective_settings = {
+            "broadcast_bulk_size": settings.broadcast_bulk_size,
+            "broadcast_max_concurrency": settings.broadcast_max_concurrency,
+            "broadcast_batch_pause_ms": settings.broadcast_batch_pause_ms,
+            "broadcast_retry_attempts": settings.broadcast_retry_attempts,
+            "broadcast_retry_max_wait_s": settings.broadcast_retry_max_wait_s,
+            "notification_pacing_enabled": settings.notification_pacing_enabled,
+            "notification_global_rate_per_s": settings.notification_global_rate_per_s,
+            "notification_global_burst": settings.notification_global_burst,
+        }
+        for recipients in cli_config.recipients:
+            clock: Callable[[], float]
+            if cli_config.real_time:
+                clock = time.monotonic
+                with asyncio.Runner() as runner:
+                    report = runner.run(
+                        run_scenario(recipients, cli_config.telegram, seed=cli_config.seed, clock=clock)
+                    )
+            else:
+                virtual_clock = VirtualClock()
+                clock = virtual_clock
+                with asyncio.Runner(loop_factory=functools.partial(VirtualTimeEventLoop, virtual_clock)) as runner:
+                    report = runner.run(
+                        run_scenario(recipients, cli_config.telegram, seed=cli_config.seed, clock=clock)
+                    )
+            scenarios.append(report)
+
+    return {
+        "time_mode": "real" if cli_config.real_time else "virtual",
+        "seed": cli_config.seed,
+        "settings": effective_settings,
+        "telegram": asdict(cli_config.telegram),
+        "scenarios": [asdict(scenario) for scenario in scenarios],
+    }
+
+
+def parse_cli_args(args: Sequence[str] | None = None) -> BenchmarkCLIConfig:
+    """Parse CLI arguments into the public tyro config.
+
+    Args:
+        args: Optional CLI arguments for testing or programmatic invocation.
+
+    Returns:
+        Parsed benchmark configuration.
+    """
+
+    return tyro.cli(BenchmarkCLIConfig, args=args)
+
+
+def main(cli_config: BenchmarkCLIConfig | None = None) -> None:
+    """Run the benchmark and print or save the JSON report.
+
+    Args:
+        cli_config: Optional CLI configuration for programmatic invocation.
+    """
+
+    resolved_cli_config = cli_config or parse_cli_args()
+    # Per-recipient warnings of the service would dominate the measured time.
+    loguru_logger.disable("src.pybot")
+    try:
+        report = run_benchmark(resolved_cli_config)
+    finally:
+        loguru_logger.enable("src.pybot")
+
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if resolved_cli_config.output is None:
+        print(payload)
+    else:
+        resolved_cli_config.output.write_text(payload + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Rebuild weekly points totals (``points_period_totals``) from the points ledger.
+
+Run it once after the migration that creates the table, and whenever the rollup
+may have drifted from ``points_transactions`` (manual SQL fixes, restored backups).
+The table is replaced inside one transaction, so the script is safe to re-run.
+Deploys run it with ``--if-empty`` right after ``alembic upgrade head``: the first
+start after the migration fills the table, later starts leave it untouched.
+Cached leaderboards in Redis are dropped afterwards; bots using the in-memory
+leaderboard cache keep already cached weeks until they restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+import tyro
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.pybot.core.config import settings
+from src.pybot.db.database import create_database_engine
+from src.pybot.infrastructure.leaderboard_cache import RedisLeaderboardCache
+from src.pybot.infrastructure.points_period_total_repository import PointsPeriodTotalRepository
+
+
+@dataclass(frozen=True, slots=True)
+class RebuildCLIConfig:
+    """Options of the rollup rebuild.
+
+    Attributes:
+        database_url: Database to rebuild; defaults to ``DATABASE_URL``.
+        if_empty: Rebuild only when the rollup has no rows yet.
+    """
+
+    database_url: str | None = None
+    if_empty: bool = False
+
+
+async def rebuild_points_rollups(database_url: str, *, business_tz: str, if_empty: bool = False) -> int | None:
+    """Replace ``points_period_totals`` with totals aggregated from the ledger.
+
+    Args:
+        database_url: SQLAlchemy async database URL.
+        business_tz: Timezone whose calendar weeks define the periods.
+        if_empty: Skip the rebuild when the rollup already has rows.
+
+    Returns:
+        Number of weekly rows written, or ``None`` when the rebuild was skipped.
+    """
+
+    engine = create_database_engine(database_url)
+    session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    repository = PointsPeriodTotalRepository()
+    try:
+        async with session_maker() as db:
+            if if_empty and await repository.has_rows(db):
+                return None
+            rows = await repository.rebuild(db, business_tz=business_tz)
+            await db.commit()
+    finally:
+        await engine.dispose()
+
+    if settings.leaderboard_cache_backend == "redis":
+        redis = Redis.from_url(settings.redis_url)
+        try:
+            await RedisLeaderboardCache(redis).clear()
+        finally:
+            await redis.aclose()
+    return rows
+
+
+def main(cli_config: RebuildCLIConfig | None = None) -> None:
+    """Rebuild the rollup and print the number of weekly rows."""
+
+    cli_config = cli_config or tyro.cli(RebuildCLIConfig)
+    rows = asyncio.run(
+        rebuild_points_rollups(
+            cli_config.database_url or settings.database_url,
+            business_tz=settings.business_tz,
+            if_empty=cli_config.if_empty,
+        )
+    )
+    if rows is None:
+        print("points_period_totals already filled, rebuild skipped")
+    else:
+        print(f"points_period_totals rebuilt: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ set -eu
 echo "Applying database migrations..."
 alembic upgrade head
 
+echo "Filling weekly points totals if they are empty..."
+python rebuild_points_rollups.py --if-empty
+
 if [ "${AUTO_SEED_DB:-false}" = "true" ]; then
   echo "Seeding database..."
   python fill_point_db.py
@@ -11,7 +11,7 @@ from ....dto import BroadcastDTO, CompetenceBroadcastDTO, CompetenceReadDTO, Rol
 from ....services.broadcast import BroadcastService
 from ....services.competence import CompetenceService
 from ...filters import check_text_message_correction, create_chat_type_routers
-from ...texts import BROADCAST_MESSAGE_REQUIRED, BROADCAST_USAGE, broadcast_unknown_target
+from ...texts import BROADCAST_MESSAGE_REQUIRED, BROADCAST_STARTING, BROADCAST_USAGE, broadcast_unknown_target
 
 (broadcast_command_private_router, _, _) = create_chat_type_routers("broadcast")
 TARGET_AND_MESSAGE_PARTS = 2
@@ -74,6 +74,12 @@ async def _extract_message_for_broadcast(message: Message, target_token: str) ->
     return broadcast_message
 
 
+async def _reply_broadcast_status(message: Message) -> dict[str, int]:
+    """Ответить статус-сообщением, которое сервис будет редактировать по ходу рассылки."""
+    status = await message.reply(BROADCAST_STARTING)
+    return {"status_chat_id": status.chat.id, "status_message_id": status.message_id}
+
+
 @broadcast_command_private_router.message(
     Command("broadcast"),
     flags={"role": settings.broadcast_allowed_roles, "rate_limit": "expensive"},
@@ -95,21 +101,28 @@ async def broadcast_command(
         return
     try:
         if _extract_all_ping(target_token):
-            await broadcast_service.broadcast_for_all(BroadcastDTO(broadcast_message=broadcast_message))
+            status_fields = await _reply_broadcast_status(message)
+            await broadcast_service.broadcast_for_all(
+                BroadcastDTO(broadcast_message=broadcast_message, **status_fields)
+            )
             return
 
         role = _extract_role(target_token)
         if role is not None:
+            status_fields = await _reply_broadcast_status(message)
             await broadcast_service.broadcast_for_users_with_role(
-                RoleBroadcastDTO(broadcast_message=broadcast_message, role_name=role.value)
+                RoleBroadcastDTO(broadcast_message=broadcast_message, role_name=role.value, **status_fields)
             )
             return
 
         competencies = await competence_service.find_all_competencies()
         competence = _extract_competence(target_token, competencies)
         if competence is not None:
+            status_fields = await _reply_broadcast_status(message)
             await broadcast_service.broadcast_for_users_with_competence(
-                CompetenceBroadcastDTO(broadcast_message=broadcast_message, competence_id=competence.id)
+                CompetenceBroadcastDTO(
+                    broadcast_message=broadcast_message, competence_id=competence.id, **status_fields
+                )
             )
             return
 
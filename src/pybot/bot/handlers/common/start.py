@@ -44,11 +44,13 @@ async def cmd_start_private(
 
 
 @start_global_router.message(CommandStart())
+@flags.public(True)
 async def cmd_start_group(message: Message) -> None:
     await message.answer(START_GROUP_GREETING)
 
 
 @start_global_router.message(Command("info"))
+@flags.public(True)
 async def cmd_info(message: Message) -> None:
     await message.answer(INFO_GLOBAL)
 
@@ -63,5 +65,6 @@ async def cmd_help_private(message: Message, user_roles_service: FromDishka[User
 
 
 @start_group_router.message(Command("help"))
+@flags.public(True)
 async def cmd_help_group(message: Message) -> None:
     await message.answer(HELP_GROUP)
@@ -1,5 +1,6 @@
 from aiogram import Router, F
 
+from .batch_points import batch_points_global_router as batch_points_global_router
 from .grand_points import grand_points_global_router as grand_points_global_router
 from .leaderboard import leaderboard_global_router as leaderboard_global_router
 
@@ -8,6 +9,7 @@ from ...filters import create_chat_type_routers
 points_private_router, points_group_router, points_global_router = create_chat_type_routers("points")
 
 points_global_router.include_router(grand_points_global_router)
+points_global_router.include_router(batch_points_global_router)
 points_global_router.include_router(leaderboard_global_router)
 
 points_router = Router(name="points")
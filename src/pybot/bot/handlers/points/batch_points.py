@@ -0,0 +1,238 @@
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from aiogram.filters.command import Command
+from aiogram.types import Message
+from dishka import FromDishka
+from pydantic import ValidationError
+
+from ....core import logger
+from ....core.constants import PointsTypeEnum, RoleEnum, TaskScheduleKind
+from ....domain.exceptions import DomainError, UserNotFoundError, ZeroPointsAdjustmentError
+from ....dto import AdjustUsersPointsDTO, CompetenceReadDTO, NotifyUsersDTO
+from ....dto.value_objects import Points
+from ....services.competence import CompetenceService
+from ....services.notification_facade import NotificationFacade
+from ....services.points import PointsService
+from ....services.user_services import UserService
+from ...filters import check_text_message_correction, create_chat_type_routers
+from ...texts import (
+    POINTS_BATCH_AMBIGUOUS_LIST,
+    POINTS_BATCH_RECIPIENTS_REQUIRED,
+    POINTS_BATCH_USAGE,
+    POINTS_OPERATION_FAILED,
+    POINTS_UNEXPECTED_ERROR,
+    TARGET_NOT_FOUND,
+    points_batch_success,
+    points_batch_unknown_target,
+    points_invalid_value,
+    points_notification,
+)
+
+(_, _, batch_points_global_router) = create_chat_type_routers("batch_points")
+
+BATCH_COMMAND_PATTERN = re.compile(
+    r"^/points(?:@\w+)?\s+batch\s+(?P<points_type>\S+)"
+    r"(?:\s+(?P<target>[^\s\"']+?))?"
+    r"\s+(?P<amount>-?\d+)"
+    r"(?:\s+(?:\"(?P<dq_reason>[^\"]*)\"|'(?P<sq_reason>[^']*)'))?\s*$",
+    re.IGNORECASE,
+)
+# Одна строка списка — ровно один Telegram ID, допускается префикс «@».
+TELEGRAM_ID_LINE_PATTERN = re.compile(r"^@?(?P<telegram_id>\d+)$")
+
+
+@dataclass(frozen=True, slots=True)
+class BatchPointsCommand:
+    points_type: PointsTypeEnum
+    target: str | None
+    amount: int
+    reason: str | None
+
+
+def _parse_batch_command(text: str) -> BatchPointsCommand | None:
+    match = BATCH_COMMAND_PATTERN.match(text.strip())
+    if match is None:
+        return None
+
+    points_type = next(
+        (item for item in PointsTypeEnum if item.value.casefold() == match["points_type"].casefold()),
+        None,
+    )
+    if points_type is None:
+        return None
+
+    reason = match["dq_reason"] if match["dq_reason"] is not None else match["sq_reason"]
+    return BatchPointsCommand(
+        points_type=points_type,
+        target=match["target"],
+        amount=int(match["amount"]),
+        reason=reason,
+    )
+
+
+def _extract_listed_telegram_ids(message: Message) -> list[int] | None:
+    """
+    Telegram ID из сообщения-списка без повторов; ``None``, если список нельзя разобрать однозначно.
+
+    Каждая непустая строка — либо ровно один ID (``123`` или ``@123``), либо упоминание
+    пользователя без username. Любая другая строка делает весь список неоднозначным.
+    """
+    text = message.text or message.caption or ""
+    listed: dict[int, None] = {}
+    mention_texts: set[str] = set()
+    for entity in message.entities or message.caption_entities or []:
+        if entity.type == "text_mention" and entity.user is not None:
+            listed[entity.user.id] = None
+            mention_texts.add(entity.extract_from(text).strip())
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line in mention_texts:
+            continue
+        match = TELEGRAM_ID_LINE_PATTERN.match(line)
+        if match is None:
+            return None
+        listed[int(match["telegram_id"])] = None
+    return list(listed)
+
+
+def _find_role(target: str) -> RoleEnum | None:
+    for role in RoleEnum:
+        if role.value.casefold() == target.casefold():
+            return role
+    return None
+
+
+def _find_competence(target: str, competencies: Sequence[CompetenceReadDTO]) -> CompetenceReadDTO | None:
+    for competence in competencies:
+        if competence.name.casefold() == target.casefold():
+            return competence
+    return None
+
+
+async def _resolve_reply_recipients(message: Message, user_service: UserService) -> tuple[list[int], int] | None:
+    """
+    Внутренние id получателей из сообщения, на которое ответили, и число незарегистрированных.
+
+    На неоднозначный список отвечает подсказкой и возвращает ``None``.
+    """
+    if message.reply_to_message is None:
+        return [], 0
+    telegram_ids = _extract_listed_telegram_ids(message.reply_to_message)
+    if telegram_ids is None:
+        await message.reply(POINTS_BATCH_AMBIGUOUS_LIST)
+        return None
+    known = await user_service.find_user_ids_by_telegram_ids(telegram_ids)
+    return [known[telegram_id] for telegram_id in telegram_ids if telegram_id in known], len(telegram_ids) - len(known)
+
+
+async def _resolve_target_recipients(
+    message: Message,
+    target: str,
+    user_service: UserService,
+    competence_service: CompetenceService,
+) -> list[int] | None:
+    """Внутренние id пользователей с ролью или компетенцией ``target``; на неизвестную цель отвечает подсказкой."""
+    role = _find_role(target)
+    if role is not None:
+        return await user_service.find_user_ids_with_role(role.value)
+
+    competencies = await competence_service.find_all_competencies()
+    competence = _find_competence(target, competencies)
+    if competence is None:
+        await message.reply(points_batch_unknown_target(competencies))
+        return None
+    return await user_service.find_user_ids_with_competence_id(competence.id)
+
+
+async def _handle_batch_points_command(
+    message: Message,
+    user_service: UserService,
+    points_service: PointsService,
+    competence_service: CompetenceService,
+    notification_facade: NotificationFacade,
+) -> None:
+    text = check_text_message_correction(message)
+    command = _parse_batch_command(text) if text is not None else None
+    if command is None or message.from_user is None:
+        await message.reply(POINTS_BATCH_USAGE)
+        return
+
+    try:
+        points = Points(value=command.amount, point_type=command.points_type)
+    except (ValidationError, ValueError):
+        await message.reply(points_invalid_value(command.amount))
+        return
+
+    skipped = 0
+    if command.target is None:
+        listed = await _resolve_reply_recipients(message, user_service)
+        if listed is None:
+            return
+        recipient_ids, skipped = listed
+    else:
+        resolved = await _resolve_target_recipients(message, command.target, user_service, competence_service)
+        if resolved is None:
+            return
+        recipient_ids = resolved
+    if not recipient_ids:
+        await message.reply(POINTS_BATCH_RECIPIENTS_REQUIRED)
+        return
+
+    giver_user = await user_service.find_user_by_telegram_id(message.from_user.id)
+    if giver_user is None:
+        await message.reply(TARGET_NOT_FOUND)
+        return
+
+    changes = await points_service.change_points_bulk(
+        AdjustUsersPointsDTO(
+            recipient_ids=recipient_ids,
+            giver_id=giver_user.id,
+            points=points,
+            reason=command.reason,
+        )
+    )
+
+    try:
+        await notification_facade.notify_users(
+            NotifyUsersDTO(
+                user_ids=[change.telegram_id for change in changes],
+                message=points_notification(points, command.points_type, giver_user.first_name, command.reason),
+                kind=TaskScheduleKind.IMMEDIATE,
+            )
+        )
+    except Exception:
+        logger.exception("Failed to enqueue batch points notifications for {count} users", count=len(changes))
+
+    await message.reply(points_batch_success(len(changes), points, command.reason, skipped))
+
+
+@batch_points_global_router.message(Command("points"), flags={"role": "Admin", "rate_limit": "expensive"})
+async def handle_batch_points(
+    message: Message,
+    user_service: FromDishka[UserService],
+    points_service: FromDishka[PointsService],
+    competence_service: FromDishka[CompetenceService],
+    notification_facade: FromDishka[NotificationFacade],
+) -> None:
+    try:
+        await _handle_batch_points_command(
+            message,
+            user_service,
+            points_service,
+            competence_service,
+            notification_facade,
+        )
+    except UserNotFoundError:
+        await message.reply(TARGET_NOT_FOUND)
+        logger.warning("User not found in batch points command")
+    except ZeroPointsAdjustmentError:
+        await message.reply(points_invalid_value(0))
+    except DomainError:
+        await message.reply(POINTS_OPERATION_FAILED)
+        logger.exception("Domain error in handle_batch_points")
+    except Exception:
+        await message.reply(POINTS_UNEXPECTED_ERROR)
+        logger.exception("Unexpected error in handle_batch_points")
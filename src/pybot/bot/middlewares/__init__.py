@@ -1,11 +1,20 @@
 from .rate_limit import RateLimitMiddleware
+from .container import UpdateScopeMiddleware, setup_update_scope
 from .logger import LoggerMiddleware
+from .metrics import MetricsMiddleware
+from .plan import MiddlewarePlan, get_middleware_plan, plan_handler_middlewares
 from .role import RoleMiddleware
 from .user_activity import UserActivityMiddleware
 
 __all__ = [
     "RateLimitMiddleware",
     "LoggerMiddleware",
+    "MetricsMiddleware",
+    "MiddlewarePlan",
     "RoleMiddleware",
+    "UpdateScopeMiddleware",
     "UserActivityMiddleware",
+    "get_middleware_plan",
+    "plan_handler_middlewares",
+    "setup_update_scope",
 ]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from aiogram import Router
+from aiogram.types import TelegramObject
+from dishka import AsyncContainer
+from dishka.integrations.aiogram import CONTAINER_NAME, ContainerMiddleware, inject_router
+
+# Ставится, пока request scope открыт: errors-observer получает тот же ``data`` уже после выхода из scope.
+UPDATE_SCOPE_ACTIVE = "dishka_update_scope_active"
+
+
+class UpdateScopeMiddleware(ContainerMiddleware):
+    """
+    Один request scope dishka на весь update.
+
+    ``setup_dishka`` вешает ``ContainerMiddleware`` на каждый observer, и update с сообщением
+    открывает два соседних scope: на ``update`` и на ``message``. Здесь вложенный observer
+    переиспользует уже открытый scope, так что middleware и handler получают одну и ту же
+    ``AsyncSession``. Errors-обработчики по-прежнему получают свежий scope.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if data.get(UPDATE_SCOPE_ACTIVE) and CONTAINER_NAME in data:
+            return await handler(event, data)
+        data[UPDATE_SCOPE_ACTIVE] = True
+        try:
+            return await super().__call__(handler, event, data)
+        finally:
+            data[UPDATE_SCOPE_ACTIVE] = False
+
+
+def setup_update_scope(container: AsyncContainer, router: Router) -> None:
+    """Аналог ``setup_dishka(container, router, auto_inject=True)`` с одним request scope на update."""
+    middleware = UpdateScopeMiddleware(container)
+    for observer in router.observers.values():
+        observer.outer_middleware(middleware)
+    router.startup.register(partial(inject_router, router=router))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 import time
 from collections.abc import Awaitable, Callable
 from typing import Any
@@ -9,8 +10,22 @@ from aiogram.types import CallbackQuery, ChatMemberUpdated, InlineQuery, Message
 
 from ...core import logger
 from ...core.config import settings
+from ...core.logger import is_level_enabled
 
 MAX_LOGGED_CONTENT_LENGTH = 80
+SLOW_HANDLER_THRESHOLD_S = 1.0
+
+
+def get_handler_name(data: dict[str, Any]) -> str:
+    """Имя callback handler из ``data``; ключ логов и метрик по handler."""
+    if "handler" in data:
+        handler = data["handler"]
+        if hasattr(handler, "callback"):
+            callback = handler.callback
+            if hasattr(callback, "__name__"):
+                return callback.__name__
+
+    return "unknown_handler"
 
 
 class LoggerMiddleware(BaseMiddleware):
@@ -26,6 +41,14 @@ class LoggerMiddleware(BaseMiddleware):
         super().__init__()
         self.enabled = settings.enable_logging_middleware and enabled
         self.log_sensitive = log_sensitive
+        self.info_enabled = is_level_enabled("INFO")
+        self.success_sample_rate = settings.log_success_sample_rate
+
+    def _should_log_success(self) -> bool:
+        """Решить один раз на update, попадут ли его INFO-строки в лог (уровень и сэмплирование)."""
+        if not self.info_enabled or self.success_sample_rate <= 0:
+            return False
+        return self.success_sample_rate >= 1 or random.random() < self.success_sample_rate  # noqa: S311
 
     def _build_event_id(self, telegram_obj: TelegramObject, data: dict[str, Any]) -> str:
         """Собрать корреляционный ключ для логов одного update."""
@@ -169,14 +192,7 @@ class LoggerMiddleware(BaseMiddleware):
 
     def _get_handler_name(self, data: dict[str, Any]) -> str:
         """Получить имя handler без сериализации всего объекта."""
-        if "handler" in data:
-            handler = data["handler"]
-            if hasattr(handler, "callback"):
-                callback = handler.callback
-                if hasattr(callback, "__name__"):
-                    return callback.__name__
-
-        return "unknown_handler"
+        return get_handler_name(data)
 
     async def __call__(
         self,
@@ -184,40 +200,50 @@ class LoggerMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        """Записать старт, завершение и ошибку обработки update."""
+        """
+        Записать старт, завершение и ошибку обработки update.
+
+        Разбор update и сборка INFO-строк выполняются только для update, попавших в сэмпл;
+        ошибки и медленные handler логируются всегда.
+        """
         if not self.enabled:
             return await handler(event, data)
 
-        event_info = self._extract_minimal_info(event, data)
+        log_success = self._should_log_success()
+        event_info: dict[str, Any] | None = None
         handler_name = self._get_handler_name(data)
-        logger.info(
-            "событие=получен_update event_id={event_id} тип={event_type} handler={handler_name} "
-            'user_id={user_id} username={username} chat_id={chat_id} chat_type={chat_type} content="{content}"',
-            event_id=event_info["event_id"],
-            event_type=event_info["event_type"],
-            handler_name=handler_name,
-            user_id=event_info["user_id"],
-            username=event_info["username"],
-            chat_id=event_info["chat_id"],
-            chat_type=event_info["chat_type"],
-            content=self._normalize_content(event_info["content"]),
-        )
+        if log_success:
+            event_info = self._extract_minimal_info(event, data)
+            logger.info(
+                "событие=получен_update event_id={event_id} тип={event_type} handler={handler_name} "
+                'user_id={user_id} username={username} chat_id={chat_id} chat_type={chat_type} content="{content}"',
+                event_id=event_info["event_id"],
+                event_type=event_info["event_type"],
+                handler_name=handler_name,
+                user_id=event_info["user_id"],
+                username=event_info["username"],
+                chat_id=event_info["chat_id"],
+                chat_type=event_info["chat_type"],
+                content=self._normalize_content(event_info["content"]),
+            )
 
         start_time = time.monotonic()
         try:
             result = await handler(event, data)
             elapsed = time.monotonic() - start_time
 
-            logger.info(
-                "событие=обработан_update event_id={event_id} тип={event_type} handler={handler_name} "
-                "status=success elapsed_ms={elapsed_ms}",
-                event_id=event_info["event_id"],
-                event_type=event_info["event_type"],
-                handler_name=handler_name,
-                elapsed_ms=round(elapsed * 1000),
-            )
+            if event_info is not None:
+                logger.info(
+                    "событие=обработан_update event_id={event_id} тип={event_type} handler={handler_name} "
+                    "status=success elapsed_ms={elapsed_ms}",
+                    event_id=event_info["event_id"],
+                    event_type=event_info["event_type"],
+                    handler_name=handler_name,
+                    elapsed_ms=round(elapsed * 1000),
+                )
 
-            if elapsed > 1.0:
+            if elapsed > SLOW_HANDLER_THRESHOLD_S:
+                event_info = event_info or self._extract_minimal_info(event, data)
                 logger.warning(
                     "событие=медленный_handler event_id={event_id} тип={event_type} handler={handler_name} "
                     "elapsed_ms={elapsed_ms}",
@@ -228,6 +254,7 @@ class LoggerMiddleware(BaseMiddleware):
                 )
         except Exception as exc:
             elapsed = time.monotonic() - start_time
+            event_info = event_info or self._extract_minimal_info(event, data)
             logger.error(
                 "событие=ошибка_handler event_id={event_id} тип={event_type} handler={handler_name} "
                 'error_type={error_type} error="{error}" elapsed_ms={elapsed_ms}',
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from ...core.metrics import QUERY_COUNT_BUCKETS, MetricsRegistry, metrics, track_queries
+from .logger import get_handler_name
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    Гистограммы времени обработки и SQL-запросов по handler.
+
+    Регистрируется первой, чтобы в замер попали и остальные middleware: запросы
+    ``UserActivityMiddleware`` и ``RoleMiddleware`` считаются в счёт того же update.
+    """
+
+    def __init__(self, registry: MetricsRegistry = metrics) -> None:
+        super().__init__()
+        self.registry = registry
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_name = get_handler_name(data)
+        started_at = time.perf_counter()
+        with track_queries() as queries:
+            try:
+                return await handler(event, data)
+            except Exception:
+                self.registry.inc("bot_handler_errors_total", handler=handler_name)
+                raise
+            finally:
+                self.registry.observe(
+                    "bot_handler_duration_seconds", time.perf_counter() - started_at, handler=handler_name
+                )
+                self.registry.observe(
+                    "bot_handler_db_queries", queries.count, buckets=QUERY_COUNT_BUCKETS, handler=handler_name
+                )
+                self.registry.observe("bot_handler_db_seconds", queries.seconds, handler=handler_name)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import Router
+
+MIDDLEWARE_PLAN_FLAG = "middleware_plan"
+USER_CONTEXT_KEYS = frozenset({"user_id", "user_context", "user_roles"})
+
+
+@dataclass(frozen=True, slots=True)
+class MiddlewarePlan:
+    """
+    Что нужно handler от middleware: лимит, проверка роли и загрузка контекста пользователя.
+
+    План строится один раз по флагам handler при ``setup_handlers``, middleware только читают его.
+    Контекст не загружается для ``public`` handler, если он не требует роль и не принимает
+    ``user_id``/``user_context``/``user_roles``.
+    """
+
+    rate_limit: str | None = None
+    role: Any = None
+    load_user_context: bool = True
+
+    @classmethod
+    def from_handler(cls, handler: Any) -> MiddlewarePlan:
+        flags: dict[str, Any] = getattr(handler, "flags", None) or {}
+        role = flags.get("role") or None
+        wants_context = bool(getattr(handler, "varkw", False)) or not USER_CONTEXT_KEYS.isdisjoint(
+            getattr(handler, "params", ())
+        )
+        return cls(
+            rate_limit=flags.get("rate_limit") or None,
+            role=role,
+            load_user_context=role is not None or wants_context or not flags.get("public", False),
+        )
+
+
+DEFAULT_PLAN = MiddlewarePlan()
+
+
+def get_middleware_plan(data: dict[str, Any]) -> MiddlewarePlan:
+    """Вернуть план handler из ``data``; для handler без плана он вычисляется по флагам на лету."""
+    handler = data.get("handler")
+    if handler is None:
+        return DEFAULT_PLAN
+    flags = getattr(handler, "flags", None)
+    plan = flags.get(MIDDLEWARE_PLAN_FLAG) if flags else None
+    if isinstance(plan, MiddlewarePlan):
+        return plan
+    return MiddlewarePlan.from_handler(handler)
+
+
+def plan_handler_middlewares(router: Router) -> int:
+    """Сохранить план middleware во флагах всех handler роутера и вложенных роутеров."""
+    planned = 0
+    for nested_router in router.chain_tail:
+        for observer in nested_router.observers.values():
+            for handler in observer.handlers:
+                handler.flags[MIDDLEWARE_PLAN_FLAG] = MiddlewarePlan.from_handler(handler)
+                planned += 1
+    return planned
@@ -1,52 +1,101 @@
 from collections.abc import Awaitable, Callable
 from typing import Any
 
-from aiocache import SimpleMemoryCache
 from aiogram import BaseMiddleware
-from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramAPIError
 from aiogram.types import Message, TelegramObject, User
-from aiolimiter import AsyncLimiter
 
 from ...core import logger
 from ...core.config import settings
+from ...core.metrics import MetricsRegistry, metrics
+from ...infrastructure.rate_limit_store import InMemoryRateLimitStore, RateLimitKey, RateLimitRule, RedisRateLimitStore
+from ..texts import rate_limit_exceeded
+from .plan import get_middleware_plan
+
+# Ключ лимитера для подсказки «слишком много запросов»: своя квота, одна подсказка за окно правила.
+NOTICE_KEY_SUFFIX = ":notice"
 
 
 class RateLimitMiddleware(BaseMiddleware):
-    def __init__(self) -> None:
+    """
+    Ограничение частоты команд по флагу ``rate_limit`` (cheap, moderate, expensive).
+
+    Сообщение сверх лимита не доходит до хендлера: счётчик ``rate_limit_dropped_total`` растёт,
+    а пользователь получает подсказку не чаще одного раза за окно правила. По умолчанию лимиты
+    считаются в памяти процесса синхронно, без await; с ``redis_store`` лимит общий для всех реплик.
+    """
+
+    def __init__(
+        self,
+        redis_store: RedisRateLimitStore | None = None,
+        *,
+        registry: MetricsRegistry = metrics,
+    ) -> None:
         super().__init__()
+        self.registry = registry
         self.enable_rate_limit = settings.enable_rate_limit
-        if self.enable_rate_limit:
-            self.limits = {
-                "cheap": (settings.rate_limit_cheap, settings.time_limit_cheap),
-                "moderate": (settings.rate_limit_moderate, settings.time_limit_moderate),
-                "expensive": (settings.rate_limit_expensive, settings.time_limit_expensive),
-            }
-        self.cache: SimpleMemoryCache = SimpleMemoryCache()
-
-    async def _get_user_limiter(
-        self,
-        user_id: int,
-        command_type: str,
-    ) -> AsyncLimiter:
-        """Получить или создать лимитер для пользователя и команды"""
-        key = f"{user_id}:{command_type}"
-
-        limiter = await self.cache.get(key)
-
-        if limiter is None:
-            # Создать новый лимитер
-            max_rate, time_period = self.limits.get(
-                command_type,
-                self.limits["moderate"],
-            )
-            # Защита от некорректных настроек
-            if max_rate <= 0 or time_period <= 0:
-                max_rate, time_period = self.limits["moderate"]
+        self.limits = {
+            "cheap": (settings.rate_limit_cheap, settings.time_limit_cheap),
+            "moderate": (settings.rate_limit_moderate, settings.time_limit_moderate),
+            "expensive": (settings.rate_limit_expensive, settings.time_limit_expensive),
+        }
+        self.store = InMemoryRateLimitStore(settings.max_user_limiters)
+        self.redis_store = redis_store
+
+    def _get_rule(self, command_type: str) -> RateLimitRule:
+        """Правило для типа команды; неизвестный тип и некорректные настройки дают moderate."""
+        max_rate, time_period = self.limits.get(command_type, self.limits["moderate"])
+        # Защита от некорректных настроек
+        if max_rate <= 0 or time_period <= 0:
+            max_rate, time_period = self.limits["moderate"]
+        return RateLimitRule(rate=max_rate, period_s=time_period)
+
+    def _hit(self, key: RateLimitKey, rule: RateLimitRule) -> float:
+        """Учесть событие в памяти процесса; ошибка лимитера не должна блокировать обработку апдейта."""
+        try:
+            return self.store.hit(key, rule)
+        except Exception as e:
+            self._log_store_error(e)
+            return 0.0
 
-            limiter = AsyncLimiter(max_rate=max_rate, time_period=time_period)
-            await self.cache.set(key, limiter, ttl=3600)
+    async def _hit_shared(self, redis_store: RedisRateLimitStore, key: RateLimitKey, rule: RateLimitRule) -> float:
+        try:
+            return await redis_store.hit(key, rule)
+        except Exception as e:
+            self._log_store_error(e)
+            return 0.0
+
+    async def _reject(self, event: Message, user_id: int, command_limit: str, retry_after: float) -> None:
+        """Учесть отброшенное сообщение и ответить подсказкой, если в этом окне её ещё не было."""
+        self.registry.inc("rate_limit_dropped_total", command_type=command_limit)
+        logger.debug(
+            "Rate limit exceeded | User: {user_id} | Type: '{command_limit}' | Retry after: {retry_after:.1f}s",
+            user_id=user_id,
+            command_limit=command_limit,
+            retry_after=retry_after,
+        )
+        notice_key = (user_id, f"{command_limit}{NOTICE_KEY_SUFFIX}")
+        notice_rule = RateLimitRule(rate=1, period_s=self._get_rule(command_limit).period_s)
+        if self.redis_store is None:
+            notice_retry_after = self._hit(notice_key, notice_rule)
+        else:
+            notice_retry_after = await self._hit_shared(self.redis_store, notice_key, notice_rule)
+        if notice_retry_after > 0:
+            return
+        try:
+            await event.answer(rate_limit_exceeded(retry_after))
+        except TelegramAPIError as e:
+            logger.warning(
+                "Rate limit notice was not sent | User: {user_id} | Error: {error}", user_id=user_id, error=e
+            )
 
-        return limiter
+    @staticmethod
+    def _log_store_error(error: Exception) -> None:
+        logger.error(
+            "❌ Rate limit middleware error: {error}",
+            error=str(error),
+            exc_info=True,
+        )
 
     async def __call__(
         self,
@@ -67,27 +116,17 @@ class RateLimitMiddleware(BaseMiddleware):
         if user is None:
             return await handler(event, data)
 
-        try:
-            # ✅ ПРАВИЛЬНО: передаём data, а не handler!
-            command_limit = get_flag(data, "rate_limit")
-            logger.info(f"Extracted rate limit type: {command_limit}")
-            if not command_limit:
-                logger.info(
-                    f"⏭️ No rate limit for user {user.id}",
-                )
-                return await handler(event, data)
-
-            limiter = await self._get_user_limiter(user.id, command_limit)
-
-            async with limiter:
-                logger.info(f"✅ Rate limit APPLIED | User: {user.id} | Type: '{command_limit}'")
-                return await handler(event, data)
+        command_limit = get_middleware_plan(data).rate_limit
+        if not command_limit:
+            return await handler(event, data)
 
-        except Exception as e:
-            logger.error(
-                "❌ Rate limit middleware error: {error}",
-                error=str(e),
-                exc_info=True,
-            )
+        key, rule = (user.id, command_limit), self._get_rule(command_limit)
+        if self.redis_store is None:
+            retry_after = self._hit(key, rule)
+        else:
+            retry_after = await self._hit_shared(self.redis_store, key, rule)
+        if retry_after > 0:
+            await self._reject(event, user.id, command_limit, retry_after)
+            return None
 
         return await handler(event, data)
@@ -2,15 +2,16 @@ from collections.abc import Awaitable, Callable
 from typing import Any
 
 from aiogram import BaseMiddleware
-from aiogram.dispatcher.flags import get_flag
 from aiogram.types import Message, TelegramObject
 from dishka.integrations.aiogram import CONTAINER_NAME
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core import logger
+from ...dto import UserContext
 from ...infrastructure.user_repository import UserRepository
 from ...utils import has_any_role
 from ..texts import ROLE_ACCESS_DENIED, ROLE_AUTH_ERROR
+from .plan import get_middleware_plan
 
 
 class RoleMiddleware(BaseMiddleware):
@@ -20,7 +21,7 @@ class RoleMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        required_role = get_flag(data, "role")
+        required_role = get_middleware_plan(data).role
 
         if not required_role:
             return await handler(event, data)
@@ -29,29 +30,20 @@ class RoleMiddleware(BaseMiddleware):
         if not user:
             return await handler(event, data)
 
-        user_db_id = data.get("user_id")
-        if not user_db_id:
+        user_context: UserContext | None = data.get("user_context")
+        if user_context is None:
+            # UserActivityMiddleware is not registered for this event type (or disabled): load it here.
+            user_context = await self._load_user_context(user.id, data)
+
+        if user_context is None:
             logger.warning("Role check failed: user not found in DB")
             if isinstance(event, Message):
                 await event.answer(ROLE_AUTH_ERROR)
             return
 
-        container = data.get(CONTAINER_NAME)
-        if not container:
-            logger.error("Dishka container not found in data")
-            return await handler(event, data)
-
-        async with container() as request_container:
-            db = await request_container.get(AsyncSession)
-            repo: UserRepository = await request_container.get(UserRepository)
-            has_permission = await repo.find_all_user_roles_by_pk(
-                db=db,
-                user_id=user_db_id,
-            )
-
         logger.info("Checking role '{required_role}' for user {user_id}", required_role=required_role, user_id=user.id)
 
-        if has_any_role(has_permission, required_role):
+        if has_any_role(user_context.roles, required_role):
             return await handler(event, data)
 
         logger.warning(
@@ -63,3 +55,14 @@ class RoleMiddleware(BaseMiddleware):
             await event.answer(ROLE_ACCESS_DENIED)
 
         return
+
+    @staticmethod
+    async def _load_user_context(telegram_id: int, data: dict[str, Any]) -> UserContext | None:
+        container = data.get(CONTAINER_NAME)
+        if not container:
+            logger.error("Dishka container not found in data")
+            return None
+
+        db = await container.get(AsyncSession)
+        repo: UserRepository = await container.get(UserRepository)
+        return await repo.load_user_context(db, telegram_id)
@@ -6,11 +6,12 @@ from aiogram.types import TelegramObject
 from dishka.integrations.aiogram import CONTAINER_NAME
 
 from ...core import logger
-from ...services import UserRolesService, UserService
+from ...services import UserService
+from .plan import get_middleware_plan
 
 
 class UserActivityMiddleware(BaseMiddleware):
-    """Middleware to update user's last activity timestamp."""
+    """Middleware to load the user context and update user's last activity timestamp."""
 
     async def __call__(
         self,
@@ -18,6 +19,10 @@ class UserActivityMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
+        # Public handlers that neither check roles nor read the user context skip the container entirely.
+        if not get_middleware_plan(data).load_user_context:
+            return await handler(event, data)
+
         # Background activity tracking for the current Telegram user.
         user = data.get("event_from_user")
         if not user:
@@ -30,16 +35,16 @@ class UserActivityMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         try:
-            async with container() as request_container:
-                user_service: UserService = await request_container.get(UserService)
-                user_roles_service: UserRolesService = await request_container.get(UserRolesService)
-                user_id = await user_service.track_activity(user.id)
-                if user_id is not None:
-                    data["user_id"] = user_id  # Decouple downstream logic from Telegram ids.
-                    data["user_roles"] = set(await user_roles_service.find_user_roles(user_id))
-
+            # The update's request container is used directly, so the handler reuses the same session.
+            user_service: UserService = await container.get(UserService)
+            user_context = await user_service.load_context(user.id)
         except Exception:
             logger.exception("Failed to update user activity")
             raise
 
+        if user_context is not None:
+            data["user_context"] = user_context
+            data["user_id"] = user_context.user_id  # Decouple downstream logic from Telegram ids.
+            data["user_roles"] = set(user_context.roles)
+
         return await handler(event, data)
@@ -1,4 +1,5 @@
 import html
+import math
 import re
 import textwrap
 from collections.abc import Sequence
@@ -46,6 +47,7 @@ HELP_PRIVATE = textwrap.dedent(
     Работа с баллами:
     /academic_points @user <число> "причина" - изменить академические баллы
     /reputation_points @user <число> "причина" - изменить репутационные баллы
+    /points batch <academic|reputation> [Role|Competence] <число> "причина" - изменить баллы группе
 
     Работа с ролями:
     /addrole @user <Student|Mentor|Admin> "причина" - выдать роль
@@ -157,6 +159,7 @@ ROLE_ACCESS_DENIED = (
     "⛔ Не удалось выполнить это действие: у вас недостаточно прав.\n"
     "Используйте аккаунт с нужной ролью или обратитесь к администратору."
 )
+RATE_LIMIT_EXCEEDED = "⏳ Слишком много запросов.\nПовторите команду через {seconds} с."
 
 BROADCAST_USAGE = (
     "Не удалось определить получателя и текст рассылки.\n"
@@ -166,6 +169,7 @@ BROADCAST_MESSAGE_REQUIRED = (
     "Не удалось отправить рассылку без текста.\n"
     "Добавьте сообщение после получателя: /broadcast @all|Role|Competence <сообщение>"
 )
+BROADCAST_STARTING = "Рассылка запускается…"
 BROADCAST_UNKNOWN_TARGET = (
     "Не удалось распознать получателя рассылки.\n"
     "Используйте @all, одну из ролей или существующую компетенцию.\n"
@@ -287,6 +291,26 @@ POINTS_INVALID_VALUE = "Не удалось изменить баллы: зна
 POINTS_CHANGE_SUCCESS = "✅ Баллы обновлены для {target_name}: {points}.{reason_text}"
 POINTS_NOTIFICATION = "📈 Пользователь {giver_name} {action} вам {points_amount} {points_label} баллов.{reason_text}"
 POINTS_REASON_LINE = "\nПричина: {reason}"
+POINTS_BATCH_USAGE = (
+    "Не удалось разобрать команду массового изменения баллов.\n"
+    'Используйте формат: /points batch <academic|reputation> [Role|Competence] <число> "причина".\n'
+    "Без роли и компетенции ответьте командой на сообщение со списком Telegram ID, по одному в строке."
+)
+POINTS_BATCH_RECIPIENTS_REQUIRED = (
+    "Не удалось найти получателей.\nОтветьте на сообщение со списком Telegram ID либо укажите роль или компетенцию."
+)
+POINTS_BATCH_AMBIGUOUS_LIST = (
+    "Не удалось однозначно разобрать список получателей.\n"
+    "Укажите по одному Telegram ID в строке, например 123456789 или @123456789, без другого текста."
+)
+POINTS_BATCH_UNKNOWN_TARGET = (
+    "Не удалось распознать получателей.\n"
+    "Используйте одну из ролей или существующую компетенцию.\n"
+    "Доступные роли: {roles}\n"
+    "Доступные компетенции: {competencies}"
+)
+POINTS_BATCH_SUCCESS = "✅ Баллы обновлены для {count} пользователей: {points}.{reason_text}{skipped_text}"
+POINTS_BATCH_SKIPPED = "\nНе зарегистрированы в боте и пропущены: {count}."
 LEADERBOARD_UNEXPECTED_ERROR = "Не удалось загрузить лидерборд.\nПопробуйте ещё раз позже."
 LEADERBOARD_EMPTY = "Пока никто не заработал баллов, будь первым!"
 LEADERBOARD_TITLE = "<b>Лидерборд за прошлую неделю</b>"
@@ -485,10 +509,30 @@ def points_change_success(target_name: str, points: Points, reason: str | None)
     return POINTS_CHANGE_SUCCESS.format(target_name=target_name, points=points.value, reason_text=reason_text)
 
 
+def points_batch_success(count: int, points: Points, reason: str | None, skipped: int) -> str:
+    reason_text = f" Причина: {reason}" if reason else ""
+    skipped_text = POINTS_BATCH_SKIPPED.format(count=skipped) if skipped else ""
+    return POINTS_BATCH_SUCCESS.format(
+        count=count,
+        points=points.value,
+        reason_text=reason_text,
+        skipped_text=skipped_text,
+    )
+
+
+def points_batch_unknown_target(competencies: Sequence[CompetenceReadDTO]) -> str:
+    competences_list = ", ".join(competence.name for competence in competencies) or "нет доступных"
+    return POINTS_BATCH_UNKNOWN_TARGET.format(roles=AVAILABLE_ROLES, competencies=competences_list)
+
+
 def points_invalid_value(value: object) -> str:
     return POINTS_INVALID_VALUE.format(value=value)
 
 
+def rate_limit_exceeded(retry_after: float) -> str:
+    return RATE_LIMIT_EXCEEDED.format(seconds=max(math.ceil(retry_after), 1))
+
+
 def render_leaderboard_message(
     *,
     academic_rows: Sequence[WeeklyLeaderboardRowDTO],
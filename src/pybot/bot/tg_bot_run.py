@@ -7,11 +7,12 @@ from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram_dialog import setup_dialogs
 from dishka import AsyncContainer
-from dishka.integrations.aiogram import setup_dishka
+from redis.asyncio import Redis
 
 from ..core import logger
 from ..core.config import settings
 from ..di.containers import setup_container
+from ..infrastructure import MetricsSnapshotWriter, RedisRateLimitStore, UserActivityBuffer
 from ..services import SystemRuntimeAlertsService
 from .dialogs import user_router
 from .handlers import (
@@ -24,10 +25,15 @@ from .handlers import (
 from .handlers.common.dialog_errors import register_dialog_error_handlers
 from .middlewares import (
     LoggerMiddleware,
+    MetricsMiddleware,
     RateLimitMiddleware,
     RoleMiddleware,
     UserActivityMiddleware,
+    plan_handler_middlewares,
+    setup_update_scope,
 )
+from .update_executor import OrderedUpdateExecutor, poll_updates
+from .webhook import run_webhook
 
 
 async def setup_dispatcher() -> Dispatcher:
@@ -44,8 +50,28 @@ async def setup_dispatcher() -> Dispatcher:
     return Dispatcher()
 
 
+def setup_rate_limit_store(dp: Dispatcher) -> RedisRateLimitStore | None:
+    """Create the shared Redis limiter store when configured; it is closed on dispatcher shutdown."""
+    if settings.rate_limit_backend != "redis":
+        return None
+    store = RedisRateLimitStore(Redis.from_url(settings.redis_url))
+    dp.shutdown.register(store.close)
+    logger.info("event=rate_limit_setup backend=redis")
+    return store
+
+
 async def setup_middlewares(dp: Dispatcher) -> None:
     """Attach configured middleware stack to the dispatcher."""
+    if settings.enable_metrics:
+        # Registered first so the measured time and SQL statements include the rest of the stack.
+        metrics_middleware = MetricsMiddleware()
+        dp.message.middleware(metrics_middleware)
+        dp.callback_query.middleware(metrics_middleware)
+        dp.inline_query.middleware(metrics_middleware)
+        logger.info("event=middleware_setup middleware=MetricsMiddleware status=enabled")
+    else:
+        logger.info("event=middleware_setup middleware=MetricsMiddleware status=disabled")
+
     if settings.enable_logging_middleware:
         logging_middleware = LoggerMiddleware(enabled=True)
         dp.message.middleware(logging_middleware)
@@ -71,9 +97,8 @@ async def setup_middlewares(dp: Dispatcher) -> None:
         logger.info("event=middleware_setup middleware=RoleMiddleware status=disabled")
 
     if settings.enable_rate_limit:
-        dp.update.middleware(RateLimitMiddleware())
-        dp.message.middleware(RateLimitMiddleware())
-        dp.callback_query.middleware(RateLimitMiddleware())
+        # Limits apply to messages only, so a single limiter pass per message is enough.
+        dp.message.middleware(RateLimitMiddleware(setup_rate_limit_store(dp)))
         logger.info("event=middleware_setup middleware=RateLimitMiddleware status=enabled")
     else:
         logger.info("event=middleware_setup middleware=RateLimitMiddleware status=disabled")
@@ -83,7 +108,7 @@ async def setup_di(dp: Dispatcher) -> AsyncContainer:
     """Initialize the DI container and connect it to aiogram."""
     container = await setup_container()
     logger.debug("event=di_setup status=success container={container}", container=container)
-    setup_dishka(container, dp, auto_inject=True)
+    setup_update_scope(container, dp)
     return container
 
 
@@ -107,6 +132,25 @@ def setup_handlers(dp: Dispatcher) -> None:
     dp.include_router(roles_router)
     dp.include_router(broadcast_router)
     setup_dialogs(dp)
+    planned = plan_handler_middlewares(dp)
+    logger.info("event=middleware_plan_setup handlers={planned}", planned=planned)
+
+
+def setup_update_executor(dp: Dispatcher) -> OrderedUpdateExecutor | None:
+    """Create the per-chat ordered update executor when UPDATE_EXECUTOR_LANES is set."""
+    if settings.update_executor_lanes == 0:
+        logger.info("event=update_executor_setup status=disabled")
+        return None
+    logger.info(
+        "event=update_executor_setup status=enabled lanes={lanes} queue_size={queue_size}",
+        lanes=settings.update_executor_lanes,
+        queue_size=settings.update_executor_queue_size,
+    )
+    return OrderedUpdateExecutor(
+        dp,
+        lanes=settings.update_executor_lanes,
+        queue_size=settings.update_executor_queue_size,
+    )
 
 
 async def notify_startup_alert(runtime_alerts_service: SystemRuntimeAlertsService) -> None:
@@ -127,6 +171,90 @@ async def notify_shutdown_alert(runtime_alerts_service: SystemRuntimeAlertsServi
         logger.exception("event=runtime_alert phase=shutdown status=failed")
 
 
+async def start_metrics_export(container: AsyncContainer) -> None:
+    """Start publishing process metrics for the health API; a failure only disables /metrics for the bot."""
+    try:
+        await container.get(MetricsSnapshotWriter)
+    except Exception:
+        logger.exception("event=metrics_export phase=startup status=failed")
+
+
+async def flush_user_activity(container: AsyncContainer) -> None:
+    """Write buffered last_active_at marks while the database engine is still open."""
+    try:
+        activity_buffer = await container.get(UserActivityBuffer)
+        await activity_buffer.close()
+    except Exception:
+        logger.exception("event=user_activity_flush phase=shutdown status=failed")
+
+
+async def run_webhook_mode(
+    dp: Dispatcher,
+    bot: Bot,
+    executor: OrderedUpdateExecutor | None,
+    runtime_alerts_service: SystemRuntimeAlertsService,
+) -> None:
+    """Serve updates through the webhook until the task is cancelled."""
+    logger.info("event=bot_runtime_init status=completed mode=webhook")
+    await notify_startup_alert(runtime_alerts_service)
+    await run_webhook(dp, bot, executor)
+
+
+async def run_polling_mode(
+    dp: Dispatcher,
+    bot: Bot,
+    executor: OrderedUpdateExecutor | None,
+    runtime_alerts_service: SystemRuntimeAlertsService,
+) -> None:
+    """Drop the webhook and poll updates, through the ordered executor when it is enabled."""
+    await bot.delete_webhook(drop_pending_updates=True)
+    logger.info("event=bot_runtime_init status=completed")
+    await notify_startup_alert(runtime_alerts_service)
+    logger.info("event=polling status=started")
+    if executor is not None:
+        await poll_updates(dp, bot, executor, drain_timeout_s=settings.update_executor_drain_timeout_s)
+    else:
+        await dp.start_polling(bot)
+
+
+async def close_fsm_storage(dp: Dispatcher) -> None:
+    """Close the dispatcher FSM storage without breaking the rest of the shutdown."""
+    storage: BaseStorage | None = getattr(dp, "storage", None)
+    if storage is None:
+        return
+    try:
+        await storage.close()
+        logger.info("event=fsm_storage_close status=success")
+    except Exception:
+        logger.exception("event=fsm_storage_close status=failed")
+
+
+async def close_container(container: AsyncContainer) -> None:
+    """Flush buffered activity and close the DI container together with its resources."""
+    await flush_user_activity(container)
+    try:
+        await container.close()
+        logger.info("event=container_close status=success")
+    except Exception:
+        logger.exception("event=container_close status=failed")
+
+
+async def graceful_shutdown(
+    dp: Dispatcher | None,
+    container: AsyncContainer | None,
+    runtime_alerts_service: SystemRuntimeAlertsService | None,
+) -> None:
+    """Release whatever the bootstrap managed to create, in reverse order."""
+    logger.info("event=graceful_shutdown status=started")
+    if runtime_alerts_service is not None:
+        await notify_shutdown_alert(runtime_alerts_service)
+    if dp is not None:
+        await close_fsm_storage(dp)
+    if container is not None:
+        await close_container(container)
+    logger.info("event=graceful_shutdown status=completed")
+
+
 async def tg_bot_main() -> None:
     """Run the bot with a graceful shutdown path."""
     container: AsyncContainer | None = None
@@ -138,13 +266,14 @@ async def tg_bot_main() -> None:
         container = await setup_di(dp)
         bot = await setup_bot(container)
         runtime_alerts_service = await setup_runtime_alerts_service(container)
+        await start_metrics_export(container)
         await setup_middlewares(dp)
         setup_handlers(dp)
-        await bot.delete_webhook(drop_pending_updates=True)
-        logger.info("event=bot_runtime_init status=completed")
-        await notify_startup_alert(runtime_alerts_service)
-        logger.info("event=polling status=started")
-        await dp.start_polling(bot)
+        executor = setup_update_executor(dp)
+        if settings.bot_runtime_mode == "webhook":
+            await run_webhook_mode(dp, bot, executor, runtime_alerts_service)
+        else:
+            await run_polling_mode(dp, bot, executor, runtime_alerts_service)
     except asyncio.CancelledError:
         logger.info("event=bot_runtime_shutdown reason=cancelled")
         raise
@@ -152,25 +281,4 @@ async def tg_bot_main() -> None:
         logger.exception("event=runtime_unexpected_error")
         raise
     finally:
-        logger.info("event=graceful_shutdown status=started")
-
-        if runtime_alerts_service is not None:
-            await notify_shutdown_alert(runtime_alerts_service)
-
-        if dp is not None:
-            storage: BaseStorage | None = getattr(dp, "storage", None)
-            if storage is not None:
-                try:
-                    await storage.close()
-                    logger.info("event=fsm_storage_close status=success")
-                except Exception:
-                    logger.exception("event=fsm_storage_close status=failed")
-
-        if container is not None:
-            try:
-                await container.close()
-                logger.info("event=container_close status=success")
-            except Exception:
-                logger.exception("event=container_close status=failed")
-
-        logger.info("event=graceful_shutdown status=completed")
+        await graceful_shutdown(dp, container, runtime_alerts_service)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass, field
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError
+from aiogram.methods import TelegramMethod
+from aiogram.types import Update
+from aiogram.utils.backoff import Backoff, BackoffConfig
+
+from ..core import logger
+from ..core.metrics import MetricsRegistry, metrics
+
+POLLING_BACKOFF = BackoffConfig(min_delay=1.0, max_delay=5.0, factor=1.3, jitter=0.1)
+
+
+def update_ordering_key(update: Update) -> int:
+    """Ключ порядка: чат update, иначе пользователь; update без чата и пользователя не упорядочиваются."""
+    context = UserContextMiddleware.resolve_event_context(update)
+    if context.chat is not None:
+        return context.chat.id
+    if context.user is not None:
+        return context.user.id
+    return update.update_id
+
+
+@dataclass(slots=True)
+class _Lane:
+    index: int
+    queue: asyncio.Queue[tuple[Bot, Update, float]]
+    busy_since: float | None = None
+    processed: int = 0
+    worker: asyncio.Task[None] | None = field(default=None, repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateExecutorStats:
+    lanes: int
+    queue_depth: int
+    busy_lanes: int
+    processed: int
+
+
+class OrderedUpdateExecutor:
+    """
+    Исполнитель update по N очередям-«полосам».
+
+    Update попадает в полосу по хешу чата (или пользователя), поэтому шаги одного диалога
+    aiogram_dialog идут строго по порядку, а разные чаты обрабатываются параллельно.
+    Очередь полосы ограничена ``queue_size``: ``submit`` ждёт свободного места, и это
+    замедляет чтение новых update (backpressure), а не копит их в памяти.
+    Каждый update проходит весь ``Dispatcher.feed_update``, включая errors-обработчики.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        *,
+        lanes: int,
+        queue_size: int,
+        registry: MetricsRegistry = metrics,
+    ) -> None:
+        if lanes < 1:
+            raise ValueError("lanes must be at least 1")
+        self.dispatcher = dispatcher
+        self.registry = registry
+        self._lanes = [_Lane(index, asyncio.Queue(maxsize=queue_size)) for index in range(lanes)]
+        self._closed = False
+
+    def start(self) -> None:
+        for lane in self._lanes:
+            if lane.worker is None:
+                lane.worker = asyncio.create_task(self._work(lane), name=f"update-lane-{lane.index}")
+
+    async def submit(self, bot: Bot, update: Update) -> None:
+        if self._closed:
+            raise RuntimeError("Update executor is closed")
+        lane = self._lanes[update_ordering_key(update) % len(self._lanes)]
+        await lane.queue.put((bot, update, time.perf_counter()))
+        self.registry.set("update_executor_queue_depth", lane.queue.qsize(), lane=lane.index)
+
+    def stats(self) -> UpdateExecutorStats:
+        return UpdateExecutorStats(
+            lanes=len(self._lanes),
+            queue_depth=sum(lane.queue.qsize() for lane in self._lanes),
+            busy_lanes=sum(lane.busy_since is not None for lane in self._lanes),
+            processed=sum(lane.processed for lane in self._lanes),
+        )
+
+    async def close(self, timeout_s: float) -> None:
+        """Перестать принимать update и дообработать очереди не дольше ``timeout_s``."""
+        self._closed = True
+        stats = self.stats()
+        logger.info(
+            "event=update_executor_drain status=started queued={queued} busy_lanes={busy}",
+            queued=stats.queue_depth,
+            busy=stats.busy_lanes,
+        )
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(timeout_s):
+                await asyncio.gather(*(lane.queue.join() for lane in self._lanes))
+        workers = [lane.worker for lane in self._lanes if lane.worker is not None]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        logger.info("event=update_executor_drain status=completed dropped={dropped}", dropped=self.stats().queue_depth)
+
+    async def _work(self, lane: _Lane) -> None:
+        while True:
+            bot, update, enqueued_at = await lane.queue.get()
+            lane.busy_since = time.perf_counter()
+            self.registry.observe("update_executor_queue_wait_seconds", lane.busy_since - enqueued_at)
+            self.registry.set("update_executor_queue_depth", lane.queue.qsize(), lane=lane.index)
+            try:
+                result = await self.dispatcher.feed_update(bot, update)
+                if isinstance(result, TelegramMethod):
+                    await self.dispatcher.silent_call_request(bot, result)
+            except Exception:
+                # Ошибку уже увидели errors-обработчики диспетчера; полоса продолжает работу.
+                logger.exception("event=update_executor_failed update_id={update_id}", update_id=update.update_id)
+            finally:
+                self.registry.inc(
+                    "update_executor_busy_seconds_total", time.perf_counter() - lane.busy_since, lane=lane.index
+                )
+                lane.busy_since = None
+                lane.processed += 1
+                lane.queue.task_done()
+
+
+async def poll_updates(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    executor: OrderedUpdateExecutor,
+    *,
+    drain_timeout_s: float,
+    polling_timeout: int = 30,
+) -> None:
+    """
+    Long polling, который отдаёт update в :class:`OrderedUpdateExecutor` вместо задачи на каждый update.
+
+    Повторяет жизненный цикл ``Dispatcher.start_polling``: startup/shutdown-события диспетчера
+    и повторные попытки с backoff при сетевых ошибках Telegram. При остановке очереди
+    дообрабатываются до shutdown-событий, пока ресурсы диспетчера ещё открыты.
+    """
+    workflow_data = {"dispatcher": dispatcher, "bots": [bot], **dispatcher.workflow_data}
+    workflow_data.pop("bot", None)
+    await dispatcher.emit_startup(bot=bot, **workflow_data)
+    executor.start()
+    backoff = Backoff(config=POLLING_BACKOFF)
+    allowed_updates = dispatcher.resolve_used_update_types()
+    offset: int | None = None
+    try:
+        while True:
+            try:
+                updates = await bot.get_updates(
+                    offset=offset,
+                    timeout=polling_timeout,
+                    allowed_updates=allowed_updates,
+                    request_timeout=int(bot.session.timeout + polling_timeout),
+                )
+            except (TelegramNetworkError, TelegramAPIError) as exc:
+                logger.warning(
+                    "event=polling_failed error_type={error_type} retry_in_s={delay:.1f}",
+                    error_type=type(exc).__name__,
+                    delay=backoff.next_delay,
+                )
+                await backoff.asleep()
+                continue
+            backoff.reset()
+            for update in updates:
+                await executor.submit(bot, update)
+                offset = update.update_id + 1
+    finally:
+        try:
+            await executor.close(drain_timeout_s)
+        finally:
+            await dispatcher.emit_shutdown(bot=bot, **workflow_data)
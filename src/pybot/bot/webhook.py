@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from ..core import logger
+from ..core.config import settings
+from .update_executor import OrderedUpdateExecutor
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookLimits:
+    """Секрет Telegram, число одновременно обрабатываемых update и время drain при остановке."""
+
+    secret_token: str
+    max_concurrency: int
+    drain_timeout_s: float
+
+    @classmethod
+    def from_settings(cls) -> WebhookLimits:
+        return cls(
+            secret_token=settings.webhook_secret_token or "",
+            max_concurrency=settings.webhook_max_concurrency,
+            drain_timeout_s=settings.webhook_drain_timeout_s,
+        )
+
+
+class BoundedWebhookRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler с ограниченным числом одновременно обрабатываемых update.
+
+    Telegram получает ответ сразу, обработка идёт в фоне. Когда заняты все ``max_concurrency``
+    слотов, следующий запрос ждёт свободного слота до ответа: Telegram не шлёт новых update,
+    пока не получит ответ, так что очередь не растёт без границ. С ``executor`` update уходят
+    в его полосы с сохранением порядка по чату, и ограничение задаёт глубина очередей.
+    При остановке ``close`` дожидается начатых update не дольше ``drain_timeout_s``,
+    а сессию бота закрывает DI-контейнер.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        *,
+        limits: WebhookLimits,
+        executor: OrderedUpdateExecutor | None = None,
+        **data: Any,
+    ) -> None:
+        super().__init__(dispatcher, bot, handle_in_background=True, secret_token=limits.secret_token, **data)
+        self.max_concurrency = limits.max_concurrency
+        self.drain_timeout_s = limits.drain_timeout_s
+        self.executor = executor
+        self._slots = asyncio.Semaphore(limits.max_concurrency)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._background_feed_update_tasks)
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        update = await request.json(loads=bot.session.json_loads)
+        if self.executor is not None:
+            await self.executor.submit(bot, Update.model_validate(update, context={"bot": bot}))
+            return web.json_response({}, dumps=bot.session.json_dumps)
+        await self._slots.acquire()
+        task = asyncio.create_task(self._background_feed_update(bot=bot, update=update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(self._release_slot)
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    def _release_slot(self, task: asyncio.Task[Any]) -> None:
+        self._background_feed_update_tasks.discard(task)
+        self._slots.release()
+
+    async def close(self) -> None:
+        """Дождаться начатых update; не успевшие за ``drain_timeout_s`` отменяются."""
+        if self.executor is not None:
+            await self.executor.close(self.drain_timeout_s)
+        pending = set(self._background_feed_update_tasks)
+        if not pending:
+            return
+        logger.info("event=webhook_drain status=started in_flight={count}", count=len(pending))
+        _, not_done = await asyncio.wait(pending, timeout=self.drain_timeout_s)
+        for task in not_done:
+            task.cancel()
+        if not_done:
+            await asyncio.gather(*not_done, return_exceptions=True)
+        logger.info("event=webhook_drain status=completed cancelled={count}", count=len(not_done))
+
+
+def build_webhook_app(
+    dp: Dispatcher,
+    bot: Bot,
+    executor: OrderedUpdateExecutor | None = None,
+) -> web.Application:
+    """Собрать aiohttp-приложение: маршрут webhook и startup/shutdown события диспетчера."""
+    app = web.Application()
+    BoundedWebhookRequestHandler(
+        dp,
+        bot,
+        limits=WebhookLimits.from_settings(),
+        executor=executor,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, executor: OrderedUpdateExecutor | None = None) -> None:
+    """
+    Зарегистрировать webhook в Telegram и обслуживать его до отмены задачи.
+
+    Webhook не удаляется при остановке: за балансировщиком остаются другие реплики,
+    а накопившиеся за рестарт update Telegram доставит повторно.
+    """
+    runner = web.AppRunner(build_webhook_app(dp, bot, executor))
+    await runner.setup()
+    if executor is not None:
+        executor.start()
+    try:
+        site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+        await site.start()
+        await bot.set_webhook(
+            settings.webhook_url,
+            secret_token=settings.webhook_secret_token,
+            allowed_updates=dp.resolve_used_update_types(),
+            max_connections=min(settings.webhook_max_concurrency, 100),
+        )
+        logger.info(
+            "event=webhook status=started host={host} port={port} path={path}",
+            host=settings.webhook_host,
+            port=settings.webhook_port,
+            path=settings.webhook_path,
+        )
+        await asyncio.Event().wait()
+    finally:
+        # Останавливает приём запросов, затем on_shutdown: drain update и shutdown-события диспетчера.
+        await runner.cleanup()
+        logger.info("event=webhook status=stopped")
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import tempfile
+from pathlib import Path
 from typing import Annotated, Literal, Self
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
@@ -31,6 +34,63 @@ class BotSettings(BaseSettings):
         alias="TELEGRAM_PROXY_URL",
         description="Optional proxy URL for Telegram Bot API traffic",
     )
+    bot_runtime_mode: Literal["polling", "webhook"] = Field(
+        "polling",
+        alias="BOT_RUNTIME_MODE",
+        description="How updates reach the bot: 'polling' (one long-poll loop) or 'webhook' (aiohttp server)",
+    )
+    webhook_base_url: str | None = Field(
+        None,
+        alias="WEBHOOK_BASE_URL",
+        description="Public HTTPS URL Telegram posts updates to, without WEBHOOK_PATH (e.g. behind a load balancer)",
+    )
+    webhook_path: str = Field("/telegram/webhook", alias="WEBHOOK_PATH", description="Webhook route path")
+    webhook_host: str = Field("0.0.0.0", alias="WEBHOOK_HOST", description="Webhook server bind host")  # noqa: S104
+    webhook_port: int = Field(8080, alias="WEBHOOK_PORT", description="Webhook server port", ge=1, le=65535)
+    webhook_secret_token: str | None = Field(
+        None,
+        alias="WEBHOOK_SECRET_TOKEN",
+        description="Secret Telegram sends in X-Telegram-Bot-Api-Secret-Token; requests without it are rejected",
+        pattern=r"^[A-Za-z0-9_-]{1,256}$",
+    )
+    webhook_max_concurrency: int = Field(
+        64,
+        alias="WEBHOOK_MAX_CONCURRENCY",
+        description="Updates handled at once by one webhook replica; further requests wait for a free slot",
+        ge=1,
+        le=10_000,
+    )
+    webhook_drain_timeout_s: float = Field(
+        25.0,
+        alias="WEBHOOK_DRAIN_TIMEOUT_S",
+        description="How long shutdown waits for in-flight webhook updates before cancelling them",
+        ge=0,
+        le=300,
+    )
+    update_executor_lanes: int = Field(
+        0,
+        alias="UPDATE_EXECUTOR_LANES",
+        description=(
+            "Parallel update lanes; updates of one chat keep their order. "
+            "0 keeps aiogram's default handling (a task per update in polling)"
+        ),
+        ge=0,
+        le=1024,
+    )
+    update_executor_queue_size: int = Field(
+        100,
+        alias="UPDATE_EXECUTOR_QUEUE_SIZE",
+        description="Updates waiting per lane before reading new updates is paused",
+        ge=1,
+        le=100_000,
+    )
+    update_executor_drain_timeout_s: float = Field(
+        25.0,
+        alias="UPDATE_EXECUTOR_DRAIN_TIMEOUT_S",
+        description="How long polling shutdown waits for queued updates before dropping them",
+        ge=0,
+        le=300,
+    )
     runtime_alerts_enabled: bool = Field(
         False,
         alias="RUNTIME_ALERTS_ENABLED",
@@ -50,7 +110,7 @@ class BotSettings(BaseSettings):
     redis_url: str = Field(
         "redis://localhost:6379/0",
         alias="REDIS_URL",
-        description="Redis URL used for FSM storage when FSM_STORAGE_BACKEND=redis",
+        description="Redis URL used for FSM storage and the broadcast lock when their backend is redis",
     )
     role_request_admin_tg_id: int = Field(
         ...,
@@ -76,7 +136,26 @@ class BotSettings(BaseSettings):
 
     # General settings
     log_level: str = Field("INFO", alias="LOG_LEVEL", description="Logging level")
+    log_format: Literal["text", "json"] = Field(
+        "text",
+        alias="LOG_FORMAT",
+        description="Log sink: 'text' (colorized, synchronous) or 'json' (one JSON line per record, queued writes)",
+    )
+    log_success_sample_rate: float = Field(
+        1.0,
+        alias="LOG_SUCCESS_SAMPLE_RATE",
+        description=(
+            "Share of successful updates logged by the logging middleware; errors and slow handlers are always logged"
+        ),
+        ge=0,
+        le=1,
+    )
     debug: bool = Field(False, alias="DEBUG", description="Debug mode")
+    business_tz: str = Field(
+        "Asia/Yekaterinburg",
+        alias="BUSINESS_TZ",
+        description="Timezone of calendar weeks used by leaderboards and weekly points totals",
+    )
 
     # Rate limit settings
     enable_rate_limit: bool = Field(True, alias="ENABLE_RATE_LIMIT")
@@ -86,7 +165,17 @@ class BotSettings(BaseSettings):
     time_limit_moderate: int = Field(60, alias="TIME_LIMIT_MODERATE")
     rate_limit_expensive: int = Field(3, alias="RATE_LIMIT_EXPENSIVE")
     time_limit_expensive: int = Field(300, alias="TIME_LIMIT_EXPENSIVE")
-    max_user_limiters: int = Field(1000, alias="MAX_USER_LIMITERS", description="Limiter cache size")
+    max_user_limiters: int = Field(
+        1000,
+        alias="MAX_USER_LIMITERS",
+        description="User and command pairs tracked by the in-memory limiter; least recently used are evicted",
+        ge=1,
+    )
+    rate_limit_backend: Literal["memory", "redis"] = Field(
+        "memory",
+        alias="RATE_LIMIT_BACKEND",
+        description="Command rate limit store: 'memory' (per process) or 'redis' (shared by all replicas)",
+    )
 
     # Broadcast settings
     broadcast_bulk_size: int = Field(20, alias="BROADCAST_BULK_SIZE", ge=1, le=25)
@@ -96,6 +185,94 @@ class BotSettings(BaseSettings):
     broadcast_jitter_max_ms: int = Field(160, alias="BROADCAST_JITTER_MAX_MS", ge=50, le=2000)
     broadcast_retry_attempts: int = Field(5, alias="BROADCAST_RETRY_ATTEMPTS", ge=1, le=10)
     broadcast_retry_max_wait_s: int = Field(30, alias="BROADCAST_RETRY_MAX_WAIT_S", ge=1, le=120)
+    broadcast_audience_page_size: int = Field(500, alias="BROADCAST_AUDIENCE_PAGE_SIZE", ge=1, le=10000)
+    broadcast_lock_backend: Literal["memory", "redis"] = Field(
+        "memory",
+        alias="BROADCAST_LOCK_BACKEND",
+        description="Broadcast lease lock backend: 'memory' (single process) or 'redis' (shared via REDIS_URL)",
+    )
+    broadcast_lock_ttl_s: int = Field(
+        300,
+        alias="BROADCAST_LOCK_TTL_S",
+        description="Broadcast lease TTL; the lease is extended after every bulk",
+        ge=10,
+        le=3600,
+    )
+    broadcast_progress_interval_s: float = Field(
+        5.0,
+        alias="BROADCAST_PROGRESS_INTERVAL_S",
+        description="Minimum interval between broadcast progress snapshots (status message edits and health API)",
+        ge=1,
+        le=60,
+    )
+    recipient_reprobe_after_hours: int = Field(
+        168,
+        alias="RECIPIENT_REPROBE_AFTER_HOURS",
+        description="Re-probe unreachable broadcast recipients whose last check is older than this",
+        ge=1,
+        le=24 * 90,
+    )
+    recipient_reprobe_batch_size: int = Field(100, alias="RECIPIENT_REPROBE_BATCH_SIZE", ge=1, le=1000)
+    recipient_reprobe_cron: str = Field(
+        "30 3 * * *",
+        alias="RECIPIENT_REPROBE_CRON",
+        description="Cron schedule (UTC) of the periodic TaskIQ re-probe of unreachable recipients",
+    )
+    broadcast_resume_cron: str = Field(
+        "*/5 * * * *",
+        alias="BROADCAST_RESUME_CRON",
+        description="Cron schedule (UTC) of the TaskIQ task that resumes broadcast jobs interrupted by a restart",
+    )
+    broadcast_shards: int = Field(
+        1,
+        alias="BROADCAST_SHARDS",
+        description="Number of users.id ranges a TaskIQ broadcast is split into",
+        ge=1,
+        le=32,
+    )
+
+    # Notification pacing settings
+    notification_pacing_enabled: bool = Field(
+        True,
+        alias="NOTIFICATION_PACING_ENABLED",
+        description="Pace all Telegram sends of the process through shared token buckets",
+    )
+    notification_global_rate_per_s: float = Field(
+        25.0,
+        alias="NOTIFICATION_GLOBAL_RATE_PER_S",
+        description="Global send rate per process; keep the sum over bot/worker processes under ~30 msg/s",
+        gt=0,
+        le=30,
+    )
+    notification_global_burst: int = Field(5, alias="NOTIFICATION_GLOBAL_BURST", ge=1, le=30)
+    notification_per_chat_rate_per_s: float = Field(
+        1.0,
+        alias="NOTIFICATION_PER_CHAT_RATE_PER_S",
+        description="Send rate into one chat",
+        gt=0,
+        le=1,
+    )
+    notification_per_chat_burst: int = Field(1, alias="NOTIFICATION_PER_CHAT_BURST", ge=1, le=5)
+    notification_interactive_weight: int = Field(
+        10,
+        alias="NOTIFICATION_INTERACTIVE_WEIGHT",
+        description="Interactive sends that may go ahead of one waiting bulk send before it gets a slot",
+        ge=1,
+        le=100,
+    )
+    notification_bulk_chunk_size: int = Field(
+        500,
+        alias="NOTIFICATION_BULK_CHUNK_SIZE",
+        description="Recipients per TaskIQ task when one notification is dispatched to many users",
+        ge=1,
+        le=5000,
+    )
+    notification_body_ttl_s: int = Field(
+        7 * 24 * 3600,
+        alias="NOTIFICATION_BODY_TTL_S",
+        description="How long a one-off bulk notification text is kept in Redis after its planned send time",
+        ge=3600,
+    )
 
     # Middleware toggles
     enable_logging_middleware: bool = Field(
@@ -108,12 +285,83 @@ class BotSettings(BaseSettings):
         alias="ENABLE_USER_ACTIVITY_MIDDLEWARE",
         description="Enable user activity middleware",
     )
+    user_cache_backend: Literal["memory", "redis"] = Field(
+        "memory",
+        alias="USER_CACHE_BACKEND",
+        description="User context cache invalidation: 'memory' (single process) or 'redis' (pub/sub between replicas)",
+    )
+    user_cache_ttl_s: float = Field(
+        60.0,
+        alias="USER_CACHE_TTL_S",
+        description="How long a cached telegram_id -> user id and roles entry stays valid",
+        ge=1,
+        le=3600,
+    )
+    user_cache_max_size: int = Field(
+        10_000,
+        alias="USER_CACHE_MAX_SIZE",
+        description="Maximum number of users kept in the in-process context cache",
+        ge=1,
+        le=1_000_000,
+    )
+    user_activity_flush_interval_s: float = Field(
+        5.0,
+        alias="USER_ACTIVITY_FLUSH_INTERVAL_S",
+        description="How often buffered last_active_at marks are written to the database",
+        ge=0.5,
+        le=300,
+    )
+    user_activity_flush_max_pending: int = Field(
+        500,
+        alias="USER_ACTIVITY_FLUSH_MAX_PENDING",
+        description="Buffered users that trigger an early last_active_at flush",
+        ge=1,
+        le=50_000,
+    )
+    leaderboard_cache_backend: Literal["memory", "redis"] = Field(
+        "memory",
+        alias="LEADERBOARD_CACHE_BACKEND",
+        description="Leaderboard cache: 'memory' (per process) or 'redis' (shared, pre-warmed by the TaskIQ scheduler)",
+    )
+    leaderboard_cache_open_ttl_s: float = Field(
+        60.0,
+        alias="LEADERBOARD_CACHE_OPEN_TTL_S",
+        description="TTL of cached leaderboards for weeks that are not over yet; closed weeks are cached permanently",
+        ge=0,
+        le=3600,
+    )
+    leaderboard_cache_max_size: int = Field(
+        256,
+        alias="LEADERBOARD_CACHE_MAX_SIZE",
+        description="Leaderboards kept by the in-memory cache",
+        ge=1,
+        le=100_000,
+    )
     enable_role_middleware: bool = Field(
         True,
         alias="ENABLE_ROLE_MIDDLEWARE",
         description="Enable role-check middleware",
     )
 
+    # Metrics settings
+    enable_metrics: bool = Field(
+        True,
+        alias="ENABLE_METRICS",
+        description="Collect handler latency, SQL and delivery metrics and serve them on the health API /metrics",
+    )
+    metrics_dir: str = Field(
+        default_factory=lambda: str(Path(tempfile.gettempdir()) / "pybot-metrics"),
+        alias="METRICS_DIR",
+        description="Directory where bot and TaskIQ processes publish metric snapshots for the health API",
+    )
+    metrics_export_interval_s: float = Field(
+        10.0,
+        alias="METRICS_EXPORT_INTERVAL_S",
+        description="How often each process rewrites its metric snapshot",
+        ge=1,
+        le=300,
+    )
+
     # Health API settings
     health_api_enabled: bool = Field(
         False,
@@ -169,6 +417,15 @@ class BotSettings(BaseSettings):
 
         raise ValueError("DEBUG must be a boolean-like value (e.g. true/false/debug/release)")
 
+    @field_validator("business_tz")
+    @classmethod
+    def validate_business_tz(cls, value: str) -> str:
+        try:
+            ZoneInfo(value)
+        except (ValueError, ZoneInfoNotFoundError) as err:
+            raise ValueError(f"Unknown BUSINESS_TZ timezone: {value}") from err
+        return value
+
     @field_validator("telegram_proxy_url", mode="before")
     @classmethod
     def parse_telegram_proxy_url(cls, value: str | None) -> str | None:
@@ -219,6 +476,23 @@ class BotSettings(BaseSettings):
             raise ValueError("BROADCAST_JITTER_MAX_MS must be greater than or equal to BROADCAST_JITTER_MIN_MS")
         return self
 
+    @model_validator(mode="after")
+    def validate_webhook_config(self: Self) -> Self:
+        if self.bot_runtime_mode != "webhook":
+            return self
+        if not self.webhook_base_url:
+            raise ValueError("WEBHOOK_BASE_URL must be set when BOT_RUNTIME_MODE=webhook")
+        if not self.webhook_secret_token:
+            raise ValueError("WEBHOOK_SECRET_TOKEN must be set when BOT_RUNTIME_MODE=webhook")
+        if not self.webhook_path.startswith("/"):
+            raise ValueError("WEBHOOK_PATH must start with '/'")
+        return self
+
+    @property
+    def webhook_url(self: Self) -> str:
+        """Full webhook URL registered in Telegram."""
+        return f"{(self.webhook_base_url or '').rstrip('/')}{self.webhook_path}"
+
     @model_validator(mode="after")
     def validate_runtime_alerts_config(self: Self) -> Self:
         if self.runtime_alerts_enabled and self.runtime_alerts_chat_id is None:
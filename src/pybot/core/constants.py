@@ -30,3 +30,31 @@ class TaskScheduleKind(StrEnum):
     AT = "at"
     INTERVAL = "interval"
     CRON = "cron"
+
+
+class BroadcastAudienceKind(StrEnum):
+    ALL = "all"
+    ROLE = "role"
+    COMPETENCE = "competence"
+
+
+class BroadcastJobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BroadcastDeliveryStatus(StrEnum):
+    SENT = "sent"
+    FAILED_TEMPORARY = "failed_temporary"
+    FAILED_PERMANENT = "failed_permanent"
+    RECIPIENT_UNREACHABLE = "recipient_unreachable"
+    SKIPPED_INVALID = "skipped_invalid"
+
+
+class NotificationPriority(StrEnum):
+    """Полоса отправки: интерактивные уведомления обгоняют массовые рассылки."""
+
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
@@ -1,4 +1,3 @@
-# src/pybot/core/logger.py
 from __future__ import annotations
 
 import sys
@@ -12,9 +11,28 @@ if TYPE_CHECKING:
     from loguru import Logger
 
 
+def is_level_enabled(level: str) -> bool:
+    """Проверить, пройдёт ли запись уровня ``level`` через настроенный ``LOG_LEVEL``."""
+    return loguru_logger.level(level).no >= loguru_logger.level(settings.log_level.upper()).no
+
+
 def setup_logger() -> Logger:
-    """Настроить единый человекочитаемый sink для логов приложения."""
+    """
+    Настроить единый sink для логов приложения.
+
+    ``LOG_FORMAT=text`` — человекочитаемый цветной вывод; ``json`` — по строке JSON на запись,
+    запись в stdout идёт из фоновой очереди и не блокирует event loop.
+    """
     loguru_logger.remove()
+    if settings.log_format == "json":
+        loguru_logger.add(
+            sys.stdout,
+            level=settings.log_level.upper(),
+            serialize=True,
+            enqueue=True,
+        )
+        return loguru_logger
+
     loguru_logger.add(
         sys.stdout,
         level=settings.log_level.upper(),
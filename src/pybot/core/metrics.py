@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import bisect
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+# Границы корзин в секундах, как принято в Prometheus.
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Число SQL-запросов на один update: хвост выше 10 обычно означает N+1.
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+METRIC_DESCRIPTIONS: dict[str, str] = {
+    "bot_handler_duration_seconds": "Update handling time per handler",
+    "bot_handler_errors_total": "Updates whose handler raised an exception",
+    "bot_handler_db_queries": "SQL statements executed while handling one update",
+    "bot_handler_db_seconds": "Time spent in SQL statements while handling one update",
+    "db_queries_total": "SQL statements executed by the process",
+    "db_query_duration_seconds": "Duration of a single SQL statement",
+    "broadcast_deliveries_total": "Broadcast recipients by final delivery status",
+    "broadcast_retries_total": "Broadcast delivery attempts rescheduled after a temporary error",
+    "broadcast_delivery_seconds": "Time from enqueueing a broadcast recipient to its final status",
+    "notifications_total": "Telegram notification calls by method and outcome",
+    "rate_limit_dropped_total": "Messages dropped by the rate limiter per command type",
+    "update_executor_queue_depth": "Updates waiting in an update executor lane",
+    "update_executor_busy_seconds_total": "Time an update executor lane spent handling updates",
+    "update_executor_queue_wait_seconds": "Time an update waited in its lane before handling",
+}
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: Mapping[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин; ``counts`` не кумулятивные, последняя корзина — ``+Inf``."""
+
+    __slots__ = ("buckets", "count", "counts", "total")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+
+class MetricsRegistry:
+    """
+    Процессный реестр счётчиков, gauge и гистограмм.
+
+    Запись — операции над словарями без await и без lock-ов: всё происходит в одном event loop.
+    ``snapshot`` отдаёт JSON-совместимый снимок, который можно сложить со снимками других процессов
+    и отрисовать в формате Prometheus через :func:`render_prometheus`.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: object) -> None:
+        series = self._counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels: object) -> None:
+        self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        *,
+        buckets: Sequence[float] = LATENCY_BUCKETS_S,
+        **labels: object,
+    ) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    def counter_value(self, name: str, **labels: object) -> float:
+        return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def gauge_value(self, name: str, **labels: object) -> float:
+        return self._gauges.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram(self, name: str, **labels: object) -> Histogram | None:
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counters": {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            },
+            "gauges": {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._gauges.items()
+            },
+            "histograms": {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "buckets": list(histogram.buckets),
+                        "counts": list(histogram.counts),
+                        "count": histogram.count,
+                        "sum": histogram.total,
+                    }
+                    for key, histogram in series.items()
+                ]
+                for name, series in self._histograms.items()
+            },
+        }
+
+    def reset(self) -> None:
+        self._counters.clear()
+        self._gauges.clear()
+        self._histograms.clear()
+
+
+def _format_labels(labels: Mapping[str, str], **extra: str) -> str:
+    merged = {**labels, **extra}
+    if not merged:
+        return ""
+    pairs = (f'{name}="{_escape_label_value(value)}"' for name, value in sorted(merged.items()))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _merge_scalars(snapshots: Sequence[Mapping[str, Any]], section: str) -> dict[str, dict[LabelKey, float]]:
+    # Gauge процессов складываются: глубина очередей и занятость суммарные по всем репликам.
+    merged: dict[str, dict[LabelKey, float]] = {}
+    for snapshot in snapshots:
+        for name, series in snapshot.get(section, {}).items():
+            merged_series = merged.setdefault(name, {})
+            for sample in series:
+                key = _label_key(sample["labels"])
+                merged_series[key] = merged_series.get(key, 0.0) + sample["value"]
+    return merged
+
+
+def _merge_histograms(snapshots: Sequence[Mapping[str, Any]]) -> dict[str, dict[LabelKey, dict[str, Any]]]:
+    merged: dict[str, dict[LabelKey, dict[str, Any]]] = {}
+    for snapshot in snapshots:
+        for name, series in snapshot.get("histograms", {}).items():
+            merged_series = merged.setdefault(name, {})
+            for sample in series:
+                key = _label_key(sample["labels"])
+                current = merged_series.get(key)
+                if current is None or current["buckets"] != sample["buckets"]:
+                    merged_series[key] = {**sample, "counts": list(sample["counts"])}
+                    continue
+                current["counts"] = [a + b for a, b in zip(current["counts"], sample["counts"], strict=True)]
+                current["count"] += sample["count"]
+                current["sum"] += sample["sum"]
+    return merged
+
+
+def _render_header(name: str, kind: str) -> list[str]:
+    return [f"# HELP {name} {METRIC_DESCRIPTIONS.get(name, name)}", f"# TYPE {name} {kind}"]
+
+
+def _render_scalar(name: str, kind: str, series: Mapping[LabelKey, float]) -> list[str]:
+    lines = _render_header(name, kind)
+    for key, value in sorted(series.items()):
+        lines.append(f"{name}{_format_labels(dict(key))} {_format_number(value)}")
+    return lines
+
+
+def _render_histogram(name: str, series: Mapping[LabelKey, Mapping[str, Any]]) -> list[str]:
+    lines = _render_header(name, "histogram")
+    for key, sample in sorted(series.items()):
+        labels = dict(key)
+        cumulative = 0
+        for bound, bucket_count in zip(sample["buckets"], sample["counts"], strict=False):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels(labels, le=_format_number(bound))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {sample['count']}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(sample['sum'])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+    return lines
+
+
+def render_prometheus(snapshots: Iterable[Mapping[str, Any]]) -> str:
+    """Сложить снимки нескольких процессов и отрисовать их в текстовом формате Prometheus 0.0.4."""
+    snapshots = list(snapshots)
+    lines: list[str] = []
+    for kind, section in (("counter", "counters"), ("gauge", "gauges")):
+        for name, series in sorted(_merge_scalars(snapshots, section).items()):
+            lines.extend(_render_scalar(name, kind, series))
+    for name, series in sorted(_merge_histograms(snapshots).items()):
+        lines.extend(_render_histogram(name, series))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """SQL-запросы, выполненные в рамках одного update."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Generator[QueryStats]:
+    """Считать SQL-запросы текущей задачи (и её greenlet-ов SQLAlchemy) в отдельный :class:`QueryStats`."""
+    stats = QueryStats()
+    token = _current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+def record_query(seconds: float) -> None:
+    """Учесть один выполненный SQL-запрос: в глобальных метриках и в статистике текущего update."""
+    metrics.inc("db_queries_total")
+    metrics.observe("db_query_duration_seconds", seconds)
+    stats = _current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+
+
+metrics = MetricsRegistry()
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import time
+from typing import Any
+
 from sqlalchemy import event
 from sqlalchemy.dialects.sqlite.aiosqlite import AsyncAdapt_aiosqlite_connection
-from sqlalchemy.engine import URL, make_url
+from sqlalchemy.engine import URL, Connection, make_url
+from sqlalchemy.engine.interfaces import DBAPICursor, ExecutionContext
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.pool import ConnectionPoolEntry
 
 from ..core.config import settings
+from ..core.metrics import record_query
 
 
 def _is_sqlite_url(database_url: str) -> bool:
@@ -25,6 +30,34 @@ def _attach_sqlite_foreign_keys_pragma(engine: AsyncEngine) -> None:
         cursor.close()
 
 
+def _attach_query_metrics(engine: AsyncEngine) -> None:
+    """Считать число и время SQL-запросов в :mod:`pybot.core.metrics` (в том числе по текущему update)."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        _cursor: DBAPICursor,
+        _statement: str,
+        _parameters: Any,
+        _context: ExecutionContext | None,
+        _executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        _cursor: DBAPICursor,
+        _statement: str,
+        _parameters: Any,
+        _context: ExecutionContext | None,
+        _executemany: bool,
+    ) -> None:
+        started = conn.info.get("query_started_at")
+        if started:
+            record_query(time.perf_counter() - started.pop())
+
+
 def create_database_engine(database_url: str) -> AsyncEngine:
     if not database_url:
         raise ValueError("Database URL is not configured.")
@@ -32,6 +65,8 @@ def create_database_engine(database_url: str) -> AsyncEngine:
     engine = create_async_engine(database_url, echo=False)
     if _is_sqlite_url(database_url):
         _attach_sqlite_foreign_keys_pragma(engine)
+    if settings.enable_metrics:
+        _attach_query_metrics(engine)
     return engine
 
 
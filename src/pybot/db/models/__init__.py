@@ -14,6 +14,7 @@ from .user_module import (
     UserCompetence,
     UserAchievement,
     PointsTransaction,
+    PointsPeriodTotal,
     Valuation,
 )
 
@@ -30,6 +31,11 @@ from .role_module import (
     RoleRequest,
 )
 
+from .broadcast_module import (
+    BroadcastJob,
+    BroadcastDelivery,
+)
+
 __all__ = [
     "Base",
     # shared
@@ -43,6 +49,7 @@ __all__ = [
     "UserCompetence",
     "UserAchievement",
     "PointsTransaction",
+    "PointsPeriodTotal",
     "Valuation",
     # role_module
     "Role",
@@ -52,4 +59,7 @@ __all__ = [
     "Task",
     "TaskSolution",
     "TaskSolutionStatus",
+    # broadcast_module
+    "BroadcastJob",
+    "BroadcastDelivery",
 ]
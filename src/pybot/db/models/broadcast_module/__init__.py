@@ -0,0 +1,10 @@
+from ...base_class import Base
+
+from .broadcast_job import BroadcastJob
+from .broadcast_delivery import BroadcastDelivery
+
+__all__ = [
+    "Base",
+    "BroadcastJob",
+    "BroadcastDelivery",
+]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ....core.constants import BroadcastDeliveryStatus
+from ...base_class import Base
+
+
+class BroadcastDelivery(Base):
+    """Запись журнала доставки: итог отправки одного задания рассылки одному пользователю."""
+
+    __tablename__ = "broadcast_deliveries"
+    __table_args__ = (UniqueConstraint("job_id", "user_id", name="uq_broadcast_deliveries_job_user"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("broadcast_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status: Mapped[BroadcastDeliveryStatus] = mapped_column(
+        Enum(
+            BroadcastDeliveryStatus,
+            name="broadcast_delivery_status_enum",
+            native_enum=False,
+            validate_strings=True,
+            create_constraint=True,
+        ),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False)
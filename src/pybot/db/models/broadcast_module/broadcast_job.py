@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, DateTime, Enum, ForeignKey, Integer, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ....core.constants import BroadcastAudienceKind, BroadcastJobStatus
+from ....dto import BroadcastResult
+from ...base_class import Base
+
+
+class BroadcastJob(Base):
+    """
+    Персистентное задание рассылки.
+
+    Хранит аудиторию, текст, агрегированные счётчики и курсор ``last_user_id``
+    по ``users.id``: курсор и счётчики фиксируются вместе с журналом доставок
+    после каждой пачки, поэтому после рестарта рассылка продолжается с места остановки.
+
+    Шардированное задание делится на дочерние задания (``parent_job_id``) с диапазоном
+    ``(last_user_id, range_end_id]`` по ``users.id``; каждый шард выполняется отдельной
+    TaskIQ-задачей, а родитель собирает итоговые счётчики после завершения всех шардов.
+
+    ``progress`` хранит последний снимок прогресса (скорость, ETA, гистограммы времени доставки),
+    который читает health API; ``status_chat_id``/``status_message_id`` указывают на сообщение
+    администратора, которое редактируется по мере рассылки.
+    """
+
+    __tablename__ = "broadcast_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    audience_kind: Mapped[BroadcastAudienceKind] = mapped_column(
+        Enum(
+            BroadcastAudienceKind,
+            name="broadcast_audience_kind_enum",
+            native_enum=False,
+            validate_strings=True,
+            create_constraint=True,
+        ),
+        nullable=False,
+    )
+    audience_role_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    audience_competence_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[BroadcastJobStatus] = mapped_column(
+        Enum(
+            BroadcastJobStatus,
+            name="broadcast_job_status_enum",
+            native_enum=False,
+            validate_strings=True,
+            create_constraint=True,
+        ),
+        default=BroadcastJobStatus.PENDING,
+        nullable=False,
+    )
+    last_user_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    range_end_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    parent_job_id: Mapped[int | None] = mapped_column(
+        ForeignKey("broadcast_jobs.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    shard_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    attempted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_temporary: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_permanent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped_invalid_user: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_recipients: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    progress: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    status_chat_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    status_message_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"BroadcastJob(id={self.id!r}, audience_kind={self.audience_kind!r}, status={self.status!r}, "
+            f"last_user_id={self.last_user_id!r}, sent={self.sent!r})"
+        )
+
+    @property
+    def is_resumed(self) -> bool:
+        """Задание уже запускалось ранее и часть аудитории могла быть обработана."""
+        return self.started_at is not None
+
+    @property
+    def is_sharded(self) -> bool:
+        """Задание разделено на шарды и само получателям не отправляет."""
+        return self.shard_count > 0
+
+    @property
+    def remaining(self) -> int | None:
+        """Сколько получателей ещё не обработано; ``None``, пока размер аудитории не подсчитан."""
+        if self.total_recipients is None:
+            return None
+        return max(self.total_recipients - self.attempted, 0)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (BroadcastJobStatus.COMPLETED, BroadcastJobStatus.FAILED)
+
+    def start(self) -> None:
+        self.status = BroadcastJobStatus.RUNNING
+        if self.started_at is None:
+            self.started_at = datetime.now(UTC).replace(tzinfo=None)
+
+    def checkpoint(self, last_user_id: int, result: BroadcastResult) -> None:
+        """Сдвинуть курсор аудитории и сохранить накопленные счётчики."""
+        self.last_user_id = max(self.last_user_id, last_user_id)
+        self.attempted = result.attempted
+        self.sent = result.sent
+        self.failed_temporary = result.failed_temporary
+        self.failed_permanent = result.failed_permanent
+        self.skipped_invalid_user = result.skipped_invalid_user
+
+    def split(self, shard_count: int) -> None:
+        """Пометить задание как родительское для ``shard_count`` шардов."""
+        self.shard_count = shard_count
+        self.start()
+
+    def collect_shards(self, shards: Sequence[BroadcastJob]) -> None:
+        """Сложить счётчики шардов и завершить задание, когда завершены все шарды."""
+        self.attempted = sum(shard.attempted for shard in shards)
+        self.sent = sum(shard.sent for shard in shards)
+        self.failed_temporary = sum(shard.failed_temporary for shard in shards)
+        self.failed_permanent = sum(shard.failed_permanent for shard in shards)
+        self.skipped_invalid_user = sum(shard.skipped_invalid_user for shard in shards)
+        if shards and all(shard.total_recipients is not None for shard in shards):
+            self.total_recipients = sum(shard.total_recipients or 0 for shard in shards)
+        if len(shards) == self.shard_count and all(shard.is_finished for shard in shards):
+            self.complete()
+
+    def complete(self) -> None:
+        self.status = BroadcastJobStatus.COMPLETED
+        self.finished_at = datetime.now(UTC).replace(tzinfo=None)
+
+    def fail(self) -> None:
+        self.status = BroadcastJobStatus.FAILED
+        self.finished_at = datetime.now(UTC).replace(tzinfo=None)
+
+    def to_result(self) -> BroadcastResult:
+        return BroadcastResult(
+            attempted=self.attempted,
+            sent=self.sent,
+            failed_temporary=self.failed_temporary,
+            failed_permanent=self.failed_permanent,
+            skipped_invalid_user=self.skipped_invalid_user,
+        )
@@ -7,6 +7,7 @@ from .competence import Competence
 from .user_competence import UserCompetence
 from .user_achievement import UserAchievement
 from .points_transaction import PointsTransaction
+from .points_period_total import PointsPeriodTotal
 from .valuation import Valuation
 from .user_level import UserLevel
 
@@ -20,6 +21,7 @@ __all__ = [
     "UserCompetence",
     "UserAchievement",
     "PointsTransaction",
+    "PointsPeriodTotal",
     "UserTask",
     "UserLevel",
     "Valuation",
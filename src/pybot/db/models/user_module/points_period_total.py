@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ....core.constants import PointsTypeEnum
+from ...base_class import Base
+
+
+class PointsPeriodTotal(Base):
+    """
+    Сумма начислений пользователю за неделю: материализованный срез ``points_transactions``.
+
+    ``period_start`` — начало календарной недели в ``BUSINESS_TZ``, сохранённое как naive UTC.
+    Строка обновляется в той же транзакции, что и запись в ledger.
+    """
+
+    __tablename__ = "points_period_totals"
+    __table_args__ = (Index("ix_points_period_totals_top", "points_type", "period_start", "total", "user_id"),)
+
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    points_type: Mapped[PointsTypeEnum] = mapped_column(String(50), primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(DateTime(timezone=False), primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
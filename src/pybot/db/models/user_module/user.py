@@ -9,7 +9,6 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....core.constants import PointsTypeEnum
-from ....domain.exceptions import ZeroPointsAdjustmentError
 from ....dto.value_objects import Points
 from ...base_class import Base
 from ..role_module.user_roles import UserRole
@@ -56,6 +55,10 @@ class User(Base):
         ForeignKey("user_activity_statuses.id"),
     )
     last_active_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    # Заполняется после постоянной ошибки доставки (бот заблокирован, аккаунт удалён); такие
+    # пользователи не попадают в аудиторию рассылок до успешной повторной проверки.
+    unreachable_since: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    reachability_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
     academic_points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     reputation_points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
@@ -187,35 +190,14 @@ class User(Base):
         for competence in competencies:
             self.remove_competence(competence)
 
+    @property
+    def is_reachable(self) -> bool:
+        return self.unreachable_since is None
+
     def change_last_user_active(self) -> None:
         """Обновить дату последней активности пользователя"""
         self.last_active_at = datetime.now(UTC)
 
-    def change_user_points(self, points: int, point_type: PointsTypeEnum) -> tuple[int, int]:
-        """
-        Изменяет очки пользователя указанного типа.
-        Возвращает кортеж (int)Изменение, (int)Новое значение
-        """
-        if points == 0:
-            raise ZeroPointsAdjustmentError()
-        current = 0
-        if point_type == PointsTypeEnum.ACADEMIC:
-            current = self.academic_points
-            self.academic_points += points
-            self.academic_points = max(self.academic_points, 0)
-            return self.academic_points - current, self.academic_points
-
-        elif point_type == PointsTypeEnum.REPUTATION:
-            current = self.reputation_points
-            self.reputation_points += points
-            self.reputation_points = max(self.reputation_points, 0)
-            return self.reputation_points - current, self.reputation_points
-
-        else:
-            raise ValueError(
-                f"Неизвестный тип баллов: {point_type}. Доступные типы: {[t.value for t in PointsTypeEnum]}"
-            )
-
     def change_user_level(self, new_level_id: int, points_type: PointsTypeEnum) -> None:
         """Изменяет уровень пользователя на новый уровень указанного типа."""
         for user_level in self.user_levels:
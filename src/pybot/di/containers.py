@@ -5,22 +5,43 @@ from aiogram.client.session.aiohttp import AiohttpSession
 from dishka import AsyncContainer, Provider, Scope, make_async_container, provide
 from dishka.integrations.aiogram import AiogramProvider
 from dishka.integrations.taskiq import TaskiqProvider
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from ..core import logger
 from ..core.config import settings
+from ..core.metrics import metrics
 from ..db.database import engine as global_engine
 from ..domain.services.level_calculator import LevelCalculator
 from ..infrastructure import (
+    BroadcastJobRepository,
     CompetenceRepository,
+    LeaderboardCache,
+    LevelCatalog,
     LevelRepository,
+    MetricsSnapshotWriter,
+    PointsLedger,
+    PointsPeriodTotalRepository,
     PointsTransactionRepository,
+    RedisLeaderboardCache,
+    RedisUserContextCache,
     RoleRepository,
     RoleRequestRepository,
+    UserActivityBuffer,
+    UserContextCache,
     UserRepository,
     ValuationRepository,
 )
-from ..infrastructure.ports import LoggingNotificationService, TelegramNotificationService
+from ..infrastructure.ports import (
+    InMemoryBroadcastLock,
+    LoggingNotificationService,
+    PacedNotificationService,
+    RedisBroadcastLock,
+    SendRateLimits,
+    SendScheduler,
+    TelegramNotificationService,
+)
+from ..infrastructure.taskiq.notification_body_store import NotificationBodyStore
 from ..infrastructure.taskiq.taskiq_notification_dispatcher import TaskIQNotificationDispatcher
 from ..services import (
     LeaderboardService,
@@ -32,12 +53,15 @@ from ..services import (
     UserService,
 )
 from ..services.broadcast import BroadcastService
+from ..services.broadcast_progress import BroadcastProgressService
 from ..services.competence import CompetenceService
 from ..services.health import HealthService, SessionExecutor
 from ..services.levels import LevelService
+from ..services.metrics import MetricsService
 from ..services.notification_facade import NotificationFacade
 from ..services.points import PointsService
-from ..services.ports import NotificationDispatchPort, NotificationPort
+from ..services.ports import BroadcastLockPort, NotificationDispatchPort, NotificationPort
+from ..services.recipient_reachability import RecipientReachabilityService
 from ..services.role_request import RoleRequestService
 
 
@@ -58,14 +82,22 @@ class DatabaseProvider(Provider):
 class SessionProvider(Provider):
     """Provide one DB session per request/update."""
 
-    @provide(scope=Scope.REQUEST)
-    async def session(self, engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
-        """Create request-scoped async SQLAlchemy session."""
-        session_maker = async_sessionmaker(
+    @provide(scope=Scope.APP)
+    def session_maker(self, engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        """Build the session factory once per process instead of once per update."""
+        return async_sessionmaker(
             bind=engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
+
+    @provide(scope=Scope.REQUEST)
+    async def session(self, session_maker: async_sessionmaker[AsyncSession]) -> AsyncGenerator[AsyncSession, None]:
+        """Create request-scoped async SQLAlchemy session.
+
+        The session is lazy: a pool connection is checked out only on the first statement,
+        so updates that never touch the database do not hold a connection.
+        """
         async with session_maker() as session:
             yield session
 
@@ -74,13 +106,59 @@ class RepositoryProvider(Provider):
     """Stateless repositories with APP scope."""
 
     @provide(scope=Scope.APP)
-    def user_repository(self) -> UserRepository:
-        return UserRepository()
+    async def user_context_cache(self) -> AsyncGenerator[UserContextCache, None]:
+        """Process-wide telegram_id -> user id and roles cache; redis only carries invalidations."""
+        if settings.user_cache_backend == "memory":
+            cache = UserContextCache(max_size=settings.user_cache_max_size, ttl_s=settings.user_cache_ttl_s)
+            yield cache
+            await cache.close()
+            return
+        if settings.user_cache_backend != "redis":
+            raise ValueError(f"Unsupported USER_CACHE_BACKEND value: {settings.user_cache_backend}")
+
+        redis = Redis.from_url(settings.redis_url)
+        cache = RedisUserContextCache(redis, max_size=settings.user_cache_max_size, ttl_s=settings.user_cache_ttl_s)
+        await cache.start()
+        try:
+            yield cache
+        finally:
+            await cache.close()
+            await redis.aclose()
+            logger.info("User context cache Redis connection closed")
+
+    @provide(scope=Scope.APP)
+    async def leaderboard_cache(self) -> AsyncGenerator[LeaderboardCache, None]:
+        """Finished leaderboards; the redis backend is shared with replicas and the TaskIQ pre-warm job."""
+        if settings.leaderboard_cache_backend == "memory":
+            cache = LeaderboardCache(max_size=settings.leaderboard_cache_max_size)
+            yield cache
+            await cache.close()
+            return
+        if settings.leaderboard_cache_backend != "redis":
+            raise ValueError(f"Unsupported LEADERBOARD_CACHE_BACKEND value: {settings.leaderboard_cache_backend}")
+
+        redis = Redis.from_url(settings.redis_url)
+        cache = RedisLeaderboardCache(redis)
+        try:
+            yield cache
+        finally:
+            await cache.close()
+            await redis.aclose()
+            logger.info("Leaderboard cache Redis connection closed")
+
+    @provide(scope=Scope.APP)
+    def user_repository(self, cache: UserContextCache) -> UserRepository:
+        return UserRepository(cache)
 
     @provide(scope=Scope.APP)
     def level_repository(self) -> LevelRepository:
         return LevelRepository()
 
+    @provide(scope=Scope.APP)
+    def level_catalog(self, level_repository: LevelRepository) -> LevelCatalog:
+        """Level thresholds loaded once per process; change_points and profiles resolve levels without queries."""
+        return LevelCatalog(level_repository)
+
     @provide(scope=Scope.APP)
     def valuation_reposiory(self) -> ValuationRepository:
         return ValuationRepository()
@@ -89,6 +167,24 @@ class RepositoryProvider(Provider):
     def points_transaction_repository(self) -> PointsTransactionRepository:
         return PointsTransactionRepository()
 
+    @provide(scope=Scope.APP)
+    def points_period_total_repository(self) -> PointsPeriodTotalRepository:
+        return PointsPeriodTotalRepository()
+
+    @provide(scope=Scope.APP)
+    def points_ledger(
+        self,
+        valuation_repository: ValuationRepository,
+        points_transaction_repository: PointsTransactionRepository,
+        points_period_total_repository: PointsPeriodTotalRepository,
+    ) -> PointsLedger:
+        return PointsLedger(
+            valuation_repository,
+            points_transaction_repository,
+            points_period_total_repository,
+            business_tz=settings.business_tz,
+        )
+
     @provide(scope=Scope.APP)
     def role_repository(self) -> RoleRepository:
         return RoleRepository()
@@ -101,10 +197,43 @@ class RepositoryProvider(Provider):
     def competence_repository(self) -> CompetenceRepository:
         return CompetenceRepository()
 
+    @provide(scope=Scope.APP)
+    def broadcast_job_repository(self) -> BroadcastJobRepository:
+        return BroadcastJobRepository()
+
 
 class ServiceProvider(Provider):
     """Application services."""
 
+    @provide(scope=Scope.APP)
+    async def user_activity_buffer(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        user_repository: UserRepository,
+    ) -> AsyncGenerator[UserActivityBuffer, None]:
+        """One write-behind buffer per process; the rest is flushed when the container closes."""
+        buffer = UserActivityBuffer(
+            session_maker,
+            user_repository,
+            flush_interval_s=settings.user_activity_flush_interval_s,
+            max_pending=settings.user_activity_flush_max_pending,
+        )
+        try:
+            yield buffer
+        finally:
+            await buffer.close()
+
+    @provide(scope=Scope.APP)
+    async def metrics_snapshot_writer(self) -> AsyncGenerator[MetricsSnapshotWriter, None]:
+        """Publish this process' metrics for the health API; bot and TaskIQ workers resolve it on startup."""
+        writer = MetricsSnapshotWriter(metrics, settings.metrics_dir, interval_s=settings.metrics_export_interval_s)
+        if settings.enable_metrics:
+            writer.start()
+        try:
+            yield writer
+        finally:
+            await writer.close()
+
     @provide(scope=Scope.REQUEST)
     def user_service(
         self,
@@ -112,8 +241,9 @@ class ServiceProvider(Provider):
         user_repository: UserRepository,
         level_repository: LevelRepository,
         role_repository: RoleRepository,
+        activity_buffer: UserActivityBuffer,
     ) -> UserService:
-        return UserService(db, user_repository, level_repository, role_repository)
+        return UserService(db, user_repository, level_repository, role_repository, activity_buffer)
 
     @provide(scope=Scope.REQUEST)
     def user_roles_service(
@@ -139,18 +269,20 @@ class ServiceProvider(Provider):
         db: AsyncSession,
         level_calculator: LevelCalculator,
         user_repository: UserRepository,
-        level_repository: LevelRepository,
-        points_transaction_repository: PointsTransactionRepository,
+        level_catalog: LevelCatalog,
+        points_ledger: PointsLedger,
     ) -> PointsService:
-        return PointsService(db, level_calculator, user_repository, level_repository, points_transaction_repository)
+        return PointsService(db, level_calculator, user_repository, level_catalog, points_ledger)
 
     @provide(scope=Scope.REQUEST)
     def leaderboard_service(
         self,
         db: AsyncSession,
         points_transaction_repository: PointsTransactionRepository,
+        points_period_total_repository: PointsPeriodTotalRepository,
+        leaderboard_cache: LeaderboardCache,
     ) -> LeaderboardService:
-        return LeaderboardService(db, points_transaction_repository)
+        return LeaderboardService(db, points_transaction_repository, points_period_total_repository, leaderboard_cache)
 
     @provide(scope=Scope.REQUEST)
     def role_request_service(
@@ -169,8 +301,19 @@ class ServiceProvider(Provider):
         db: AsyncSession,
         user_repository: UserRepository,
         notification_service: NotificationPort,
+        broadcast_job_repository: BroadcastJobRepository,
+        broadcast_lock: BroadcastLockPort,
     ) -> BroadcastService:
-        return BroadcastService(db, user_repository, notification_service)
+        return BroadcastService(db, user_repository, notification_service, broadcast_job_repository, broadcast_lock)
+
+    @provide(scope=Scope.REQUEST)
+    def recipient_reachability_service(
+        self,
+        db: AsyncSession,
+        user_repository: UserRepository,
+        notification_service: NotificationPort,
+    ) -> RecipientReachabilityService:
+        return RecipientReachabilityService(db, user_repository, notification_service)
 
     @provide(scope=Scope.REQUEST)
     def competence_service(
@@ -181,8 +324,13 @@ class ServiceProvider(Provider):
         return CompetenceService(db, competence_repository)
 
     @provide(scope=Scope.REQUEST)
-    def level_service(self, db: AsyncSession, level_repository: LevelRepository) -> LevelService:
-        return LevelService(level_repository, db)
+    def level_service(
+        self,
+        db: AsyncSession,
+        level_repository: LevelRepository,
+        level_catalog: LevelCatalog,
+    ) -> LevelService:
+        return LevelService(level_repository, db, level_catalog)
 
     @provide(scope=Scope.REQUEST)
     def user_profile_service(
@@ -212,6 +360,18 @@ class HealthProvider(Provider):
     def health_service(self, db: AsyncSession) -> HealthService:
         return HealthService(SessionExecutor(db))
 
+    @provide(scope=Scope.REQUEST)
+    def broadcast_progress_service(
+        self,
+        db: AsyncSession,
+        broadcast_job_repository: BroadcastJobRepository,
+    ) -> BroadcastProgressService:
+        return BroadcastProgressService(db, broadcast_job_repository)
+
+    @provide(scope=Scope.APP)
+    def metrics_service(self) -> MetricsService:
+        return MetricsService(metrics, settings.metrics_dir, export_interval_s=settings.metrics_export_interval_s)
+
 
 class DomainServiceProvider(Provider):
     """Domain services."""
@@ -242,16 +402,58 @@ class BotProvider(Provider):
 
 class PortsProvider(Provider):
     @provide(scope=Scope.APP)
-    async def notification_port(self, bot: Bot) -> NotificationPort:
+    def send_scheduler(self) -> SendScheduler:
+        """One scheduler per process: every Telegram send shares the same rate budget."""
+        return SendScheduler(
+            SendRateLimits(
+                global_rate=settings.notification_global_rate_per_s,
+                global_burst=settings.notification_global_burst,
+                per_chat_rate=settings.notification_per_chat_rate_per_s,
+                per_chat_burst=settings.notification_per_chat_burst,
+                interactive_weight=settings.notification_interactive_weight,
+            )
+        )
+
+    @provide(scope=Scope.APP)
+    async def notification_port(self, bot: Bot, send_scheduler: SendScheduler) -> NotificationPort:
         if settings.notification_backend == "telegram":
-            return TelegramNotificationService(bot)
+            telegram_port = TelegramNotificationService(bot)
+            if settings.notification_pacing_enabled:
+                return PacedNotificationService(telegram_port, send_scheduler)
+            return telegram_port
         if settings.notification_backend == "logging":
             return LoggingNotificationService()
         raise ValueError(f"Unsupported NOTIFICATION_BACKEND value: {settings.notification_backend}")
 
     @provide(scope=Scope.APP)
-    async def notification_dispatch_port(self) -> NotificationDispatchPort:
-        return TaskIQNotificationDispatcher()
+    async def broadcast_lock(self) -> AsyncGenerator[BroadcastLockPort, None]:
+        """Lease lock shared by the bot and every worker process when the backend is redis."""
+        if settings.broadcast_lock_backend == "memory":
+            yield InMemoryBroadcastLock()
+            return
+        if settings.broadcast_lock_backend != "redis":
+            raise ValueError(f"Unsupported BROADCAST_LOCK_BACKEND value: {settings.broadcast_lock_backend}")
+
+        redis = Redis.from_url(settings.redis_url)
+        try:
+            yield RedisBroadcastLock(redis)
+        finally:
+            await redis.aclose()
+            logger.info("Broadcast lock Redis connection closed")
+
+    @provide(scope=Scope.APP)
+    async def notification_body_store(self) -> AsyncGenerator[NotificationBodyStore, None]:
+        """Texts of bulk notifications, written by the bot and read by TaskIQ workers."""
+        redis = Redis.from_url(settings.redis_url)
+        try:
+            yield NotificationBodyStore(redis)
+        finally:
+            await redis.aclose()
+            logger.info("Notification body store Redis connection closed")
+
+    @provide(scope=Scope.APP)
+    async def notification_dispatch_port(self, body_store: NotificationBodyStore) -> NotificationDispatchPort:
+        return TaskIQNotificationDispatcher(body_store=body_store)
 
 
 class FacadeProvider(Provider):
@@ -288,6 +490,7 @@ def setup_health_container() -> AsyncContainer:
     return make_async_container(
         DatabaseProvider(),
         SessionProvider(),
+        RepositoryProvider(),
         HealthProvider(),
     )
 
@@ -276,6 +276,17 @@ class BroadcastAlreadyRunningError(RuntimeError):
     """Raised when another broadcast is already in progress."""
 
 
+class BroadcastLeaseLostError(BroadcastAlreadyRunningError):
+    """Raised when the broadcast lease expired and another worker may have taken the job over."""
+
+
+class BroadcastJobNotFoundError(DomainError):
+    """Задание рассылки не найдено."""
+
+    def __init__(self, job_id: int) -> None:
+        super().__init__(f"Задание рассылки не найдено (ID: {job_id})", details={"job_id": job_id})
+
+
 class TaskScheduleError(DomainError, ValueError):
     """Base domain error for TaskSchedule invariants and field access."""
 
@@ -1,3 +1,5 @@
 from .level_calculator import LevelCalculator as LevelCalculator
+from .level_calculator import LevelSnapshot as LevelSnapshot
+from .level_calculator import LevelThresholdIndex as LevelThresholdIndex
 
-__all__ = ["LevelCalculator"]
+__all__ = ["LevelCalculator", "LevelSnapshot", "LevelThresholdIndex"]
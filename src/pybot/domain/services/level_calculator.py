@@ -1,25 +1,62 @@
-from sqlalchemy import Sequence
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 from ...core import logger
+from ...core.constants import PointsTypeEnum
 from ...db.models import Level
 
 
+@dataclass(frozen=True, slots=True)
+class LevelSnapshot:
+    """Неизменяемая копия строки ``levels``: живёт дольше сессии и безопасно делится между апдейтами."""
+
+    id: int
+    name: str
+    level_type: PointsTypeEnum
+    required_points: int
+
+    @classmethod
+    def from_orm(cls, level: Level) -> LevelSnapshot:
+        return cls(
+            id=level.id,
+            name=level.name,
+            level_type=PointsTypeEnum(level.level_type),
+            required_points=level.required_points,
+        )
+
+
+class LevelThresholdIndex:
+    """Уровни одного типа, отсортированные по порогу; текущий, следующий и предыдущий ищутся bisect."""
+
+    def __init__(self, levels: Iterable[LevelSnapshot]) -> None:
+        self.levels: tuple[LevelSnapshot, ...] = tuple(sorted(levels, key=lambda level: level.required_points))
+        self.thresholds: list[int] = [level.required_points for level in self.levels]
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def current(self, points: int) -> LevelSnapshot | None:
+        """Самый высокий уровень, порог которого покрывают ``points``."""
+        position = bisect_right(self.thresholds, points)
+        return self.levels[position - 1] if position else None
+
+    def next(self, points: int) -> LevelSnapshot | None:
+        """Ближайший уровень с порогом строго выше ``points``."""
+        position = bisect_right(self.thresholds, points)
+        return self.levels[position] if position < len(self.levels) else None
+
+    def previous(self, level: LevelSnapshot) -> LevelSnapshot | None:
+        """Ближайший уровень с порогом строго ниже порога ``level``."""
+        position = bisect_left(self.thresholds, level.required_points)
+        return self.levels[position - 1] if position else None
+
+
 class LevelCalculator:
-    def calculate_level(self, current_points: int, all_levels: Sequence[Level]) -> Level | None:
-        # Сортируем уровни по возрастанию требований (на всякий случай)
-        sorted_levels = sorted(all_levels, key=lambda level: level.required_points)
-
-        # Ищем самый высокий уровень, который покрывают наши баллы
-        current_level = None
-        for level in sorted_levels:
-            if current_points >= level.required_points:
-                current_level = level
-            else:
-                # Как только требований стало больше, чем у нас баллов — стоп
-                break
-
-        if current_level:
-            return current_level
-        else:
-            logger.warning("No level found for current points: %d", current_points)
-            return None
+    def calculate_level(self, current_points: int, thresholds: LevelThresholdIndex) -> LevelSnapshot | None:
+        current_level = thresholds.current(current_points)
+        if current_level is None:
+            logger.warning("No level found for current points: {points}", points=current_points)
+        return current_level
@@ -1,5 +1,9 @@
 from .user_dto import AdjustUserPointsDTO as AdjustUserPointsDTO
+from .user_dto import AdjustUsersPointsDTO as AdjustUsersPointsDTO
+from .user_dto import PointsRecipientChange as PointsRecipientChange
+from .user_dto import PointsRecipientState as PointsRecipientState
 from .user_dto import UpdateUserLevelDTO as UpdateUserLevelDTO
+from .user_dto import UserContext as UserContext
 from .user_dto import UserCreateDTO as UserCreateDTO
 from .user_dto import UserReadDTO as UserReadDTO
 from .user_dto import UserProfileReadDTO as UserProfileReadDTO
@@ -23,14 +27,20 @@ from .role_dto import RoleByIdDTO as RoleByIdDTO
 from .role_dto import RoleIdsDTO as RoleIdsDTO
 from .role_dto import RoleReadDTO as RoleReadDTO
 
+from .notify_dto import BulkNotificationTaskPayload as BulkNotificationTaskPayload
+from .notify_dto import BulkNotifyDTO as BulkNotifyDTO
 from .notify_dto import NotificationLogEvent as NotificationLogEvent
 from .notify_dto import NotificationTaskPayload as NotificationTaskPayload
 from .notify_dto import NotifyDTO as NotifyDTO
 from .notify_dto import NotifyUserDTO as NotifyUserDTO
+from .notify_dto import NotifyUsersDTO as NotifyUsersDTO
 
 from .broadcast_dto import BaseBroadcastDTO as BroadcastDTO
+from .broadcast_dto import BroadcastProgressDTO as BroadcastProgressDTO
+from .broadcast_dto import BroadcastRecipient as BroadcastRecipient
 from .broadcast_dto import BroadcastResult as BroadcastResult
 from .broadcast_dto import CompetenceBroadcastDTO as CompetenceBroadcastDTO
+from .broadcast_dto import ReachabilityProbeResult as ReachabilityProbeResult
 from .broadcast_dto import RoleBroadcastDTO as RoleBroadcastDTO
 
 from .leaderboard_dto import WeeklyLeaderboardRowDTO as WeeklyLeaderboardRowDTO
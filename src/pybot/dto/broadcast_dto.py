@@ -1,11 +1,19 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 from pydantic import Field, field_validator
 
+from ..core.constants import BroadcastJobStatus
 from ..utils import normalize_message
 from .base_dto import BaseDTO
 
 
+@dataclass(frozen=True, slots=True)
+class BroadcastRecipient:
+    user_id: int
+    telegram_id: int
+
+
 @dataclass(slots=True)
 class BroadcastResult:
     attempted: int = 0
@@ -15,8 +23,41 @@ class BroadcastResult:
     skipped_invalid_user: int = 0
 
 
+@dataclass(slots=True)
+class ReachabilityProbeResult:
+    probed: int = 0
+    restored: int = 0
+    still_unreachable: int = 0
+    inconclusive: int = 0
+
+
+class BroadcastProgressDTO(BaseDTO):
+    """Снимок прогресса рассылки для статус-сообщения администратора и health API."""
+
+    job_id: int = Field(description="Идентификатор задания рассылки.", examples=[12])
+    status: BroadcastJobStatus = Field(description="Статус задания.", examples=["running"])
+    total: int | None = Field(default=None, description="Размер аудитории; null, пока не подсчитан.")
+    attempted: int = Field(default=0, description="Обработано получателей.")
+    sent: int = Field(default=0, description="Доставлено сообщений.")
+    failed: int = Field(default=0, description="Ошибки доставки (временные и постоянные).")
+    skipped: int = Field(default=0, description="Пропущено некорректных получателей.")
+    remaining: int | None = Field(default=None, description="Осталось обработать получателей.")
+    rate_per_s: float | None = Field(default=None, description="Текущая скорость, получателей в секунду.")
+    eta_s: float | None = Field(default=None, description="Оценка оставшегося времени в секундах.")
+    elapsed_s: float | None = Field(default=None, description="Время с начала рассылки в секундах.")
+    timings: dict[str, dict[str, float]] = Field(
+        default_factory=dict,
+        description="Гистограммы времени доставки по этапам, миллисекунды.",
+        examples=[{"send": {"count": 120, "sum_ms": 7340.0, "le_50ms": 10, "le_100ms": 96}}],
+    )
+    updated_at: datetime | None = Field(default=None, description="UTC-время снимка.")
+
+
 class BaseBroadcastDTO(BaseDTO):
     message: str = Field(..., alias="broadcast_message")
+    # Сообщение администратора, которое редактируется по мере рассылки.
+    status_chat_id: int | None = None
+    status_message_id: int | None = None
 
     @field_validator("message")
     @classmethod
@@ -3,11 +3,11 @@ from datetime import timedelta
 from typing import Literal
 
 import pendulum
-from pydantic import ConfigDict, Field, field_validator
+from pydantic import ConfigDict, Field, PositiveInt, field_validator
 from pydantic_extra_types.cron import CronStr
 from pydantic_extra_types.timezone_name import TimeZoneName
 
-from ..core.constants import TaskScheduleKind
+from ..core.constants import NotificationPriority, TaskScheduleKind
 from ..utils import normalize_message
 from .base_dto import BaseDTO
 
@@ -21,6 +21,13 @@ class NotificationTaskPayload:
     message: str
 
 
+@dataclass(slots=True)
+class BulkNotificationTaskPayload:
+    sent: int = 0
+    failed_temporary: int = 0
+    failed_permanent: int = 0
+
+
 class NotifyDTO(BaseDTO):
     """
     DTO для отправки уведомления пользователю.
@@ -28,11 +35,13 @@ class NotifyDTO(BaseDTO):
     Поля:
         message (str): текст уведомления.
         user_id (int): идентификатор пользователя.
+        priority (NotificationPriority): полоса отправки, по умолчанию интерактивная.
 
     """
 
     message: str
     user_id: int = Field(..., alias="user_id", ge=1)
+    priority: NotificationPriority = NotificationPriority.INTERACTIVE
 
     @field_validator("message")
     @classmethod
@@ -57,6 +66,19 @@ class NotifyDTO(BaseDTO):
         return message
 
 
+class BulkNotifyDTO(BaseDTO):
+    """
+    Полезная нагрузка задачи массовой отправки: текст хранится в Redis один раз.
+
+    Поля:
+        user_ids (list[int]): получатели одной порции.
+        body_key (str): ключ текста уведомления в хранилище.
+    """
+
+    user_ids: list[PositiveInt] = Field(..., min_length=1)
+    body_key: str = Field(..., min_length=1)
+
+
 @dataclass(frozen=True, slots=True)
 class NotificationLogEvent:
     event_type: Literal["role_request_to_admin", "direct_message"]
@@ -99,3 +121,20 @@ class NotifyUserDTO(BaseDTO):
         """
         message = normalize_message(message)
         return message
+
+
+class NotifyUsersDTO(BaseDTO):
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, arbitrary_types_allowed=True)
+
+    user_ids: list[PositiveInt] = Field(..., min_length=1)
+    message: str
+    kind: TaskScheduleKind
+    run_at: pendulum.DateTime | None = None
+    interval: timedelta | None = None
+    cron: CronStr | None = None
+    timezone: TimeZoneName | None = None
+
+    @field_validator("message")
+    @classmethod
+    def validate_message(cls, message: str) -> str:
+        return normalize_message(message)
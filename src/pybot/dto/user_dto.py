@@ -1,6 +1,7 @@
 import re
 from collections.abc import Sequence
-from datetime import date
+from dataclasses import dataclass
+from datetime import date, datetime
 from typing import ClassVar
 
 from pydantic import Field, computed_field, field_validator
@@ -27,6 +28,44 @@ class AdjustUserPointsDTO(BaseDTO):
     reason: str | None = None
 
 
+class AdjustUsersPointsDTO(BaseDTO):
+    """Одно изменение баллов многим получателям от одного выдающего, например всему классу."""
+
+    recipient_ids: list[int] = Field(..., min_length=1)
+    giver_id: int
+    points: Points
+    reason: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PointsRecipientState:
+    """Баллы получателя одного типа и его связь с уровнем этого типа."""
+
+    user_id: int
+    telegram_id: int
+    points: int
+    user_level_id: int | None
+    level_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class PointsRecipientChange:
+    user_id: int
+    telegram_id: int
+    actual_delta: int
+    new_score: int
+
+
+@dataclass(frozen=True, slots=True)
+class UserContext:
+    """Пользователь текущего апдейта: загружается middleware одним запросом и кладётся в ``data``."""
+
+    user_id: int
+    telegram_id: int
+    roles: frozenset[str]
+    last_active_at: datetime | None
+
+
 class UserCreateDTO(BaseDTO):
     """DTO для создания нового пользователя."""
 
@@ -5,12 +5,16 @@ from contextlib import asynccontextmanager
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka, setup_dishka
 from fastapi import FastAPI, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from ..core import logger
 from ..di.containers import setup_health_container
+from ..domain.exceptions import BroadcastJobNotFoundError
+from ..dto import BroadcastProgressDTO
 from ..dto.health_dto import HealthStatusDTO
+from ..services.broadcast_progress import BroadcastProgressService
 from ..services.health import HealthService
+from ..services.metrics import MetricsService
 
 container = setup_health_container()
 
@@ -94,3 +98,75 @@ async def ready(
     if is_ready:
         return status_dto
     return JSONResponse(status_code=503, content=status_dto.model_dump(mode="json"))
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["health"],
+    summary="Prometheus metrics",
+    description=(
+        "Handler latency histograms, per-update SQL statement counts and broadcast/notification counters "
+        "of the bot, TaskIQ workers and this process in the Prometheus text format."
+    ),
+)
+async def prometheus_metrics(metrics_service: FromDishka[MetricsService]) -> PlainTextResponse:
+    """Return aggregated metrics of all bot processes.
+
+    Args:
+        metrics_service: Metrics service resolved from Dishka container.
+
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(metrics_service.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get(
+    "/broadcasts/active",
+    response_model=list[BroadcastProgressDTO],
+    tags=["broadcasts"],
+    summary="Active broadcasts progress",
+    description="Progress snapshots of pending and running broadcast jobs, throttled to BROADCAST_PROGRESS_INTERVAL_S.",
+)
+async def active_broadcasts(progress_service: FromDishka[BroadcastProgressService]) -> list[BroadcastProgressDTO]:
+    """Return progress of unfinished broadcast jobs.
+
+    Args:
+        progress_service: Broadcast progress service resolved from Dishka container.
+
+    Returns:
+        list[BroadcastProgressDTO]: Snapshots ordered by job id.
+    """
+    return await progress_service.list_active()
+
+
+@app.get(
+    "/broadcasts/{job_id}",
+    response_model=BroadcastProgressDTO,
+    tags=["broadcasts"],
+    summary="Broadcast progress",
+    description="Counters, rate, ETA and delivery timing histograms of a single broadcast job.",
+    responses={
+        404: {
+            "description": "Broadcast job does not exist.",
+        },
+    },
+)
+async def broadcast_progress(
+    job_id: int,
+    progress_service: FromDishka[BroadcastProgressService],
+) -> JSONResponse | BroadcastProgressDTO:
+    """Return the latest progress snapshot of a broadcast job.
+
+    Args:
+        job_id: Broadcast job identifier.
+        progress_service: Broadcast progress service resolved from Dishka container.
+
+    Returns:
+        BroadcastProgressDTO | JSONResponse: Progress payload or 404 response.
+    """
+    try:
+        return await progress_service.get_progress(job_id)
+    except BroadcastJobNotFoundError:
+        return JSONResponse(status_code=404, content={"detail": f"Broadcast job {job_id} not found"})
@@ -1,19 +1,43 @@
+from .broadcast_job_repository import BroadcastJobRepository
 from .competence_repository import CompetenceRepository
+from .leaderboard_cache import LeaderboardCache, LeaderboardCacheKey, RedisLeaderboardCache
+from .level_catalog import LevelCatalog
 from .level_repository import LevelRepository
+from .metrics_snapshots import MetricsSnapshotWriter, read_metric_snapshots
+from .points_ledger import PointsLedger
+from .points_period_total_repository import PointsPeriodTotalRepository
 from .points_transaction_repository import PointsTransactionRepository
+from .rate_limit_store import InMemoryRateLimitStore, RateLimitRule, RedisRateLimitStore
 from .role_repository import RoleRepository
 from .roles import RoleRequestRepository
+from .user_activity_buffer import UserActivityBuffer
+from .user_context_cache import RedisUserContextCache, UserContextCache
 from .user_repository import UserRepository
 from .valuation_repository import ValuationRepository
 from .points_transaction_repository import PointsTransactionRepository
 
 __all__ = [
+    "BroadcastJobRepository",
     "CompetenceRepository",
+    "InMemoryRateLimitStore",
+    "LeaderboardCache",
+    "LeaderboardCacheKey",
+    "LevelCatalog",
     "LevelRepository",
+    "MetricsSnapshotWriter",
+    "PointsLedger",
+    "PointsPeriodTotalRepository",
     "PointsTransactionRepository",
     "RoleRepository",
+    "RateLimitRule",
+    "RedisLeaderboardCache",
+    "RedisRateLimitStore",
+    "RedisUserContextCache",
     "RoleRequestRepository",
+    "UserActivityBuffer",
+    "UserContextCache",
     "UserRepository",
     "ValuationRepository",
+    "read_metric_snapshots",
     "PointsTransactionRepository",
 ]
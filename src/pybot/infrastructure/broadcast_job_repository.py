@@ -0,0 +1,115 @@
+from collections.abc import Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.constants import BroadcastAudienceKind, BroadcastDeliveryStatus, BroadcastJobStatus
+from ..db.models import BroadcastDelivery, BroadcastJob
+from ..domain.exceptions import BroadcastJobNotFoundError
+
+
+class BroadcastJobRepository:
+    """Stateless репозиторий заданий рассылки и журнала доставок."""
+
+    async def create_job(
+        self,
+        db: AsyncSession,
+        *,
+        message: str,
+        audience_kind: BroadcastAudienceKind,
+        role_name: str | None = None,
+        competence_id: int | None = None,
+    ) -> BroadcastJob:
+        job = BroadcastJob(
+            message=message,
+            audience_kind=audience_kind,
+            audience_role_name=role_name,
+            audience_competence_id=competence_id,
+            status=BroadcastJobStatus.PENDING,
+            last_user_id=0,
+            shard_count=0,
+            attempted=0,
+            sent=0,
+            failed_temporary=0,
+            failed_permanent=0,
+            skipped_invalid_user=0,
+        )
+        db.add(job)
+        await db.flush()
+        return job
+
+    async def create_shard(
+        self,
+        db: AsyncSession,
+        parent: BroadcastJob,
+        *,
+        after_id: int,
+        until_id: int,
+    ) -> BroadcastJob:
+        """Создать шард задания ``parent`` для диапазона ``users.id`` в ``(after_id, until_id]``."""
+        shard = BroadcastJob(
+            message=parent.message,
+            audience_kind=parent.audience_kind,
+            audience_role_name=parent.audience_role_name,
+            audience_competence_id=parent.audience_competence_id,
+            status=BroadcastJobStatus.PENDING,
+            parent_job_id=parent.id,
+            last_user_id=after_id,
+            range_end_id=until_id,
+            shard_count=0,
+            attempted=0,
+            sent=0,
+            failed_temporary=0,
+            failed_permanent=0,
+            skipped_invalid_user=0,
+        )
+        db.add(shard)
+        await db.flush()
+        return shard
+
+    async def get_by_id(self, db: AsyncSession, job_id: int) -> BroadcastJob:
+        job = await db.get(BroadcastJob, job_id)
+        if job is None:
+            raise BroadcastJobNotFoundError(job_id)
+        return job
+
+    async def find_unfinished_jobs(self, db: AsyncSession) -> Sequence[BroadcastJob]:
+        stmt = (
+            select(BroadcastJob)
+            .where(BroadcastJob.status.in_((BroadcastJobStatus.PENDING, BroadcastJobStatus.RUNNING)))
+            .order_by(BroadcastJob.id.asc())
+        )
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    async def find_shards(self, db: AsyncSession, parent_job_id: int) -> Sequence[BroadcastJob]:
+        stmt = select(BroadcastJob).where(BroadcastJob.parent_job_id == parent_job_id).order_by(BroadcastJob.id.asc())
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    async def find_recorded_user_ids(self, db: AsyncSession, job_id: int, user_ids: Sequence[int]) -> set[int]:
+        """Пользователи из ``user_ids``, чей итог доставки по заданию уже записан в журнал."""
+        if not user_ids:
+            return set()
+
+        stmt = select(BroadcastDelivery.user_id).where(
+            BroadcastDelivery.job_id == job_id,
+            BroadcastDelivery.user_id.in_(user_ids),
+        )
+        result = await db.execute(stmt)
+        return set(result.scalars().all())
+
+    async def add_deliveries(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        deliveries: Sequence[tuple[int, BroadcastDeliveryStatus]],
+    ) -> None:
+        """Записать итоги пачки одним multi-row INSERT."""
+        if not deliveries:
+            return
+
+        stmt = insert(BroadcastDelivery).values(
+            [{"job_id": job_id, "user_id": user_id, "status": status} for user_id, status in deliveries]
+        )
+        await db.execute(stmt)
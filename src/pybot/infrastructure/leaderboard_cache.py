@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+
+from ..core import logger
+from ..core.constants import PointsTypeEnum
+from ..dto import WeeklyLeaderboardRowDTO
+
+Clock = Callable[[], float]
+
+_ROWS_ADAPTER = TypeAdapter(list[WeeklyLeaderboardRowDTO])
+# Вычисляемые поля не сериализуются: DTO запрещают лишние поля при обратной валидации.
+_COMPUTED_FIELDS = {"__all__": set(WeeklyLeaderboardRowDTO.model_computed_fields)}
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderboardCacheKey:
+    points_type: PointsTypeEnum
+    period_start: datetime
+    limit: int
+    business_tz: str
+
+    def to_redis_key(self, prefix: str) -> str:
+        return f"{prefix}:{self.points_type}:{self.period_start.isoformat()}:{self.limit}:{self.business_tz}"
+
+
+class LeaderboardCache:
+    """
+    Процессный кеш готовых лидербордов.
+
+    ``ttl_s=None`` — запись бессрочная: так кешируются закрытые недели, которые больше не меняются.
+    Открытые периоды кладутся с коротким TTL. Размер ограничен ``max_size`` (вытесняются самые старые).
+    """
+
+    def __init__(self, *, max_size: int, clock: Clock = time.monotonic) -> None:
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[LeaderboardCacheKey, tuple[float | None, list[WeeklyLeaderboardRowDTO]]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: LeaderboardCacheKey) -> list[WeeklyLeaderboardRowDTO] | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= self._clock():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def put(
+        self,
+        key: LeaderboardCacheKey,
+        rows: Sequence[WeeklyLeaderboardRowDTO],
+        *,
+        ttl_s: float | None,
+    ) -> None:
+        expires_at = None if ttl_s is None else self._clock() + ttl_s
+        self._entries[key] = (expires_at, list(rows))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    async def close(self) -> None:
+        logger.info("event=leaderboard_cache_close hits={hits} misses={misses} size={size}", **self.stats())
+
+
+class RedisLeaderboardCache(LeaderboardCache):
+    """
+    :class:`LeaderboardCache` в Redis: общий для всех реплик бота и TaskIQ-воркера.
+
+    Воркер прогревает новую закрытую неделю, и первый ``/leaderboard`` после смены недели
+    уже не ходит в БД. Строки хранятся в JSON; TTL открытых периодов задаёт Redis.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        prefix: str = "pybot:leaderboard",
+    ) -> None:
+        super().__init__(max_size=0)
+        self.redis = redis
+        self.prefix = prefix
+
+    async def get(self, key: LeaderboardCacheKey) -> list[WeeklyLeaderboardRowDTO] | None:
+        payload = await self.redis.get(key.to_redis_key(self.prefix))
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _ROWS_ADAPTER.validate_json(payload)
+
+    async def put(
+        self,
+        key: LeaderboardCacheKey,
+        rows: Sequence[WeeklyLeaderboardRowDTO],
+        *,
+        ttl_s: float | None,
+    ) -> None:
+        payload = _ROWS_ADAPTER.dump_json(list(rows), exclude=_COMPUTED_FIELDS)
+        expire_ms = None if ttl_s is None else max(int(ttl_s * 1000), 1)
+        await self.redis.set(key.to_redis_key(self.prefix), payload, px=expire_ms)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.redis.scan_iter(match=f"{self.prefix}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def close(self) -> None:
+        logger.info("event=leaderboard_cache_close backend=redis hits={hits} misses={misses}", **self.stats())
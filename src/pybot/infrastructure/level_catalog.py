@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import logger
+from ..core.constants import PointsTypeEnum
+from ..domain.services.level_calculator import LevelSnapshot, LevelThresholdIndex
+from .level_repository import LevelRepository
+
+
+class LevelCatalog:
+    """
+    Процессный каталог уровней: пороги каждого типа баллов в отсортированных массивах.
+
+    Таблица ``levels`` читается одним запросом при первом обращении, дальше уровни
+    определяются без БД. Пока уровней нет, каталог не запоминается, чтобы бот,
+    запущенный до сидирования, подхватил их сам. Изменённые уровни процесс увидит
+    только после перезапуска.
+    """
+
+    def __init__(self, level_repository: LevelRepository) -> None:
+        self.level_repository = level_repository
+        self._indexes: dict[PointsTypeEnum, LevelThresholdIndex] | None = None
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    async def thresholds(self, db: AsyncSession, points_type: PointsTypeEnum) -> LevelThresholdIndex:
+        indexes = self._indexes
+        if indexes is None:
+            indexes = await self._load(db)
+        return indexes[points_type]
+
+    async def _load(self, db: AsyncSession) -> dict[PointsTypeEnum, LevelThresholdIndex]:
+        async with self._lock:
+            if self._indexes is not None:
+                return self._indexes
+
+            levels = await self.level_repository.find_all_levels(db)
+            self.loads += 1
+            grouped: dict[PointsTypeEnum, list[LevelSnapshot]] = {points_type: [] for points_type in PointsTypeEnum}
+            for level in levels:
+                snapshot = LevelSnapshot.from_orm(level)
+                grouped[snapshot.level_type].append(snapshot)
+            indexes = {points_type: LevelThresholdIndex(items) for points_type, items in grouped.items()}
+
+            if levels:
+                self._indexes = indexes
+                logger.info("event=level_catalog_loaded levels={count}", count=len(levels))
+            return indexes
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from ..core import logger
+from ..core.metrics import MetricsRegistry
+
+
+class MetricsSnapshotWriter:
+    """
+    Периодически сохраняет снимок :class:`MetricsRegistry` процесса в файл ``metrics-<pid>.json``.
+
+    Health API работает в отдельном процессе и не видит реестров бота и TaskIQ-воркеров:
+    он складывает свежие снимки из общего каталога (:func:`read_metric_snapshots`).
+    Файл перезаписывается атомарно и удаляется при ``close``.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str | Path, *, interval_s: float) -> None:
+        self.registry = registry
+        self.interval_s = interval_s
+        self.path = Path(directory) / f"metrics-{os.getpid()}.json"
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.registry.snapshot()), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        with contextlib.suppress(OSError):
+            self.path.unlink(missing_ok=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                self.write()
+            except OSError:
+                logger.exception("event=metrics_snapshot_write status=failed path={path}", path=str(self.path))
+
+
+def read_metric_snapshots(directory: str | Path, *, max_age_s: float) -> list[dict[str, Any]]:
+    """Прочитать снимки процессов, обновлённые не раньше ``max_age_s`` назад; файлы упавших процессов пропускаются."""
+    snapshots: list[dict[str, Any]] = []
+    oldest_allowed = time.time() - max_age_s
+    with contextlib.suppress(FileNotFoundError):
+        for path in Path(directory).glob("metrics-*.json"):
+            try:
+                if path.stat().st_mtime < oldest_allowed:
+                    continue
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                logger.warning("event=metrics_snapshot_read status=skipped path={path}", path=str(path))
+    return snapshots
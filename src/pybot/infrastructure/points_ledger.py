@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..dto.value_objects import Points
+from ..utils import week_bounds_utc
+from .points_period_total_repository import PointsPeriodTotalRepository
+from .points_transaction_repository import PointsTransactionRepository
+from .valuation_repository import ValuationRepository
+
+
+class PointsLedger:
+    """
+    Запись одного начисления: оценки, строки ledger и недельные суммы в сессии вызывающего.
+
+    Все три записи делаются многострочными INSERT и коммитятся вызывающим вместе с баллами,
+    так что лидерборд, который читает только недельные суммы, не расходится с ledger.
+    Недели считаются в ``business_tz``, как и в лидерборде.
+    """
+
+    def __init__(
+        self,
+        valuation_repository: ValuationRepository,
+        points_transaction_repository: PointsTransactionRepository,
+        points_period_total_repository: PointsPeriodTotalRepository,
+        *,
+        business_tz: str,
+    ) -> None:
+        self.business_tz = business_tz
+        self.valuation_repository = valuation_repository
+        self.points_transaction_repository = points_transaction_repository
+        self.points_period_total_repository = points_period_total_repository
+
+    async def record(
+        self,
+        db: AsyncSession,
+        *,
+        giver_id: int,
+        points: Points,
+        reason: str | None,
+        amounts: Mapping[int, int],
+    ) -> None:
+        """
+        Записать оценку ``points`` от ``giver_id`` каждому получателю из ``amounts``.
+
+        ``amounts`` — фактическое изменение баллов получателя (с учётом обрезки на нуле):
+        оно попадает в ledger и недельную сумму, а оценка хранит запрошенное значение.
+        """
+        if not amounts:
+            return
+
+        created_at = datetime.now(UTC).replace(tzinfo=None)
+        period_start, _ = week_bounds_utc(created_at, self.business_tz)
+        await self.valuation_repository.add_many(
+            db,
+            recipient_ids=list(amounts),
+            giver_id=giver_id,
+            points=points,
+            reason=reason.strip() if reason else None,
+        )
+        await self.points_transaction_repository.add_many(
+            db,
+            amounts=amounts,
+            giver_id=giver_id,
+            points_type=points.point_type,
+            created_at=created_at,
+        )
+        await self.points_period_total_repository.add_amounts(
+            db,
+            points_type=points.point_type,
+            period_start=period_start,
+            amounts=amounts,
+        )
@@ -0,0 +1,134 @@
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.constants import PointsTypeEnum
+from ..db.models import PointsPeriodTotal, PointsTransaction, User
+from ..dto import WeeklyLeaderboardRowDTO
+from ..utils import week_bounds_utc
+
+# INSERT ... ON CONFLICT DO UPDATE есть в обоих поддерживаемых диалектах, но строится разными классами.
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+REBUILD_INSERT_CHUNK_SIZE = 1000
+
+
+class PointsPeriodTotalRepository:
+    async def add_amounts(
+        self,
+        db: AsyncSession,
+        *,
+        points_type: PointsTypeEnum,
+        period_start: datetime,
+        amounts: Mapping[int, int],
+    ) -> None:
+        """Прибавить ``user_id -> amount`` к недельным суммам одним многострочным upsert."""
+        if not amounts:
+            return
+        upsert = self._upsert_insert(db)
+        stmt = upsert(PointsPeriodTotal).values(
+            [
+                {"user_id": user_id, "points_type": points_type, "period_start": period_start, "total": amount}
+                for user_id, amount in amounts.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PointsPeriodTotal.user_id, PointsPeriodTotal.points_type, PointsPeriodTotal.period_start],
+            set_={"total": PointsPeriodTotal.total + stmt.excluded.total},
+        )
+        await db.execute(stmt)
+
+    async def find_top_for_period(
+        self,
+        db: AsyncSession,
+        *,
+        points_type: PointsTypeEnum,
+        period_start: datetime,
+        period_end: datetime,
+        limit: int = 10,
+    ) -> Sequence[WeeklyLeaderboardRowDTO]:
+        stmt = (
+            select(
+                User.id,
+                User.telegram_id,
+                User.first_name,
+                User.last_name,
+                User.patronymic,
+                PointsPeriodTotal.total,
+            )
+            .join(User, User.id == PointsPeriodTotal.user_id)
+            .where(
+                PointsPeriodTotal.points_type == points_type,
+                PointsPeriodTotal.period_start == period_start,
+            )
+            .order_by(PointsPeriodTotal.total.desc(), PointsPeriodTotal.user_id.asc())
+            .limit(limit)
+        )
+
+        result = await db.execute(stmt)
+        return [
+            WeeklyLeaderboardRowDTO(
+                user_id=row.id,
+                telegram_id=row.telegram_id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                patronymic=row.patronymic,
+                total_points_delta=row.total,
+                points_type=points_type,
+                period_start=period_start,
+                period_end=period_end,
+            )
+            for row in result.all()
+        ]
+
+    async def has_rows(self, db: AsyncSession) -> bool:
+        """Есть ли в таблице хотя бы одна недельная сумма."""
+        result = await db.execute(select(PointsPeriodTotal.user_id).limit(1))
+        return result.first() is not None
+
+    async def rebuild(self, db: AsyncSession, *, business_tz: str) -> int:
+        """
+        Пересобрать таблицу из ``points_transactions``; вернуть число недельных строк.
+
+        Ledger читается потоком по возрастанию ``created_at``, так что границы недели
+        пересчитываются только при переходе в следующую неделю. Коммит — на вызывающем.
+        """
+        totals: dict[tuple[int, str, datetime], int] = {}
+        week_start: datetime | None = None
+        week_end: datetime | None = None
+
+        stmt = select(
+            PointsTransaction.recipient_id,
+            PointsTransaction.points_type,
+            PointsTransaction.created_at,
+            PointsTransaction.amount,
+        ).order_by(PointsTransaction.created_at)
+        result = await db.stream(stmt.execution_options(yield_per=REBUILD_INSERT_CHUNK_SIZE))
+        async for recipient_id, points_type, created_at, amount in result:
+            if week_start is None or week_end is None or not week_start <= created_at < week_end:
+                week_start, week_end = week_bounds_utc(created_at, business_tz)
+            key = (recipient_id, points_type, week_start)
+            totals[key] = totals.get(key, 0) + amount
+
+        await db.execute(delete(PointsPeriodTotal))
+        rows = [
+            {"user_id": user_id, "points_type": points_type, "period_start": period_start, "total": total}
+            for (user_id, points_type, period_start), total in totals.items()
+        ]
+        for offset in range(0, len(rows), REBUILD_INSERT_CHUNK_SIZE):
+            await db.execute(insert(PointsPeriodTotal), rows[offset : offset + REBUILD_INSERT_CHUNK_SIZE])
+        return len(rows)
+
+    @staticmethod
+    def _upsert_insert(db: AsyncSession) -> Callable[..., Any]:
+        dialect = db.get_bind().dialect.name
+        upsert = _UPSERT_INSERTS.get(dialect)
+        if upsert is None:
+            raise NotImplementedError(f"Points period totals upsert is not supported for {dialect}")
+        return upsert
@@ -1,7 +1,7 @@
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.constants import PointsTypeEnum
@@ -13,6 +13,29 @@ class PointsTransactionRepository:
     async def add(self, db: AsyncSession, transaction: PointsTransaction) -> None:
         db.add(transaction)
 
+    async def add_many(
+        self,
+        db: AsyncSession,
+        *,
+        amounts: Mapping[int, int],
+        giver_id: int | None,
+        points_type: PointsTypeEnum,
+        created_at: datetime,
+    ) -> None:
+        """Записать в ledger фактические изменения ``recipient_id -> amount`` одним многострочным INSERT."""
+        rows = [
+            {
+                "recipient_id": recipient_id,
+                "giver_id": giver_id,
+                "amount": amount,
+                "points_type": points_type,
+                "created_at": created_at,
+            }
+            for recipient_id, amount in amounts.items()
+        ]
+        if rows:
+            await db.execute(insert(PointsTransaction).values(rows))
+
     async def find_top_recipients_for_period(
         self,
         db: AsyncSession,
@@ -1,4 +1,17 @@
+from .in_memory_broadcast_lock import InMemoryBroadcastLock
 from .logging_notification_service import LoggingNotificationService
+from .paced_notification_service import PacedNotificationService
+from .redis_broadcast_lock import RedisBroadcastLock
+from .send_scheduler import SendRateLimits, SendScheduler, TokenBucket
 from .telegram_notification_service import TelegramNotificationService
 
-__all__ = ["TelegramNotificationService", "LoggingNotificationService"]
+__all__ = [
+    "TelegramNotificationService",
+    "LoggingNotificationService",
+    "PacedNotificationService",
+    "SendRateLimits",
+    "SendScheduler",
+    "TokenBucket",
+    "InMemoryBroadcastLock",
+    "RedisBroadcastLock",
+]
@@ -0,0 +1,45 @@
+import time
+import uuid
+from collections.abc import Callable
+
+from ...services.ports import BroadcastLockPort
+
+
+class InMemoryBroadcastLock(BroadcastLockPort):
+    """
+    Реализация :class:`BroadcastLockPort` в памяти процесса.
+
+    Подходит для одного процесса и для тестов: все операции синхронны между ``await``,
+    поэтому отдельный ``asyncio.Lock`` не нужен. Между процессами не защищает.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._leases: dict[str, tuple[str, float]] = {}
+
+    def _owner(self, key: str) -> str | None:
+        lease = self._leases.get(key)
+        if lease is None:
+            return None
+        token, expires_at = lease
+        if expires_at <= self._clock():
+            del self._leases[key]
+            return None
+        return token
+
+    async def acquire(self, key: str, ttl_seconds: float) -> str | None:
+        if self._owner(key) is not None:
+            return None
+        token = uuid.uuid4().hex
+        self._leases[key] = (token, self._clock() + ttl_seconds)
+        return token
+
+    async def extend(self, key: str, token: str, ttl_seconds: float) -> bool:
+        if self._owner(key) != token:
+            return False
+        self._leases[key] = (token, self._clock() + ttl_seconds)
+        return True
+
+    async def release(self, key: str, token: str) -> None:
+        if self._owner(key) == token:
+            del self._leases[key]
@@ -78,3 +78,12 @@ class LoggingNotificationService(NotificationPort):
                 message_preview=cleaned_text[:120],
             )
             raise NotificationPermanentError(message="Failed to log direct notification") from exc
+
+    async def edit_message(self, chat_id: int, message_id: int, text: str) -> None:
+        """Log status message edit; edits are not buffered as separate events."""
+        logger.info(
+            "Message edit (logging backend) | chat_id={chat_id} message_id={message_id} message_preview={preview}",
+            chat_id=chat_id,
+            message_id=message_id,
+            preview=text[:120],
+        )
@@ -0,0 +1,85 @@
+from collections.abc import Awaitable, Callable
+
+from ...core.config import settings
+from ...core.constants import NotificationPriority
+from ...core.metrics import metrics
+from ...dto import NotifyDTO
+from ...services.ports import NotificationPermanentError, NotificationPort, NotificationTemporaryError
+from .send_scheduler import SendScheduler
+
+
+class PacedNotificationService(NotificationPort):
+    """
+    Декоратор :class:`NotificationPort`, который пропускает отправки через общий :class:`SendScheduler`.
+
+    Один экземпляр живёт в APP scope, поэтому рассылки, уведомления по заявкам на роли,
+    баллы и TaskIQ-уведомления процесса делят один глобальный бюджет Telegram.
+    Приоритет берётся из ``NotifyDTO.priority``; уведомления администратору и правки
+    статус-сообщений всегда интерактивные.
+    """
+
+    def __init__(self, inner: NotificationPort, scheduler: SendScheduler) -> None:
+        self.inner = inner
+        self.scheduler = scheduler
+
+    async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
+        await self._paced(
+            "send_role_request_to_admin",
+            settings.role_request_admin_tg_id,
+            NotificationPriority.INTERACTIVE,
+            lambda: self.inner.send_role_request_to_admin(request_id, requester_user_id, role_name),
+        )
+
+    async def send_message(self, message_data: NotifyDTO) -> None:
+        await self._paced(
+            "send_message",
+            message_data.user_id,
+            message_data.priority,
+            lambda: self.inner.send_message(message_data),
+        )
+
+    async def edit_message(self, chat_id: int, message_id: int, text: str) -> None:
+        await self._paced(
+            "edit_message",
+            chat_id,
+            NotificationPriority.INTERACTIVE,
+            lambda: self.inner.edit_message(chat_id, message_id, text),
+        )
+
+    async def probe_recipient(self, user_id: int) -> None:
+        # Повторная проверка недоступных получателей фоновая и не должна задерживать ответы пользователям.
+        await self._paced(
+            "probe_recipient",
+            user_id,
+            NotificationPriority.BULK,
+            lambda: self.inner.probe_recipient(user_id),
+        )
+
+    async def _paced(
+        self,
+        method: str,
+        chat_id: int,
+        priority: NotificationPriority,
+        call: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Дождаться слота планировщика, выполнить отправку и учесть её исход в планировщике и метриках."""
+        await self.scheduler.acquire(chat_id, priority)
+        try:
+            await call()
+        except NotificationTemporaryError as exc:
+            self._observe_temporary_error(exc)
+            self._count(method, "temporary_error")
+            raise
+        except NotificationPermanentError:
+            self._count(method, "permanent_error")
+            raise
+        self.scheduler.on_success()
+        self._count(method, "sent")
+
+    @staticmethod
+    def _count(method: str, outcome: str) -> None:
+        metrics.inc("notifications_total", method=method, outcome=outcome)
+
+    def _observe_temporary_error(self, exc: NotificationTemporaryError) -> None:
+        if exc.retry_after_seconds is not None:
+            self.scheduler.on_retry_after(exc.retry_after_seconds)
@@ -0,0 +1,51 @@
+import uuid
+
+from redis.asyncio import Redis
+
+from ...services.ports import BroadcastLockPort
+
+# Продление и освобождение атомарно сверяют владельца: чужую аренду трогать нельзя.
+_EXTEND_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBroadcastLock(BroadcastLockPort):
+    """
+    Реализация :class:`BroadcastLockPort` на Redis: ``SET key token NX PX ttl``.
+
+    Аренда общая для bot- и всех worker-процессов; упавший владелец не держит
+    блокировку дольше ``ttl_seconds``.
+    """
+
+    def __init__(self, redis: Redis, *, key_prefix: str = "pybot:lock:") -> None:
+        self.redis = redis
+        self.key_prefix = key_prefix
+        # Скрипты вызываются через EVALSHA; после SCRIPT FLUSH redis-py загрузит их заново.
+        self._extend_script = redis.register_script(_EXTEND_SCRIPT)
+        self._release_script = redis.register_script(_RELEASE_SCRIPT)
+
+    async def acquire(self, key: str, ttl_seconds: float) -> str | None:
+        token = uuid.uuid4().hex
+        acquired = await self.redis.set(self.key_prefix + key, token, nx=True, px=self._ttl_ms(ttl_seconds))
+        return token if acquired else None
+
+    async def extend(self, key: str, token: str, ttl_seconds: float) -> bool:
+        extended = await self._extend_script(keys=[self.key_prefix + key], args=[token, self._ttl_ms(ttl_seconds)])
+        return bool(extended)
+
+    async def release(self, key: str, token: str) -> None:
+        await self._release_script(keys=[self.key_prefix + key], args=[token])
+
+    @staticmethod
+    def _ttl_ms(ttl_seconds: float) -> int:
+        return max(1, int(ttl_seconds * 1000))
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from ...core import logger
+from ...core.constants import NotificationPriority
+
+Clock = Callable[[], float]
+Sleep = Callable[[float], Awaitable[None]]
+
+
+class TokenBucket:
+    """
+    Token bucket с резервированием.
+
+    ``reserve`` всегда забирает токен и возвращает, сколько секунд нужно подождать
+    до его появления. Баланс может уходить в минус: так конкурентные корутины
+    выстраиваются в очередь без lock-ов, каждая получает свой слот по времени.
+    """
+
+    __slots__ = ("_tokens", "_updated_at", "capacity", "rate")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def reserve(self, now: float) -> float:
+        self._refill(now)
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def try_take(self, now: float) -> bool:
+        """Забрать токен, только если он есть прямо сейчас."""
+        self._refill(now)
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def refund(self) -> None:
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class SendRateLimits:
+    global_rate: float
+    global_burst: int
+    per_chat_rate: float
+    per_chat_burst: int
+    max_tracked_chats: int = 10_000
+    min_global_rate: float = 1.0
+    # Сколько интерактивных отправок подряд может обойти ожидающую массовую.
+    interactive_weight: int = 10
+
+
+class SendScheduler:
+    """
+    Процессный планировщик отправок в Telegram.
+
+    Держит глобальный token bucket на весь бот и по одному бакету на чат.
+    После ``retry_after`` от Telegram глобально ставит отправку на паузу и
+    мультипликативно снижает глобальную скорость; затем скорость аддитивно
+    восстанавливается до настроенного потолка с каждой успешной отправкой.
+
+    Глобальные слоты раздаются по полосам :class:`NotificationPriority`: пока есть ожидающие
+    интерактивные отправки, они получают слот раньше массовых, но не больше ``interactive_weight``
+    подряд, чтобы рассылка не стояла совсем. Без очереди токен выдаётся сразу, без переключения задач.
+    """
+
+    def __init__(
+        self,
+        limits: SendRateLimits,
+        *,
+        clock: Clock = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._max_global_rate = limits.global_rate
+        self._min_global_rate = min(limits.min_global_rate, limits.global_rate)
+        self._recovery_step = limits.global_rate / 100
+        self._global = TokenBucket(limits.global_rate, limits.global_burst, clock())
+        self._per_chat_rate = limits.per_chat_rate
+        self._per_chat_burst = limits.per_chat_burst
+        self._max_tracked_chats = limits.max_tracked_chats
+        self._chats: OrderedDict[int, TokenBucket] = OrderedDict()
+        self._paused_until = 0.0
+        self._interactive_weight = limits.interactive_weight
+        self._waiters: dict[NotificationPriority, deque[asyncio.Future[None]]] = {
+            priority: deque() for priority in NotificationPriority
+        }
+        self._interactive_streak = 0
+        self._dispatcher: asyncio.Task[None] | None = None
+
+    @property
+    def global_rate(self) -> float:
+        return self._global.rate
+
+    @property
+    def tracked_chats(self) -> int:
+        return len(self._chats)
+
+    def _chat_bucket(self, chat_id: int, now: float) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is not None:
+            self._chats.move_to_end(chat_id)
+            return bucket
+
+        if len(self._chats) >= self._max_tracked_chats:
+            # LRU: давно не писавший чат почти наверняка уже восстановил свой бакет.
+            self._chats.popitem(last=False)
+        bucket = TokenBucket(self._per_chat_rate, self._per_chat_burst, now)
+        self._chats[chat_id] = bucket
+        return bucket
+
+    async def _wait_for_pause(self) -> None:
+        pause = self._paused_until - self._clock()
+        if pause > 0:
+            await self._sleep(pause)
+
+    async def acquire(self, chat_id: int, priority: NotificationPriority = NotificationPriority.INTERACTIVE) -> None:
+        """Дождаться слота для отправки одного сообщения в чат ``chat_id``."""
+        now = self._clock()
+        chat_wait = self._chat_bucket(chat_id, now).reserve(now)
+        if chat_wait > 0:
+            await self._sleep(chat_wait)
+
+        await self._wait_for_pause()
+        if not self._has_waiters() and self._global.try_take(self._clock()):
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_slots())
+        await waiter
+
+    def _has_waiters(self) -> bool:
+        return any(self._waiters.values())
+
+    def _next_waiter(self) -> asyncio.Future[None] | None:
+        """Следующий ожидающий по взвешенному приоритету; отменённые ожидания пропускаются."""
+        interactive, bulk = self._waiters[NotificationPriority.INTERACTIVE], self._waiters[NotificationPriority.BULK]
+        while interactive or bulk:
+            if interactive and (not bulk or self._interactive_streak < self._interactive_weight):
+                # Считаем только обгоны: без ожидающих массовых отправок счётчик не растёт.
+                self._interactive_streak = self._interactive_streak + 1 if bulk else 0
+                waiter = interactive.popleft()
+            else:
+                self._interactive_streak = 0
+                waiter = bulk.popleft()
+            if not waiter.done():
+                return waiter
+        return None
+
+    async def _dispatch_slots(self) -> None:
+        while self._has_waiters():
+            await self._wait_for_pause()
+            global_wait = self._global.reserve(self._clock())
+            if global_wait > 0:
+                await self._sleep(global_wait)
+            # retry_after мог прийти, пока ждали глобальный слот.
+            await self._wait_for_pause()
+
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._global.refund()
+                break
+            waiter.set_result(None)
+            # Даём получателю слота начать отправку до выдачи следующего.
+            await asyncio.sleep(0)
+
+    def on_success(self) -> None:
+        if self._global.rate < self._max_global_rate:
+            self._global.rate = min(self._max_global_rate, self._global.rate + self._recovery_step)
+
+    def on_retry_after(self, retry_after_seconds: float) -> None:
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + max(0.0, retry_after_seconds))
+        self._global.rate = max(self._min_global_rate, self._global.rate / 2)
+        logger.warning(
+            "Send scheduler paused after Telegram retry-after | retry_after={retry_after} global_rate={global_rate}",
+            retry_after=retry_after_seconds,
+            global_rate=round(self._global.rate, 2),
+        )
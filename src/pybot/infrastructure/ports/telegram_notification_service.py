@@ -21,6 +21,13 @@ from ...services.ports import NotificationPermanentError, NotificationPort, Noti
 from ...utils import telegram_user_link
 
 
+def _is_recipient_unreachable(exc: TelegramAPIError) -> bool:
+    """Бот заблокирован, аккаунт удалён или чат не существует: отправки этому получателю бесполезны."""
+    if isinstance(exc, TelegramForbiddenError | TelegramNotFound):
+        return True
+    return isinstance(exc, TelegramBadRequest) and "chat not found" in exc.message.lower()
+
+
 class TelegramNotificationService(NotificationPort):
     """Telegram implementation of :class:`NotificationPort`.
 
@@ -125,7 +132,10 @@ class TelegramNotificationService(NotificationPort):
                 user_id=user_id,
                 error=str(exc),
             )
-            raise NotificationPermanentError(message="Permanent Telegram delivery failure") from exc
+            raise NotificationPermanentError(
+                message="Permanent Telegram delivery failure",
+                recipient_unreachable=_is_recipient_unreachable(exc),
+            ) from exc
         except TelegramAPIError as exc:
             logger.warning(
                 "Telegram API error while sending message | user_id={user_id} error={error}",
@@ -140,3 +150,43 @@ class TelegramNotificationService(NotificationPort):
                 message_preview=cleaned_text[:120],
             )
             raise NotificationPermanentError(message="Unexpected notification delivery failure") from exc
+
+    async def edit_message(self, chat_id: int, message_id: int, text: str) -> None:
+        try:
+            await self.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text)
+        except TelegramRetryAfter as exc:
+            raise NotificationTemporaryError(
+                message="Telegram rate limit encountered",
+                retry_after_seconds=float(exc.retry_after),
+            ) from exc
+        except (TelegramNetworkError, TelegramServerError, RestartingTelegram) as exc:
+            raise NotificationTemporaryError(message="Temporary Telegram edit failure") from exc
+        except TelegramBadRequest as exc:
+            # Повторная публикация того же снимка прогресса не ошибка.
+            if "message is not modified" in exc.message.lower():
+                return
+            raise NotificationPermanentError(message="Telegram message edit failed") from exc
+        except TelegramAPIError as exc:
+            raise NotificationPermanentError(message="Telegram message edit failed") from exc
+
+    async def probe_recipient(self, user_id: int) -> None:
+        """Проверить доступность чата через ``sendChatAction``: сообщение пользователю не отправляется."""
+        try:
+            await self.bot.send_chat_action(chat_id=user_id, action="typing")
+        except TelegramRetryAfter as exc:
+            raise NotificationTemporaryError(
+                message="Telegram rate limit encountered",
+                retry_after_seconds=float(exc.retry_after),
+            ) from exc
+        except (TelegramNetworkError, TelegramServerError, RestartingTelegram) as exc:
+            raise NotificationTemporaryError(message="Temporary Telegram probe failure") from exc
+        except TelegramAPIError as exc:
+            logger.info(
+                "Telegram recipient probe failed | user_id={user_id} error={error}",
+                user_id=user_id,
+                error=str(exc),
+            )
+            raise NotificationPermanentError(
+                message="Telegram recipient probe failed",
+                recipient_unreachable=_is_recipient_unreachable(exc),
+            ) from exc
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+Clock = Callable[[], float]
+RateLimitKey = tuple[int, str]
+
+# GCRA в одном скрипте: проверка и сдвиг TAT атомарны для всех реплик. Время берётся у Redis,
+# чтобы расхождение часов реплик не влияло на лимит. Значения в микросекундах.
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000000 + tonumber(now_parts[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+if tat - now > tolerance then
+    return tat - now - tolerance
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil((new_tat - now) / 1000))
+return 0
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """Не больше ``rate`` событий за ``period_s`` секунд; все ``rate`` можно потратить сразу."""
+
+    rate: int
+    period_s: float
+
+    @property
+    def interval_s(self) -> float:
+        return self.period_s / self.rate
+
+    @property
+    def tolerance_s(self) -> float:
+        return self.period_s - self.interval_s
+
+
+class InMemoryRateLimitStore:
+    """
+    Процессный GCRA-лимитер с LRU-вытеснением.
+
+    Состояние ключа — одно число, теоретическое время следующего события (TAT), поэтому
+    пользователь стоит десятки байт, а не отдельный объект лимитера. Проверка синхронная.
+    Вытесненный ключ просто начинает с полного запаса, как новый пользователь.
+    """
+
+    def __init__(self, max_keys: int, *, clock: Clock = time.monotonic) -> None:
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tats: OrderedDict[RateLimitKey, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def hit(self, key: RateLimitKey, rule: RateLimitRule) -> float:
+        """Учесть событие; вернуть 0, если оно разрешено, иначе сколько секунд ждать."""
+        now = self._clock()
+        tat = max(self._tats.get(key, now), now)
+        retry_after = tat - now - rule.tolerance_s
+        if retry_after <= 0:
+            self._tats[key] = tat + rule.interval_s
+            retry_after = 0.0
+        self._tats.move_to_end(key)
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        return retry_after
+
+
+class RedisRateLimitStore:
+    """GCRA-лимитер в Redis: один скрипт на проверку, лимит общий для всех реплик бота."""
+
+    def __init__(self, redis: Redis, *, key_prefix: str = "pybot:rate-limit:") -> None:
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self._script = redis.register_script(_GCRA_SCRIPT)
+
+    async def hit(self, key: RateLimitKey, rule: RateLimitRule) -> float:
+        user_id, command_type = key
+        retry_after_us = await self._script(
+            keys=[f"{self.key_prefix}{command_type}:{user_id}"],
+            args=[math.ceil(rule.interval_s * 1_000_000), math.floor(rule.tolerance_s * 1_000_000)],
+        )
+        return int(retry_after_us) / 1_000_000
+
+    async def close(self) -> None:
+        await self.redis.aclose()
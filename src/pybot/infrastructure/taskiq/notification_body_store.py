@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import hashlib
+
+from redis.asyncio import Redis
+
+
+class NotificationBodyStore:
+    """
+    Тексты массовых уведомлений в Redis по ключу содержимого.
+
+    Задачи TaskIQ несут только ключ, поэтому текст, отправляемый тысячам получателей, хранится один раз.
+    Разовые тексты живут ``ttl_seconds``; тексты регулярных расписаний лежат в отдельном пространстве
+    ключей без срока жизни, чтобы разовая отправка того же текста не ограничила их TTL.
+    """
+
+    def __init__(self, redis: Redis, *, key_prefix: str = "pybot:notification:body:") -> None:
+        self.redis = redis
+        self.key_prefix = key_prefix
+
+    def key_for(self, text: str, *, recurring: bool) -> str:
+        digest = hashlib.sha256(text.encode()).hexdigest()[:32]
+        return f"{self.key_prefix}{'recurring:' if recurring else ''}{digest}"
+
+    async def put(self, text: str, *, ttl_seconds: int | None) -> str:
+        """Сохранить текст и вернуть его ключ; ``ttl_seconds=None`` означает регулярное расписание."""
+        key = self.key_for(text, recurring=ttl_seconds is None)
+        if ttl_seconds is None:
+            await self.redis.set(key, text)
+            return key
+
+        # Новый ключ создаётся с TTL, у существующего TTL только продлевается: одна пачка команд.
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, text, ex=ttl_seconds, nx=True)
+            pipe.expire(key, ttl_seconds, gt=True)
+            await pipe.execute()
+        return key
+
+    async def get(self, key: str) -> str | None:
+        value = await self.redis.get(key)
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
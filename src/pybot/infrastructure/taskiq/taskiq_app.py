@@ -5,10 +5,16 @@ from dataclasses import dataclass
 from dishka import AsyncContainer
 from dishka.integrations.taskiq import setup_dishka
 from taskiq import AsyncBroker, TaskiqEvents, TaskiqScheduler, TaskiqState
+from taskiq.schedule_sources import LabelScheduleSource
 from taskiq_redis import ListRedisScheduleSource, RedisStreamBroker
 
 from ...core import logger, settings
 from ...di.containers import setup_taskiq_container
+from ..metrics_snapshots import MetricsSnapshotWriter
+
+# Массовые задачи (рассылки, пачки уведомлений) идут отдельным stream-ом: очередь из тысяч
+# таких задач не задерживает интерактивные уведомления из основного stream-а.
+BULK_QUEUE_NAME = "taskiq:bulk"
 
 
 @dataclass(slots=True)
@@ -35,6 +41,10 @@ async def _on_worker_startup(_state: TaskiqState) -> None:
     container = setup_taskiq_container()
     setup_dishka(container=container, broker=_runtime_state.broker)
     _runtime_state.container = container
+    try:
+        await container.get(MetricsSnapshotWriter)
+    except Exception:
+        logger.exception("событие=экспорт_метрик_taskiq_worker status=failed")
     logger.info("событие=инициализация_taskiq_worker status=success")
 
 
@@ -54,7 +64,8 @@ def get_taskiq_broker() -> AsyncBroker:
     if _runtime_state.broker is not None:
         return _runtime_state.broker
 
-    broker = RedisStreamBroker(settings.redis_url)
+    # Воркер читает оба stream-а; задача попадает в массовый по метке ``queue_name``.
+    broker = RedisStreamBroker(settings.redis_url, additional_streams={BULK_QUEUE_NAME: ">"})
     broker.add_event_handler(TaskiqEvents.WORKER_STARTUP, _on_worker_startup)
     broker.add_event_handler(TaskiqEvents.WORKER_SHUTDOWN, _on_worker_shutdown)
 
@@ -72,11 +83,15 @@ def get_taskiq_schedule_source() -> ListRedisScheduleSource:
 
 
 def get_taskiq_scheduler() -> TaskiqScheduler:
-    """Вернуть singleton scheduler для отложенных и periodic задач."""
+    """
+    Вернуть singleton scheduler для отложенных и periodic задач.
+
+    Отложенные задачи приходят из Redis, periodic задачи объявлены меткой ``schedule`` в ``@broker.task``.
+    """
     if _runtime_state.scheduler is not None:
         return _runtime_state.scheduler
 
     broker = get_taskiq_broker()
     source = get_taskiq_schedule_source()
-    _runtime_state.scheduler = TaskiqScheduler(broker=broker, sources=[source])
+    _runtime_state.scheduler = TaskiqScheduler(broker=broker, sources=[source, LabelScheduleSource(broker)])
     return _runtime_state.scheduler
@@ -1,24 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
 from importlib import import_module
 from typing import TYPE_CHECKING, Any
 
+import pendulum
+
+from ...core.config import settings
 from ...core.constants import TaskScheduleKind
 from ...domain.exceptions import TaskScheduleUnknownKindError
-from ...dto import NotifyDTO
+from ...dto import BulkNotifyDTO, NotifyDTO
 from ...dto.value_objects import TaskSchedule
 from ...services.ports import NotificationDispatchPort
+from ...utils import normalize_message
+from .notification_body_store import NotificationBodyStore
 
 if TYPE_CHECKING:
     from taskiq_redis import ListRedisScheduleSource
 
 
 class TaskIQNotificationDispatcher(NotificationDispatchPort):
-    def __init__(self, schedule_source: ListRedisScheduleSource | None = None) -> None:
+    def __init__(
+        self,
+        body_store: NotificationBodyStore,
+        schedule_source: ListRedisScheduleSource | None = None,
+    ) -> None:
         if schedule_source is None:
             taskiq_app = import_module(".taskiq_app", package=__package__)
             schedule_source = taskiq_app.get_taskiq_schedule_source()
         self._schedule_source = schedule_source
+        self._body_store = body_store
 
     @staticmethod
     def _task() -> Any:
@@ -26,35 +38,81 @@ class TaskIQNotificationDispatcher(NotificationDispatchPort):
         notification_module = import_module(".tasks.notification", package=__package__)
         return notification_module.send_notification_task
 
+    @staticmethod
+    def _bulk_task() -> Any:
+        notification_module = import_module(".tasks.notification", package=__package__)
+        return notification_module.send_bulk_notification_task
+
     async def dispatch_message(self, user_id: int, message_text: str, schedule: TaskSchedule) -> str:
-        notification_task = self._task()
+        return await self._kick(self._task(), schedule, NotifyDTO(user_id=user_id, message=message_text))
+
+    async def dispatch_bulk(self, user_ids: Sequence[int], message_text: str, schedule: TaskSchedule) -> list[str]:
+        """
+        Сохранить текст один раз и поставить по задаче на каждые ``NOTIFICATION_BULK_CHUNK_SIZE`` получателей.
+
+        Порции ставятся в очередь параллельно через ``asyncio.gather``: по одному round trip в брокер
+        на порцию, а не на получателя. Брокер TaskIQ не принимает задачи через Redis pipeline.
+        """
+        if not user_ids:
+            return []
+
+        body_key = await self._body_store.put(
+            normalize_message(message_text), ttl_seconds=self._body_ttl_seconds(schedule)
+        )
+        chunk_size = settings.notification_bulk_chunk_size
+        bulk_task = self._bulk_task()
+        return list(
+            await asyncio.gather(
+                *(
+                    self._kick(
+                        bulk_task,
+                        schedule,
+                        BulkNotifyDTO(user_ids=list(user_ids[index : index + chunk_size]), body_key=body_key),
+                    )
+                    for index in range(0, len(user_ids), chunk_size)
+                )
+            )
+        )
+
+    @staticmethod
+    def _body_ttl_seconds(schedule: TaskSchedule) -> int | None:
+        match schedule.kind:
+            case TaskScheduleKind.IMMEDIATE:
+                return settings.notification_body_ttl_s
+            case TaskScheduleKind.AT:
+                delay = (schedule.as_taskiq_datetime() - pendulum.now("UTC")).total_seconds()
+                return settings.notification_body_ttl_s + max(int(delay), 0)
+            case _:
+                # Регулярное расписание читает текст при каждом срабатывании.
+                return None
 
+    async def _kick(self, task: Any, schedule: TaskSchedule, payload: NotifyDTO | BulkNotifyDTO) -> str:
         match schedule.kind:
             case TaskScheduleKind.IMMEDIATE:
-                result = await notification_task.kiq(NotifyDTO(user_id=user_id, message=message_text))
+                result = await task.kiq(payload)
                 return result.task_id
             case TaskScheduleKind.AT:
-                created = await notification_task.schedule_by_time(
+                created = await task.schedule_by_time(
                     self._schedule_source,
                     schedule.as_taskiq_datetime(),
-                    notification_data=NotifyDTO(user_id=user_id, message=message_text),
+                    notification_data=payload,
                 )
                 return created.schedule_id
             case TaskScheduleKind.INTERVAL:
-                created = await notification_task.schedule_by_interval(
+                created = await task.schedule_by_interval(
                     self._schedule_source,
                     schedule.as_interval(),
-                    notification_data=NotifyDTO(user_id=user_id, message=message_text),
+                    notification_data=payload,
                 )
                 return created.schedule_id
             case TaskScheduleKind.CRON:
                 created = await (
-                    notification_task.kicker()
+                    task.kicker()
                     .with_labels(cron_offset=schedule.as_timezone_name())
                     .schedule_by_cron(
                         self._schedule_source,
                         schedule.as_cron_expression(),
-                        notification_data=NotifyDTO(user_id=user_id, message=message_text),
+                        notification_data=payload,
                     )
                 )
                 return created.schedule_id
@@ -1,5 +1,20 @@
-from .broadcast import broadcast_for_all_task
+from .broadcast import (
+    broadcast_for_all_task,
+    broadcast_reprobe_unreachable_task,
+    broadcast_resume_unfinished_task,
+    broadcast_shard_task,
+)
+from .leaderboard import leaderboard_warm_previous_week_task
 from .system import system_ping_task
-from .notification import send_notification_task
+from .notification import send_bulk_notification_task, send_notification_task
 
-__all__ = ["broadcast_for_all_task", "system_ping_task", "send_notification_task"]
+__all__ = [
+    "broadcast_for_all_task",
+    "broadcast_reprobe_unreachable_task",
+    "broadcast_resume_unfinished_task",
+    "broadcast_shard_task",
+    "leaderboard_warm_previous_week_task",
+    "system_ping_task",
+    "send_bulk_notification_task",
+    "send_notification_task",
+]
@@ -1,36 +1,124 @@
 from __future__ import annotations
 
+from typing import cast
+
 from dishka.integrations.taskiq import FromDishka, inject
+from taskiq import AsyncTaskiqDecoratedTask
 
 from ....core import logger
-from ....dto import BroadcastDTO
+from ....core.config import settings
+from ....dto import BroadcastResult
 from ....services.broadcast import BroadcastService
-from ..taskiq_app import get_taskiq_broker
+from ....services.recipient_reachability import RecipientReachabilityService
+from ..taskiq_app import BULK_QUEUE_NAME, get_taskiq_broker
 
 broker = get_taskiq_broker()
 
 
-@broker.task(task_name="broadcast.send_for_all")
+def _result_payload(result: BroadcastResult) -> dict[str, int]:
+    return {
+        "attempted": result.attempted,
+        "sent": result.sent,
+        "failed_temporary": result.failed_temporary,
+        "failed_permanent": result.failed_permanent,
+        "skipped_invalid_user": result.skipped_invalid_user,
+    }
+
+
+@broker.task(task_name="broadcast.send_shard", queue_name=BULK_QUEUE_NAME)
+@inject(patch_module=True)
+async def broadcast_shard_task(
+    job_id: int,
+    service: FromDishka[BroadcastService],
+) -> dict[str, int]:
+    """Рассылка по одному шарду задания: диапазону ``users.id``, выделенному ``BroadcastService.shard_job``."""
+
+    result = await service.run_job(job_id)
+
+    payload = _result_payload(result)
+    logger.info("TaskIQ broadcast shard finished | job_id={job_id} payload={payload}", job_id=job_id, payload=payload)
+    return payload
+
+
+def _shard_task_handle() -> AsyncTaskiqDecoratedTask[[int], dict[str, int]]:
+    """``broadcast.send_shard`` так, как его видит вызывающий: FromDishka-параметры заполняет воркер."""
+    return cast("AsyncTaskiqDecoratedTask[[int], dict[str, int]]", broadcast_shard_task)
+
+
+@broker.task(task_name="broadcast.send_for_all", queue_name=BULK_QUEUE_NAME)
 @inject(patch_module=True)
 async def broadcast_for_all_task(
-    message: str,
+    job_id: int,
     service: FromDishka[BroadcastService],
 ) -> dict[str, int]:
     """
-    Отложенная массовая рассылка для всех пользователей.
+    Отложенная массовая рассылка по сохранённому заданию.
+
+    Задание создаётся через ``BroadcastService.create_job``. Задача выполняется в worker-процессе
+    через отдельный request-scope DI-контейнера; при повторной доставке после рестарта worker-а
+    рассылка продолжается с последней зафиксированной пачки.
 
-    Задача выполняется в worker-процессе и использует тот же сервисный слой,
-    что и aiogram-хендлеры, но через отдельный request-scope DI-контейнера.
+    При ``BROADCAST_SHARDS > 1`` задание делится на диапазоны ``users.id``, и каждый шард
+    ставится отдельной задачей ``broadcast.send_shard``, чтобы его подхватил свободный worker.
     """
 
-    result = await service.broadcast_for_all(BroadcastDTO(broadcast_message=message))
+    if settings.broadcast_shards > 1:
+        shard_ids = await service.shard_job(job_id, settings.broadcast_shards)
+        for shard_id in shard_ids:
+            await _shard_task_handle().kiq(shard_id)
+        logger.info(
+            "TaskIQ broadcast task fanned out | job_id={job_id} shards={shards}",
+            job_id=job_id,
+            shards=len(shard_ids),
+        )
+        return {"shards": len(shard_ids)}
 
-    payload = {
-        "attempted": result.attempted,
-        "sent": result.sent,
-        "failed_temporary": result.failed_temporary,
-        "failed_permanent": result.failed_permanent,
-        "skipped_invalid_user": result.skipped_invalid_user,
-    }
-    logger.info("TaskIQ broadcast task finished with payload={payload}", payload=payload)
+    result = await service.run_job(job_id)
+
+    payload = _result_payload(result)
+    logger.info("TaskIQ broadcast task finished | job_id={job_id} payload={payload}", job_id=job_id, payload=payload)
     return payload
+
+
+@broker.task(
+    task_name="broadcast.resume_unfinished",
+    queue_name=BULK_QUEUE_NAME,
+    schedule=[{"cron": settings.broadcast_resume_cron}],
+)
+@inject(patch_module=True)
+async def broadcast_resume_unfinished_task(
+    service: FromDishka[BroadcastService],
+) -> list[dict[str, int]]:
+    """
+    Периодически продолжать задания рассылки, прерванные рестартом bot- или worker-процесса.
+
+    Задание, аренду которого держит живой worker, пропускается; упавшее подхватывается
+    первым запуском после истечения ``BROADCAST_LOCK_TTL_S``.
+    """
+
+    results = await service.resume_unfinished_jobs()
+
+    payloads = [_result_payload(result) for result in results]
+    logger.info("TaskIQ broadcast resume finished | jobs={jobs_count}", jobs_count=len(payloads))
+    return payloads
+
+
+@broker.task(
+    task_name="broadcast.reprobe_unreachable",
+    queue_name=BULK_QUEUE_NAME,
+    schedule=[{"cron": settings.recipient_reprobe_cron}],
+)
+@inject(patch_module=True)
+async def broadcast_reprobe_unreachable_task(
+    service: FromDishka[RecipientReachabilityService],
+) -> dict[str, int]:
+    """Периодически проверять недоступных получателей и возвращать в аудиторию тех, кто снова доступен."""
+
+    result = await service.reprobe_unreachable()
+
+    return {
+        "probed": result.probed,
+        "restored": result.restored,
+        "still_unreachable": result.still_unreachable,
+        "inconclusive": result.inconclusive,
+    }
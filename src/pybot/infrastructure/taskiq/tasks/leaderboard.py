@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dishka.integrations.taskiq import FromDishka, inject
+
+from ....core import logger
+from ....core.config import settings
+from ....services.leaderboard import LeaderboardService
+from ..taskiq_app import get_taskiq_broker
+
+broker = get_taskiq_broker()
+
+# Понедельник 00:05 в BUSINESS_TZ: прошлая неделя только что закрылась, начисления на границе уже закоммичены.
+LEADERBOARD_WARM_CRON = "5 0 * * 1"
+
+
+@broker.task(
+    task_name="leaderboard.warm_previous_week",
+    schedule=[{"cron": LEADERBOARD_WARM_CRON, "cron_offset": settings.business_tz}],
+)
+@inject(patch_module=True)
+async def leaderboard_warm_previous_week_task(
+    service: FromDishka[LeaderboardService],
+) -> dict[str, int]:
+    """Закешировать лидерборд закрывшейся недели до первых ``/leaderboard`` в группах."""
+
+    rows = await service.warm_previous_week()
+    logger.info("TaskIQ leaderboard warm finished | rows={rows}", rows=rows)
+    return {"rows": rows}
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+from collections import Counter
+
 from dishka.integrations.taskiq import FromDishka, inject
 
 from ....core import logger
-from ....dto import NotificationTaskPayload, NotifyDTO
+from ....core.config import settings
+from ....core.constants import NotificationPriority
+from ....dto import BulkNotificationTaskPayload, BulkNotifyDTO, NotificationTaskPayload, NotifyDTO
+from ....dto.notify_dto import NotificationStatus
 from ....services.ports import NotificationPermanentError, NotificationPort, NotificationTemporaryError
-from ..taskiq_app import get_taskiq_broker
+from ..notification_body_store import NotificationBodyStore
+from ..taskiq_app import BULK_QUEUE_NAME, get_taskiq_broker
 
 broker = get_taskiq_broker()
 
@@ -32,3 +39,57 @@ async def send_notification_task(
         return NotificationTaskPayload(status="failed_permanent", user_id=user_id, message=message)
     else:
         return NotificationTaskPayload(status="sent", user_id=user_id, message=message)
+
+
+async def _send_one(notification_port: NotificationPort, notification_data: NotifyDTO) -> NotificationStatus:
+    try:
+        await notification_port.send_message(notification_data)
+    except NotificationTemporaryError:
+        return "failed_temporary"
+    except NotificationPermanentError:
+        return "failed_permanent"
+    return "sent"
+
+
+@broker.task(task_name="notification.send_bulk_notification_task", queue_name=BULK_QUEUE_NAME)
+@inject(patch_module=True)
+async def send_bulk_notification_task(
+    notification_data: BulkNotifyDTO,
+    *,
+    notification_port: FromDishka[NotificationPort],
+    body_store: FromDishka[NotificationBodyStore],
+) -> BulkNotificationTaskPayload:
+    """Отправить один текст порции получателей; текст читается из хранилища по ключу."""
+    user_ids, body_key = notification_data.user_ids, notification_data.body_key
+
+    message = await body_store.get(body_key)
+    if message is None:
+        logger.error(
+            "событие=массовое_уведомление status=body_missing body_key={body_key} recipients={recipients}",
+            body_key=body_key,
+            recipients=len(user_ids),
+        )
+        return BulkNotificationTaskPayload(failed_permanent=len(user_ids))
+
+    # Темп отправок задаёт notification port (общий планировщик), здесь только ограничение параллелизма.
+    semaphore = asyncio.Semaphore(settings.broadcast_max_concurrency)
+
+    async def send(user_id: int) -> NotificationStatus:
+        async with semaphore:
+            notification = NotifyDTO(user_id=user_id, message=message, priority=NotificationPriority.BULK)
+            return await _send_one(notification_port, notification)
+
+    statuses = Counter(await asyncio.gather(*(send(user_id) for user_id in user_ids)))
+    result = BulkNotificationTaskPayload(
+        sent=statuses["sent"],
+        failed_temporary=statuses["failed_temporary"],
+        failed_permanent=statuses["failed_permanent"],
+    )
+    logger.info(
+        "событие=массовое_уведомление status=done sent={sent} failed_temporary={failed_temporary} "
+        "failed_permanent={failed_permanent}",
+        sent=result.sent,
+        failed_temporary=result.failed_temporary,
+        failed_permanent=result.failed_permanent,
+    )
+    return result
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core import logger
+from .user_repository import UserRepository
+
+
+class UserActivityBuffer:
+    """
+    Write-behind буфер отметок активности пользователей.
+
+    ``record`` только запоминает время в памяти процесса (по одной, самой свежей отметке на пользователя)
+    и не трогает БД. Фоновая задача записывает накопленное одним UPDATE с ``executemany`` раз в
+    ``flush_interval_s`` или сразу, как только набралось ``max_pending`` пользователей. ``close``
+    останавливает задачу и записывает остаток: его вызывают при остановке бота.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        user_repository: UserRepository,
+        *,
+        flush_interval_s: float,
+        max_pending: int,
+    ) -> None:
+        self.session_maker = session_maker
+        self.user_repository = user_repository
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self._pending: dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, user_id: int, at: datetime) -> None:
+        previous = self._pending.get(user_id)
+        if previous is None or at > previous:
+            self._pending[user_id] = at
+        if self._closed:
+            return
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Записать накопленные отметки; возвращает число обновлённых пользователей."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                async with self.session_maker() as db:
+                    await self.user_repository.bulk_update_last_active(db, batch)
+                    await db.commit()
+            except BaseException:
+                # Пачка возвращается и при отмене задачи (CancelledError), иначе её потеряет close.
+                # Отметки, пришедшие во время записи, свежее возвращаемых.
+                for user_id, at in batch.items():
+                    self._pending.setdefault(user_id, at)
+                raise
+            return len(batch)
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        flushed = await self.flush()
+        logger.info("event=user_activity_flush phase=shutdown users={users}", users=flushed)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("event=user_activity_flush status=failed pending={pending}", pending=self.pending)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from ..core import logger
+from ..dto import UserContext
+
+Clock = Callable[[], float]
+
+# Переподписка после обрыва Redis: пауза удваивается от начальной до потолка.
+LISTENER_BACKOFF_INITIAL_S = 0.5
+LISTENER_BACKOFF_MAX_S = 30.0
+
+
+class UserContextCache:
+    """
+    Процессный LRU-кеш контекста пользователя (id и роли) по telegram_id с TTL.
+
+    Кешируется и отсутствие пользователя, чтобы апдейты незарегистрированных не ходили в БД.
+    Сервисы, меняющие роли или регистрирующие пользователя, вызывают ``invalidate`` после commit.
+    Роли по внутреннему id доступны, пока в кеше есть контекст этого пользователя.
+    """
+
+    def __init__(self, *, max_size: int, ttl_s: float, clock: Clock = time.monotonic) -> None:
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, UserContext | None]] = OrderedDict()
+        self._telegram_ids: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, telegram_id: int) -> tuple[bool, UserContext | None]:
+        """Вернуть ``(найдено, контекст)``; ``(True, None)`` означает закешированное отсутствие пользователя."""
+        entry = self._fresh_entry(telegram_id)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry[1]
+
+    def get_roles(self, user_id: int) -> frozenset[str] | None:
+        telegram_id = self._telegram_ids.get(user_id)
+        entry = self._fresh_entry(telegram_id) if telegram_id is not None else None
+        if entry is None or entry[1] is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1].roles
+
+    def put(self, telegram_id: int, context: UserContext | None) -> None:
+        self._drop(telegram_id)
+        self._entries[telegram_id] = (self._clock() + self.ttl_s, context)
+        if context is not None:
+            self._telegram_ids[context.user_id] = telegram_id
+        while len(self._entries) > self.max_size:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate(self, telegram_id: int) -> None:
+        self.invalidate_local(telegram_id)
+
+    def invalidate_local(self, telegram_id: int) -> None:
+        if self._drop(telegram_id):
+            self.invalidations += 1
+
+    def touch(self, telegram_id: int, context: UserContext) -> None:
+        """Заменить закешированный контекст, не продлевая TTL; отсутствующую запись не создаёт."""
+        entry = self._entries.get(telegram_id)
+        if entry is not None:
+            self._entries[telegram_id] = (entry[0], context)
+
+    def clear(self) -> None:
+        """Сбросить весь кеш: например, когда могли потеряться инвалидации."""
+        self._entries.clear()
+        self._telegram_ids.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    async def start(self) -> None:
+        """Процессному кешу запускать нечего; Redis-вариант подписывается на инвалидации."""
+
+    async def close(self) -> None:
+        logger.info(
+            "event=user_context_cache_close hits={hits} misses={misses} evictions={evictions} "
+            "invalidations={invalidations} size={size}",
+            **self.stats(),
+        )
+
+    def _fresh_entry(self, telegram_id: int) -> tuple[float, UserContext | None] | None:
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            self._drop(telegram_id)
+            return None
+        self._entries.move_to_end(telegram_id)
+        return entry
+
+    def _drop(self, telegram_id: int) -> bool:
+        entry = self._entries.pop(telegram_id, None)
+        if entry is None:
+            return False
+        if entry[1] is not None:
+            self._telegram_ids.pop(entry[1].user_id, None)
+        return True
+
+
+class RedisUserContextCache(UserContextCache):
+    """
+    :class:`UserContextCache`, который рассылает инвалидации через Redis pub/sub.
+
+    Данные по-прежнему лежат в памяти каждой реплики бота; через Redis передаются только telegram_id,
+    чтобы смена ролей на одной реплике сбрасывала кеш на всех. После обрыва соединения подписка
+    восстанавливается с нарастающей паузой, а локальный кеш очищается: пропущенные за это время
+    инвалидации уже не придут.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        max_size: int,
+        ttl_s: float,
+        channel: str = "pybot:user-context-cache:invalidate",
+        clock: Clock = time.monotonic,
+    ) -> None:
+        super().__init__(max_size=max_size, ttl_s=ttl_s, clock=clock)
+        self.redis = redis
+        self.channel = channel
+        self.reconnect_backoff_s = LISTENER_BACKOFF_INITIAL_S
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+    async def invalidate(self, telegram_id: int) -> None:
+        self.invalidate_local(telegram_id)
+        await self.redis.publish(self.channel, str(telegram_id))
+
+    async def start(self) -> None:
+        self._pubsub = await self._subscribe()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+        await self._close_pubsub()
+        await super().close()
+
+    async def _subscribe(self) -> PubSub:
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        return pubsub
+
+    async def _close_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.aclose()
+        except Exception:
+            logger.warning("event=user_context_cache_listener status=close_failed", exc_info=True)
+
+    async def _listen(self) -> None:
+        delay = self.reconnect_backoff_s
+        while True:
+            try:
+                pubsub = self._pubsub or await self._resubscribe()
+                delay = self.reconnect_backoff_s
+                await self._consume(pubsub)
+            except Exception:
+                logger.exception(
+                    "event=user_context_cache_listener status=disconnected retry_in={delay}s",
+                    delay=delay,
+                )
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LISTENER_BACKOFF_MAX_S)
+
+    async def _resubscribe(self) -> PubSub:
+        self._pubsub = await self._subscribe()
+        self.clear()
+        logger.info("event=user_context_cache_listener status=resubscribed")
+        return self._pubsub
+
+    async def _consume(self, pubsub: PubSub) -> None:
+        async for message in pubsub.listen():
+            self._handle_message(message)
+        raise ConnectionError("pub/sub stream ended")
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        if message["type"] != "message":
+            return
+        try:
+            self.invalidate_local(int(message["data"]))
+        except ValueError:
+            logger.warning("event=user_context_cache_invalidation status=malformed data={data}", data=message)
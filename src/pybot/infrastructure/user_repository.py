@@ -1,15 +1,22 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Mapping, Sequence
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import and_, or_, select, update
+from sqlalchemy import Select, and_, bindparam, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from ..db.models import Competence, Role, User, UserCompetence, UserLevel, UserRole
+from ..core.constants import PointsTypeEnum
+from ..db.models import Competence, Level, Role, User, UserCompetence, UserLevel, UserRole
 from ..domain.exceptions import UserNotFoundError, UsersNotFoundError
-from ..dto import UserCreateDTO
+from ..dto import BroadcastRecipient, PointsRecipientState, UserContext, UserCreateDTO
+from .user_context_cache import UserContextCache
 
 ACTIVITY_UPDATE_INTERVAL = timedelta(minutes=1)
+AUDIENCE_PAGE_SIZE = 500
+POINTS_COLUMNS = {
+    PointsTypeEnum.ACADEMIC: User.academic_points,
+    PointsTypeEnum.REPUTATION: User.reputation_points,
+}
 
 
 class UserRepository:
@@ -18,8 +25,13 @@ class UserRepository:
     БЕЗ хранения сессии внутри!
 
     Правильный подход: сессия передаётся в методы.
+    Единственное состояние — необязательный процессный :class:`UserContextCache` перед
+    горячими чтениями контекста и ролей.
     """
 
+    def __init__(self, cache: UserContextCache | None = None) -> None:
+        self.cache = cache
+
     async def get_by_id(
         self,
         db: AsyncSession,
@@ -94,6 +106,243 @@ class UserRepository:
 
         return users
 
+    async def iter_all_recipients(
+        self,
+        db: AsyncSession,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = AUDIENCE_PAGE_SIZE,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        """Стримит получателей среди всех пользователей страницами по ``page_size``."""
+        stmt = self._all_recipients_stmt()
+        async for page in self._iter_recipient_pages(
+            db, stmt, after_id=after_id, until_id=until_id, page_size=page_size
+        ):
+            yield page
+
+    async def iter_recipients_with_role(
+        self,
+        db: AsyncSession,
+        role_name: str,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = AUDIENCE_PAGE_SIZE,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        """Стримит получателей с ролью ``role_name`` страницами по ``page_size``."""
+        stmt = self._recipients_with_role_stmt(role_name)
+        async for page in self._iter_recipient_pages(
+            db, stmt, after_id=after_id, until_id=until_id, page_size=page_size
+        ):
+            yield page
+
+    async def iter_recipients_with_competence_id(
+        self,
+        db: AsyncSession,
+        competence_id: int,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = AUDIENCE_PAGE_SIZE,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        """Стримит получателей с компетенцией ``competence_id`` страницами по ``page_size``."""
+        stmt = self._recipients_with_competence_stmt(competence_id)
+        async for page in self._iter_recipient_pages(
+            db, stmt, after_id=after_id, until_id=until_id, page_size=page_size
+        ):
+            yield page
+
+    async def split_all_recipients(self, db: AsyncSession, shards: int) -> list[int]:
+        """Делит всех пользователей на ``shards`` равных по числу диапазонов ``users.id``."""
+        return await self._split_recipient_ranges(db, self._all_recipients_stmt(), shards)
+
+    async def split_recipients_with_role(self, db: AsyncSession, role_name: str, shards: int) -> list[int]:
+        """Делит пользователей с ролью ``role_name`` на ``shards`` диапазонов ``users.id``."""
+        return await self._split_recipient_ranges(db, self._recipients_with_role_stmt(role_name), shards)
+
+    async def split_recipients_with_competence_id(
+        self,
+        db: AsyncSession,
+        competence_id: int,
+        shards: int,
+    ) -> list[int]:
+        """Делит пользователей с компетенцией ``competence_id`` на ``shards`` диапазонов ``users.id``."""
+        return await self._split_recipient_ranges(db, self._recipients_with_competence_stmt(competence_id), shards)
+
+    async def count_all_recipients(self, db: AsyncSession, *, after_id: int = 0, until_id: int | None = None) -> int:
+        """Число получателей рассылки всем пользователям в диапазоне ``(after_id, until_id]``."""
+        return await self._count_recipients(db, self._all_recipients_stmt(), after_id=after_id, until_id=until_id)
+
+    async def count_recipients_with_role(
+        self,
+        db: AsyncSession,
+        role_name: str,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+    ) -> int:
+        stmt = self._recipients_with_role_stmt(role_name)
+        return await self._count_recipients(db, stmt, after_id=after_id, until_id=until_id)
+
+    async def count_recipients_with_competence_id(
+        self,
+        db: AsyncSession,
+        competence_id: int,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+    ) -> int:
+        stmt = self._recipients_with_competence_stmt(competence_id)
+        return await self._count_recipients(db, stmt, after_id=after_id, until_id=until_id)
+
+    @staticmethod
+    def _all_recipients_stmt() -> Select[tuple[int, int]]:
+        # Недоступные получатели исключаются из любой аудитории до успешной повторной проверки.
+        return select(User.id, User.telegram_id).where(User.unreachable_since.is_(None))
+
+    def _recipients_with_role_stmt(self, role_name: str) -> Select[tuple[int, int]]:
+        return (
+            self._all_recipients_stmt()
+            .join(UserRole, UserRole.user_id == User.id)
+            .join(Role, Role.id == UserRole.role_id)
+            .where(Role.name == role_name)
+        )
+
+    def _recipients_with_competence_stmt(self, competence_id: int) -> Select[tuple[int, int]]:
+        return (
+            self._all_recipients_stmt()
+            .join(UserCompetence, UserCompetence.user_id == User.id)
+            .where(UserCompetence.competence_id == competence_id)
+        )
+
+    async def mark_recipients_unreachable(self, db: AsyncSession, user_ids: Sequence[int]) -> None:
+        """Исключить пользователей из аудитории рассылок после постоянной ошибки доставки."""
+        if not user_ids:
+            return
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        stmt = (
+            update(User)
+            .where(User.id.in_(user_ids), User.unreachable_since.is_(None))
+            .values(unreachable_since=now, reachability_checked_at=now)
+        )
+        await db.execute(stmt)
+
+    async def find_unreachable_recipients(
+        self,
+        db: AsyncSession,
+        *,
+        checked_before: datetime,
+        limit: int,
+    ) -> list[BroadcastRecipient]:
+        """Недоступные получатели, которых не проверяли с ``checked_before``; давно проверенные идут первыми."""
+        stmt = (
+            select(User.id, User.telegram_id)
+            .where(User.unreachable_since.is_not(None), User.reachability_checked_at < checked_before)
+            .order_by(User.reachability_checked_at.asc(), User.id.asc())
+            .limit(limit)
+        )
+        rows = (await db.execute(stmt)).all()
+        return [BroadcastRecipient(user_id=user_id, telegram_id=telegram_id) for user_id, telegram_id in rows]
+
+    async def mark_recipients_reachable(self, db: AsyncSession, user_ids: Sequence[int]) -> None:
+        """Вернуть пользователей в аудиторию рассылок после успешной проверки."""
+        if not user_ids:
+            return
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        stmt = update(User).where(User.id.in_(user_ids)).values(unreachable_since=None, reachability_checked_at=now)
+        await db.execute(stmt)
+
+    async def touch_reachability_checked(self, db: AsyncSession, user_ids: Sequence[int]) -> None:
+        """Отложить следующую проверку получателей, доступность которых не подтвердилась."""
+        if not user_ids:
+            return
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        stmt = update(User).where(User.id.in_(user_ids)).values(reachability_checked_at=now)
+        await db.execute(stmt)
+
+    async def _split_recipient_ranges(
+        self,
+        db: AsyncSession,
+        stmt: Select[tuple[int, int]],
+        shards: int,
+    ) -> list[int]:
+        """
+        Возвращает верхние границы (включительно) диапазонов ``users.id`` одним запросом через ``ntile``.
+
+        Диапазоны идут подряд: шард ``i`` покрывает ``(bounds[i - 1], bounds[i]]``, первый начинается с 0.
+        Шардов может получиться меньше ``shards``, если пользователей меньше. Для пустой аудитории
+        поднимает UsersNotFoundError.
+        """
+        if shards < 1:
+            raise ValueError("shards must be greater than 0")
+
+        numbered = stmt.add_columns(func.ntile(shards).over(order_by=User.id).label("bucket")).subquery()
+        bounds_stmt = select(func.max(numbered.c.id)).group_by(numbered.c.bucket).order_by(numbered.c.bucket)
+        bounds = list((await db.execute(bounds_stmt)).scalars().all())
+        if not bounds:
+            raise UsersNotFoundError()
+        return bounds
+
+    async def _count_recipients(
+        self,
+        db: AsyncSession,
+        stmt: Select[tuple[int, int]],
+        *,
+        after_id: int,
+        until_id: int | None,
+    ) -> int:
+        stmt = stmt.where(User.id > after_id)
+        if until_id is not None:
+            stmt = stmt.where(User.id <= until_id)
+        count_stmt = select(func.count()).select_from(stmt.subquery())
+        return (await db.execute(count_stmt)).scalar_one()
+
+    async def _iter_recipient_pages(
+        self,
+        db: AsyncSession,
+        stmt: Select[tuple[int, int]],
+        *,
+        after_id: int,
+        until_id: int | None,
+        page_size: int,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        """
+        Keyset-пагинация аудитории: ``WHERE id > :last ORDER BY id LIMIT :page_size``.
+
+        ``until_id`` ограничивает диапазон сверху (включительно) для шардов рассылки.
+
+        В памяти держится только одна страница пар (id, telegram_id), поэтому
+        потребитель начинает работу сразу после первой страницы.
+        Если аудитория пуста с самого начала (``after_id == 0``), поднимает UsersNotFoundError;
+        при продолжении с курсора пустой остаток означает, что аудитория уже обработана.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be greater than 0")
+        if until_id is not None:
+            stmt = stmt.where(User.id <= until_id)
+
+        last_id = after_id
+        has_users = False
+        while True:
+            page_stmt = stmt.where(User.id > last_id).order_by(User.id.asc()).limit(page_size)
+            rows = (await db.execute(page_stmt)).all()
+            if not rows:
+                break
+
+            has_users = True
+            yield [BroadcastRecipient(user_id=user_id, telegram_id=telegram_id) for user_id, telegram_id in rows]
+
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1][0]
+
+        if not has_users and after_id == 0:
+            raise UsersNotFoundError()
+
     async def find_all_user_competencies(self, db: AsyncSession, user_id: int) -> Sequence[Competence]:
         stmt = (
             select(Competence)
@@ -120,11 +369,83 @@ class UserRepository:
 
         return users
 
+    async def find_user_ids_by_telegram_ids(self, db: AsyncSession, telegram_ids: Sequence[int]) -> dict[int, int]:
+        """Внутренние id зарегистрированных пользователей по telegram_id; незнакомые id пропускаются."""
+        if not telegram_ids:
+            return {}
+        stmt = select(User.telegram_id, User.id).where(User.telegram_id.in_(telegram_ids))
+        result = await db.execute(stmt)
+        return {telegram_id: user_id for telegram_id, user_id in result.all()}
+
+    async def find_user_ids_with_role(self, db: AsyncSession, role_name: str) -> list[int]:
+        stmt = (
+            select(User.id)
+            .join(UserRole, UserRole.user_id == User.id)
+            .join(Role, Role.id == UserRole.role_id)
+            .where(Role.name == role_name)
+            .order_by(User.id)
+        )
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def find_user_ids_with_competence_id(self, db: AsyncSession, competence_id: int) -> list[int]:
+        stmt = (
+            select(User.id)
+            .join(UserCompetence, UserCompetence.user_id == User.id)
+            .where(UserCompetence.competence_id == competence_id)
+            .order_by(User.id)
+        )
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
     async def find_all_user_roles_by_pk(self, db: AsyncSession, user_id: int) -> set[str]:
+        if self.cache is not None and (roles := self.cache.get_roles(user_id)) is not None:
+            return set(roles)
         stmt = select(Role.name).select_from(UserRole).join(Role).where(UserRole.user_id == user_id)
         result = await db.execute(stmt)
         return set(result.scalars().all())
 
+    async def load_user_context(self, db: AsyncSession, telegram_id: int) -> UserContext | None:
+        """Id, роли и время последней активности пользователя одним запросом (строка на каждую роль)."""
+        if self.cache is not None:
+            found, context = self.cache.lookup(telegram_id)
+            if found:
+                return context
+
+        context = await self._select_user_context(db, telegram_id)
+        if self.cache is not None:
+            self.cache.put(telegram_id, context)
+        return context
+
+    def touch_cached_user_context(self, context: UserContext) -> None:
+        """Обновить закешированный контекст (например, отметку активности), не продлевая его TTL."""
+        if self.cache is not None:
+            self.cache.touch(context.telegram_id, context)
+
+    async def invalidate_cached_user(self, telegram_id: int) -> None:
+        """Сбросить кеш пользователя; вызывается после commit, изменившего его роли или регистрацию."""
+        if self.cache is not None:
+            await self.cache.invalidate(telegram_id)
+
+    async def _select_user_context(self, db: AsyncSession, telegram_id: int) -> UserContext | None:
+        stmt = (
+            select(User.id, User.last_active_at, Role.name)
+            .outerjoin(UserRole, UserRole.user_id == User.id)
+            .outerjoin(Role, Role.id == UserRole.role_id)
+            .where(User.telegram_id == telegram_id)
+        )
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return None
+
+        user_id, last_active_at, _ = rows[0]
+        return UserContext(
+            user_id=user_id,
+            telegram_id=telegram_id,
+            roles=frozenset(role_name for _, _, role_name in rows if role_name is not None),
+            last_active_at=last_active_at,
+        )
+
     async def find_user_by_phone(
         self,
         db: AsyncSession,
@@ -193,23 +514,140 @@ class UserRepository:
         db: AsyncSession,
         user_id: int,
     ) -> Sequence[str]:
-        roles_stmt = select(Role.name).join(UserRole).where(UserRole.user_id == user_id)
+        if self.cache is not None and (roles := self.cache.get_roles(user_id)) is not None:
+            return sorted(roles)
+        roles_stmt = select(Role.name).join(UserRole).where(UserRole.user_id == user_id).order_by(Role.name)
         roles_result = await db.execute(roles_stmt)
         return roles_result.scalars().all()
 
-    async def update_user_last_active(
+    async def bulk_update_last_active(self, db: AsyncSession, activity: Mapping[int, datetime]) -> None:
+        """Записать отметки активности одним UPDATE с ``executemany``; время назад не сдвигается."""
+        if not activity:
+            return
+
+        # ORM bulk UPDATE по первичному ключу с общим WHERE на время: такой UPDATE не синхронизирует
+        # загруженные объекты, буфер пишет в собственной сессии.
+        stmt = (
+            update(User)
+            .where(or_(User.last_active_at.is_(None), User.last_active_at < bindparam("b_at")))
+            .execution_options(synchronize_session=None)
+        )
+        await db.execute(stmt, [{"id": user_id, "last_active_at": at, "b_at": at} for user_id, at in activity.items()])
+
+    async def find_points_recipients(
+        self,
+        db: AsyncSession,
+        user_ids: Sequence[int],
+        points_type: PointsTypeEnum,
+    ) -> list[PointsRecipientState]:
+        """
+        Баллы ``points_type`` и связь с уровнем этого типа для ``user_ids`` одним запросом.
+
+        Строки ``users`` блокируются до конца транзакции, чтобы параллельное начисление
+        не перезаписало результат. Роли, компетенции и прочие связи не загружаются.
+        """
+        if not user_ids:
+            return []
+
+        type_levels = (
+            select(UserLevel.id, UserLevel.user_id, UserLevel.level_id)
+            .join(Level, Level.id == UserLevel.level_id)
+            .where(Level.level_type == points_type)
+            .subquery()
+        )
+        stmt = (
+            select(User.id, User.telegram_id, POINTS_COLUMNS[points_type], type_levels.c.id, type_levels.c.level_id)
+            .outerjoin(type_levels, type_levels.c.user_id == User.id)
+            .where(User.id.in_(user_ids))
+            .order_by(User.id)
+            .with_for_update(of=User)
+        )
+        result = await db.execute(stmt)
+
+        states: dict[int, PointsRecipientState] = {}
+        for user_id, telegram_id, points, user_level_id, level_id in result.all():
+            states.setdefault(
+                user_id,
+                PointsRecipientState(
+                    user_id=user_id,
+                    telegram_id=telegram_id,
+                    points=points,
+                    user_level_id=user_level_id,
+                    level_id=level_id,
+                ),
+            )
+        return list(states.values())
+
+    async def add_points(
         self,
         db: AsyncSession,
         user_id: int,
-    ) -> None:
-        now = datetime.now(UTC).replace(tzinfo=None)
-        threshold = now - ACTIVITY_UPDATE_INTERVAL
+        points_type: PointsTypeEnum,
+        delta: int,
+    ) -> tuple[User, int]:
+        """
+        Атомарно прибавить ``delta`` к баллам ``points_type`` на стороне БД.
+
+        Обычный случай — один ``UPDATE ... SET points = points + :delta ... RETURNING`` без
+        предварительного чтения, поэтому параллельные начисления не теряют друг друга.
+        Если баллы ушли бы ниже нуля, строка блокируется и обнуляется: ``RETURNING`` не
+        отдаёт прежнее значение, а фактическое изменение тогда равно минус прежним баллам.
+        Возвращает пользователя без связей и фактическое изменение.
+        """
+        column = POINTS_COLUMNS[points_type]
+        stmt = (
+            update(User)
+            .where(User.id == user_id, column + delta >= 0)
+            .values({column.key: column + delta})
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        user = (await db.execute(stmt)).scalar_one_or_none()
+        if user is not None:
+            return user, delta
+
+        locked = select(column).where(User.id == user_id).with_for_update()
+        current = (await db.execute(locked)).scalar_one_or_none()
+        if current is None:
+            raise UserNotFoundError(user_id=user_id)
 
+        new_score = max(current + delta, 0)
         stmt = (
             update(User)
             .where(User.id == user_id)
-            .where(or_(User.last_active_at.is_(None), User.last_active_at < threshold))
-            .values(last_active_at=now)
+            .values({column.key: new_score})
+            .returning(User)
+            .execution_options(populate_existing=True)
         )
+        user = (await db.execute(stmt)).scalar_one()
+        return user, new_score - current
 
-        await db.execute(stmt)
+    async def bulk_set_points(self, db: AsyncSession, points_type: PointsTypeEnum, scores: Mapping[int, int]) -> None:
+        """Записать новые баллы ``points_type`` одним ORM bulk UPDATE по первичному ключу."""
+        if not scores:
+            return
+
+        column = POINTS_COLUMNS[points_type].key
+        await db.execute(update(User), [{"id": user_id, column: points} for user_id, points in scores.items()])
+
+    async def bulk_assign_levels(
+        self,
+        db: AsyncSession,
+        *,
+        moved: Mapping[int, int],
+        added: Mapping[int, int],
+    ) -> None:
+        """
+        Перевести пользователей на новые уровни без загрузки ORM-графа.
+
+        ``moved`` — ``user_levels.id`` -> новый ``level_id`` для существующих связей,
+        ``added`` — ``user_id`` -> ``level_id`` для пользователей без уровня этого типа.
+        """
+        if moved:
+            await db.execute(
+                update(UserLevel),
+                [{"id": link_id, "level_id": level_id} for link_id, level_id in moved.items()],
+            )
+        if added:
+            rows = [{"user_id": user_id, "level_id": level_id} for user_id, level_id in added.items()]
+            await db.execute(insert(UserLevel).values(rows))
@@ -1,11 +1,12 @@
 from collections.abc import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from ..core.constants import PointsTypeEnum
 from ..db.models import Valuation
+from ..dto.value_objects import Points
 
 
 class ValuationRepository:
@@ -34,3 +35,26 @@ class ValuationRepository:
 
         result = await db.execute(stmt)
         return result.scalars().all()
+
+    async def add_many(
+        self,
+        db: AsyncSession,
+        *,
+        recipient_ids: Sequence[int],
+        giver_id: int,
+        points: Points,
+        reason: str | None,
+    ) -> None:
+        """Записать одинаковую оценку многим получателям одним многострочным INSERT; время ставит БД."""
+        rows = [
+            {
+                "recipient_id": recipient_id,
+                "giver_id": giver_id,
+                "points": points.value,
+                "points_type": points.point_type,
+                "reason": reason,
+            }
+            for recipient_id in recipient_ids
+        ]
+        if rows:
+            await db.execute(insert(Valuation).values(rows))
@@ -1,4 +1,5 @@
 from ..db.models import Level
+from ..domain.services.level_calculator import LevelSnapshot
 from ..dto import LevelReadDTO
 from ..dto.value_objects import Points
 
@@ -12,3 +13,11 @@ async def map_orm_level_to_level_read_dto(orm_level: Level) -> LevelReadDTO:
         name=orm_level.name,
         required_points=Points(value=orm_level.required_points, point_type=orm_level.level_type),
     )
+
+
+async def map_level_snapshot_to_level_read_dto(level: LevelSnapshot) -> LevelReadDTO:
+    """Маппит уровень из каталога уровней в LevelReadDTO."""
+    return LevelReadDTO(
+        name=level.name,
+        required_points=Points(value=level.required_points, point_type=level.level_type),
+    )
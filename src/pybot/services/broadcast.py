@@ -2,50 +2,71 @@ from __future__ import annotations
 
 import asyncio
 import random
-from collections.abc import Sequence
+from collections.abc import AsyncIterator
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from tenacity import AsyncRetrying, RetryCallState, retry_if_exception_type, stop_after_attempt
 
 from ..core import logger
 from ..core.config import settings
-from ..db.models import User
-from ..domain.exceptions import BroadcastAlreadyRunningError
-from ..dto import BroadcastDTO, BroadcastResult, CompetenceBroadcastDTO, NotifyDTO, RoleBroadcastDTO
+from ..core.constants import (
+    BroadcastAudienceKind,
+    BroadcastDeliveryStatus,
+    BroadcastJobStatus,
+    NotificationPriority,
+)
+from ..db.models import BroadcastJob
+from ..domain.exceptions import BroadcastAlreadyRunningError, BroadcastLeaseLostError, UsersNotFoundError
+from ..dto import (
+    BroadcastDTO,
+    BroadcastRecipient,
+    BroadcastResult,
+    CompetenceBroadcastDTO,
+    NotifyDTO,
+    RoleBroadcastDTO,
+)
+from ..infrastructure.broadcast_job_repository import BroadcastJobRepository
 from ..infrastructure.user_repository import UserRepository
-from .ports import NotificationPermanentError, NotificationPort, NotificationTemporaryError
+from .broadcast_pipeline import BroadcastPipeline
+from .broadcast_progress import BroadcastProgressTracker, broadcast_progress_text
+from .ports import (
+    BroadcastLockPort,
+    NotificationError,
+    NotificationPermanentError,
+    NotificationPort,
+    NotificationTemporaryError,
+)
 
+BROADCAST_LOCK_KEY = "broadcast:running"
 
-class BroadcastService:
-    _broadcast_lock: asyncio.Lock | None = None
-    _broadcast_lock_loop: asyncio.AbstractEventLoop | None = None
 
+class BroadcastService:
     def __init__(
         self,
         db: AsyncSession,
         user_repository: UserRepository,
         notification_service: NotificationPort,
+        broadcast_job_repository: BroadcastJobRepository,
+        broadcast_lock: BroadcastLockPort,
     ) -> None:
         self.db = db
         self.user_repository = user_repository
         self.notification_service = notification_service
+        self.broadcast_job_repository = broadcast_job_repository
+        self.broadcast_lock = broadcast_lock
+
+    @staticmethod
+    def _lock_key(job: BroadcastJob) -> str:
+        # Обычные рассылки идут по одной за раз; шарды одного задания выполняются параллельно.
+        if job.parent_job_id is None:
+            return BROADCAST_LOCK_KEY
+        return f"broadcast:shard:{job.id}"
+
+    @staticmethod
+    def _retry_delay(attempt: int, error: NotificationTemporaryError) -> float:
+        if error.retry_after_seconds is not None:
+            return max(0.0, error.retry_after_seconds)
 
-    @classmethod
-    def _get_broadcast_lock(cls) -> asyncio.Lock:
-        running_loop = asyncio.get_running_loop()
-        if cls._broadcast_lock is None or cls._broadcast_lock_loop is not running_loop:
-            cls._broadcast_lock = asyncio.Lock()
-            cls._broadcast_lock_loop = running_loop
-        return cls._broadcast_lock
-
-    def _wait_for_retry(self, retry_state: RetryCallState) -> float:
-        outcome = retry_state.outcome
-        if outcome is not None:
-            exception = outcome.exception()
-            if isinstance(exception, NotificationTemporaryError) and exception.retry_after_seconds is not None:
-                return max(0.0, exception.retry_after_seconds)
-
-        exponential = min(float(settings.broadcast_retry_max_wait_s), float(2 ** (retry_state.attempt_number - 1)))
+        exponential = min(float(settings.broadcast_retry_max_wait_s), float(2 ** (attempt - 1)))
         jitter = random.uniform(0.0, 1.0)  # noqa: S311
         return min(float(settings.broadcast_retry_max_wait_s), exponential + jitter)
 
@@ -53,123 +74,405 @@ class BroadcastService:
         jitter_ms = random.randint(settings.broadcast_jitter_min_ms, settings.broadcast_jitter_max_ms)  # noqa: S311
         return (settings.broadcast_batch_pause_ms + jitter_ms) / 1000
 
-    async def _send_with_retry(self, user_id: int, message: str) -> None:
-        retrying = AsyncRetrying(
-            stop=stop_after_attempt(settings.broadcast_retry_attempts),
-            retry=retry_if_exception_type(NotificationTemporaryError),
-            wait=self._wait_for_retry,
-            reraise=True,
-        )
-        async for attempt in retrying:
-            with attempt:
-                await self.notification_service.send_message(NotifyDTO(message=message, user_id=user_id))
+    async def _batch_pause(self) -> None:
+        await asyncio.sleep(self._batch_pause_seconds())
 
-    async def _send_one_user(self, user_id: int, message: str, result: BroadcastResult) -> None:
-        result.attempted += 1
+    def _retry_or_give_up(
+        self,
+        user_id: int,
+        attempt: int,
+        error: NotificationTemporaryError,
+    ) -> BroadcastDeliveryStatus | float:
+        if attempt < settings.broadcast_retry_attempts:
+            return self._retry_delay(attempt, error)
+        logger.warning("Broadcast temporary delivery failure for user_id={user_id}", user_id=user_id)
+        return BroadcastDeliveryStatus.FAILED_TEMPORARY
+
+    async def _send_one_user(self, user_id: int, message: str, attempt: int) -> BroadcastDeliveryStatus | float:
+        """Одна попытка доставки: итоговый статус или задержка до повторной попытки."""
         if user_id <= 0:
-            result.skipped_invalid_user += 1
             logger.warning("Broadcast skipped invalid telegram user id: {user_id}", user_id=user_id)
-            return
+            return BroadcastDeliveryStatus.SKIPPED_INVALID
 
         try:
-            await self._send_with_retry(user_id=user_id, message=message)
-        except NotificationTemporaryError:
-            result.failed_temporary += 1
-            logger.warning("Broadcast temporary delivery failure for user_id={user_id}", user_id=user_id)
-        except NotificationPermanentError:
-            result.failed_permanent += 1
+            await self.notification_service.send_message(
+                NotifyDTO(message=message, user_id=user_id, priority=NotificationPriority.BULK)
+            )
+        except NotificationTemporaryError as exc:
+            return self._retry_or_give_up(user_id, attempt, exc)
+        except NotificationPermanentError as exc:
+            if exc.recipient_unreachable:
+                logger.warning("Broadcast recipient unreachable: user_id={user_id}", user_id=user_id)
+                return BroadcastDeliveryStatus.RECIPIENT_UNREACHABLE
             logger.warning("Broadcast permanent delivery failure for user_id={user_id}", user_id=user_id)
+            return BroadcastDeliveryStatus.FAILED_PERMANENT
         except Exception:
-            result.failed_permanent += 1
             logger.exception("Broadcast unexpected delivery failure for user_id={user_id}", user_id=user_id)
+            return BroadcastDeliveryStatus.FAILED_PERMANENT
         else:
-            result.sent += 1
+            return BroadcastDeliveryStatus.SENT
 
-    async def _send_batch(self, users: Sequence[User], message: str, result: BroadcastResult) -> None:
-        semaphore = asyncio.Semaphore(settings.broadcast_max_concurrency)
+    @staticmethod
+    def _count_delivery(result: BroadcastResult, status: BroadcastDeliveryStatus) -> None:
+        result.attempted += 1
+        match status:
+            case BroadcastDeliveryStatus.SENT:
+                result.sent += 1
+            case BroadcastDeliveryStatus.FAILED_TEMPORARY:
+                result.failed_temporary += 1
+            case BroadcastDeliveryStatus.SKIPPED_INVALID:
+                result.skipped_invalid_user += 1
+            case _:
+                result.failed_permanent += 1
 
-        async def worker(user: User) -> None:
-            async with semaphore:
-                await self._send_one_user(user.telegram_id, message, result)
+    async def _skip_already_recorded(
+        self,
+        job_id: int,
+        audience: AsyncIterator[list[BroadcastRecipient]],
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        """Убрать из страниц аудитории тех, чей итог уже записан в журнал задания."""
+        async for page in audience:
+            recorded_user_ids = await self.broadcast_job_repository.find_recorded_user_ids(
+                self.db,
+                job_id,
+                [recipient.user_id for recipient in page],
+            )
+            yield [recipient for recipient in page if recipient.user_id not in recorded_user_ids]
 
-        worker_tasks = [worker(user) for user in users]
-        outcomes = await asyncio.gather(*worker_tasks, return_exceptions=True)
-        for outcome in outcomes:
-            if isinstance(outcome, Exception):
-                logger.exception("Broadcast worker failed outside guarded flow: {error}", error=str(outcome))
+    def _job_audience(self, job: BroadcastJob) -> AsyncIterator[list[BroadcastRecipient]]:
+        page_size = settings.broadcast_audience_page_size
+        match job.audience_kind:
+            case BroadcastAudienceKind.ALL:
+                audience = self.user_repository.iter_all_recipients(
+                    self.db,
+                    after_id=job.last_user_id,
+                    until_id=job.range_end_id,
+                    page_size=page_size,
+                )
+            case BroadcastAudienceKind.ROLE if job.audience_role_name is not None:
+                audience = self.user_repository.iter_recipients_with_role(
+                    self.db,
+                    job.audience_role_name,
+                    after_id=job.last_user_id,
+                    until_id=job.range_end_id,
+                    page_size=page_size,
+                )
+            case BroadcastAudienceKind.COMPETENCE if job.audience_competence_id is not None:
+                audience = self.user_repository.iter_recipients_with_competence_id(
+                    self.db,
+                    job.audience_competence_id,
+                    after_id=job.last_user_id,
+                    until_id=job.range_end_id,
+                    page_size=page_size,
+                )
+            case _:
+                raise ValueError(f"Broadcast job {job.id} has incomplete audience: {job.audience_kind}")
 
-    async def _broadcast_users(self, users: Sequence[User], message: str) -> BroadcastResult:
-        result = BroadcastResult()
-        bulk_size = settings.broadcast_bulk_size
+        if job.is_resumed:
+            return self._skip_already_recorded(job.id, audience)
+        return audience
 
-        for index in range(0, len(users), bulk_size):
-            batch_users = users[index : index + bulk_size]
-            await self._send_batch(batch_users, message, result)
-            if index + bulk_size < len(users):
-                await asyncio.sleep(self._batch_pause_seconds())
+    @staticmethod
+    def _describe_audience(job: BroadcastJob) -> str:
+        match job.audience_kind:
+            case BroadcastAudienceKind.ROLE:
+                return f"role={job.audience_role_name}"
+            case BroadcastAudienceKind.COMPETENCE:
+                return f"competence_id={job.audience_competence_id}"
+            case _:
+                return "all"
 
-        return result
+    async def _split_audience(self, job: BroadcastJob, shards: int) -> list[int]:
+        match job.audience_kind:
+            case BroadcastAudienceKind.ALL:
+                return await self.user_repository.split_all_recipients(self.db, shards)
+            case BroadcastAudienceKind.ROLE if job.audience_role_name is not None:
+                return await self.user_repository.split_recipients_with_role(self.db, job.audience_role_name, shards)
+            case BroadcastAudienceKind.COMPETENCE if job.audience_competence_id is not None:
+                return await self.user_repository.split_recipients_with_competence_id(
+                    self.db,
+                    job.audience_competence_id,
+                    shards,
+                )
+            case _:
+                raise ValueError(f"Broadcast job {job.id} has incomplete audience: {job.audience_kind}")
+
+    async def _count_audience(self, job: BroadcastJob) -> int:
+        bounds = {"after_id": job.last_user_id, "until_id": job.range_end_id}
+        match job.audience_kind:
+            case BroadcastAudienceKind.ALL:
+                return await self.user_repository.count_all_recipients(self.db, **bounds)
+            case BroadcastAudienceKind.ROLE if job.audience_role_name is not None:
+                return await self.user_repository.count_recipients_with_role(
+                    self.db,
+                    job.audience_role_name,
+                    **bounds,
+                )
+            case BroadcastAudienceKind.COMPETENCE if job.audience_competence_id is not None:
+                return await self.user_repository.count_recipients_with_competence_id(
+                    self.db,
+                    job.audience_competence_id,
+                    **bounds,
+                )
+            case _:
+                raise ValueError(f"Broadcast job {job.id} has incomplete audience: {job.audience_kind}")
 
-    async def _run_broadcast(
+    async def _publish_progress(self, job: BroadcastJob, tracker: BroadcastProgressTracker) -> None:
+        """Сохранить снимок прогресса и обновить статус-сообщение администратора, если оно есть."""
+        progress = tracker.publish()
+        await self.db.commit()
+        if job.status_chat_id is None or job.status_message_id is None:
+            return
+
+        try:
+            await self.notification_service.edit_message(
+                job.status_chat_id,
+                job.status_message_id,
+                broadcast_progress_text(progress),
+            )
+        except NotificationError:
+            # Статус-сообщение вспомогательное: его сбой не должен останавливать рассылку.
+            logger.warning("Broadcast status message update failed | job_id={job_id}", job_id=job.id)
+
+    async def _broadcast_users(
         self,
-        users: Sequence[User],
-        message: str,
-        *,
-        summary_message: str,
-        summary_context: dict[str, str | int],
+        job: BroadcastJob,
+        audience: AsyncIterator[list[BroadcastRecipient]],
+        lock_key: str,
+        lease_token: str,
+        tracker: BroadcastProgressTracker,
     ) -> BroadcastResult:
-        broadcast_lock = self._get_broadcast_lock()
-        if broadcast_lock.locked():
+        result = job.to_result()
+
+        async def attempt(recipient: BroadcastRecipient, attempt_number: int) -> BroadcastDeliveryStatus | float:
+            return await self._send_one_user(recipient.telegram_id, job.message, attempt_number)
+
+        async def flush(
+            completed: list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]],
+            last_user_id: int | None,
+        ) -> None:
+            # Журнал, счётчики и курсор фиксируются одной транзакцией: рестарт теряет максимум одну пачку.
+            for _, status in completed:
+                self._count_delivery(result, status)
+            await self.broadcast_job_repository.add_deliveries(
+                self.db,
+                job.id,
+                [(recipient.user_id, status) for recipient, status in completed],
+            )
+            await self.user_repository.mark_recipients_unreachable(
+                self.db,
+                [
+                    recipient.user_id
+                    for recipient, status in completed
+                    if status is BroadcastDeliveryStatus.RECIPIENT_UNREACHABLE
+                ],
+            )
+            job.checkpoint(last_user_id=last_user_id or job.last_user_id, result=result)
+            tracker.record(result)
+            if tracker.is_due():
+                await self._publish_progress(job, tracker)
+            else:
+                await self.db.commit()
+
+            if not await self.broadcast_lock.extend(lock_key, lease_token, settings.broadcast_lock_ttl_s):
+                raise BroadcastLeaseLostError(f"Broadcast lease lost | job_id={job.id}")
+
+        pipeline = BroadcastPipeline(
+            attempt,
+            workers=settings.broadcast_max_concurrency,
+            # Половина окна может ждать повторной попытки, не оставляя worker-ов без работы.
+            window=settings.broadcast_bulk_size * 2,
+            flush_size=settings.broadcast_bulk_size,
+            timings=tracker.observe,
+        )
+        # С общим планировщиком отправок темп задают token bucket-ы, фиксированная пауза не нужна.
+        pause = None if settings.notification_pacing_enabled else self._batch_pause
+        await pipeline.run(audience, flush, pause)
+        return result
+
+    async def _collect_parent(self, parent_job_id: int) -> None:
+        """Обновить счётчики родительского задания; последний завершившийся шард завершает родителя."""
+        parent = await self.broadcast_job_repository.get_by_id(self.db, parent_job_id)
+        parent.collect_shards(await self.broadcast_job_repository.find_shards(self.db, parent_job_id))
+        await self.db.commit()
+
+    async def _run_job(self, job: BroadcastJob) -> BroadcastResult:
+        lock_key = self._lock_key(job)
+        lease_token = await self.broadcast_lock.acquire(lock_key, settings.broadcast_lock_ttl_s)
+        if lease_token is None:
             raise BroadcastAlreadyRunningError("Broadcast is already running")
 
-        async with broadcast_lock:
-            result = await self._broadcast_users(users, message)
-            logger.info(
-                summary_message,
-                attempted=result.attempted,
-                sent=result.sent,
-                failed_temporary=result.failed_temporary,
-                failed_permanent=result.failed_permanent,
-                skipped_invalid=result.skipped_invalid_user,
-                **summary_context,
+        try:
+            # Пока аренда была у другого worker-а, задание могло продвинуться или завершиться.
+            await self.db.refresh(job)
+            if job.is_finished:
+                return job.to_result()
+
+            if job.is_resumed:
+                logger.info(
+                    "Broadcast job resumed | job_id={job_id} last_user_id={last_user_id} sent={sent}",
+                    job_id=job.id,
+                    last_user_id=job.last_user_id,
+                    sent=job.sent,
+                )
+            if job.total_recipients is None:
+                job.total_recipients = job.attempted + await self._count_audience(job)
+            audience = self._job_audience(job)
+            job.start()
+            await self.db.commit()
+            tracker = BroadcastProgressTracker(job, clock=asyncio.get_running_loop().time)
+
+            try:
+                result = await self._broadcast_users(job, audience, lock_key, lease_token, tracker)
+            except UsersNotFoundError:
+                job.fail()
+                await self._publish_progress(job, tracker)
+                if job.parent_job_id is not None:
+                    await self._collect_parent(job.parent_job_id)
+                raise
+
+            job.complete()
+            await self._publish_progress(job, tracker)
+            if job.parent_job_id is not None:
+                await self._collect_parent(job.parent_job_id)
+        finally:
+            await self.broadcast_lock.release(lock_key, lease_token)
+
+        logger.info(
+            "Broadcast finished | job_id={job_id} audience={audience} attempted={attempted} sent={sent} "
+            "failed_temporary={failed_temporary} "
+            "failed_permanent={failed_permanent} skipped_invalid={skipped_invalid}",
+            job_id=job.id,
+            audience=self._describe_audience(job),
+            attempted=result.attempted,
+            sent=result.sent,
+            failed_temporary=result.failed_temporary,
+            failed_permanent=result.failed_permanent,
+            skipped_invalid=result.skipped_invalid_user,
+        )
+        return result
+
+    async def create_job(self, broadcast_data: BroadcastDTO) -> int:
+        """Сохранить задание рассылки для последующего запуска через :meth:`run_job`."""
+        if isinstance(broadcast_data, RoleBroadcastDTO):
+            job = await self.broadcast_job_repository.create_job(
+                self.db,
+                message=broadcast_data.message,
+                audience_kind=BroadcastAudienceKind.ROLE,
+                role_name=broadcast_data.role_name,
             )
-            return result
+        elif isinstance(broadcast_data, CompetenceBroadcastDTO):
+            job = await self.broadcast_job_repository.create_job(
+                self.db,
+                message=broadcast_data.message,
+                audience_kind=BroadcastAudienceKind.COMPETENCE,
+                competence_id=broadcast_data.competence_id,
+            )
+        else:
+            job = await self.broadcast_job_repository.create_job(
+                self.db,
+                message=broadcast_data.message,
+                audience_kind=BroadcastAudienceKind.ALL,
+            )
+        job.status_chat_id = broadcast_data.status_chat_id
+        job.status_message_id = broadcast_data.status_message_id
+        await self.db.commit()
+        return job.id
 
-    async def broadcast_for_all(self, broadcast_data: BroadcastDTO) -> BroadcastResult:
-        users = await self.user_repository.get_all_users(self.db)
-        return await self._run_broadcast(
-            users,
-            broadcast_data.message,
-            summary_message=(
-                "Broadcast finished for all users | attempted={attempted} sent={sent} "
-                "failed_temporary={failed_temporary} "
-                "failed_permanent={failed_permanent} skipped_invalid={skipped_invalid}"
-            ),
-            summary_context={},
+    async def run_job(self, job_id: int) -> BroadcastResult:
+        """
+        Запустить или продолжить сохранённое задание рассылки.
+
+        Завершённое задание не отправляется повторно: возвращаются его итоговые счётчики.
+        """
+        job = await self.broadcast_job_repository.get_by_id(self.db, job_id)
+        if job.status is BroadcastJobStatus.COMPLETED or job.is_sharded:
+            return job.to_result()
+        return await self._run_job(job)
+
+    async def shard_job(self, job_id: int, shards: int) -> list[int]:
+        """
+        Разделить задание на шарды по диапазонам ``users.id`` и вернуть их идентификаторы.
+
+        Диапазоны равны по числу получателей. Повторный вызов (например, при повторной доставке
+        TaskIQ-задачи) возвращает уже созданные шарды. Каждый шард запускается через :meth:`run_job`.
+        """
+        job = await self.broadcast_job_repository.get_by_id(self.db, job_id)
+        if job.is_sharded:
+            return [shard.id for shard in await self.broadcast_job_repository.find_shards(self.db, job_id)]
+
+        try:
+            bounds = await self._split_audience(job, shards)
+        except UsersNotFoundError:
+            job.fail()
+            await self.db.commit()
+            raise
+
+        shard_ids: list[int] = []
+        after_id = job.last_user_id
+        for until_id in bounds:
+            if until_id <= after_id:
+                continue
+            shard = await self.broadcast_job_repository.create_shard(
+                self.db,
+                job,
+                after_id=after_id,
+                until_id=until_id,
+            )
+            shard_ids.append(shard.id)
+            after_id = until_id
+        job.split(len(shard_ids))
+        await self.db.commit()
+        logger.info(
+            "Broadcast job sharded | job_id={job_id} audience={audience} shards={shards}",
+            job_id=job.id,
+            audience=self._describe_audience(job),
+            shards=len(shard_ids),
         )
+        return shard_ids
+
+    async def resume_unfinished_jobs(self) -> list[BroadcastResult]:
+        """Продолжить все задания, прерванные рестартом процесса."""
+        jobs = await self.broadcast_job_repository.find_unfinished_jobs(self.db)
+        results: list[BroadcastResult] = []
+        for job in jobs:
+            # Родитель шардов сам не отправляет: его завершат возобновлённые шарды.
+            if job.is_sharded:
+                continue
+            try:
+                results.append(await self._run_job(job))
+            except BroadcastAlreadyRunningError:
+                # Задание ведёт другой worker или аренда упавшего ещё не истекла: следующий запуск подхватит его.
+                logger.info("Broadcast job skipped on resume: lease is held | job_id={job_id}", job_id=job.id)
+            except UsersNotFoundError:
+                logger.warning("Broadcast job skipped on resume: audience is empty | job_id={job_id}", job_id=job.id)
+        return results
+
+    async def _create_and_run_job(self, broadcast_data: BroadcastDTO) -> BroadcastResult:
+        """
+        Создать задание и сразу выполнить его.
+
+        Если аренду держит другая рассылка, вызывающему отвечают отказом, а задание помечается FAILED,
+        чтобы :meth:`resume_unfinished_jobs` не отправил его позже.
+        """
+        job_id = await self.create_job(broadcast_data)
+        try:
+            return await self.run_job(job_id)
+        except BroadcastLeaseLostError:
+            # Задание уже начато: оно остаётся незавершённым и будет продолжено.
+            raise
+        except BroadcastAlreadyRunningError:
+            job = await self.broadcast_job_repository.get_by_id(self.db, job_id)
+            job.fail()
+            await self.db.commit()
+            logger.info("Broadcast job rejected: another broadcast is running | job_id={job_id}", job_id=job_id)
+            raise
+
+    async def broadcast_for_all(self, broadcast_data: BroadcastDTO) -> BroadcastResult:
+        return await self._create_and_run_job(broadcast_data)
 
     async def broadcast_for_users_with_role(self, broadcast_data: RoleBroadcastDTO) -> BroadcastResult:
-        users = await self.user_repository.get_all_users_with_role(self.db, broadcast_data.role_name)
-        return await self._run_broadcast(
-            users,
-            broadcast_data.message,
-            summary_message=(
-                "Broadcast finished for role={role_name} | attempted={attempted} sent={sent} "
-                "failed_temporary={failed_temporary} "
-                "failed_permanent={failed_permanent} skipped_invalid={skipped_invalid}"
-            ),
-            summary_context={"role_name": broadcast_data.role_name},
-        )
+        return await self._create_and_run_job(broadcast_data)
 
     async def broadcast_for_users_with_competence(self, broadcast_data: CompetenceBroadcastDTO) -> BroadcastResult:
-        users = await self.user_repository.get_all_users_with_competence_id(self.db, broadcast_data.competence_id)
-        return await self._run_broadcast(
-            users,
-            broadcast_data.message,
-            summary_message=(
-                "Broadcast finished for competence_id={competence_id} | attempted={attempted} sent={sent} "
-                "failed_temporary={failed_temporary} "
-                "failed_permanent={failed_permanent} skipped_invalid={skipped_invalid}"
-            ),
-            summary_context={"competence_id": broadcast_data.competence_id},
-        )
+        return await self._create_and_run_job(broadcast_data)
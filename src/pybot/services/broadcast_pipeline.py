@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from ..core import logger
+from ..core.constants import BroadcastDeliveryStatus
+from ..core.metrics import metrics
+from ..dto import BroadcastRecipient
+
+# Одна попытка доставки: итоговый статус или задержка в секундах до повторной попытки.
+DeliveryAttempt = Callable[[BroadcastRecipient, int], Awaitable[BroadcastDeliveryStatus | float]]
+# Сохранение завершённых доставок и нового курсора (``None``, если курсор не сдвинулся).
+DeliveryFlush = Callable[[list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]], int | None], Awaitable[None]]
+ProducerPause = Callable[[], Awaitable[None]]
+# Наблюдатель длительностей: этап (queue_wait, send, retry_wait, delivery) и секунды.
+TimingObserver = Callable[[str, float], None]
+
+
+@dataclass(slots=True)
+class _QueuedDelivery:
+    seq: int
+    recipient: BroadcastRecipient
+    enqueued_at: float
+    # Когда получатель встал в очередь на текущую попытку: при повторе это момент ошибки.
+    waiting_since: float
+    attempt: int = 1
+
+
+class BroadcastPipeline:
+    """
+    Конвейер отправки рассылки без блокировки «головы очереди».
+
+    Producer читает аудиторию в очередь, пул из ``workers`` долгоживущих задач отправляет сообщения.
+    Временная ошибка не держит worker: получатель возвращается в очередь, когда наступит срок
+    повторной попытки. Не больше ``window`` получателей могут быть взяты в работу, но ещё не записаны
+    через ``flush``: это ограничивает и память, и число повторных отправок после падения процесса.
+    """
+
+    def __init__(
+        self,
+        attempt: DeliveryAttempt,
+        *,
+        workers: int,
+        window: int,
+        flush_size: int,
+        timings: TimingObserver | None = None,
+    ) -> None:
+        self.attempt = attempt
+        self.workers = workers
+        self.window = max(window, workers, flush_size)
+        self.flush_size = flush_size
+        self.timings = timings
+
+    async def run(
+        self,
+        audience: AsyncIterator[list[BroadcastRecipient]],
+        flush: DeliveryFlush,
+        pause: ProducerPause | None = None,
+    ) -> None:
+        """
+        Доставить сообщение всей аудитории.
+
+        ``flush`` вызывается после каждых ``flush_size`` завершённых доставок и в конце. ``pause``,
+        если задан, вызывается producer-ом между порциями по ``flush_size`` получателей.
+        Чтение аудитории и ``flush`` не пересекаются, поэтому могут работать с одной сессией БД.
+        """
+        await _PipelineRun(self, audience, flush, pause).execute()
+
+
+class _PipelineRun:
+    """Состояние одного прогона :class:`BroadcastPipeline`."""
+
+    def __init__(
+        self,
+        pipeline: BroadcastPipeline,
+        audience: AsyncIterator[list[BroadcastRecipient]],
+        flush: DeliveryFlush,
+        pause: ProducerPause | None,
+    ) -> None:
+        self.pipeline = pipeline
+        self.audience = audience
+        self.flush = flush
+        self.pause = pause
+        self.ready: asyncio.Queue[_QueuedDelivery] = asyncio.Queue()
+        # ``None`` означает, что producer исчерпал аудиторию или упал.
+        self.finished: asyncio.Queue[tuple[_QueuedDelivery, BroadcastDeliveryStatus] | None] = asyncio.Queue()
+        self.slots = asyncio.Semaphore(pipeline.window)
+        self.db_lock = asyncio.Lock()
+        self.retry_tasks: set[asyncio.Task[None]] = set()
+        # (seq, user_id) в порядке аудитории. Доставки завершаются не по порядку, поэтому курсор
+        # сдвигается только до последнего получателя, перед которым завершены все остальные.
+        self.order: deque[tuple[int, int]] = deque()
+        self.completed_seqs: set[int] = set()
+        self.in_flight = 0
+        self.loop = asyncio.get_running_loop()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if self.pipeline.timings is not None:
+            self.pipeline.timings(stage, seconds)
+
+    async def produce(self) -> None:
+        seq = 0
+        try:
+            while True:
+                async with self.db_lock:
+                    page = await anext(self.audience, None)
+                if page is None:
+                    return
+                for recipient in page:
+                    if self.pause is not None and seq and seq % self.pipeline.flush_size == 0:
+                        await self.pause()
+                    await self.slots.acquire()
+                    self.order.append((seq, recipient.user_id))
+                    self.in_flight += 1
+                    now = self.loop.time()
+                    self.ready.put_nowait(
+                        _QueuedDelivery(seq=seq, recipient=recipient, enqueued_at=now, waiting_since=now)
+                    )
+                    seq += 1
+        finally:
+            self.finished.put_nowait(None)
+
+    async def requeue_after(self, delivery: _QueuedDelivery, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.ready.put_nowait(delivery)
+
+    async def work(self) -> None:
+        while True:
+            delivery = await self.ready.get()
+            started_at = self.loop.time()
+            self.observe("queue_wait" if delivery.attempt == 1 else "retry_wait", started_at - delivery.waiting_since)
+            try:
+                outcome = await self.pipeline.attempt(delivery.recipient, delivery.attempt)
+            except Exception as exc:
+                logger.exception("Broadcast worker failed outside guarded flow: {error}", error=str(exc))
+                outcome = BroadcastDeliveryStatus.FAILED_PERMANENT
+            finished_at = self.loop.time()
+            self.observe("send", finished_at - started_at)
+
+            if isinstance(outcome, BroadcastDeliveryStatus):
+                self.observe("delivery", finished_at - delivery.enqueued_at)
+                metrics.inc("broadcast_deliveries_total", status=outcome.value)
+                metrics.observe("broadcast_delivery_seconds", finished_at - delivery.enqueued_at)
+                self.finished.put_nowait((delivery, outcome))
+                continue
+
+            metrics.inc("broadcast_retries_total")
+            delivery.attempt += 1
+            delivery.waiting_since = finished_at
+            retry_task = asyncio.create_task(self.requeue_after(delivery, outcome))
+            self.retry_tasks.add(retry_task)
+            retry_task.add_done_callback(self.retry_tasks.discard)
+
+    async def flush_completed(self, batch: list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]]) -> None:
+        last_user_id: int | None = None
+        while self.order and self.order[0][0] in self.completed_seqs:
+            seq, last_user_id = self.order.popleft()
+            self.completed_seqs.discard(seq)
+        async with self.db_lock:
+            await self.flush(batch, last_user_id)
+        for _ in batch:
+            self.slots.release()
+
+    async def execute(self) -> None:
+        producer = asyncio.create_task(self.produce())
+        workers = [asyncio.create_task(self.work()) for _ in range(self.pipeline.workers)]
+        try:
+            batch: list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]] = []
+            producer_done = False
+            while not producer_done or self.in_flight:
+                item = await self.finished.get()
+                if item is None:
+                    producer_done = True
+                    # Пробрасывает ошибку чтения аудитории, например UsersNotFoundError.
+                    await producer
+                    continue
+
+                delivery, status = item
+                self.in_flight -= 1
+                self.completed_seqs.add(delivery.seq)
+                batch.append((delivery.recipient, status))
+                if len(batch) >= self.pipeline.flush_size:
+                    await self.flush_completed(batch)
+                    batch = []
+
+            if batch:
+                await self.flush_completed(batch)
+        finally:
+            pending = [producer, *workers, *self.retry_tasks]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.constants import BroadcastJobStatus
+from ..db.models import BroadcastJob
+from ..dto import BroadcastProgressDTO, BroadcastResult
+from ..infrastructure.broadcast_job_repository import BroadcastJobRepository
+
+# Этапы, на которые раскладывается время доставки одного получателя.
+TIMING_STAGES = ("queue_wait", "send", "retry_wait", "delivery")
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10_000, 30_000)
+# Скорость считается по скользящему окну, чтобы ETA реагировал на паузы flood control.
+RATE_WINDOW_S = 30.0
+
+_STATUS_TITLES = {
+    BroadcastJobStatus.PENDING: "в очереди",
+    BroadcastJobStatus.RUNNING: "выполняется",
+    BroadcastJobStatus.COMPLETED: "завершена",
+    BroadcastJobStatus.FAILED: "остановлена",
+}
+
+
+class LatencyHistogram:
+    """Гистограмма длительностей с фиксированными границами корзин в миллисекундах."""
+
+    def __init__(self, buckets_ms: Sequence[int] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.total_ms = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        value_ms = max(seconds, 0.0) * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, value_ms)] += 1
+        self.total_ms += value_ms
+
+    def to_dict(self) -> dict[str, float]:
+        """Кумулятивные счётчики ``le_<граница>ms`` в стиле Prometheus, плюс ``count`` и ``sum_ms``."""
+        payload: dict[str, float] = {"count": self.count, "sum_ms": round(self.total_ms, 1)}
+        cumulative = 0
+        for bound_ms, bucket_count in zip(self.buckets_ms, self.counts, strict=False):
+            cumulative += bucket_count
+            payload[f"le_{bound_ms}ms"] = cumulative
+        return payload
+
+
+class BroadcastProgressTracker:
+    """
+    Прогресс одного прогона рассылки: скорость по скользящему окну, ETA и гистограммы этапов доставки.
+
+    Снимок публикуется не чаще раза в ``BROADCAST_PROGRESS_INTERVAL_S``: он сохраняется в
+    ``broadcast_jobs.progress`` в той же транзакции, что и пачка доставок.
+    """
+
+    def __init__(self, job: BroadcastJob, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.job = job
+        self._clock = clock
+        self._samples: deque[tuple[float, int]] = deque([(clock(), job.attempted)])
+        self._last_published_at: float | None = None
+        self.timings = {stage: LatencyHistogram() for stage in TIMING_STAGES}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.timings[stage].observe(seconds)
+
+    def record(self, result: BroadcastResult) -> None:
+        """Запомнить точку для расчёта скорости; вызывается после каждой зафиксированной пачки."""
+        now = self._clock()
+        self._samples.append((now, result.attempted))
+        # Самая старая точка внутри окна остаётся опорной для расчёта скорости.
+        while len(self._samples) > 1 and now - self._samples[1][0] >= RATE_WINDOW_S:
+            self._samples.popleft()
+
+    def rate_per_s(self) -> float | None:
+        (first_at, first_attempted), (last_at, last_attempted) = self._samples[0], self._samples[-1]
+        if last_at <= first_at:
+            return None
+        return (last_attempted - first_attempted) / (last_at - first_at)
+
+    def is_due(self) -> bool:
+        if self._last_published_at is None:
+            return True
+        return self._clock() - self._last_published_at >= settings.broadcast_progress_interval_s
+
+    def publish(self) -> BroadcastProgressDTO:
+        """Сохранить снимок в задании и вернуть его."""
+        self._last_published_at = self._clock()
+        rate = self.rate_per_s()
+        remaining = self.job.remaining
+        eta = remaining / rate if rate and remaining is not None else None
+        now = datetime.now(UTC).replace(tzinfo=None)
+        elapsed = (now - self.job.started_at).total_seconds() if self.job.started_at is not None else None
+        self.job.progress = {
+            "rate_per_s": round(rate, 2) if rate is not None else None,
+            "eta_s": round(eta, 1) if eta is not None else None,
+            "elapsed_s": round(elapsed, 1) if elapsed is not None else None,
+            "timings": {stage: histogram.to_dict() for stage, histogram in self.timings.items() if histogram.count},
+            "updated_at": now.isoformat(),
+        }
+        return progress_from_job(self.job)
+
+
+def progress_from_job(job: BroadcastJob) -> BroadcastProgressDTO:
+    """Собрать снимок из счётчиков задания и последнего сохранённого ``progress``."""
+    progress = job.progress or {}
+    is_running = job.status is BroadcastJobStatus.RUNNING
+    return BroadcastProgressDTO(
+        job_id=job.id,
+        status=job.status,
+        total=job.total_recipients,
+        attempted=job.attempted,
+        sent=job.sent,
+        failed=job.failed_temporary + job.failed_permanent,
+        skipped=job.skipped_invalid_user,
+        remaining=job.remaining,
+        rate_per_s=progress.get("rate_per_s"),
+        eta_s=progress.get("eta_s") if is_running else None,
+        elapsed_s=progress.get("elapsed_s"),
+        timings=progress.get("timings", {}),
+        updated_at=progress.get("updated_at"),
+    )
+
+
+def broadcast_progress_text(progress: BroadcastProgressDTO) -> str:
+    """Текст статус-сообщения администратора."""
+    lines = [f"Рассылка #{progress.job_id}: {_STATUS_TITLES[progress.status]}"]
+    total = "?" if progress.total is None else str(progress.total)
+    lines.append(f"Отправлено: {progress.sent} из {total}, ошибок: {progress.failed}, пропущено: {progress.skipped}")
+
+    details: list[str] = []
+    if progress.remaining is not None and progress.status is BroadcastJobStatus.RUNNING:
+        details.append(f"осталось {progress.remaining}")
+    if progress.rate_per_s is not None:
+        details.append(f"{progress.rate_per_s:.1f} сообщ./с")
+    if progress.eta_s is not None:
+        details.append(f"ещё ~{_format_duration(progress.eta_s)}")
+    elif progress.elapsed_s is not None and progress.status is not BroadcastJobStatus.RUNNING:
+        details.append(f"заняло {_format_duration(progress.elapsed_s)}")
+    if details:
+        lines.append(", ".join(details).capitalize())
+    return "\n".join(lines)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours} ч {minutes} мин"
+    if minutes:
+        return f"{minutes} мин {seconds} с"
+    return f"{seconds} с"
+
+
+class BroadcastProgressService:
+    """Чтение прогресса рассылок для health API."""
+
+    def __init__(self, db: AsyncSession, broadcast_job_repository: BroadcastJobRepository) -> None:
+        self.db = db
+        self.broadcast_job_repository = broadcast_job_repository
+
+    async def get_progress(self, job_id: int) -> BroadcastProgressDTO:
+        """Поднимает BroadcastJobNotFoundError, если задания нет."""
+        return progress_from_job(await self.broadcast_job_repository.get_by_id(self.db, job_id))
+
+    async def list_active(self) -> list[BroadcastProgressDTO]:
+        jobs = await self.broadcast_job_repository.find_unfinished_jobs(self.db)
+        return [progress_from_job(job) for job in jobs]
@@ -1,11 +1,22 @@
 from collections.abc import Sequence
+from datetime import datetime, timedelta
 
 import pendulum
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.config import settings
 from ..core.constants import PointsTypeEnum
 from ..dto import WeeklyLeaderboardRowDTO
-from ..infrastructure import PointsTransactionRepository
+from ..infrastructure import (
+    LeaderboardCache,
+    LeaderboardCacheKey,
+    PointsPeriodTotalRepository,
+    PointsTransactionRepository,
+)
+
+DEFAULT_LEADERBOARD_LIMIT = 10
+# Начисление, начатое до конца недели, может закоммититься чуть позже границы.
+CLOSED_PERIOD_GRACE = timedelta(minutes=2)
 
 
 class LeaderboardService:
@@ -13,28 +24,101 @@ class LeaderboardService:
         self,
         db: AsyncSession,
         points_transaction_repository: PointsTransactionRepository,
+        points_period_total_repository: PointsPeriodTotalRepository,
+        leaderboard_cache: LeaderboardCache,
     ) -> None:
         self.db = db
         self.points_transaction_repository = points_transaction_repository
+        self.points_period_total_repository = points_period_total_repository
+        self.leaderboard_cache = leaderboard_cache
 
     async def get_previous_calendar_week_leaderboard(
         self,
         *,
         points_type: PointsTypeEnum,
-        limit: int = 10,
-        business_tz: str = "Asia/Yekaterinburg",
+        limit: int = DEFAULT_LEADERBOARD_LIMIT,
+        business_tz: str | None = None,
+    ) -> Sequence[WeeklyLeaderboardRowDTO]:
+        return await self.get_calendar_week_leaderboard(
+            points_type=points_type,
+            weeks_ago=1,
+            limit=limit,
+            business_tz=business_tz,
+        )
+
+    async def get_calendar_week_leaderboard(
+        self,
+        *,
+        points_type: PointsTypeEnum,
+        weeks_ago: int,
+        limit: int = DEFAULT_LEADERBOARD_LIMIT,
+        business_tz: str | None = None,
+        refresh: bool = False,
     ) -> Sequence[WeeklyLeaderboardRowDTO]:
+        """
+        Лидерборд календарной недели ``business_tz``: 0 — текущая, 1 — прошлая.
+
+        Закрытая неделя кешируется бессрочно, открытая — на ``LEADERBOARD_CACHE_OPEN_TTL_S``.
+        ``refresh`` пересчитывает результат из БД и перезаписывает кеш.
+        """
+        business_tz = business_tz or settings.business_tz
         now = pendulum.now(business_tz)
-        start_local = now.start_of("week").subtract(weeks=1)
+        start_local = now.start_of("week").subtract(weeks=weeks_ago)
         end_local = start_local.add(weeks=1)
 
         start_at = start_local.in_timezone("UTC").naive()
         end_at = end_local.in_timezone("UTC").naive()
 
-        return await self.points_transaction_repository.find_top_recipients_for_period(
+        key = LeaderboardCacheKey(points_type, start_at, limit, business_tz)
+        if not refresh:
+            cached = await self.leaderboard_cache.get(key)
+            if cached is not None:
+                return cached
+
+        rows = await self._load_week(points_type, start_at, end_at, limit, business_tz)
+        is_closed = now.in_timezone("UTC").naive() >= end_at + CLOSED_PERIOD_GRACE
+        await self.leaderboard_cache.put(
+            key,
+            rows,
+            ttl_s=None if is_closed else settings.leaderboard_cache_open_ttl_s,
+        )
+        return rows
+
+    async def warm_previous_week(self, *, limit: int = DEFAULT_LEADERBOARD_LIMIT) -> int:
+        """Пересчитать и закешировать прошлую неделю по всем типам баллов; вернуть число строк."""
+        warmed = 0
+        for points_type in PointsTypeEnum:
+            rows = await self.get_calendar_week_leaderboard(
+                points_type=points_type,
+                weeks_ago=1,
+                limit=limit,
+                refresh=True,
+            )
+            warmed += len(rows)
+        return warmed
+
+    async def _load_week(
+        self,
+        points_type: PointsTypeEnum,
+        start_at: datetime,
+        end_at: datetime,
+        limit: int,
+        business_tz: str,
+    ) -> Sequence[WeeklyLeaderboardRowDTO]:
+        if business_tz != settings.business_tz:
+            # Недельные суммы разбиты по неделям BUSINESS_TZ; для другой зоны остаётся агрегация ledger.
+            return await self.points_transaction_repository.find_top_recipients_for_period(
+                self.db,
+                points_type=points_type,
+                start_at=start_at,
+                end_at=end_at,
+                limit=limit,
+            )
+
+        return await self.points_period_total_repository.find_top_for_period(
             self.db,
             points_type=points_type,
-            start_at=start_at,
-            end_at=end_at,
+            period_start=start_at,
+            period_end=end_at,
             limit=limit,
         )
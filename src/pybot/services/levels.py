@@ -4,13 +4,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.constants import PointsTypeEnum
 from ..db.models.user_module import Level, UserLevel
-from ..infrastructure import LevelRepository
+from ..domain.services.level_calculator import LevelThresholdIndex
+from ..infrastructure import LevelCatalog, LevelRepository
 
 
 class LevelService:
-    def __init__(self, level_repo: LevelRepository, db: AsyncSession) -> None:
+    def __init__(self, level_repo: LevelRepository, db: AsyncSession, level_catalog: LevelCatalog) -> None:
         self.level_repo = level_repo
         self.db = db
+        self.level_catalog = level_catalog
 
     async def find_all_levels(self) -> Sequence[Level]:
         return await self.level_repo.find_all_levels(self.db)
@@ -18,6 +20,10 @@ class LevelService:
     async def level_exists(self) -> bool:
         return await self.level_repo.level_exists(self.db)
 
+    async def get_thresholds(self, points_type: PointsTypeEnum) -> LevelThresholdIndex:
+        """Пороги уровней типа из процессного каталога; БД читается только при первом обращении."""
+        return await self.level_catalog.thresholds(self.db, points_type)
+
     async def find_user_current_level(
         self,
         user_id: int,
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ..core.metrics import MetricsRegistry, render_prometheus
+from ..infrastructure.metrics_snapshots import read_metric_snapshots
+
+# Снимок считается живым, пока процесс пропустил не больше двух циклов записи.
+SNAPSHOT_STALE_INTERVALS = 3
+
+
+class MetricsService:
+    """Собрать метрики health-процесса и снимки бота и TaskIQ-воркеров в один ответ ``/metrics``."""
+
+    def __init__(self, registry: MetricsRegistry, snapshots_dir: str | Path, *, export_interval_s: float) -> None:
+        self.registry = registry
+        self.snapshots_dir = snapshots_dir
+        self.max_snapshot_age_s = export_interval_s * SNAPSHOT_STALE_INTERVALS
+
+    def render(self) -> str:
+        snapshots = read_metric_snapshots(self.snapshots_dir, max_age_s=self.max_snapshot_age_s)
+        return render_prometheus([self.registry.snapshot(), *snapshots])
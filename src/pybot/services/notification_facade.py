@@ -3,7 +3,7 @@ from __future__ import annotations
 from pydantic import ValidationError
 
 from ..domain.exceptions import TaskScheduleError
-from ..dto import NotifyUserDTO
+from ..dto import NotifyUserDTO, NotifyUsersDTO
 from ..dto.value_objects import TaskSchedule
 from .ports import NotificationDispatchPort
 
@@ -12,9 +12,10 @@ class NotificationFacade:
     def __init__(self, dispatch_port: NotificationDispatchPort) -> None:
         self._dispatch_port = dispatch_port
 
-    async def notify_user(self, data: NotifyUserDTO) -> None:
+    @staticmethod
+    def _build_schedule(data: NotifyUserDTO | NotifyUsersDTO) -> TaskSchedule:
         try:
-            schedule = TaskSchedule(
+            return TaskSchedule(
                 kind=data.kind,
                 run_at=data.run_at,
                 interval=data.interval,
@@ -24,4 +25,11 @@ class NotificationFacade:
         except (ValidationError, TaskScheduleError) as err:
             raise TaskScheduleError(f"Invalid notification schedule: {err}") from err
 
+    async def notify_user(self, data: NotifyUserDTO) -> None:
+        schedule = self._build_schedule(data)
         await self._dispatch_port.dispatch_message(user_id=data.user_id, message_text=data.message, schedule=schedule)
+
+    async def notify_users(self, data: NotifyUsersDTO) -> None:
+        """Поставить одно уведомление многим пользователям, например напоминание всей роли."""
+        schedule = self._build_schedule(data)
+        await self._dispatch_port.dispatch_bulk(user_ids=data.user_ids, message_text=data.message, schedule=schedule)
@@ -1,15 +1,20 @@
+from collections.abc import Mapping, Sequence
+from itertools import batched
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core import logger
-from ..db.models import PointsTransaction, Valuation
-from ..domain.exceptions import UserNotFoundError
-from ..domain.services.level_calculator import LevelCalculator
-from ..dto import AdjustUserPointsDTO, UserReadDTO
-from ..infrastructure.level_repository import LevelRepository
-from ..infrastructure.points_transaction_repository import PointsTransactionRepository
+from ..domain.exceptions import UserNotFoundError, ZeroPointsAdjustmentError
+from ..domain.services.level_calculator import LevelCalculator, LevelThresholdIndex
+from ..dto import AdjustUserPointsDTO, AdjustUsersPointsDTO, PointsRecipientChange, PointsRecipientState, UserReadDTO
+from ..infrastructure.level_catalog import LevelCatalog
+from ..infrastructure.points_ledger import PointsLedger
 from ..infrastructure.user_repository import UserRepository
 from ..mappers.user_mappers import map_orm_user_to_user_read_dto
 
+# Получатели одного массового начисления читаются и записываются пачками, чтобы не упереться в лимит параметров.
+BULK_POINTS_CHUNK_SIZE = 1000
+
 
 class PointsService:
     def __init__(
@@ -17,51 +22,136 @@ class PointsService:
         db: AsyncSession,
         level_calculator: LevelCalculator,
         user_repository: UserRepository,
-        level_repository: LevelRepository,
-        points_transaction_repository: PointsTransactionRepository,
+        level_catalog: LevelCatalog,
+        points_ledger: PointsLedger,
     ) -> None:
         self.db: AsyncSession = db
         self.level_calculator: LevelCalculator = level_calculator
         self.user_repository: UserRepository = user_repository
-        self.level_repository: LevelRepository = level_repository
-        self.points_transaction_repository: PointsTransactionRepository = points_transaction_repository
+        self.level_catalog: LevelCatalog = level_catalog
+        self.points_ledger: PointsLedger = points_ledger
 
     async def change_points(self, dto: AdjustUserPointsDTO) -> UserReadDTO:
-        try:
-            user = await self.user_repository.get_by_id(self.db, dto.recipient_id)
-        except UserNotFoundError as err:
-            raise UserNotFoundError(user_id=dto.recipient_id) from err
-
-        all_levels = await self.level_repository.find_all_by_type(self.db, dto.points.point_type)
-        actual_delta, new_score = user.change_user_points(dto.points.value, dto.points.point_type)
-        new_level = self.level_calculator.calculate_level(new_score, all_levels)
-
-        if new_level:
-            user.change_user_level(new_level.id, dto.points.point_type)
-        else:
-            logger.info("Пользователь достиг максимального уровня")
-
-        try:
-            giver_orm = await self.user_repository.get_by_id(self.db, dto.giver_id)
-        except UserNotFoundError as err:
-            raise UserNotFoundError(user_id=dto.giver_id) from err
-
-        valuation = Valuation.create(
-            recipient=user,
-            giver=giver_orm,
+        """
+        Изменить баллы одного получателя.
+
+        Баллы меняются атомарным UPDATE на стороне БД, поэтому одновременные начисления
+        одному студенту не теряются. ORM-граф пользователя не загружается: уровень
+        переставляется по каталогу порогов, оценка, ledger и недельная сумма пишутся
+        в той же транзакции.
+        """
+        if dto.points.value == 0:
+            raise ZeroPointsAdjustmentError()
+        if await self.user_repository.find_user_by_id(self.db, dto.giver_id) is None:
+            raise UserNotFoundError(user_id=dto.giver_id)
+
+        points_type = dto.points.point_type
+        thresholds = await self.level_catalog.thresholds(self.db, points_type)
+        user, actual_delta = await self.user_repository.add_points(
+            self.db,
+            dto.recipient_id,
+            points_type,
+            dto.points.value,
+        )
+        # Строка получателя уже заблокирована UPDATE, повторная блокировка не ждёт.
+        [state] = await self.user_repository.find_points_recipients(self.db, [user.id], points_type)
+        await self._assign_levels([state], {state.user_id: state.points}, thresholds)
+
+        # Недельная сумма обновляется в той же транзакции, что и ledger: лидерборд читает только её.
+        await self.points_ledger.record(
+            self.db,
+            giver_id=dto.giver_id,
             points=dto.points,
             reason=dto.reason,
+            amounts={user.id: actual_delta},
         )
-        points_transaction = PointsTransaction.create(
-            recipient_id=user.id,
-            giver_id=giver_orm.id,
-            amount=actual_delta,
-            points_type=dto.points.point_type,
-        )
-
-        self.db.add(valuation)
-        await self.points_transaction_repository.add(self.db, points_transaction)
-        self.db.add(user)
         await self.db.commit()
 
         return await map_orm_user_to_user_read_dto(user)
+
+    async def change_points_bulk(self, dto: AdjustUsersPointsDTO) -> list[PointsRecipientChange]:
+        """
+        Изменить баллы всем ``dto.recipient_ids`` в одной транзакции.
+
+        Получатели читаются одним запросом на пачку, уровни считаются по каталогу порогов,
+        оценки, ledger и недельные суммы пишутся многострочными INSERT, commit — один.
+        Уведомления отправляет вызывающий по ``telegram_id`` из результата.
+        """
+        if dto.points.value == 0:
+            raise ZeroPointsAdjustmentError()
+        if await self.user_repository.find_user_by_id(self.db, dto.giver_id) is None:
+            raise UserNotFoundError(user_id=dto.giver_id)
+
+        points_type = dto.points.point_type
+        thresholds = await self.level_catalog.thresholds(self.db, points_type)
+
+        changes: list[PointsRecipientChange] = []
+        for chunk in batched(dict.fromkeys(dto.recipient_ids), BULK_POINTS_CHUNK_SIZE):
+            states = await self.user_repository.find_points_recipients(self.db, chunk, points_type)
+            if len(states) != len(chunk):
+                missing = set(chunk) - {state.user_id for state in states}
+                raise UserNotFoundError(user_id=min(missing))
+
+            chunk_changes = await self._apply_bulk_chunk(dto, states, thresholds)
+            await self.points_ledger.record(
+                self.db,
+                giver_id=dto.giver_id,
+                points=dto.points,
+                reason=dto.reason,
+                amounts={change.user_id: change.actual_delta for change in chunk_changes},
+            )
+            changes.extend(chunk_changes)
+
+        await self.db.commit()
+        logger.info(
+            "event=points_bulk_changed recipients={count} points_type={points_type} points={points}",
+            count=len(changes),
+            points_type=points_type,
+            points=dto.points.value,
+        )
+        return changes
+
+    async def _apply_bulk_chunk(
+        self,
+        dto: AdjustUsersPointsDTO,
+        states: list[PointsRecipientState],
+        thresholds: LevelThresholdIndex,
+    ) -> list[PointsRecipientChange]:
+        """Записать новые баллы и уровни пачки получателей; вернуть фактические изменения."""
+        changes: list[PointsRecipientChange] = []
+        for state in states:
+            # То же правило, что в UserRepository.add_points: баллы не опускаются ниже нуля.
+            new_score = max(state.points + dto.points.value, 0)
+            changes.append(
+                PointsRecipientChange(
+                    user_id=state.user_id,
+                    telegram_id=state.telegram_id,
+                    actual_delta=new_score - state.points,
+                    new_score=new_score,
+                )
+            )
+
+        scores = {change.user_id: change.new_score for change in changes}
+        await self.user_repository.bulk_set_points(self.db, dto.points.point_type, scores)
+        await self._assign_levels(states, scores, thresholds)
+        return changes
+
+    async def _assign_levels(
+        self,
+        states: Sequence[PointsRecipientState],
+        scores: Mapping[int, int],
+        thresholds: LevelThresholdIndex,
+    ) -> None:
+        """Перевести получателей на уровни, соответствующие новым баллам ``scores``."""
+        moved_levels: dict[int, int] = {}
+        added_levels: dict[int, int] = {}
+        for state in states:
+            new_level = self.level_calculator.calculate_level(scores[state.user_id], thresholds)
+            if new_level is None or new_level.id == state.level_id:
+                continue
+            if state.user_level_id is None:
+                added_levels[state.user_id] = new_level.id
+            else:
+                moved_levels[state.user_level_id] = new_level.id
+
+        await self.user_repository.bulk_assign_levels(self.db, moved=moved_levels, added=added_levels)
@@ -1,3 +1,4 @@
+from .broadcast_lock_port import BroadcastLockPort
 from .errors import NotificationError as NotificationError
 from .errors import NotificationPermanentError as NotificationPermanentError
 from .errors import NotificationTemporaryError as NotificationTemporaryError
@@ -5,6 +6,7 @@ from .notification_port import NotificationPort
 from .notification_dispatch_port import NotificationDispatchPort
 
 __all__ = [
+    "BroadcastLockPort",
     "NotificationPort",
     "NotificationDispatchPort",
     "NotificationError",
@@ -0,0 +1,58 @@
+from abc import ABC, abstractmethod
+
+
+class BroadcastLockPort(ABC):
+    """
+    Интерфейс распределённой блокировки рассылок с арендой (lease).
+
+    Блокировка выдаётся на ``ttl_seconds`` и должна продлеваться владельцем; если процесс
+    упал, аренда истекает сама, и задание может подхватить другой worker.
+
+    Methods:
+        acquire(key, ttl_seconds)
+            Захватывает блокировку и возвращает токен аренды либо ``None``, если она занята.
+        extend(key, token, ttl_seconds)
+            Продлевает аренду; ``False`` означает, что аренда потеряна.
+        release(key, token)
+            Освобождает блокировку, только если она всё ещё принадлежит токену.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl_seconds: float) -> str | None:
+        """
+        Захватывает блокировку ``key`` на ``ttl_seconds``.
+
+        Args:
+            key (str): Ключ блокировки.
+            ttl_seconds (float): Время аренды в секундах.
+
+        Returns:
+            str | None: Токен аренды или ``None``, если блокировку держит другой владелец.
+        """
+        pass
+
+    @abstractmethod
+    async def extend(self, key: str, token: str, ttl_seconds: float) -> bool:
+        """
+        Продлевает аренду ``key`` ещё на ``ttl_seconds``.
+
+        Args:
+            key (str): Ключ блокировки.
+            token (str): Токен, полученный из :meth:`acquire`.
+            ttl_seconds (float): Новое время аренды в секундах.
+
+        Returns:
+            bool: ``False``, если аренда истекла или принадлежит другому владельцу.
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, key: str, token: str) -> None:
+        """
+        Освобождает блокировку ``key``, если она принадлежит ``token``.
+
+        Args:
+            key (str): Ключ блокировки.
+            token (str): Токен, полученный из :meth:`acquire`.
+        """
+        pass
@@ -18,9 +18,14 @@ class NotificationTemporaryError(NotificationError):
 
 @dataclass(slots=True)
 class NotificationPermanentError(NotificationError):
-    """Permanent notification delivery error that should not be retried."""
+    """Permanent notification delivery error that should not be retried.
+
+    ``recipient_unreachable`` marks failures caused by the recipient itself (bot blocked,
+    account deleted, chat not found): later sends to the same recipient will fail too.
+    """
 
     message: str
+    recipient_unreachable: bool = False
 
     def __str__(self) -> str:
         return self.message
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from ...dto.value_objects import TaskSchedule
 
@@ -21,6 +22,9 @@ class NotificationDispatchPort(ABC):
 
             Returns:
                 str: Уника отправки уведомления.
+
+        dispatch_bulk(user_ids, message_text, schedule)
+            Отправляет одно уведомление многим пользователям.
     """
 
     @abstractmethod
@@ -37,3 +41,20 @@ class NotificationDispatchPort(ABC):
             str: Уника отправки уведомления.
         """
         pass
+
+    async def dispatch_bulk(self, user_ids: Sequence[int], message_text: str, schedule: TaskSchedule) -> list[str]:
+        """
+        Отправляет одно уведомление многим пользователям.
+
+        Реализация по умолчанию ставит по задаче на получателя; транспорт может переопределить её,
+        чтобы хранить текст один раз и отправлять получателей порциями.
+
+        Args:
+            user_ids (Sequence[int]): Идентификаторы получателей.
+            message_text (str): Текст уведомления.
+            schedule (TaskSchedule): Параметры отправки уведомления.
+
+        Returns:
+            list[str]: Идентификаторы поставленных задач или расписаний.
+        """
+        return [await self.dispatch_message(user_id, message_text, schedule) for user_id in user_ids]
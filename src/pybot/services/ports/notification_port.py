@@ -46,3 +46,34 @@ class NotificationPort(ABC):
             NotificationPermanentError: Non-retryable delivery error.
         """
         pass
+
+    async def edit_message(self, chat_id: int, message_id: int, text: str) -> None:
+        """Replace the text of a message previously sent by the bot.
+
+        Used for live status messages. Transports that cannot edit messages ignore the call.
+
+        Args:
+            chat_id: Chat identifier in current notification transport semantics.
+            message_id: Identifier of the message inside ``chat_id``.
+            text: New message text.
+
+        Raises:
+            NotificationTemporaryError: Transient error, retry is allowed.
+            NotificationPermanentError: Non-retryable error.
+        """
+        return None
+
+    async def probe_recipient(self, user_id: int) -> None:
+        """Check that a recipient is reachable without delivering a message.
+
+        Transports without a cheap probe treat every recipient as reachable.
+
+        Args:
+            user_id: Recipient identifier in current notification transport semantics.
+
+        Raises:
+            NotificationTemporaryError: Transient error, the probe is inconclusive.
+            NotificationPermanentError: Non-retryable error; ``recipient_unreachable``
+                tells whether the recipient is still unreachable.
+        """
+        return None
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import logger
+from ..core.config import settings
+from ..dto import ReachabilityProbeResult
+from ..infrastructure.user_repository import UserRepository
+from .ports import NotificationError, NotificationPermanentError, NotificationPort
+
+
+class RecipientReachabilityService:
+    """
+    Повторная проверка получателей, исключённых из рассылок после постоянной ошибки доставки.
+
+    Пользователь, снова ставший доступным (разблокировал бота), возвращается в аудиторию;
+    остальные получают отметку о проверке и ждут следующего окна ``RECIPIENT_REPROBE_AFTER_HOURS``.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        user_repository: UserRepository,
+        notification_service: NotificationPort,
+    ) -> None:
+        self.db = db
+        self.user_repository = user_repository
+        self.notification_service = notification_service
+
+    async def reprobe_unreachable(self) -> ReachabilityProbeResult:
+        """Проверить всех недоступных получателей, чья последняя проверка старше окна повторной проверки."""
+        checked_before = datetime.now(UTC).replace(tzinfo=None) - timedelta(
+            hours=settings.recipient_reprobe_after_hours
+        )
+        result = ReachabilityProbeResult()
+
+        while True:
+            recipients = await self.user_repository.find_unreachable_recipients(
+                self.db,
+                checked_before=checked_before,
+                limit=settings.recipient_reprobe_batch_size,
+            )
+            if not recipients:
+                break
+
+            restored_user_ids: list[int] = []
+            checked_user_ids: list[int] = []
+            for recipient in recipients:
+                result.probed += 1
+                try:
+                    await self.notification_service.probe_recipient(recipient.telegram_id)
+                except NotificationPermanentError as exc:
+                    if exc.recipient_unreachable:
+                        result.still_unreachable += 1
+                    else:
+                        result.inconclusive += 1
+                    checked_user_ids.append(recipient.user_id)
+                except NotificationError:
+                    result.inconclusive += 1
+                    checked_user_ids.append(recipient.user_id)
+                else:
+                    result.restored += 1
+                    restored_user_ids.append(recipient.user_id)
+
+            # Каждый проверенный получатель получает свежую отметку, поэтому цикл не вернёт его повторно.
+            await self.user_repository.mark_recipients_reachable(self.db, restored_user_ids)
+            await self.user_repository.touch_reachability_checked(self.db, checked_user_ids)
+            await self.db.commit()
+
+        logger.info(
+            "Unreachable recipients re-probed | probed={probed} restored={restored} "
+            "still_unreachable={still_unreachable} inconclusive={inconclusive}",
+            probed=result.probed,
+            restored=result.restored,
+            still_unreachable=result.still_unreachable,
+            inconclusive=result.inconclusive,
+        )
+        return result
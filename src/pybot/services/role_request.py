@@ -112,6 +112,8 @@ class RoleRequestService:
 
         self.db.add(request)
         await self.db.commit()
+        if request.status == RequestStatus.APPROVED:
+            await self.user_repository.invalidate_cached_user(user.telegram_id)
         await self.notification_service.send_message(
             NotifyDTO(
                 message=role_request_user_status(request.role.name, request.status),
@@ -4,7 +4,7 @@ from ...core.constants import PointsTypeEnum
 from ...domain.exceptions import LevelNotFoundError
 from ...dto import CompetenceReadDTO, ProfileViewDTO, UserLevelReadDTO, UserProfileReadDTO, UserReadDTO
 from ...dto.value_objects import Points
-from ...mappers.level_mappers import map_orm_level_to_level_read_dto
+from ...mappers.level_mappers import map_level_snapshot_to_level_read_dto
 from ..levels import LevelService
 from .user_competence import UserCompetenceService
 from .user_roles import UserRolesService
@@ -67,18 +67,20 @@ class UserProfileService:
     async def _get_user_level_data(self, user_read_dto: UserReadDTO) -> dict[PointsTypeEnum, UserLevelReadDTO]:
         levels_data: dict[PointsTypeEnum, UserLevelReadDTO] = {}
         for level_system in PointsTypeEnum:
-            orm_current_level_res = await self.level_service.find_user_current_level(user_read_dto.id, level_system)
-            if orm_current_level_res is None:
+            # Уровень однозначно следует из баллов: change_points выставляет его по тем же порогам.
+            thresholds = await self.level_service.get_thresholds(level_system)
+            points: Points = getattr(user_read_dto, f"{level_system.value}_points")
+            current_level = thresholds.current(points.value)
+            if current_level is None:
                 raise LevelNotFoundError(user_read_dto.id)
 
-            _, orm_current_level = orm_current_level_res
-            dto_current_level = await map_orm_level_to_level_read_dto(orm_current_level)
+            dto_current_level = await map_level_snapshot_to_level_read_dto(current_level)
 
-            orm_next_level = await self.level_service.find_next_level(orm_current_level, level_system)
-            if orm_next_level is None:
+            next_level = thresholds.next(points.value)
+            if next_level is None:
                 dto_next_level = dto_current_level
             else:
-                dto_next_level = await map_orm_level_to_level_read_dto(orm_next_level)
+                dto_next_level = await map_level_snapshot_to_level_read_dto(next_level)
 
             levels_data[level_system] = UserLevelReadDTO(
                 current_level=dto_current_level,
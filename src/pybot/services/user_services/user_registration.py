@@ -60,4 +60,5 @@ class UserRegistrationService:
 
         self.db.add(user)
         await self.db.commit()
+        await self.user_repository.invalidate_cached_user(user.telegram_id)
         return await map_orm_user_to_user_read_dto(user)
@@ -40,6 +40,7 @@ class UserRolesService:
 
         user.remove_role(role)
         await self.db.commit()
+        await self.user_repository.invalidate_cached_user(user.telegram_id)
         return await map_orm_user_to_user_read_dto(user)
 
     async def find_user_roles(
@@ -76,4 +77,5 @@ class UserRolesService:
         user.add_role(role)
         self.db.add(user)
         await self.db.commit()
+        await self.user_repository.invalidate_cached_user(user.telegram_id)
         return await map_orm_user_to_user_read_dto(user)
@@ -1,12 +1,17 @@
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import UTC, datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.config import settings
 from ...core.constants import RoleEnum
 from ...domain.exceptions import InitialLevelsNotFoundError, RoleNotFoundError, UserNotFoundError
-from ...dto import UserCreateDTO, UserReadDTO
+from ...dto import UserContext, UserCreateDTO, UserReadDTO
 from ...infrastructure.level_repository import LevelRepository
 from ...infrastructure.role_repository import RoleRepository
-from ...infrastructure.user_repository import UserRepository
+from ...infrastructure.user_activity_buffer import UserActivityBuffer
+from ...infrastructure.user_repository import ACTIVITY_UPDATE_INTERVAL, UserRepository
 from ...mappers.user_mappers import map_orm_user_to_user_read_dto
 
 
@@ -17,11 +22,13 @@ class UserService:
         user_repository: UserRepository,
         level_repository: LevelRepository,
         role_repository: RoleRepository,
+        activity_buffer: UserActivityBuffer,
     ) -> None:
         self.db: AsyncSession = db
         self.user_repository: UserRepository = user_repository
         self.level_repository: LevelRepository = level_repository
         self.role_repository: RoleRepository = role_repository
+        self.activity_buffer: UserActivityBuffer = activity_buffer
 
     async def register_student(self, dto: UserCreateDTO) -> UserReadDTO:
         initial_levels = await self.level_repository.find_initial_levels(self.db)
@@ -45,6 +52,7 @@ class UserService:
 
         self.db.add(user)
         await self.db.commit()
+        await self.user_repository.invalidate_cached_user(user.telegram_id)
         return await map_orm_user_to_user_read_dto(user)
 
     async def get_user(
@@ -73,11 +81,36 @@ class UserService:
             return await map_orm_user_to_user_read_dto(user)
         return None
 
+    async def find_user_ids_by_telegram_ids(self, telegram_ids: Sequence[int]) -> dict[int, int]:
+        return await self.user_repository.find_user_ids_by_telegram_ids(self.db, telegram_ids)
+
+    async def find_user_ids_with_role(self, role_name: str) -> list[int]:
+        return await self.user_repository.find_user_ids_with_role(self.db, role_name)
+
+    async def find_user_ids_with_competence_id(self, competence_id: int) -> list[int]:
+        return await self.user_repository.find_user_ids_with_competence_id(self.db, competence_id)
+
     async def track_activity(self, telegram_id: int) -> int | None:
-        user = await self.user_repository.find_user_by_telegram_id(self.db, telegram_id)
-        if not user:
+        context = await self.load_context(telegram_id)
+        return context.user_id if context else None
+
+    async def load_context(self, telegram_id: int) -> UserContext | None:
+        """
+        Загрузить контекст пользователя для middleware и отметить его активность.
+
+        Это один SELECT: отметка активности, если ``last_active_at`` старше ``ACTIVITY_UPDATE_INTERVAL``,
+        уходит в :class:`UserActivityBuffer` и записывается в БД пачкой вне обработки апдейта.
+        """
+        context = await self.user_repository.load_user_context(self.db, telegram_id)
+        if context is None:
             return None
 
-        await self.user_repository.update_user_last_active(self.db, user.id)
-        await self.db.commit()
-        return user.id
+        now = datetime.now(UTC).replace(tzinfo=None)
+        if context.last_active_at is not None and now - context.last_active_at < ACTIVITY_UPDATE_INTERVAL:
+            return context
+
+        self.activity_buffer.record(context.user_id, now)
+        # Без обновления кеша каждый следующий апдейт снова записывал бы отметку до истечения TTL записи.
+        context = replace(context, last_active_at=now)
+        self.user_repository.touch_cached_user_context(context)
+        return context
@@ -4,3 +4,4 @@ from .normalize_message import normalize_message
 from .normalize_competence_names import normalize_competence_names
 from .telegram_user_link import telegram_user_link as telegram_user_link
 from .text_ui import progress_bar
+from .periods import week_bounds_utc
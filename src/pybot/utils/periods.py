@@ -0,0 +1,10 @@
+from datetime import datetime
+
+import pendulum
+
+
+def week_bounds_utc(moment: datetime, business_tz: str) -> tuple[datetime, datetime]:
+    """Границы календарной недели ``business_tz``, в которую попадает ``moment``; всё в naive UTC."""
+    start_local = pendulum.instance(moment, tz="UTC").in_timezone(business_tz).start_of("week")
+    end_local = start_local.add(weeks=1)
+    return start_local.in_timezone("UTC").naive(), end_local.in_timezone("UTC").naive()
@@ -1,4 +1,7 @@
-def has_any_role(user_roles: set[str], required_roles: set[str] | str) -> bool:
+from collections.abc import Set as AbstractSet
+
+
+def has_any_role(user_roles: AbstractSet[str], required_roles: AbstractSet[str] | str) -> bool:
     if isinstance(required_roles, str):
         required_roles = {required_roles}
     if not required_roles:
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import cast
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.types import Chat, Message, MessageEntity, User
+
+from pybot.bot.handlers.points.batch_points import (
+    _extract_listed_telegram_ids,
+    _handle_batch_points_command,
+    _parse_batch_command,
+)
+from pybot.bot.texts import POINTS_BATCH_AMBIGUOUS_LIST, POINTS_BATCH_USAGE
+from pybot.core.constants import PointsTypeEnum, TaskScheduleKind
+from pybot.dto import AdjustUsersPointsDTO, PointsRecipientChange, UserReadDTO
+from pybot.dto.value_objects import Points
+from pybot.services.competence import CompetenceService
+from pybot.services.notification_facade import NotificationFacade
+from pybot.services.points import PointsService
+from pybot.services.user_services import UserService
+
+
+def _build_message(*, text: str, from_user_id: int = 730_001, reply_to: Message | None = None) -> Message:
+    return Message(
+        message_id=2,
+        date=datetime.now(UTC),
+        chat=Chat(id=-100_500, type="supergroup"),
+        from_user=User(id=from_user_id, is_bot=False, first_name="Admin"),
+        text=text,
+        reply_to_message=reply_to,
+    )
+
+
+@dataclass(slots=True)
+class StubUserService:
+    user_ids_by_tg: dict[int, int] = field(default_factory=dict)
+    giver: UserReadDTO | None = None
+
+    async def find_user_ids_by_telegram_ids(self, telegram_ids: list[int]) -> dict[int, int]:
+        return {tg_id: self.user_ids_by_tg[tg_id] for tg_id in telegram_ids if tg_id in self.user_ids_by_tg}
+
+    async def find_user_by_telegram_id(self, tg_id: int) -> UserReadDTO | None:
+        return self.giver
+
+
+@dataclass(slots=True)
+class StubNotificationFacade:
+    notify_users: AsyncMock = field(default_factory=AsyncMock)
+
+
+def test_parse_batch_command_reads_target_amount_and_reason() -> None:
+    command = _parse_batch_command('/points batch academic Mentor 15 "Хакатон"')
+
+    assert command is not None
+    assert command.points_type == PointsTypeEnum.ACADEMIC
+    assert command.target == "Mentor"
+    assert command.amount == 15
+    assert command.reason == "Хакатон"
+
+
+def test_parse_batch_command_without_target_and_reason() -> None:
+    command = _parse_batch_command("/points batch Reputation -5")
+
+    assert command is not None
+    assert command.points_type == PointsTypeEnum.REPUTATION
+    assert command.target is None
+    assert command.amount == -5
+    assert command.reason is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["/points academic 10", "/points batch karma 10", "/points batch academic 10 unquoted reason"],
+)
+def test_parse_batch_command_rejects_malformed_input(text: str) -> None:
+    assert _parse_batch_command(text) is None
+
+
+def test_extract_listed_telegram_ids_reads_one_id_per_line_and_text_mentions() -> None:
+    # Given: список из ID с «@» и без, повтора и упоминания пользователя без username
+    roster = Message(
+        message_id=1,
+        date=datetime.now(UTC),
+        chat=Chat(id=-100_500, type="supergroup"),
+        text="730010\n @730011 \nИван\n730010",
+        entities=[
+            MessageEntity(
+                type="text_mention",
+                offset=17,
+                length=4,
+                user=User(id=730_012, is_bot=False, first_name="Иван"),
+            )
+        ],
+    )
+
+    # When / Then
+    assert _extract_listed_telegram_ids(roster) == [730_012, 730_010, 730_011]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["730010 730011", "Группа 3: 730010", "730010\nзанятие 12", "1. 730010"],
+)
+def test_extract_listed_telegram_ids_rejects_ambiguous_lines(text: str) -> None:
+    assert _extract_listed_telegram_ids(_build_message(text=text)) is None
+
+
+@pytest.mark.asyncio
+async def test_batch_command_rejects_ambiguous_reply_list(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: список, где рядом с ID стоит номер занятия
+    points_service = AsyncMock()
+    roster = _build_message(text="730010\nзанятие 12", from_user_id=730_002)
+    message = _build_message(text="/points batch academic 20", reply_to=roster)
+    reply_mock = AsyncMock()
+    monkeypatch.setattr(Message, "reply", reply_mock)
+
+    # When
+    await _handle_batch_points_command(
+        message,
+        cast(UserService, StubUserService()),
+        cast(PointsService, points_service),
+        cast(CompetenceService, AsyncMock()),
+        cast(NotificationFacade, StubNotificationFacade()),
+    )
+
+    # Then: никому не начислено, админ получил подсказку о формате
+    reply_mock.assert_awaited_once_with(POINTS_BATCH_AMBIGUOUS_LIST)
+    points_service.change_points_bulk.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batch_command_awards_reply_list_in_one_call_and_notifies_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    giver = UserReadDTO(
+        id=1,
+        first_name="Admin",
+        last_name="Test",
+        patronymic=None,
+        telegram_id=730_001,
+        academic_points=Points(value=0, point_type=PointsTypeEnum.ACADEMIC),
+        reputation_points=Points(value=0, point_type=PointsTypeEnum.REPUTATION),
+        join_date=date.today(),
+    )
+    user_service = StubUserService(user_ids_by_tg={730_010: 10, 730_011: 11}, giver=giver)
+    points_service = AsyncMock()
+    points_service.change_points_bulk.return_value = [
+        PointsRecipientChange(user_id=10, telegram_id=730_010, actual_delta=20, new_score=20),
+        PointsRecipientChange(user_id=11, telegram_id=730_011, actual_delta=20, new_score=120),
+    ]
+    notification_facade = StubNotificationFacade()
+    roster = _build_message(text="730010\n@730011\n\n730099", from_user_id=730_002)
+    message = _build_message(text='/points batch academic 20 "Хакатон"', reply_to=roster)
+    reply_mock = AsyncMock()
+    monkeypatch.setattr(Message, "reply", reply_mock)
+
+    await _handle_batch_points_command(
+        message,
+        cast(UserService, user_service),
+        cast(PointsService, points_service),
+        cast(CompetenceService, AsyncMock()),
+        cast(NotificationFacade, notification_facade),
+    )
+
+    points_service.change_points_bulk.assert_awaited_once_with(
+        AdjustUsersPointsDTO(
+            recipient_ids=[10, 11],
+            giver_id=1,
+            points=Points(value=20, point_type=PointsTypeEnum.ACADEMIC),
+            reason="Хакатон",
+        )
+    )
+    notification_facade.notify_users.assert_awaited_once()
+    notify_call = notification_facade.notify_users.await_args
+    assert notify_call is not None
+    notify_dto = notify_call.args[0]
+    assert notify_dto.user_ids == [730_010, 730_011]
+    assert notify_dto.kind == TaskScheduleKind.IMMEDIATE
+    reply_call = reply_mock.await_args
+    assert reply_call is not None
+    reply_text = str(reply_call.args[0])
+    assert "2 пользователей" in reply_text
+    assert "пропущены: 1" in reply_text
+
+
+@pytest.mark.asyncio
+async def test_batch_command_replies_usage_for_malformed_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    points_service = AsyncMock()
+    message = _build_message(text="/points batch")
+    reply_mock = AsyncMock()
+    monkeypatch.setattr(Message, "reply", reply_mock)
+
+    await _handle_batch_points_command(
+        message,
+        cast(UserService, StubUserService()),
+        cast(PointsService, points_service),
+        cast(CompetenceService, AsyncMock()),
+        cast(NotificationFacade, StubNotificationFacade()),
+    )
+
+    reply_mock.assert_awaited_once_with(POINTS_BATCH_USAGE)
+    points_service.change_points_bulk.assert_not_awaited()
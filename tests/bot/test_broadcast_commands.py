@@ -8,7 +8,7 @@ import pytest
 from aiogram.types import Chat, Message, User
 
 from pybot.bot.handlers.broadcast.broadcast_commands import _extract_message_for_broadcast, broadcast_command
-from pybot.bot.texts import BROADCAST_MESSAGE_REQUIRED, BROADCAST_USAGE
+from pybot.bot.texts import BROADCAST_MESSAGE_REQUIRED, BROADCAST_STARTING, BROADCAST_USAGE
 from pybot.domain.exceptions import BroadcastMessageNotSpecifiedError
 from pybot.dto import BroadcastDTO, CompetenceBroadcastDTO, CompetenceReadDTO, RoleBroadcastDTO
 
@@ -48,6 +48,10 @@ class StubCompetenceService:
         return self.competencies
 
 
+def _status_reply_mock() -> AsyncMock:
+    return AsyncMock(return_value=_build_message(BROADCAST_STARTING).model_copy(update={"message_id": 2}))
+
+
 def _last_reply_text(reply_mock: AsyncMock) -> str:
     assert reply_mock.await_args_list
     return str(reply_mock.await_args_list[-1][0][0])
@@ -72,7 +76,7 @@ async def test_broadcast_command_routes_to_all(monkeypatch: pytest.MonkeyPatch)
     message = _build_message("/broadcast @all hello everyone")
     broadcast_service = StubBroadcastService()
     competence_service = StubCompetenceService(competencies=[])
-    reply_mock = AsyncMock()
+    reply_mock = _status_reply_mock()
     monkeypatch.setattr(Message, "reply", reply_mock)
 
     await broadcast_command(
@@ -83,9 +87,11 @@ async def test_broadcast_command_routes_to_all(monkeypatch: pytest.MonkeyPatch)
 
     assert len(broadcast_service.all_messages) == 1
     assert broadcast_service.all_messages[0].message == "hello everyone"
+    assert broadcast_service.all_messages[0].status_chat_id == message.chat.id
+    assert broadcast_service.all_messages[0].status_message_id == 2
     assert broadcast_service.role_messages == []
     assert broadcast_service.competence_messages == []
-    assert reply_mock.await_count == 0
+    reply_mock.assert_awaited_once_with(BROADCAST_STARTING)
 
 
 @pytest.mark.asyncio
@@ -93,7 +99,7 @@ async def test_broadcast_command_routes_to_role(monkeypatch: pytest.MonkeyPatch)
     message = _build_message("/broadcast Admin hello role")
     broadcast_service = StubBroadcastService()
     competence_service = StubCompetenceService(competencies=[])
-    reply_mock = AsyncMock()
+    reply_mock = _status_reply_mock()
     monkeypatch.setattr(Message, "reply", reply_mock)
 
     await broadcast_command(
@@ -107,7 +113,7 @@ async def test_broadcast_command_routes_to_role(monkeypatch: pytest.MonkeyPatch)
     assert broadcast_service.role_messages[0].role_name == "Admin"
     assert broadcast_service.role_messages[0].message == "hello role"
     assert broadcast_service.competence_messages == []
-    assert reply_mock.await_count == 0
+    reply_mock.assert_awaited_once_with(BROADCAST_STARTING)
 
 
 @pytest.mark.asyncio
@@ -120,7 +126,7 @@ async def test_broadcast_command_routes_to_competence(monkeypatch: pytest.Monkey
             CompetenceReadDTO(id=2, name="SQL", description=None),
         ]
     )
-    reply_mock = AsyncMock()
+    reply_mock = _status_reply_mock()
     monkeypatch.setattr(Message, "reply", reply_mock)
 
     await broadcast_command(
@@ -134,7 +140,7 @@ async def test_broadcast_command_routes_to_competence(monkeypatch: pytest.Monkey
     assert len(broadcast_service.competence_messages) == 1
     assert broadcast_service.competence_messages[0].competence_id == 1
     assert broadcast_service.competence_messages[0].message == "hello competence"
-    assert reply_mock.await_count == 0
+    reply_mock.assert_awaited_once_with(BROADCAST_STARTING)
 
 
 @pytest.mark.asyncio
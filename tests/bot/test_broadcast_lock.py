@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import cast
+
+import pytest
+from redis.asyncio import Redis
+
+from pybot.infrastructure.ports import InMemoryBroadcastLock, RedisBroadcastLock
+from pybot.infrastructure.ports.redis_broadcast_lock import _EXTEND_SCRIPT, _RELEASE_SCRIPT
+
+
+class VirtualClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """Minimal stand-in for the Redis commands used by the lease lock; TTLs are not simulated."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.ttls_ms: dict[str, int] = {}
+
+    async def set(self, key: str, value: str, *, nx: bool, px: int) -> bool | None:
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        self.ttls_ms[key] = px
+        return True
+
+    def register_script(self, script: str) -> Callable[..., Awaitable[int]]:
+        async def run(*, keys: list[str], args: list[str | int]) -> int:
+            [key] = keys
+            token, *rest = args
+            if self.values.get(key) != token:
+                return 0
+            if script == _EXTEND_SCRIPT:
+                self.ttls_ms[key] = int(rest[0])
+                return 1
+            if script == _RELEASE_SCRIPT:
+                del self.values[key]
+                del self.ttls_ms[key]
+                return 1
+            raise AssertionError("unexpected script")
+
+        return run
+
+
+@pytest.mark.asyncio
+async def test_in_memory_lock_is_exclusive_until_release() -> None:
+    # Given
+    lock = InMemoryBroadcastLock()
+    token = await lock.acquire("broadcast:running", 60)
+    assert token is not None
+
+    # When
+    second = await lock.acquire("broadcast:running", 60)
+    other_key = await lock.acquire("broadcast:shard:2", 60)
+    await lock.release("broadcast:running", "foreign-token")
+    still_held = await lock.acquire("broadcast:running", 60)
+    await lock.release("broadcast:running", token)
+    after_release = await lock.acquire("broadcast:running", 60)
+
+    # Then
+    assert second is None
+    assert other_key is not None
+    assert still_held is None
+    assert after_release is not None
+
+
+@pytest.mark.asyncio
+async def test_in_memory_lock_lease_expires_unless_extended() -> None:
+    # Given
+    clock = VirtualClock()
+    lock = InMemoryBroadcastLock(clock=clock)
+    token = await lock.acquire("broadcast:running", 10)
+    assert token is not None
+
+    # When
+    clock.now = 8.0
+    extended = await lock.extend("broadcast:running", token, 10)
+    clock.now = 15.0
+    held_after_extend = await lock.acquire("broadcast:running", 10)
+    clock.now = 19.0
+    taken_over = await lock.acquire("broadcast:running", 10)
+
+    # Then
+    assert extended is True
+    assert held_after_extend is None
+    assert taken_over is not None
+    assert await lock.extend("broadcast:running", token, 10) is False
+
+
+@pytest.mark.asyncio
+async def test_redis_lock_uses_set_nx_and_owner_checked_scripts() -> None:
+    # Given
+    redis = FakeRedis()
+    lock = RedisBroadcastLock(cast(Redis, redis))
+
+    # When
+    token = await lock.acquire("broadcast:running", 300)
+    assert token is not None
+    second = await lock.acquire("broadcast:running", 300)
+    foreign_extend = await lock.extend("broadcast:running", "foreign-token", 600)
+    extended = await lock.extend("broadcast:running", token, 600)
+    await lock.release("broadcast:running", "foreign-token")
+    held_after_foreign_release = "pybot:lock:broadcast:running" in redis.values
+    await lock.release("broadcast:running", token)
+
+    # Then
+    assert second is None
+    assert foreign_extend is False
+    assert extended is True
+    assert held_after_foreign_release is True
+    assert redis.values == {}
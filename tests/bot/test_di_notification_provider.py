@@ -4,8 +4,15 @@ import pytest
 from dishka import make_async_container
 
 from pybot.di import containers as di_containers
-from pybot.infrastructure.ports import LoggingNotificationService, TelegramNotificationService
-from pybot.services.ports import NotificationPort
+from pybot.infrastructure.ports import (
+    InMemoryBroadcastLock,
+    LoggingNotificationService,
+    PacedNotificationService,
+    RedisBroadcastLock,
+    SendScheduler,
+    TelegramNotificationService,
+)
+from pybot.services.ports import BroadcastLockPort, NotificationPort
 
 
 def _configure_fake_bot(monkeypatch: pytest.MonkeyPatch, mocker) -> None:
@@ -46,6 +53,7 @@ async def test_ports_provider_resolves_telegram_backend(
 ) -> None:
     _configure_fake_bot(monkeypatch, mocker)
     monkeypatch.setattr(di_containers.settings, "notification_backend", "telegram")
+    monkeypatch.setattr(di_containers.settings, "notification_pacing_enabled", False)
 
     container = make_async_container(
         di_containers.BotProvider(),
@@ -58,6 +66,29 @@ async def test_ports_provider_resolves_telegram_backend(
         await container.close()
 
 
+@pytest.mark.asyncio
+async def test_ports_provider_wraps_telegram_backend_with_shared_scheduler(
+    monkeypatch: pytest.MonkeyPatch,
+    mocker,
+) -> None:
+    _configure_fake_bot(monkeypatch, mocker)
+    monkeypatch.setattr(di_containers.settings, "notification_backend", "telegram")
+    monkeypatch.setattr(di_containers.settings, "notification_pacing_enabled", True)
+
+    container = make_async_container(
+        di_containers.BotProvider(),
+        di_containers.PortsProvider(),
+    )
+    try:
+        notification_port = await container.get(NotificationPort)
+        scheduler = await container.get(SendScheduler)
+        assert isinstance(notification_port, PacedNotificationService)
+        assert isinstance(notification_port.inner, TelegramNotificationService)
+        assert notification_port.scheduler is scheduler
+    finally:
+        await container.close()
+
+
 @pytest.mark.asyncio
 async def test_ports_provider_raises_on_invalid_backend(
     monkeypatch: pytest.MonkeyPatch,
@@ -75,3 +106,42 @@ async def test_ports_provider_raises_on_invalid_backend(
             await container.get(NotificationPort)
     finally:
         await container.close()
+
+
+@pytest.mark.asyncio
+async def test_ports_provider_resolves_in_memory_broadcast_lock(
+    monkeypatch: pytest.MonkeyPatch,
+    mocker,
+) -> None:
+    _configure_fake_bot(monkeypatch, mocker)
+    monkeypatch.setattr(di_containers.settings, "broadcast_lock_backend", "memory")
+
+    container = make_async_container(
+        di_containers.BotProvider(),
+        di_containers.PortsProvider(),
+    )
+    try:
+        broadcast_lock = await container.get(BroadcastLockPort)
+        assert isinstance(broadcast_lock, InMemoryBroadcastLock)
+    finally:
+        await container.close()
+
+
+@pytest.mark.asyncio
+async def test_ports_provider_resolves_redis_broadcast_lock(
+    monkeypatch: pytest.MonkeyPatch,
+    mocker,
+) -> None:
+    _configure_fake_bot(monkeypatch, mocker)
+    monkeypatch.setattr(di_containers.settings, "broadcast_lock_backend", "redis")
+    monkeypatch.setattr(di_containers.settings, "redis_url", "redis://localhost:6379/0")
+
+    container = make_async_container(
+        di_containers.BotProvider(),
+        di_containers.PortsProvider(),
+    )
+    try:
+        broadcast_lock = await container.get(BroadcastLockPort)
+        assert isinstance(broadcast_lock, RedisBroadcastLock)
+    finally:
+        await container.close()
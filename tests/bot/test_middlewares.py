@@ -8,17 +8,27 @@ from typing import cast
 from unittest.mock import AsyncMock
 
 import pytest
-from aiogram.types import Chat, Message, User
-from dishka import AsyncContainer
-from dishka.integrations.aiogram import CONTAINER_NAME
-from sqlalchemy.ext.asyncio import AsyncSession
-
+from aiogram import Bot, Dispatcher, Router
+from aiogram.filters import Command
+from aiogram.types import Chat, Message, TelegramObject, Update, User
+from dishka import AsyncContainer, FromDishka, make_async_container
+from dishka.integrations.aiogram import CONTAINER_NAME, AiogramProvider, setup_dishka
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from pybot.bot.middlewares.container import setup_update_scope
 from pybot.bot.middlewares.logger import LoggerMiddleware
+from pybot.bot.middlewares.metrics import MetricsMiddleware
+from pybot.bot.middlewares.plan import MIDDLEWARE_PLAN_FLAG, MiddlewarePlan, plan_handler_middlewares
 from pybot.bot.middlewares.rate_limit import RateLimitMiddleware
 from pybot.bot.middlewares.role import RoleMiddleware
 from pybot.bot.middlewares.user_activity import UserActivityMiddleware
 from pybot.core.config import settings
+from pybot.core.metrics import MetricsRegistry, record_query
+from pybot.dto import UserContext
+from pybot.infrastructure import RateLimitRule, UserActivityBuffer
 from tests.factories import UserSpec, attach_user_role, create_role, create_user
+from tests.providers import TestDatabaseProvider
 
 
 def _build_message(*, text: str = "/command", from_user_id: int = 700_001) -> Message:
@@ -77,6 +87,35 @@ async def test_logger_middleware_reuses_same_event_id_for_start_and_finish_logs(
     assert second_call.kwargs["handler_name"] == "cmd_start_private"
 
 
+@pytest.mark.asyncio
+async def test_logger_middleware_skips_unsampled_success_but_keeps_errors(
+    monkeypatch: pytest.MonkeyPatch,
+    mocker,
+) -> None:
+    # Given: успешные update не сэмплируются
+    monkeypatch.setattr(settings, "enable_logging_middleware", True)
+    monkeypatch.setattr(settings, "log_success_sample_rate", 0.0)
+    middleware = LoggerMiddleware(enabled=True)
+    message = _build_message(text="/start", from_user_id=700_010)
+    info_mock = mocker.Mock()
+    error_mock = mocker.Mock()
+    extract_spy = mocker.spy(middleware, "_extract_minimal_info")
+    monkeypatch.setattr("pybot.bot.middlewares.logger.logger.info", info_mock)
+    monkeypatch.setattr("pybot.bot.middlewares.logger.logger.error", error_mock)
+
+    # When
+    result = await middleware(AsyncMock(return_value="handled"), message, {})
+    with pytest.raises(RuntimeError):
+        await middleware(AsyncMock(side_effect=RuntimeError("boom")), message, {})
+
+    # Then: разбор update выполнен только для ошибки
+    assert result == "handled"
+    info_mock.assert_not_called()
+    error_mock.assert_called_once()
+    assert error_mock.call_args.kwargs["error_type"] == "RuntimeError"
+    assert extract_spy.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_role_middleware_allows_handler_without_role_flag(monkeypatch: pytest.MonkeyPatch) -> None:
     # Given
@@ -145,7 +184,7 @@ async def test_role_middleware_replies_with_auth_error_when_user_id_is_missing(
 @pytest.mark.asyncio
 async def test_role_middleware_allows_user_with_required_role(
     db_session: AsyncSession,
-    dishka_test_container: AsyncContainer,
+    dishka_request_container: AsyncContainer,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     # Given
@@ -162,7 +201,7 @@ async def test_role_middleware_allows_user_with_required_role(
     data = _build_handler_data(role="Admin")
     data["event_from_user"] = message.from_user
     data["user_id"] = user.id
-    data[CONTAINER_NAME] = dishka_test_container
+    data[CONTAINER_NAME] = dishka_request_container
 
     # When
     result = await middleware(handler, message, data)
@@ -173,10 +212,28 @@ async def test_role_middleware_allows_user_with_required_role(
     answer_mock.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_role_middleware_uses_loaded_user_context_without_db(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: контекст уже загружен UserActivityMiddleware, контейнера в data нет
+    middleware = RoleMiddleware()
+    message = _build_message()
+    handler = AsyncMock(return_value="access-granted")
+    monkeypatch.setattr(Message, "answer", AsyncMock())
+    data = _build_handler_data(role="Admin")
+    data["event_from_user"] = message.from_user
+    data["user_context"] = UserContext(user_id=1, telegram_id=700_001, roles=frozenset({"Admin"}), last_active_at=None)
+
+    # When
+    result = await middleware(handler, message, data)
+
+    # Then
+    assert result == "access-granted"
+
+
 @pytest.mark.asyncio
 async def test_role_middleware_blocks_user_without_required_role(
     db_session: AsyncSession,
-    dishka_test_container: AsyncContainer,
+    dishka_request_container: AsyncContainer,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     # Given
@@ -193,7 +250,7 @@ async def test_role_middleware_blocks_user_without_required_role(
     data = _build_handler_data(role="Admin")
     data["event_from_user"] = message.from_user
     data["user_id"] = user.id
-    data[CONTAINER_NAME] = dishka_test_container
+    data[CONTAINER_NAME] = dishka_request_container
 
     # When
     result = await middleware(handler, message, data)
@@ -210,7 +267,7 @@ async def test_role_middleware_blocks_user_without_required_role(
 @pytest.mark.asyncio
 async def test_user_activity_middleware_enriches_data_and_persists_last_activity(
     db_session: AsyncSession,
-    dishka_test_container: AsyncContainer,
+    dishka_request_container: AsyncContainer,
 ) -> None:
     # Given
     user = await create_user(db_session, spec=UserSpec(telegram_id=700_333))
@@ -223,7 +280,7 @@ async def test_user_activity_middleware_enriches_data_and_persists_last_activity
     handler = AsyncMock(return_value="downstream-handler-result")
     data: dict[str, object] = {
         "event_from_user": message.from_user,
-        CONTAINER_NAME: dishka_test_container,
+        CONTAINER_NAME: dishka_request_container,
     }
 
     # When
@@ -232,9 +289,20 @@ async def test_user_activity_middleware_enriches_data_and_persists_last_activity
     # Then
     assert result == "downstream-handler-result"
     handler.assert_awaited_once_with(message, data)
+    user_context = data["user_context"]
+    assert isinstance(user_context, UserContext)
+    assert user_context == UserContext(
+        user_id=user.id,
+        telegram_id=user.telegram_id,
+        roles=frozenset({"Admin"}),
+        last_active_at=user_context.last_active_at,
+    )
     assert data["user_id"] == user.id
     assert data["user_roles"] == {"Admin"}
 
+    activity_buffer = await dishka_request_container.get(UserActivityBuffer)
+    assert activity_buffer.pending == 1
+    await activity_buffer.flush()
     await db_session.refresh(user)
     assert user.last_active_at is not None
 
@@ -254,7 +322,7 @@ async def test_rate_limit_middleware_skips_limiting_when_flag_is_missing() -> No
     # Then
     assert result == "handled-without-rate-limit"
     handler.assert_awaited_once_with(message, data)
-    assert await middleware.cache.get(f"{message.from_user.id}:moderate") is None
+    assert len(middleware.store) == 0
 
 
 @pytest.mark.asyncio
@@ -288,8 +356,216 @@ async def test_rate_limit_middleware_falls_back_to_moderate_limits(
     # Then
     assert result == "handled-with-fallback"
     handler.assert_awaited_once_with(message, data)
-    limiter = await middleware.cache.get(f"{message.from_user.id}:{command_limit}")
-    assert limiter is not None
-    typed_limiter = cast("object", limiter)
-    assert getattr(typed_limiter, "max_rate") == 7
-    assert getattr(typed_limiter, "time_period") == 13
+    assert len(middleware.store) == 1
+    assert middleware._get_rule(command_limit) == RateLimitRule(rate=7, period_s=13)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_middleware_drops_messages_over_the_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: не больше двух дорогих команд за минуту
+    monkeypatch.setattr(settings, "rate_limit_expensive", 2)
+    monkeypatch.setattr(settings, "time_limit_expensive", 60)
+    registry = MetricsRegistry()
+    middleware = RateLimitMiddleware(registry=registry)
+    message = _build_message(from_user_id=700_666)
+    handler = AsyncMock(return_value="handled")
+    data = _build_handler_data(rate_limit="expensive")
+    answer_mock = AsyncMock()
+    monkeypatch.setattr(Message, "answer", answer_mock)
+
+    # When
+    results = [await middleware(handler, message, data) for _ in range(4)]
+
+    # Then: лишние команды отброшены без вызова хендлера, подсказка отправлена один раз за окно
+    assert results == ["handled", "handled", None, None]
+    assert handler.await_count == 2
+    assert registry.counter_value("rate_limit_dropped_total", command_type="expensive") == 2
+    answer_mock.assert_awaited_once()
+    answer_call = answer_mock.await_args
+    assert answer_call is not None
+    assert "Слишком много запросов" in answer_call.args[0]
+
+
+def test_plan_handler_middlewares_stores_plan_from_flags_and_signature() -> None:
+    # Given
+    router = Router()
+    nested_router = Router()
+    router.include_router(nested_router)
+
+    @router.message(Command("admin"), flags={"role": "Admin", "rate_limit": "expensive"})
+    async def admin_handler(message: Message) -> None: ...
+
+    @nested_router.message(Command("help"), flags={"public": True})
+    async def public_handler(message: Message) -> None: ...
+
+    @nested_router.message(Command("me"), flags={"public": True})
+    async def public_handler_with_user(message: Message, user_id: int) -> None: ...
+
+    # When
+    planned = plan_handler_middlewares(router)
+
+    # Then
+    plans = [
+        handler.flags[MIDDLEWARE_PLAN_FLAG]
+        for observer in (router.message, nested_router.message)
+        for handler in observer.handlers
+    ]
+    assert planned == 3
+    assert plans == [
+        MiddlewarePlan(rate_limit="expensive", role="Admin", load_user_context=True),
+        MiddlewarePlan(load_user_context=False),
+        MiddlewarePlan(load_user_context=True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_user_activity_middleware_skips_container_for_public_handler() -> None:
+    # Given: контейнера в data нет, public handler его и не требует
+    middleware = UserActivityMiddleware()
+    message = _build_message()
+    handler = AsyncMock(return_value="handled")
+    data = _build_handler_data(public=True)
+    data["event_from_user"] = message.from_user
+
+    # When
+    result = await middleware(handler, message, data)
+
+    # Then
+    assert result == "handled"
+    assert "user_context" not in data
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_middleware_uses_precomputed_plan() -> None:
+    # Given: план уже построен при setup_handlers
+    middleware = RateLimitMiddleware()
+    message = _build_message(from_user_id=700_777)
+    handler = AsyncMock(return_value="handled")
+    data = _build_handler_data(**{MIDDLEWARE_PLAN_FLAG: MiddlewarePlan(rate_limit="cheap")})
+
+    # When
+    result = await middleware(handler, message, data)
+
+    # Then
+    assert result == "handled"
+    assert len(middleware.store) == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_records_latency_and_queries_per_handler() -> None:
+    # Given
+    registry = MetricsRegistry()
+    middleware = MetricsMiddleware(registry)
+    message = _build_message()
+
+    async def handler(_event: object, _data: dict[str, object]) -> str:
+        record_query(0.001)
+        record_query(0.001)
+        return "handled"
+
+    data: dict[str, object] = {"handler": SimpleNamespace(callback=SimpleNamespace(__name__="cmd_ping"), flags={})}
+
+    # When
+    result = await middleware(handler, message, data)
+
+    # Then
+    assert result == "handled"
+    duration = registry.histogram("bot_handler_duration_seconds", handler="cmd_ping")
+    queries = registry.histogram("bot_handler_db_queries", handler="cmd_ping")
+    assert duration is not None and duration.count == 1
+    assert queries is not None and queries.total == 2
+
+
+async def _feed_update_through_db_middleware(
+    engine: AsyncEngine,
+    *,
+    own_scope: bool,
+    use_setup_dishka: bool = False,
+) -> tuple[int, set[int], list[AsyncContainer]]:
+    """Прогнать update через middleware и handler, которые оба читают БД; вернуть checkouts, сессии и scope."""
+    checkouts = 0
+    sessions: set[int] = set()
+    containers: list[AsyncContainer] = []
+
+    def on_checkout(*_: object) -> None:
+        nonlocal checkouts
+        checkouts += 1
+
+    async def record_update_scope(handler, tg_event: TelegramObject, data: dict[str, object]) -> object:
+        containers.append(cast(AsyncContainer, data[CONTAINER_NAME]))
+        return await handler(tg_event, data)
+
+    app_container = make_async_container(TestDatabaseProvider(engine), AiogramProvider())
+
+    async def db_middleware(handler, tg_event: TelegramObject, data: dict[str, object]) -> object:
+        container = cast(AsyncContainer, data[CONTAINER_NAME])
+        containers.append(container)
+        if own_scope:
+            # Прежняя схема: middleware открывал собственный REQUEST-scope на APP-контейнере.
+            async with app_container() as middleware_scope:
+                db = await middleware_scope.get(AsyncSession)
+                await db.execute(text("SELECT 1"))
+                sessions.add(id(db))
+        else:
+            db = await container.get(AsyncSession)
+            await db.execute(text("SELECT 1"))
+            sessions.add(id(db))
+        return await handler(tg_event, data)
+
+    async def handler(message: Message, db: FromDishka[AsyncSession]) -> None:
+        await db.execute(text("SELECT 1"))
+        sessions.add(id(db))
+
+    dp = Dispatcher()
+    dp.message.middleware(db_middleware)
+    dp.message.register(handler)
+    if use_setup_dishka:
+        setup_dishka(app_container, dp, auto_inject=True)
+    else:
+        setup_update_scope(app_container, dp)
+    dp.update.outer_middleware(record_update_scope)
+    await dp.emit_startup()
+
+    event.listen(engine.sync_engine, "checkout", on_checkout)
+    try:
+        await dp.feed_update(
+            Bot("123456:TEST_TOKEN"),
+            Update(update_id=1, message=_build_message(text="hello")),
+        )
+    finally:
+        event.remove(engine.sync_engine, "checkout", on_checkout)
+        await app_container.close()
+    return checkouts, sessions, containers
+
+
+@pytest.mark.asyncio
+async def test_middleware_and_handler_share_one_session_and_pool_checkout(
+    create_schema: None,
+    test_engine: AsyncEngine,
+) -> None:
+    # When
+    shared_checkouts, shared_sessions, _ = await _feed_update_through_db_middleware(test_engine, own_scope=False)
+    own_checkouts, own_sessions, _ = await _feed_update_through_db_middleware(test_engine, own_scope=True)
+
+    # Then: собственный scope middleware стоил отдельной сессии и checkout
+    assert (shared_checkouts, len(shared_sessions)) == (1, 1)
+    assert (own_checkouts, len(own_sessions)) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_update_scope_is_reused_by_message_observer(
+    create_schema: None,
+    test_engine: AsyncEngine,
+) -> None:
+    # When
+    _, _, update_scopes = await _feed_update_through_db_middleware(test_engine, own_scope=False)
+    _, _, dishka_scopes = await _feed_update_through_db_middleware(
+        test_engine,
+        own_scope=False,
+        use_setup_dishka=True,
+    )
+
+    # Then: setup_dishka открывает второй scope на observer message, setup_update_scope — нет
+    update_scope, message_scope = update_scopes
+    assert update_scope is message_scope
+    assert dishka_scopes[0] is not dishka_scopes[1]
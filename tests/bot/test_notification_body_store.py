@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any, cast
+
+import pytest
+from redis.asyncio import Redis
+
+from pybot.infrastructure.taskiq.notification_body_store import NotificationBodyStore
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> FakePipeline:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def set(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("set", args, kwargs))
+
+    def expire(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("expire", args, kwargs))
+
+    async def execute(self) -> list[object]:
+        self.redis.round_trips += 1
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Minimal stand-in for the Redis commands used by the body store; TTLs are recorded, not simulated."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.round_trips = 0
+
+    def pipeline(self, *, transaction: bool) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def set(self, key: str, value: str, *, ex: int | None = None, nx: bool = False) -> bool | None:
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode()
+        self.ttls.pop(key, None)
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    async def expire(self, key: str, seconds: int, *, gt: bool = False) -> bool:
+        current = self.ttls.get(key)
+        if key not in self.values or (gt and (current is None or seconds <= current)):
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+
+def _mk_store() -> tuple[FakeRedis, NotificationBodyStore]:
+    redis = FakeRedis()
+    return redis, NotificationBodyStore(cast(Redis, redis))
+
+
+@pytest.mark.asyncio
+async def test_body_store_deduplicates_text_and_only_extends_ttl() -> None:
+    # Given
+    redis, store = _mk_store()
+
+    # When: тот же текст сохраняется дважды, второй раз с меньшим сроком жизни
+    first_key = await store.put("reminder", ttl_seconds=7200)
+    second_key = await store.put("reminder", ttl_seconds=3600)
+
+    # Then: ключ один, TTL не сократился, каждая запись заняла один round trip
+    assert first_key == second_key
+    assert redis.ttls[first_key] == 7200
+    assert redis.round_trips == 2
+    assert await store.get(first_key) == "reminder"
+
+
+@pytest.mark.asyncio
+async def test_body_store_keeps_recurring_text_apart_from_one_off_text() -> None:
+    redis, store = _mk_store()
+
+    one_off_key = await store.put("reminder", ttl_seconds=3600)
+    recurring_key = await store.put("reminder", ttl_seconds=None)
+
+    assert one_off_key != recurring_key
+    assert recurring_key not in redis.ttls
+    assert await store.get(recurring_key) == "reminder"
+    assert await store.get("pybot:notification:body:missing") is None
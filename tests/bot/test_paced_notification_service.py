@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pybot.core.config import settings
+from pybot.core.constants import NotificationPriority
+from pybot.dto import NotifyDTO
+from pybot.infrastructure.ports import PacedNotificationService, SendRateLimits, SendScheduler, TokenBucket
+from pybot.services.ports import NotificationPort, NotificationTemporaryError
+
+
+class VirtualClock:
+    """Виртуальное время: sleep мгновенно двигает часы вперёд."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RecordingNotificationPort(NotificationPort):
+    def __init__(self, clock: VirtualClock, retry_after_for: set[int] | None = None) -> None:
+        self.clock = clock
+        self.retry_after_for = retry_after_for or set()
+        self.sent_at: list[tuple[int, float]] = []
+        self.admin_sent_at: list[float] = []
+
+    async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
+        self.admin_sent_at.append(self.clock.now)
+
+    async def send_message(self, message_data: NotifyDTO) -> None:
+        if message_data.user_id in self.retry_after_for:
+            self.retry_after_for.discard(message_data.user_id)
+            raise NotificationTemporaryError("flood", retry_after_seconds=3.0)
+        self.sent_at.append((message_data.user_id, self.clock.now))
+
+
+def _mk_scheduler(
+    clock: VirtualClock,
+    *,
+    global_rate: float = 10.0,
+    global_burst: int = 1,
+    interactive_weight: int = 10,
+) -> SendScheduler:
+    return SendScheduler(
+        SendRateLimits(
+            global_rate=global_rate,
+            global_burst=global_burst,
+            per_chat_rate=1.0,
+            per_chat_burst=1,
+            interactive_weight=interactive_weight,
+        ),
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+def test_token_bucket_reserves_future_slots() -> None:
+    bucket = TokenBucket(rate=2.0, capacity=2, now=0.0)
+
+    waits = [bucket.reserve(0.0) for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_token_bucket_validates_parameters() -> None:
+    with pytest.raises(ValueError, match="rate"):
+        TokenBucket(rate=0, capacity=1, now=0.0)
+    with pytest.raises(ValueError, match="capacity"):
+        TokenBucket(rate=1, capacity=0, now=0.0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_paces_global_rate_across_chats() -> None:
+    clock = VirtualClock()
+    port = RecordingNotificationPort(clock)
+    service = PacedNotificationService(port, _mk_scheduler(clock, global_rate=10.0))
+
+    for user_id in range(1, 6):
+        await service.send_message(NotifyDTO(user_id=user_id, message="hi"))
+
+    assert [sent_at for _, sent_at in port.sent_at] == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+
+@pytest.mark.asyncio
+async def test_scheduler_paces_per_chat_rate() -> None:
+    clock = VirtualClock()
+    port = RecordingNotificationPort(clock)
+    service = PacedNotificationService(port, _mk_scheduler(clock, global_rate=30.0, global_burst=30))
+
+    for _ in range(3):
+        await service.send_message(NotifyDTO(user_id=42, message="hi"))
+
+    assert [sent_at for _, sent_at in port.sent_at] == pytest.approx([0.0, 1.0, 2.0])
+
+
+@pytest.mark.asyncio
+async def test_scheduler_pauses_and_slows_down_after_retry_after() -> None:
+    clock = VirtualClock()
+    port = RecordingNotificationPort(clock, retry_after_for={1})
+    scheduler = _mk_scheduler(clock, global_rate=10.0)
+    service = PacedNotificationService(port, scheduler)
+
+    with pytest.raises(NotificationTemporaryError):
+        await service.send_message(NotifyDTO(user_id=1, message="hi"))
+    await service.send_message(NotifyDTO(user_id=2, message="hi"))
+
+    assert port.sent_at[0][1] >= 3.0
+    assert scheduler.global_rate == pytest.approx(5.0 + 0.1)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_shares_budget_between_concurrent_senders() -> None:
+    clock = VirtualClock()
+    port = RecordingNotificationPort(clock)
+    service = PacedNotificationService(port, _mk_scheduler(clock, global_rate=10.0))
+
+    await asyncio.gather(*(service.send_message(NotifyDTO(user_id=user_id, message="hi")) for user_id in range(1, 4)))
+    await service.send_role_request_to_admin(request_id=1, requester_user_id=5, role_name="Mentor")
+
+    assert sorted(sent_at for _, sent_at in port.sent_at) == pytest.approx([0.0, 0.1, 0.2])
+    assert port.admin_sent_at == pytest.approx([0.3])
+
+
+@pytest.mark.asyncio
+async def test_scheduler_lets_interactive_send_overtake_queued_broadcast() -> None:
+    # Given: рассылка заняла весь глобальный бюджет, в очереди ещё четыре массовые отправки
+    clock = VirtualClock()
+    port = RecordingNotificationPort(clock)
+    service = PacedNotificationService(port, _mk_scheduler(clock, global_rate=10.0))
+    bulk = [
+        service.send_message(NotifyDTO(user_id=user_id, message="news", priority=NotificationPriority.BULK))
+        for user_id in range(1, 6)
+    ]
+
+    # When: пока рассылка ждёт, приходит решение по заявке на роль
+    await asyncio.gather(*bulk, service.send_message(NotifyDTO(user_id=99, message="approved")))
+
+    # Then: интерактивное уведомление получает первый же освободившийся слот, темп не превышен
+    assert [user_id for user_id, _ in port.sent_at] == [1, 99, 2, 3, 4, 5]
+    assert [sent_at for _, sent_at in port.sent_at] == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+
+
+@pytest.mark.asyncio
+async def test_scheduler_weight_keeps_bulk_lane_moving() -> None:
+    # Given: вес 2 — не больше двух интерактивных отправок подряд обгоняют массовую
+    clock = VirtualClock()
+    scheduler = _mk_scheduler(clock, global_rate=10.0, interactive_weight=2)
+    granted: list[str] = []
+
+    async def acquire(chat_id: int, priority: NotificationPriority) -> None:
+        await scheduler.acquire(chat_id, priority)
+        granted.append(f"{priority.value}-{chat_id}")
+
+    # When
+    await asyncio.gather(
+        acquire(1, NotificationPriority.BULK),
+        *(acquire(chat_id, NotificationPriority.BULK) for chat_id in (2, 3)),
+        *(acquire(chat_id, NotificationPriority.INTERACTIVE) for chat_id in (10, 11, 12, 13)),
+    )
+
+    # Then
+    assert granted == [
+        "bulk-1",
+        "interactive-10",
+        "interactive-11",
+        "bulk-2",
+        "interactive-12",
+        "interactive-13",
+        "bulk-3",
+    ]
+
+
+def test_scheduler_bounds_tracked_chats() -> None:
+    clock = VirtualClock()
+    scheduler = SendScheduler(
+        SendRateLimits(global_rate=30.0, global_burst=30, per_chat_rate=1.0, per_chat_burst=1, max_tracked_chats=2),
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    for chat_id in range(5):
+        asyncio.run(scheduler.acquire(chat_id))
+
+    assert scheduler.tracked_chats == 2
+
+
+def test_paced_service_uses_admin_chat_for_role_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "role_request_admin_tg_id", 777)
+    clock = VirtualClock()
+    scheduler = _mk_scheduler(clock, global_rate=30.0, global_burst=30)
+    service = PacedNotificationService(RecordingNotificationPort(clock), scheduler)
+
+    asyncio.run(service.send_role_request_to_admin(request_id=1, requester_user_id=5, role_name="Mentor"))
+    asyncio.run(service.send_message(NotifyDTO(user_id=777, message="hi")))
+
+    assert clock.sleeps == pytest.approx([1.0])
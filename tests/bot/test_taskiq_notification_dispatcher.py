@@ -7,10 +7,12 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from pybot.core.config import settings
 from pybot.core.constants import TaskScheduleKind
-from pybot.dto import NotifyDTO
+from pybot.dto import BulkNotifyDTO, NotifyDTO
 from pybot.dto.value_objects import TaskSchedule
 from pybot.dto.value_objects import TaskScheduleFieldUnavailableError
+from pybot.infrastructure.taskiq.notification_body_store import NotificationBodyStore
 from pybot.infrastructure.taskiq.taskiq_notification_dispatcher import TaskIQNotificationDispatcher
 
 if TYPE_CHECKING:
@@ -25,13 +27,27 @@ def _fake_schedule_source() -> ListRedisScheduleSource:
     return cast("ListRedisScheduleSource", FakeScheduleSource())
 
 
+class FakeBodyStore:
+    def __init__(self) -> None:
+        self.puts: list[tuple[str, int | None]] = []
+
+    async def put(self, text: str, *, ttl_seconds: int | None) -> str:
+        self.puts.append((text, ttl_seconds))
+        return f"body-{len(self.puts)}"
+
+
+def _fake_body_store() -> tuple[FakeBodyStore, NotificationBodyStore]:
+    store = FakeBodyStore()
+    return store, cast("NotificationBodyStore", store)
+
+
 @pytest.mark.asyncio
 async def test_notification_dispatcher_immediate_smoke_returns_task_id(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     fake_task = SimpleNamespace(kiq=AsyncMock(return_value=SimpleNamespace(task_id="task-42")))
     monkeypatch.setattr(TaskIQNotificationDispatcher, "_task", staticmethod(lambda: fake_task))
-    dispatcher = TaskIQNotificationDispatcher(schedule_source=_fake_schedule_source())
+    dispatcher = TaskIQNotificationDispatcher(schedule_source=_fake_schedule_source(), body_store=_fake_body_store()[1])
 
     result = await dispatcher.dispatch_message(101, "hello", TaskSchedule.immediate())
 
@@ -48,7 +64,7 @@ async def test_notification_dispatcher_schedules_at_specific_time_with_shared_so
     fake_source = _fake_schedule_source()
     fake_task = SimpleNamespace(schedule_by_time=AsyncMock(return_value=SimpleNamespace(schedule_id="schedule-at-1")))
     monkeypatch.setattr(TaskIQNotificationDispatcher, "_task", staticmethod(lambda: fake_task))
-    dispatcher = TaskIQNotificationDispatcher(schedule_source=fake_source)
+    dispatcher = TaskIQNotificationDispatcher(schedule_source=fake_source, body_store=_fake_body_store()[1])
     schedule = TaskSchedule.at(datetime(2026, 3, 8, 18, 0, tzinfo=UTC))
 
     result = await dispatcher.dispatch_message(202, "later", schedule)
@@ -79,7 +95,7 @@ async def test_notification_dispatcher_schedules_interval_and_cron_paths(
         kicker=lambda: fake_kicker,
     )
     monkeypatch.setattr(TaskIQNotificationDispatcher, "_task", staticmethod(lambda: fake_task))
-    dispatcher = TaskIQNotificationDispatcher(schedule_source=fake_source)
+    dispatcher = TaskIQNotificationDispatcher(schedule_source=fake_source, body_store=_fake_body_store()[1])
 
     interval_result = await dispatcher.dispatch_message(303, "tick", TaskSchedule.every(timedelta(minutes=15)))
     cron_schedule = TaskSchedule.cron_based("0 9 * * *", timezone="Asia/Yekaterinburg")
@@ -96,8 +112,57 @@ async def test_notification_dispatcher_schedules_interval_and_cron_paths(
 
 @pytest.mark.asyncio
 async def test_notification_dispatcher_raises_helpful_error_on_missing_interval() -> None:
-    dispatcher = TaskIQNotificationDispatcher(schedule_source=_fake_schedule_source())
+    dispatcher = TaskIQNotificationDispatcher(schedule_source=_fake_schedule_source(), body_store=_fake_body_store()[1])
     broken_schedule = TaskSchedule.model_construct(kind=TaskScheduleKind.INTERVAL, interval=None)
 
     with pytest.raises(TaskScheduleFieldUnavailableError, match="interval is only available for INTERVAL schedules"):
         await dispatcher.dispatch_message(505, "oops", broken_schedule)
+
+
+@pytest.mark.asyncio
+async def test_notification_dispatcher_bulk_stores_text_once_and_enqueues_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given: пять получателей и порции по два
+    monkeypatch.setattr(settings, "notification_bulk_chunk_size", 2)
+    task_ids = iter(["bulk-1", "bulk-2", "bulk-3"])
+    fake_bulk_task = SimpleNamespace(kiq=AsyncMock(side_effect=lambda _: SimpleNamespace(task_id=next(task_ids))))
+    monkeypatch.setattr(TaskIQNotificationDispatcher, "_bulk_task", staticmethod(lambda: fake_bulk_task))
+    store, body_store = _fake_body_store()
+    dispatcher = TaskIQNotificationDispatcher(schedule_source=_fake_schedule_source(), body_store=body_store)
+
+    # When
+    result = await dispatcher.dispatch_bulk([1, 2, 3, 4, 5], "  reminder  ", TaskSchedule.immediate())
+
+    # Then: текст сохранён один раз, задачи несут только ключ и порцию получателей
+    assert result == ["bulk-1", "bulk-2", "bulk-3"]
+    assert store.puts == [("reminder", settings.notification_body_ttl_s)]
+    payloads = [call.args[0] for call in fake_bulk_task.kiq.await_args_list]
+    assert payloads == [
+        BulkNotifyDTO(user_ids=[1, 2], body_key="body-1"),
+        BulkNotifyDTO(user_ids=[3, 4], body_key="body-1"),
+        BulkNotifyDTO(user_ids=[5], body_key="body-1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_notification_dispatcher_bulk_keeps_recurring_text_without_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_source = _fake_schedule_source()
+    fake_bulk_task = SimpleNamespace(
+        schedule_by_interval=AsyncMock(return_value=SimpleNamespace(schedule_id="schedule-bulk-1"))
+    )
+    monkeypatch.setattr(TaskIQNotificationDispatcher, "_bulk_task", staticmethod(lambda: fake_bulk_task))
+    store, body_store = _fake_body_store()
+    dispatcher = TaskIQNotificationDispatcher(schedule_source=fake_source, body_store=body_store)
+
+    result = await dispatcher.dispatch_bulk([7, 8], "weekly", TaskSchedule.every(timedelta(days=7)))
+
+    assert result == ["schedule-bulk-1"]
+    assert store.puts == [("weekly", None)]
+    fake_bulk_task.schedule_by_interval.assert_awaited_once_with(
+        fake_source,
+        timedelta(days=7),
+        notification_data=BulkNotifyDTO(user_ids=[7, 8], body_key="body-1"),
+    )
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 from collections.abc import Awaitable
-from typing import Protocol, cast
+from typing import Any, Protocol, cast
 from unittest.mock import AsyncMock
 
 import pytest
 from pydantic import ValidationError
 
-from pybot.dto import NotificationTaskPayload, NotifyDTO
-from pybot.infrastructure.taskiq.tasks.notification import send_notification_task
+from pybot.dto import BulkNotificationTaskPayload, BulkNotifyDTO, NotificationTaskPayload, NotifyDTO
+from pybot.infrastructure.taskiq.notification_body_store import NotificationBodyStore
+from pybot.infrastructure.taskiq.tasks.notification import send_bulk_notification_task, send_notification_task
 from pybot.services.ports import NotificationPermanentError, NotificationPort, NotificationTemporaryError
 
 
@@ -115,3 +116,65 @@ async def test_send_notification_task_returns_permanent_failure_payload() -> Non
 def test_notify_dto_rejects_blank_message_before_task_execution() -> None:
     with pytest.raises(ValidationError, match="message must not be empty"):
         NotifyDTO(user_id=444, message="   ")
+
+
+class BodyStoreStub:
+    def __init__(self, bodies: dict[str, str]) -> None:
+        self.bodies = bodies
+
+    async def get(self, key: str) -> str | None:
+        return self.bodies.get(key)
+
+
+class BulkDishkaContainerStub:
+    def __init__(self, notification_port: NotificationPort, body_store: BodyStoreStub) -> None:
+        self._dependencies: dict[type, object] = {
+            NotificationPort: notification_port,
+            NotificationBodyStore: body_store,
+        }
+
+    async def get(self, dependency_type: type, *args: object, **kwargs: object) -> object:
+        return self._dependencies[dependency_type]
+
+
+async def _run_bulk_task(
+    notification_port: NotificationPort,
+    body_store: BodyStoreStub,
+    notification_data: BulkNotifyDTO,
+) -> BulkNotificationTaskPayload:
+    task = cast(Any, send_bulk_notification_task)
+    return await task(
+        notification_data=notification_data,
+        dishka_container=BulkDishkaContainerStub(notification_port, body_store),
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_bulk_notification_task_sends_stored_text_to_every_recipient() -> None:
+    # Given: текст в хранилище и постоянная ошибка у одного получателя
+    async def send(message_data: NotifyDTO) -> None:
+        if message_data.user_id == 2:
+            raise NotificationPermanentError("blocked")
+
+    send_message_mock = AsyncMock(side_effect=send)
+    notification_port = NotificationPortSpy(send_message_mock)
+    body_store = BodyStoreStub({"body-1": "reminder"})
+
+    # When
+    result = await _run_bulk_task(notification_port, body_store, BulkNotifyDTO(user_ids=[1, 2, 3], body_key="body-1"))
+
+    # Then
+    assert result == BulkNotificationTaskPayload(sent=2, failed_permanent=1)
+    sent_to = sorted(call.args[0].user_id for call in send_message_mock.await_args_list)
+    assert sent_to == [1, 2, 3]
+    assert {call.args[0].message for call in send_message_mock.await_args_list} == {"reminder"}
+
+
+@pytest.mark.asyncio
+async def test_send_bulk_notification_task_fails_chunk_when_text_expired() -> None:
+    notification_port = NotificationPortSpy(AsyncMock())
+
+    result = await _run_bulk_task(notification_port, BodyStoreStub({}), BulkNotifyDTO(user_ids=[1, 2], body_key="gone"))
+
+    assert result == BulkNotificationTaskPayload(failed_permanent=2)
+    notification_port.send_message_mock.assert_not_awaited()
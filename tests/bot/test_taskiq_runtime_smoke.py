@@ -34,8 +34,9 @@ async def test_taskiq_runtime_smoke_builds_singletons_and_wires_worker_hooks(
     """Smoke test for TaskIQ runtime wiring with a friendly failure signal."""
 
     class FakeBroker:
-        def __init__(self, url: str) -> None:
+        def __init__(self, url: str, additional_streams: dict[str, str] | None = None) -> None:
             self.url = url
+            self.additional_streams = additional_streams or {}
             self.handlers: list[tuple[object, object]] = []
 
         def add_event_handler(self, event: object, handler: object) -> None:
@@ -68,9 +69,16 @@ async def test_taskiq_runtime_smoke_builds_singletons_and_wires_worker_hooks(
         "TaskIQ scheduler singleton changed unexpectedly. Please re-check runtime wiring."
     )
     assert broker.url == "redis://smoke-test:6379/7"
+    assert broker.additional_streams == {taskiq_app.BULK_QUEUE_NAME: ">"}, (
+        "Worker must also consume the bulk stream, otherwise broadcasts are never executed."
+    )
     assert source.url == "redis://smoke-test:6379/7"
     assert scheduler.broker is broker
-    assert scheduler.sources == [source]
+    assert scheduler.sources[0] is source
+    assert isinstance(scheduler.sources[1], taskiq_app.LabelScheduleSource), (
+        "Periodic tasks declared with a schedule label would never be enqueued without the label source."
+    )
+    assert scheduler.sources[1].broker is broker
     assert broker.handlers == [
         (taskiq_app.TaskiqEvents.WORKER_STARTUP, taskiq_app._on_worker_startup),
         (taskiq_app.TaskiqEvents.WORKER_SHUTDOWN, taskiq_app._on_worker_shutdown),
@@ -6,7 +6,13 @@ from unittest.mock import AsyncMock
 import pytest
 import pytest_asyncio
 from aiogram import Bot
-from aiogram.exceptions import TelegramAPIError, TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+)
 from aiogram.methods import SendMessage
 from pytest_mock import MockerFixture
 
@@ -248,3 +254,72 @@ async def test_send_message_maps_unexpected_error_to_permanent_error(fake_bot: B
         await service.send_message(NotifyDTO(user_id=RECIPIENT_USER_ID, message="hello"))
 
     fake_bot.send_message.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_message_flags_blocked_recipient_as_unreachable(fake_bot: BotFixture) -> None:
+    fake_bot.send_message.side_effect = TelegramForbiddenError(_dummy_method(), "bot was blocked by the user")
+    service = TelegramNotificationService(fake_bot.bot)
+
+    with pytest.raises(NotificationPermanentError) as exc_info:
+        await service.send_message(NotifyDTO(user_id=RECIPIENT_USER_ID, message="hello"))
+
+    _expect(exc_info.value.recipient_unreachable, "blocked recipient must be flagged as unreachable")
+
+
+@pytest.mark.asyncio
+async def test_send_message_does_not_flag_generic_bad_request_as_unreachable(fake_bot: BotFixture) -> None:
+    fake_bot.send_message.side_effect = TelegramBadRequest(_dummy_method(), "message is too long")
+    service = TelegramNotificationService(fake_bot.bot)
+
+    with pytest.raises(NotificationPermanentError) as exc_info:
+        await service.send_message(NotifyDTO(user_id=RECIPIENT_USER_ID, message="hello"))
+
+    _expect(not exc_info.value.recipient_unreachable, "malformed request must not exclude the recipient")
+
+
+@pytest.mark.asyncio
+async def test_probe_recipient_uses_chat_action_and_flags_missing_chat(
+    fake_bot: BotFixture,
+    mocker: MockerFixture,
+) -> None:
+    send_chat_action: AsyncMock = mocker.AsyncMock(
+        side_effect=[True, TelegramBadRequest(_dummy_method(), "Bad Request: chat not found")]
+    )
+    mocker.patch.object(fake_bot.bot, "send_chat_action", send_chat_action)
+    service = TelegramNotificationService(fake_bot.bot)
+
+    await service.probe_recipient(RECIPIENT_USER_ID)
+    with pytest.raises(NotificationPermanentError) as exc_info:
+        await service.probe_recipient(RECIPIENT_USER_ID)
+
+    _expect(exc_info.value.recipient_unreachable, "missing chat must be flagged as unreachable")
+    send_chat_action.assert_awaited_with(chat_id=RECIPIENT_USER_ID, action="typing")
+    fake_bot.send_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_edit_message_ignores_not_modified_and_maps_errors(
+    fake_bot: BotFixture,
+    mocker: MockerFixture,
+) -> None:
+    edit_message_text: AsyncMock = mocker.AsyncMock(
+        side_effect=[
+            True,
+            TelegramBadRequest(_dummy_method(), "Bad Request: message is not modified"),
+            TelegramBadRequest(_dummy_method(), "Bad Request: message to edit not found"),
+            TelegramRetryAfter(_dummy_method(), "Flood control exceeded", retry_after=int(RETRY_AFTER_SECONDS)),
+        ]
+    )
+    mocker.patch.object(fake_bot.bot, "edit_message_text", edit_message_text)
+    service = TelegramNotificationService(fake_bot.bot)
+
+    await service.edit_message(ADMIN_TG_ID, 7, "progress")
+    await service.edit_message(ADMIN_TG_ID, 7, "progress")
+    with pytest.raises(NotificationPermanentError):
+        await service.edit_message(ADMIN_TG_ID, 7, "progress")
+    with pytest.raises(NotificationTemporaryError) as exc_info:
+        await service.edit_message(ADMIN_TG_ID, 7, "progress")
+
+    _expect(exc_info.value.retry_after_seconds == RETRY_AFTER_SECONDS, "retry_after must be propagated")
+    edit_message_text.assert_awaited_with(chat_id=ADMIN_TG_ID, message_id=7, text="progress")
@@ -8,7 +8,8 @@ from pybot.bot import tg_bot_run
 
 @pytest.mark.asyncio
 async def test_tg_bot_main_uses_di_bot_and_closes_container(monkeypatch: pytest.MonkeyPatch, mocker) -> None:
-    fake_container = SimpleNamespace(close=mocker.AsyncMock())
+    activity_buffer = SimpleNamespace(close=mocker.AsyncMock())
+    fake_container = SimpleNamespace(close=mocker.AsyncMock(), get=mocker.AsyncMock(return_value=activity_buffer))
     fake_bot = SimpleNamespace(
         delete_webhook=mocker.AsyncMock(),
         session=SimpleNamespace(close=mocker.AsyncMock()),
@@ -42,6 +43,7 @@ async def test_tg_bot_main_uses_di_bot_and_closes_container(monkeypatch: pytest.
     runtime_alerts_service.notify_startup.assert_awaited_once()
     runtime_alerts_service.notify_shutdown.assert_awaited_once()
     fake_dp.start_polling.assert_awaited_once_with(fake_bot)
+    activity_buffer.close.assert_awaited_once()
     fake_container.close.assert_awaited_once()
     fake_bot.session.close.assert_not_awaited()
 
@@ -79,3 +81,67 @@ async def test_tg_bot_main_keeps_shutdown_running_when_runtime_alert_delivery_fa
     runtime_alerts_service.notify_startup.assert_awaited_once()
     runtime_alerts_service.notify_shutdown.assert_awaited_once()
     fake_container.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_tg_bot_main_serves_webhook_instead_of_polling(monkeypatch: pytest.MonkeyPatch, mocker) -> None:
+    fake_container = SimpleNamespace(close=mocker.AsyncMock(), get=mocker.AsyncMock())
+    fake_bot = SimpleNamespace(delete_webhook=mocker.AsyncMock())
+    fake_dp = SimpleNamespace(start_polling=mocker.AsyncMock())
+    run_webhook_mock = mocker.AsyncMock(side_effect=asyncio.CancelledError())
+
+    monkeypatch.setattr(tg_bot_run.settings, "bot_runtime_mode", "webhook")
+    monkeypatch.setattr(tg_bot_run, "setup_dispatcher", mocker.AsyncMock(return_value=fake_dp))
+    monkeypatch.setattr(tg_bot_run, "setup_di", mocker.AsyncMock(return_value=fake_container))
+    monkeypatch.setattr(tg_bot_run, "setup_bot", mocker.AsyncMock(return_value=fake_bot))
+    runtime_alerts_service = SimpleNamespace(notify_startup=mocker.AsyncMock(), notify_shutdown=mocker.AsyncMock())
+    monkeypatch.setattr(
+        tg_bot_run,
+        "setup_runtime_alerts_service",
+        mocker.AsyncMock(return_value=runtime_alerts_service),
+    )
+    monkeypatch.setattr(tg_bot_run, "setup_middlewares", mocker.AsyncMock())
+    monkeypatch.setattr(tg_bot_run, "setup_handlers", mocker.Mock())
+    monkeypatch.setattr(tg_bot_run, "run_webhook", run_webhook_mock)
+
+    with pytest.raises(asyncio.CancelledError):
+        await tg_bot_run.tg_bot_main()
+
+    run_webhook_mock.assert_awaited_once_with(fake_dp, fake_bot, None)
+    fake_bot.delete_webhook.assert_not_awaited()
+    fake_dp.start_polling.assert_not_awaited()
+    fake_container.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_tg_bot_main_polls_through_update_executor_when_lanes_set(
+    monkeypatch: pytest.MonkeyPatch, mocker
+) -> None:
+    fake_container = SimpleNamespace(close=mocker.AsyncMock(), get=mocker.AsyncMock())
+    fake_bot = SimpleNamespace(delete_webhook=mocker.AsyncMock())
+    fake_dp = SimpleNamespace(start_polling=mocker.AsyncMock())
+    poll_updates_mock = mocker.AsyncMock(side_effect=asyncio.CancelledError())
+
+    monkeypatch.setattr(tg_bot_run.settings, "update_executor_lanes", 4)
+    monkeypatch.setattr(tg_bot_run, "setup_dispatcher", mocker.AsyncMock(return_value=fake_dp))
+    monkeypatch.setattr(tg_bot_run, "setup_di", mocker.AsyncMock(return_value=fake_container))
+    monkeypatch.setattr(tg_bot_run, "setup_bot", mocker.AsyncMock(return_value=fake_bot))
+    runtime_alerts_service = SimpleNamespace(notify_startup=mocker.AsyncMock(), notify_shutdown=mocker.AsyncMock())
+    monkeypatch.setattr(
+        tg_bot_run,
+        "setup_runtime_alerts_service",
+        mocker.AsyncMock(return_value=runtime_alerts_service),
+    )
+    monkeypatch.setattr(tg_bot_run, "setup_middlewares", mocker.AsyncMock())
+    monkeypatch.setattr(tg_bot_run, "setup_handlers", mocker.Mock())
+    monkeypatch.setattr(tg_bot_run, "poll_updates", poll_updates_mock)
+
+    with pytest.raises(asyncio.CancelledError):
+        await tg_bot_run.tg_bot_main()
+
+    executor = poll_updates_mock.await_args.args[2]
+    assert isinstance(executor, tg_bot_run.OrderedUpdateExecutor)
+    assert executor.stats().lanes == 4
+    fake_bot.delete_webhook.assert_awaited_once_with(drop_pending_updates=True)
+    fake_dp.start_polling.assert_not_awaited()
+    fake_container.close.assert_awaited_once()
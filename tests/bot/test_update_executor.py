@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from pybot.bot.update_executor import OrderedUpdateExecutor, update_ordering_key
+from pybot.core.metrics import MetricsRegistry
+
+BOT = cast(Bot, SimpleNamespace())
+
+
+def _message_update(update_id: int, chat_id: int) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "User"},
+                "text": "hi",
+            },
+        }
+    )
+
+
+def _build_executor(feed_update: Any, *, lanes: int, queue_size: int = 10) -> OrderedUpdateExecutor:
+    dispatcher = SimpleNamespace(feed_update=feed_update, silent_call_request=None)
+    return OrderedUpdateExecutor(
+        cast(Dispatcher, dispatcher),
+        lanes=lanes,
+        queue_size=queue_size,
+        registry=MetricsRegistry(),
+    )
+
+
+def test_update_ordering_key_uses_chat_id() -> None:
+    assert update_ordering_key(_message_update(1, chat_id=42)) == 42
+
+
+@pytest.mark.asyncio
+async def test_executor_keeps_chat_order_and_runs_chats_in_parallel() -> None:
+    # Given: update чата 1 блокируется, пока его не отпустят
+    release = asyncio.Event()
+    handled: list[tuple[int, int]] = []
+
+    async def feed_update(bot: Bot, update: Update) -> None:
+        assert update.message is not None
+        chat_id = update.message.chat.id
+        if chat_id == 1 and update.update_id == 1:
+            await release.wait()
+        handled.append((chat_id, update.update_id))
+
+    executor = _build_executor(feed_update, lanes=2)
+    executor.start()
+
+    # When
+    for update_id, chat_id in ((1, 1), (2, 1), (3, 2)):
+        await executor.submit(BOT, _message_update(update_id, chat_id))
+    await asyncio.sleep(0.01)
+    handled_before_release = list(handled)
+    release.set()
+    await executor.close(timeout_s=1.0)
+
+    # Then: чат 2 не ждал чат 1, а внутри чата 1 порядок сохранён
+    assert handled_before_release == [(2, 3)]
+    assert handled == [(2, 3), (1, 1), (1, 2)]
+    assert executor.stats().processed == 3
+
+
+@pytest.mark.asyncio
+async def test_executor_applies_backpressure_when_lane_is_full() -> None:
+    # Given: одна полоса с очередью на один update, обработчик занят
+    release = asyncio.Event()
+
+    async def feed_update(bot: Bot, update: Update) -> None:
+        await release.wait()
+
+    executor = _build_executor(feed_update, lanes=1, queue_size=1)
+    executor.start()
+    await executor.submit(BOT, _message_update(1, chat_id=1))
+    await asyncio.sleep(0)
+    await executor.submit(BOT, _message_update(2, chat_id=1))
+
+    # When
+    blocked = asyncio.create_task(executor.submit(BOT, _message_update(3, chat_id=1)))
+    await asyncio.sleep(0.01)
+
+    # Then
+    assert not blocked.done()
+    assert executor.stats().queue_depth == 1
+    assert executor.registry.gauge_value("update_executor_queue_depth", lane=0) == 1
+    release.set()
+    await blocked
+    await executor.close(timeout_s=1.0)
+    assert executor.stats().processed == 3
+    assert executor.registry.counter_value("update_executor_busy_seconds_total", lane=0) > 0
+
+
+@pytest.mark.asyncio
+async def test_executor_survives_handler_errors_and_rejects_after_close() -> None:
+    calls: list[int] = []
+
+    async def feed_update(bot: Bot, update: Update) -> None:
+        calls.append(update.update_id)
+        if update.update_id == 1:
+            raise RuntimeError("boom")
+
+    executor = _build_executor(feed_update, lanes=1)
+    executor.start()
+    await executor.submit(BOT, _message_update(1, chat_id=1))
+    await executor.submit(BOT, _message_update(2, chat_id=1))
+    await executor.close(timeout_s=1.0)
+
+    assert calls == [1, 2]
+    with pytest.raises(RuntimeError):
+        await executor.submit(BOT, _message_update(3, chat_id=1))
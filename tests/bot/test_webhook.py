@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, cast
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import Bot, Dispatcher
+
+from pybot.bot.webhook import BoundedWebhookRequestHandler, WebhookLimits
+
+SECRET = "s3cret-token"
+
+
+def _build_request(secret: str, update_id: int) -> Any:
+    return SimpleNamespace(
+        headers={"X-Telegram-Bot-Api-Secret-Token": secret},
+        json=AsyncMock(return_value={"update_id": update_id}),
+    )
+
+
+def _build_handler(
+    dispatcher: object,
+    *,
+    max_concurrency: int = 2,
+    drain_timeout_s: float = 1.0,
+) -> BoundedWebhookRequestHandler:
+    bot = SimpleNamespace(session=SimpleNamespace(json_loads=json.loads, json_dumps=json.dumps))
+    return BoundedWebhookRequestHandler(
+        cast(Dispatcher, dispatcher),
+        cast(Bot, bot),
+        limits=WebhookLimits(secret_token=SECRET, max_concurrency=max_concurrency, drain_timeout_s=drain_timeout_s),
+    )
+
+
+@pytest.mark.asyncio
+async def test_webhook_rejects_request_with_wrong_secret_token() -> None:
+    # Given
+    dispatcher = SimpleNamespace(feed_raw_update=AsyncMock())
+    handler = _build_handler(dispatcher)
+
+    # When
+    response = await handler.handle(_build_request("wrong", update_id=1))
+
+    # Then
+    assert response.status == 401
+    dispatcher.feed_raw_update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_webhook_waits_for_free_slot_and_drains_on_close() -> None:
+    # Given: один слот, первый update обрабатывается, пока его не отпустят
+    release = asyncio.Event()
+    handled: list[int] = []
+
+    async def feed_raw_update(*, bot: object, update: dict[str, int]) -> None:
+        await release.wait()
+        handled.append(update["update_id"])
+
+    handler = _build_handler(SimpleNamespace(feed_raw_update=feed_raw_update), max_concurrency=1)
+    first = await handler.handle(_build_request(SECRET, update_id=1))
+
+    # When: второй запрос не получает ответа, пока слот занят
+    second = asyncio.create_task(handler.handle(_build_request(SECRET, update_id=2)))
+    await asyncio.sleep(0)
+    assert not second.done()
+    release.set()
+    await second
+    await handler.close()
+
+    # Then
+    assert first.status == 200
+    assert handled == [1, 2]
+    assert handler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_webhook_close_cancels_updates_after_drain_timeout() -> None:
+    # Given
+    async def feed_raw_update(*, bot: object, update: dict[str, int]) -> None:
+        await asyncio.Event().wait()
+
+    handler = _build_handler(SimpleNamespace(feed_raw_update=feed_raw_update), drain_timeout_s=0.01)
+    await handler.handle(_build_request(SECRET, update_id=1))
+
+    # When
+    await handler.close()
+
+    # Then
+    assert handler.in_flight == 0
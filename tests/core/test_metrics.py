@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pybot.core.metrics import (
+    QUERY_COUNT_BUCKETS,
+    MetricsRegistry,
+    metrics,
+    record_query,
+    render_prometheus,
+    track_queries,
+)
+
+
+def test_track_queries_counts_only_statements_of_current_update() -> None:
+    # Given
+    record_query(0.5)
+
+    # When
+    with track_queries() as stats:
+        record_query(0.01)
+        record_query(0.02)
+    record_query(0.5)
+
+    # Then
+    assert stats.count == 2
+    assert round(stats.seconds, 3) == 0.03
+    assert metrics.counter_value("db_queries_total") >= 4
+
+
+def test_render_prometheus_outputs_cumulative_histogram_buckets() -> None:
+    # Given
+    registry = MetricsRegistry()
+    for count in (1, 1, 12):
+        registry.observe("bot_handler_db_queries", count, buckets=QUERY_COUNT_BUCKETS, handler="cmd_leaderboard")
+
+    # When
+    body = render_prometheus([registry.snapshot()])
+
+    # Then
+    assert "# TYPE bot_handler_db_queries histogram" in body
+    assert 'bot_handler_db_queries_bucket{handler="cmd_leaderboard",le="1"} 2' in body
+    assert 'bot_handler_db_queries_bucket{handler="cmd_leaderboard",le="8"} 2' in body
+    assert 'bot_handler_db_queries_bucket{handler="cmd_leaderboard",le="13"} 3' in body
+    assert 'bot_handler_db_queries_bucket{handler="cmd_leaderboard",le="+Inf"} 3' in body
+    assert 'bot_handler_db_queries_sum{handler="cmd_leaderboard"} 14' in body
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pybot.core.constants import PointsTypeEnum
+from pybot.domain.services import LevelCalculator, LevelSnapshot, LevelThresholdIndex
+
+
+def _level(level_id: int, required_points: int) -> LevelSnapshot:
+    return LevelSnapshot(
+        id=level_id,
+        name=f"A{level_id}",
+        level_type=PointsTypeEnum.ACADEMIC,
+        required_points=required_points,
+    )
+
+
+def test_threshold_index_resolves_current_next_and_previous_levels() -> None:
+    # Given
+    basic, middle, top = _level(1, 0), _level(2, 100), _level(3, 300)
+    index = LevelThresholdIndex([top, basic, middle])
+
+    # Then
+    assert index.current(0) == basic
+    assert index.current(99) == basic
+    assert index.current(100) == middle
+    assert index.current(1_000) == top
+    assert index.next(99) == middle
+    assert index.next(100) == top
+    assert index.next(300) is None
+    assert index.previous(middle) == basic
+    assert index.previous(basic) is None
+
+
+def test_calculate_level_returns_none_below_lowest_threshold() -> None:
+    # Given
+    calculator = LevelCalculator()
+    index = LevelThresholdIndex([_level(1, 10)])
+
+    # Then
+    assert calculator.calculate_level(5, index) is None
+    assert calculator.calculate_level(10, index) == _level(1, 10)
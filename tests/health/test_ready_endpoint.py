@@ -2,14 +2,21 @@ from __future__ import annotations
 
 import json
 from collections.abc import Mapping
-from typing import Any
+from typing import Any, cast
 
 import pytest
 from fastapi.responses import JSONResponse
 
+from pybot.core.constants import BroadcastJobStatus
+from pybot.core.metrics import MetricsRegistry
+from pybot.domain.exceptions import BroadcastJobNotFoundError
+from pybot.dto import BroadcastProgressDTO
 from pybot.dto.health_dto import HealthStatusDTO
-from pybot.health.app import ready
+from pybot.health.app import broadcast_progress, prometheus_metrics, ready
+from pybot.infrastructure import MetricsSnapshotWriter
+from pybot.services.broadcast_progress import BroadcastProgressService
 from pybot.services.health import HealthService, SupportsExecute
+from pybot.services.metrics import MetricsService
 
 
 class _FakeSession(SupportsExecute):
@@ -81,3 +88,55 @@ async def test_ready_endpoint_returns_503_on_fail() -> None:
     payload = json.loads(bytes(response.body).decode("utf-8"))
     assert payload["status"] == "fail", "Payload should report fail status."
     assert payload["checks"][0]["details"] == "db down", "Payload should include failure details."
+
+
+class _StubProgressService:
+    def __init__(self, progress: BroadcastProgressDTO | None) -> None:
+        self._progress = progress
+
+    async def get_progress(self, job_id: int) -> BroadcastProgressDTO:
+        if self._progress is None or self._progress.job_id != job_id:
+            raise BroadcastJobNotFoundError(job_id=job_id)
+        return self._progress
+
+
+@pytest.mark.asyncio
+async def test_broadcast_progress_endpoint_returns_snapshot_or_404() -> None:
+    """Friendly test: /broadcasts/{job_id} should return the snapshot and 404 for unknown jobs."""
+    snapshot = BroadcastProgressDTO(
+        job_id=3,
+        status=BroadcastJobStatus.RUNNING,
+        total=10,
+        attempted=4,
+        sent=4,
+        failed=0,
+        skipped=0,
+        remaining=6,
+    )
+    service = cast(BroadcastProgressService, _StubProgressService(snapshot))
+
+    found = await broadcast_progress(3, service)
+    missing = await broadcast_progress(4, service)
+
+    assert found == snapshot, "Known job should return its progress snapshot."
+    assert isinstance(missing, JSONResponse), "Unknown job should produce a JSONResponse."
+    assert missing.status_code == 404, "HTTP status must be 404 for an unknown broadcast job."
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_merges_process_snapshots(tmp_path) -> None:
+    """Metrics of the bot process come from its snapshot file, the health process adds its own registry."""
+    bot_registry = MetricsRegistry()
+    bot_registry.observe("bot_handler_duration_seconds", 0.02, handler="cmd_ping")
+    bot_registry.inc("broadcast_deliveries_total", status="sent")
+    MetricsSnapshotWriter(bot_registry, tmp_path, interval_s=10).write()
+    health_registry = MetricsRegistry()
+    health_registry.inc("broadcast_deliveries_total", status="sent")
+
+    response = await prometheus_metrics(MetricsService(health_registry, tmp_path, export_interval_s=10))
+
+    body = bytes(response.body).decode()
+    assert response.media_type.startswith("text/plain"), "Prometheus expects the text exposition format."
+    assert 'broadcast_deliveries_total{status="sent"} 2' in body, "Counters of all processes must be summed."
+    assert 'bot_handler_duration_seconds_bucket{handler="cmd_ping",le="0.025"} 1' in body
+    assert 'bot_handler_duration_seconds_count{handler="cmd_ping"} 1' in body
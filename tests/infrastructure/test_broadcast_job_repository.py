@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from unittest.mock import AsyncMock
+
+import pytest
+
+from pybot.core.config import settings
+from pybot.core.constants import BroadcastAudienceKind, BroadcastDeliveryStatus, BroadcastJobStatus
+from pybot.domain.exceptions import BroadcastJobNotFoundError
+from pybot.dto import BroadcastDTO, NotifyDTO
+from pybot.infrastructure.broadcast_job_repository import BroadcastJobRepository
+from pybot.infrastructure.ports import InMemoryBroadcastLock
+from pybot.infrastructure.user_repository import UserRepository
+from pybot.services.broadcast import BroadcastService
+from pybot.services.ports import NotificationPort
+from tests.factories import UserSpec, create_user
+
+
+class CountingNotificationPort(NotificationPort):
+    def __init__(self) -> None:
+        self.sent_to: Counter[int] = Counter()
+
+    async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
+        return None
+
+    async def send_message(self, message_data: NotifyDTO) -> None:
+        self.sent_to[message_data.user_id] += 1
+
+
+class CrashingJobRepository(BroadcastJobRepository):
+    """Падает при фиксации пачки с номером ``crash_on_call``, имитируя рестарт процесса."""
+
+    def __init__(self, crash_on_call: int) -> None:
+        self.crash_on_call = crash_on_call
+        self.calls = 0
+
+    async def add_deliveries(self, db, job_id, deliveries) -> None:  # type: ignore[no-untyped-def]
+        self.calls += 1
+        if self.calls == self.crash_on_call:
+            raise RuntimeError("worker crashed")
+        await super().add_deliveries(db, job_id, deliveries)
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_job_by_id(db_session) -> None:
+    # Given
+    repo = BroadcastJobRepository()
+
+    # When
+    job = await repo.create_job(
+        db_session,
+        message="hello",
+        audience_kind=BroadcastAudienceKind.ROLE,
+        role_name="Mentor",
+    )
+    await db_session.commit()
+    loaded = await repo.get_by_id(db_session, job.id)
+
+    # Then
+    assert loaded.status is BroadcastJobStatus.PENDING
+    assert loaded.audience_role_name == "Mentor"
+    assert loaded.last_user_id == 0
+    assert [unfinished.id for unfinished in await repo.find_unfinished_jobs(db_session)] == [job.id]
+
+    with pytest.raises(BroadcastJobNotFoundError):
+        await repo.get_by_id(db_session, 404_404)
+
+
+@pytest.mark.asyncio
+async def test_add_deliveries_and_find_recorded_user_ids(db_session) -> None:
+    # Given
+    repo = BroadcastJobRepository()
+    first_user = await create_user(db_session, spec=UserSpec(telegram_id=610_001))
+    second_user = await create_user(db_session, spec=UserSpec(telegram_id=610_002))
+    job = await repo.create_job(db_session, message="hello", audience_kind=BroadcastAudienceKind.ALL)
+
+    # When
+    await repo.add_deliveries(
+        db_session,
+        job.id,
+        [(first_user.id, BroadcastDeliveryStatus.SENT), (second_user.id, BroadcastDeliveryStatus.FAILED_PERMANENT)],
+    )
+    await db_session.commit()
+
+    # Then
+    assert await repo.find_recorded_user_ids(db_session, job.id, [first_user.id, second_user.id, 404_404]) == {
+        first_user.id,
+        second_user.id,
+    }
+    assert await repo.find_recorded_user_ids(db_session, job.id, []) == set()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_job_resumes_after_crash_losing_at_most_one_window(
+    db_session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given
+    monkeypatch.setattr(settings, "broadcast_bulk_size", 2)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+    telegram_ids = [610_100 + offset for offset in range(7)]
+    for telegram_id in telegram_ids:
+        await create_user(db_session, spec=UserSpec(telegram_id=telegram_id))
+    await db_session.commit()
+
+    notification_port = CountingNotificationPort()
+    crashing_service = BroadcastService(
+        db_session,
+        UserRepository(),
+        notification_port,
+        CrashingJobRepository(crash_on_call=2),
+        InMemoryBroadcastLock(),
+    )
+    job_id = await crashing_service.create_job(BroadcastDTO(broadcast_message="hello"))
+
+    # When
+    with pytest.raises(RuntimeError, match="worker crashed"):
+        await crashing_service.run_job(job_id)
+    await db_session.rollback()
+
+    resumed_service = BroadcastService(
+        db_session,
+        UserRepository(),
+        notification_port,
+        BroadcastJobRepository(),
+        InMemoryBroadcastLock(),
+    )
+    result = await resumed_service.run_job(job_id)
+
+    # Then: повторно отправлены только незаписанные получатели из окна конвейера (2 * bulk_size)
+    resent = sorted(telegram_id for telegram_id, count in notification_port.sent_to.items() if count > 1)
+    assert set(notification_port.sent_to) == set(telegram_ids)
+    assert max(notification_port.sent_to.values()) == 2
+    assert resent[:2] == telegram_ids[2:4]
+    assert len(resent) <= 4
+    assert result.sent == len(telegram_ids)
+    job = await BroadcastJobRepository().get_by_id(db_session, job_id)
+    assert job.status is BroadcastJobStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_sharded_job_runs_each_range_once_and_completes_parent(
+    db_session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given
+    monkeypatch.setattr(settings, "broadcast_bulk_size", 2)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+    telegram_ids = [610_200 + offset for offset in range(5)]
+    for telegram_id in telegram_ids:
+        await create_user(db_session, spec=UserSpec(telegram_id=telegram_id))
+    await db_session.commit()
+
+    notification_port = CountingNotificationPort()
+    repo = BroadcastJobRepository()
+    service = BroadcastService(db_session, UserRepository(), notification_port, repo, InMemoryBroadcastLock())
+    job_id = await service.create_job(BroadcastDTO(broadcast_message="hello"))
+
+    # When
+    shard_ids = await service.shard_job(job_id, 2)
+    for shard_id in reversed(shard_ids):
+        await service.run_job(shard_id)
+
+    # Then
+    parent = await repo.get_by_id(db_session, job_id)
+    shards = await repo.find_shards(db_session, job_id)
+    assert [shard.id for shard in shards] == shard_ids
+    assert all(shard.parent_job_id == job_id for shard in shards)
+    assert notification_port.sent_to == Counter({telegram_id: 1 for telegram_id in telegram_ids})
+    assert parent.shard_count == 2
+    assert parent.status is BroadcastJobStatus.COMPLETED
+    assert parent.sent == 5
+    assert await repo.find_unfinished_jobs(db_session) == []
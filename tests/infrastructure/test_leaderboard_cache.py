@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+from fnmatch import fnmatch
+from typing import cast
+
+import pytest
+from redis.asyncio import Redis
+
+from pybot.core.constants import PointsTypeEnum
+from pybot.dto import WeeklyLeaderboardRowDTO
+from pybot.infrastructure import LeaderboardCache, LeaderboardCacheKey, RedisLeaderboardCache
+
+KEY = LeaderboardCacheKey(PointsTypeEnum.ACADEMIC, datetime(2026, 3, 22, 19, 0, 0), 10, "Asia/Yekaterinburg")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.expirations: dict[str, int | None] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, px: int | None = None) -> None:
+        self.values[key] = value
+        self.expirations[key] = px
+
+    async def scan_iter(self, match: str) -> AsyncIterator[str]:
+        for key in list(self.values):
+            if fnmatch(key, match):
+                yield key
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+
+def _row(user_id: int = 1) -> WeeklyLeaderboardRowDTO:
+    return WeeklyLeaderboardRowDTO(
+        user_id=user_id,
+        telegram_id=900_000 + user_id,
+        first_name="Ivan",
+        last_name="Ivanov",
+        patronymic=None,
+        total_points_delta=7,
+        points_type=PointsTypeEnum.ACADEMIC,
+        period_start=KEY.period_start,
+        period_end=datetime(2026, 3, 29, 19, 0, 0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_keeps_closed_periods_and_expires_open_ones() -> None:
+    # Given
+    clock = FakeClock()
+    cache = LeaderboardCache(max_size=10, clock=clock)
+    open_key = LeaderboardCacheKey(PointsTypeEnum.ACADEMIC, datetime(2026, 3, 29, 19, 0, 0), 10, KEY.business_tz)
+    await cache.put(KEY, [_row()], ttl_s=None)
+    await cache.put(open_key, [_row(2)], ttl_s=60)
+
+    # When
+    clock.now = 3600
+
+    # Then
+    assert await cache.get(KEY) == [_row()]
+    assert await cache.get(open_key) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used_entry() -> None:
+    cache = LeaderboardCache(max_size=1)
+    other_key = LeaderboardCacheKey(PointsTypeEnum.REPUTATION, KEY.period_start, 10, KEY.business_tz)
+
+    await cache.put(KEY, [_row()], ttl_s=None)
+    await cache.put(other_key, [], ttl_s=None)
+
+    assert await cache.get(KEY) is None
+    assert await cache.get(other_key) == []
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_round_trips_rows_and_sets_ttl_only_for_open_periods() -> None:
+    # Given
+    redis = FakeRedis()
+    cache = RedisLeaderboardCache(cast(Redis, redis))
+    open_key = LeaderboardCacheKey(PointsTypeEnum.ACADEMIC, KEY.period_start, 3, KEY.business_tz)
+
+    # When
+    await cache.put(KEY, [_row()], ttl_s=None)
+    await cache.put(open_key, [_row()], ttl_s=1.5)
+
+    # Then
+    assert await cache.get(KEY) == [_row()]
+    assert redis.expirations == {
+        KEY.to_redis_key(cache.prefix): None,
+        open_key.to_redis_key(cache.prefix): 1500,
+    }
+    await cache.clear()
+    assert await cache.get(KEY) is None
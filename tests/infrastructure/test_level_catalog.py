@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pybot.core.constants import PointsTypeEnum
+from pybot.db.models import Level
+from pybot.infrastructure import LevelCatalog, LevelRepository
+from tests.factories import create_level
+
+
+class CountingLevelRepository(LevelRepository):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def find_all_levels(self, db: AsyncSession) -> Sequence[Level]:
+        self.calls += 1
+        return await super().find_all_levels(db)
+
+
+@pytest.mark.asyncio
+async def test_catalog_loads_levels_once(db_session) -> None:
+    # Given
+    repository = CountingLevelRepository()
+    catalog = LevelCatalog(repository)
+    await create_level(db_session, name="A0", level_type=PointsTypeEnum.ACADEMIC, required_points=0)
+    await create_level(db_session, name="A1", level_type=PointsTypeEnum.ACADEMIC, required_points=100)
+    await create_level(db_session, name="R0", level_type=PointsTypeEnum.REPUTATION, required_points=0)
+    await db_session.commit()
+
+    # When
+    academic = await catalog.thresholds(db_session, PointsTypeEnum.ACADEMIC)
+    reputation = await catalog.thresholds(db_session, PointsTypeEnum.REPUTATION)
+
+    # Then
+    assert repository.calls == 1
+    assert [level.name for level in academic.levels] == ["A0", "A1"]
+    assert [level.name for level in reputation.levels] == ["R0"]
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_not_remembered_while_levels_are_missing(db_session) -> None:
+    # Given
+    repository = CountingLevelRepository()
+    catalog = LevelCatalog(repository)
+
+    # When
+    empty = await catalog.thresholds(db_session, PointsTypeEnum.ACADEMIC)
+    await create_level(db_session, name="A0", level_type=PointsTypeEnum.ACADEMIC, required_points=0)
+    await db_session.commit()
+    seeded = await catalog.thresholds(db_session, PointsTypeEnum.ACADEMIC)
+
+    # Then
+    assert len(empty) == 0
+    assert len(seeded) == 1
+    assert repository.calls == 2
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from pybot.core.constants import PointsTypeEnum
+from pybot.db.models import PointsPeriodTotal
+from pybot.infrastructure.points_period_total_repository import PointsPeriodTotalRepository
+from tests.factories import PointsTransactionSpec, UserSpec, create_points_transaction, create_user
+
+WEEK_START = datetime(2026, 3, 22, 19, 0, 0)
+WEEK_END = datetime(2026, 3, 29, 19, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_add_amounts_accumulates_and_top_is_sorted_by_total(db_session) -> None:
+    # Given
+    repo = PointsPeriodTotalRepository()
+    first_user = await create_user(db_session, spec=UserSpec(telegram_id=531_001, first_name="Ivan"))
+    second_user = await create_user(db_session, spec=UserSpec(telegram_id=531_002, first_name="Petr"))
+
+    # When
+    for user_id, amount in ((first_user.id, 5), (second_user.id, 4), (first_user.id, -2), (second_user.id, 3)):
+        await repo.add_amounts(
+            db_session,
+            points_type=PointsTypeEnum.ACADEMIC,
+            period_start=WEEK_START,
+            amounts={user_id: amount},
+        )
+    await repo.add_amounts(
+        db_session,
+        points_type=PointsTypeEnum.REPUTATION,
+        period_start=WEEK_START,
+        amounts={first_user.id: 100},
+    )
+    leaderboard = await repo.find_top_for_period(
+        db_session,
+        points_type=PointsTypeEnum.ACADEMIC,
+        period_start=WEEK_START,
+        period_end=WEEK_END,
+    )
+
+    # Then
+    assert [(row.user_id, row.total_points_delta) for row in leaderboard] == [(second_user.id, 7), (first_user.id, 3)]
+    assert leaderboard[0].period_end == WEEK_END
+
+
+@pytest.mark.asyncio
+async def test_rebuild_groups_ledger_by_business_week(db_session) -> None:
+    # Given
+    repo = PointsPeriodTotalRepository()
+    user = await create_user(db_session, spec=UserSpec(telegram_id=531_003))
+    giver = await create_user(db_session, spec=UserSpec(telegram_id=531_004))
+    await repo.add_amounts(
+        db_session,
+        points_type=PointsTypeEnum.ACADEMIC,
+        period_start=datetime(2020, 1, 1),
+        amounts={user.id: 999},
+    )
+    # 2026-03-29 20:00 UTC — уже понедельник 30 марта в Asia/Yekaterinburg.
+    for amount, created_at in (
+        (4, datetime(2026, 3, 23, 1, 0, 0)),
+        (6, datetime(2026, 3, 29, 18, 0, 0)),
+        (30, datetime(2026, 3, 29, 20, 0, 0)),
+    ):
+        await create_points_transaction(
+            db_session,
+            spec=PointsTransactionSpec(
+                recipient=user,
+                giver=giver,
+                amount=amount,
+                points_type=PointsTypeEnum.ACADEMIC,
+                created_at=created_at,
+            ),
+        )
+
+    # When
+    rows = await repo.rebuild(db_session, business_tz="Asia/Yekaterinburg")
+
+    # Then
+    totals = (await db_session.execute(select(PointsPeriodTotal).order_by(PointsPeriodTotal.period_start))).scalars()
+    assert rows == 2
+    assert [(row.period_start, row.total) for row in totals] == [(WEEK_START, 10), (WEEK_END, 30)]
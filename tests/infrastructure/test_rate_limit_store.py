@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, cast
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.asyncio import Redis
+
+from pybot.infrastructure import InMemoryRateLimitStore, RateLimitRule, RedisRateLimitStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_in_memory_store_allows_burst_then_spaces_events() -> None:
+    # Given: три события за 30 секунд, то есть одно каждые 10 секунд после всплеска
+    clock = FakeClock()
+    store = InMemoryRateLimitStore(max_keys=10, clock=clock)
+    rule = RateLimitRule(rate=3, period_s=30)
+
+    # When / Then
+    assert [store.hit((1, "expensive"), rule) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert store.hit((1, "expensive"), rule) == pytest.approx(10.0)
+    clock.now += 10
+    assert store.hit((1, "expensive"), rule) == 0.0
+    assert store.hit((1, "expensive"), rule) == pytest.approx(10.0)
+    assert store.hit((2, "expensive"), rule) == 0.0
+
+
+def test_in_memory_store_evicts_least_recently_used_keys() -> None:
+    clock = FakeClock()
+    store = InMemoryRateLimitStore(max_keys=2, clock=clock)
+    rule = RateLimitRule(rate=1, period_s=60)
+    store.hit((1, "cheap"), rule)
+    store.hit((2, "cheap"), rule)
+    store.hit((1, "cheap"), rule)
+
+    store.hit((3, "cheap"), rule)
+
+    assert len(store) == 2
+    # Ключ 2 вытеснен и начинает с полного запаса, ключ 1 по-прежнему ограничен.
+    assert store.hit((1, "cheap"), rule) > 0
+    assert store.hit((2, "cheap"), rule) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_redis_store_runs_gcra_script_in_microseconds() -> None:
+    script = AsyncMock(return_value=2_500_000)
+    redis: Any = type("FakeRedis", (), {"register_script": lambda self, _source: script})()
+    store = RedisRateLimitStore(cast(Redis, redis))
+
+    retry_after = await store.hit((42, "moderate"), RateLimitRule(rate=10, period_s=60))
+
+    assert retry_after == 2.5
+    script.assert_awaited_once_with(keys=["pybot:rate-limit:moderate:42"], args=[6_000_000, 54_000_000])
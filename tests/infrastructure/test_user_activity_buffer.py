@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from pybot.infrastructure import UserActivityBuffer, UserRepository
+from tests.factories import UserSpec, create_user
+
+
+def _buffer(
+    session_maker: async_sessionmaker[AsyncSession],
+    *,
+    flush_interval_s: float = 60.0,
+    max_pending: int = 100,
+) -> UserActivityBuffer:
+    return UserActivityBuffer(
+        session_maker,
+        UserRepository(),
+        flush_interval_s=flush_interval_s,
+        max_pending=max_pending,
+    )
+
+
+@pytest.mark.asyncio
+async def test_buffer_coalesces_marks_and_writes_latest_per_user(
+    db_session: AsyncSession,
+    db_session_maker: async_sessionmaker[AsyncSession],
+) -> None:
+    # Given: две отметки одного пользователя и одна отметка другого
+    first = await create_user(db_session, spec=UserSpec(telegram_id=800_001))
+    second = await create_user(db_session, spec=UserSpec(telegram_id=800_002))
+    await db_session.commit()
+    buffer = _buffer(db_session_maker)
+    buffer.record(first.id, datetime(2026, 3, 1, 10, 5))
+    buffer.record(first.id, datetime(2026, 3, 1, 10, 0))
+    buffer.record(second.id, datetime(2026, 3, 1, 9, 0))
+
+    # When
+    flushed = await buffer.flush()
+    await buffer.close()
+
+    # Then: записана самая свежая отметка каждого пользователя
+    assert flushed == 2
+    assert buffer.pending == 0
+    await db_session.refresh(first)
+    await db_session.refresh(second)
+    assert first.last_active_at == datetime(2026, 3, 1, 10, 5)
+    assert second.last_active_at == datetime(2026, 3, 1, 9, 0)
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_early_when_size_threshold_is_reached(
+    db_session: AsyncSession,
+    db_session_maker: async_sessionmaker[AsyncSession],
+) -> None:
+    # Given: порог в два пользователя и интервал, который в тесте не наступит
+    users = [await create_user(db_session, spec=UserSpec(telegram_id=800_010 + index)) for index in range(2)]
+    await db_session.commit()
+    buffer = _buffer(db_session_maker, max_pending=2)
+
+    # When
+    for user in users:
+        buffer.record(user.id, datetime(2026, 3, 1, 12, 0))
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if not buffer.pending:
+            break
+
+    # Then: фоновая задача записала пачку, не дожидаясь интервала
+    try:
+        assert buffer.pending == 0
+        for user in users:
+            await db_session.refresh(user)
+            assert user.last_active_at == datetime(2026, 3, 1, 12, 0)
+    finally:
+        await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_buffer_close_writes_remaining_marks(
+    db_session: AsyncSession,
+    db_session_maker: async_sessionmaker[AsyncSession],
+) -> None:
+    user = await create_user(db_session, spec=UserSpec(telegram_id=800_020))
+    await db_session.commit()
+    buffer = _buffer(db_session_maker)
+    buffer.record(user.id, datetime(2026, 3, 1, 8, 0))
+
+    await buffer.close()
+
+    await db_session.refresh(user)
+    assert user.last_active_at == datetime(2026, 3, 1, 8, 0)
+
+
+class _BlockingUserRepository(UserRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+
+    async def bulk_update_last_active(self, db, activity) -> None:
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_buffer_keeps_batch_when_flush_is_cancelled(
+    db_session_maker: async_sessionmaker[AsyncSession],
+) -> None:
+    # Given: запись пачки зависла в БД
+    repository = _BlockingUserRepository()
+    buffer = UserActivityBuffer(db_session_maker, repository, flush_interval_s=60.0, max_pending=100)
+    buffer.record(1, datetime(2026, 3, 1, 8, 0))
+    flush = asyncio.create_task(buffer.flush())
+    await repository.started.wait()
+
+    # When
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+
+    # Then: отметка осталась в буфере и будет записана следующим flush
+    assert buffer.pending == 1
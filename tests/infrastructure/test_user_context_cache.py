@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+import pytest
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pybot.dto import UserContext
+from pybot.infrastructure import RedisUserContextCache, UserContextCache, UserRepository
+from tests.factories import UserSpec, attach_user_role, create_role, create_user
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# Сообщение-маркер: подписка, получившая его, ведёт себя как при обрыве соединения с Redis.
+DISCONNECT: dict[str, Any] = {"type": "disconnect"}
+
+
+class FakePubSub:
+    def __init__(self, hub: FakeRedis) -> None:
+        self.hub = hub
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self.hub.subscribers.setdefault(channel, []).append(self)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            message = await self.queue.get()
+            if message is DISCONNECT:
+                raise ConnectionError("connection lost")
+            yield message
+
+    async def aclose(self) -> None:
+        for subscribers in self.hub.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakeRedis:
+    """Pub/sub hub shared by several cache replicas."""
+
+    def __init__(self) -> None:
+        self.subscribers: dict[str, list[FakePubSub]] = {}
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def publish(self, channel: str, data: str) -> int:
+        subscribers = self.subscribers.get(channel, [])
+        for subscriber in subscribers:
+            subscriber.queue.put_nowait({"type": "message", "data": data.encode()})
+        return len(subscribers)
+
+    def disconnect(self) -> None:
+        for subscribers in self.subscribers.values():
+            for subscriber in subscribers:
+                subscriber.queue.put_nowait(DISCONNECT)
+
+
+def _context(user_id: int, telegram_id: int, *roles: str) -> UserContext:
+    return UserContext(user_id=user_id, telegram_id=telegram_id, roles=frozenset(roles), last_active_at=None)
+
+
+def test_cache_expires_entries_after_ttl_and_counts_hits() -> None:
+    clock = FakeClock()
+    cache = UserContextCache(max_size=10, ttl_s=60, clock=clock)
+    cache.put(1001, _context(1, 1001, "Admin"))
+    cache.put(1002, None)
+
+    assert cache.lookup(1001) == (True, _context(1, 1001, "Admin"))
+    assert cache.lookup(1002) == (True, None)
+    assert cache.get_roles(1) == frozenset({"Admin"})
+    clock.now += 60
+    assert cache.lookup(1001) == (False, None)
+    assert cache.get_roles(1) is None
+
+    assert cache.stats() == {"hits": 3, "misses": 2, "size": 1, "evictions": 0, "invalidations": 0}
+
+
+def test_cache_evicts_least_recently_used_entry() -> None:
+    cache = UserContextCache(max_size=2, ttl_s=60, clock=FakeClock())
+    cache.put(1001, _context(1, 1001))
+    cache.put(1002, _context(2, 1002))
+    cache.lookup(1001)
+
+    cache.put(1003, _context(3, 1003))
+
+    assert cache.lookup(1002) == (False, None)
+    assert cache.lookup(1001)[0] is True
+    assert cache.get_roles(2) is None
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_serves_context_from_cache_until_invalidated(db_session: AsyncSession) -> None:
+    # Given: контекст пользователя уже закеширован
+    cache = UserContextCache(max_size=10, ttl_s=60)
+    repo = UserRepository(cache)
+    user = await create_user(db_session, spec=UserSpec(telegram_id=810_001))
+    await db_session.commit()
+    context = await repo.load_user_context(db_session, 810_001)
+    assert context is not None
+    assert context.roles == frozenset()
+
+    # When: роль выдаётся в обход кеша
+    await attach_user_role(db_session, user=user, role=await create_role(db_session, name="Mentor"))
+    await db_session.commit()
+    cached = await repo.load_user_context(db_session, 810_001)
+    await repo.invalidate_cached_user(810_001)
+    reloaded = await repo.load_user_context(db_session, 810_001)
+
+    # Then: до инвалидации отдаётся кеш, после неё — новые роли
+    assert cached is not None
+    assert cached.roles == frozenset()
+    assert reloaded is not None
+    assert reloaded.roles == frozenset({"Mentor"})
+    assert await repo.find_user_roles(db_session, user.id) == ["Mentor"]
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_repository_caches_missing_user_until_registration_invalidates_it(db_session: AsyncSession) -> None:
+    cache = UserContextCache(max_size=10, ttl_s=60)
+    repo = UserRepository(cache)
+    assert await repo.load_user_context(db_session, 810_002) is None
+
+    await create_user(db_session, spec=UserSpec(telegram_id=810_002))
+    await db_session.commit()
+    assert await repo.load_user_context(db_session, 810_002) is None
+    await repo.invalidate_cached_user(810_002)
+
+    assert await repo.load_user_context(db_session, 810_002) is not None
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_propagates_invalidation_to_other_replicas() -> None:
+    # Given: две реплики с общим Redis и одним и тем же пользователем в кеше
+    redis = FakeRedis()
+    replicas = [RedisUserContextCache(cast(Redis, redis), max_size=10, ttl_s=60, clock=FakeClock()) for _ in range(2)]
+    for replica in replicas:
+        await replica.start()
+        replica.put(1001, _context(1, 1001, "Student"))
+
+    # When: роли меняются на первой реплике
+    await replicas[0].invalidate(1001)
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    # Then: вторая реплика тоже сбросила запись
+    try:
+        assert replicas[1].lookup(1001) == (False, None)
+        assert replicas[1].invalidations == 1
+    finally:
+        for replica in replicas:
+            await replica.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_resubscribes_and_clears_entries_after_disconnect() -> None:
+    # Given: реплика с закешированным пользователем
+    redis = FakeRedis()
+    replica = RedisUserContextCache(cast(Redis, redis), max_size=10, ttl_s=60, clock=FakeClock())
+    replica.reconnect_backoff_s = 0
+    await replica.start()
+    replica.put(1001, _context(1, 1001, "Student"))
+
+    try:
+        # When: соединение с Redis оборвалось
+        redis.disconnect()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # Then: подписка восстановлена, а кеш сброшен, потому что инвалидации могли потеряться
+        assert len(redis.subscribers[replica.channel]) == 1
+        assert replica.lookup(1001) == (False, None)
+
+        # When: после переподписки роли меняются на другой реплике
+        replica.put(1002, _context(2, 1002, "Student"))
+        await redis.publish(replica.channel, "1002")
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # Then
+        assert replica.lookup(1002) == (False, None)
+    finally:
+        await replica.close()
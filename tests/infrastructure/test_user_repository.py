@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from pybot.core.constants import PointsTypeEnum
 from pybot.domain.exceptions import UserNotFoundError, UsersNotFoundError
+from pybot.dto import BroadcastRecipient, UserContext
 from pybot.infrastructure.user_repository import UserRepository
 from tests.factories import (
     attach_user_competence,
@@ -82,6 +83,34 @@ async def test_has_role_returns_true_and_false(db_session) -> None:
     assert await repo.has_role(db_session, user.id, "Mentor") is False
 
 
+@pytest.mark.asyncio
+async def test_load_user_context_returns_id_roles_and_activity_in_one_query(db_session) -> None:
+    # Given: пользователь с двумя ролями и пользователь без ролей
+    repo = UserRepository()
+    user = await create_user(db_session, spec=UserSpec(telegram_id=500_031))
+    loner = await create_user(db_session, spec=UserSpec(telegram_id=500_032))
+    for role_name in ("Admin", "Mentor"):
+        await attach_user_role(db_session, user=user, role=await create_role(db_session, name=role_name))
+    last_active_at = datetime(2026, 1, 1, 12, 0)
+    user.last_active_at = last_active_at
+    await db_session.commit()
+
+    # When
+    context = await repo.load_user_context(db_session, user.telegram_id)
+    loner_context = await repo.load_user_context(db_session, loner.telegram_id)
+
+    # Then
+    assert context == UserContext(
+        user_id=user.id,
+        telegram_id=500_031,
+        roles=frozenset({"Admin", "Mentor"}),
+        last_active_at=last_active_at,
+    )
+    assert loner_context is not None
+    assert loner_context.roles == frozenset()
+    assert await repo.load_user_context(db_session, 500_039) is None
+
+
 @pytest.mark.asyncio
 async def test_get_all_users_with_role_filters_and_raises_on_empty(db_session) -> None:
     # Given
@@ -105,6 +134,199 @@ async def test_get_all_users_with_role_filters_and_raises_on_empty(db_session) -
         await repo.get_all_users_with_role(db_session, "Mentor")
 
 
+@pytest.mark.asyncio
+async def test_iter_all_recipients_streams_keyset_pages(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    telegram_ids = [500_010 + offset for offset in range(5)]
+    for telegram_id in telegram_ids:
+        await create_user(db_session, spec=UserSpec(telegram_id=telegram_id))
+    await db_session.commit()
+
+    # When
+    pages = [page async for page in repo.iter_all_recipients(db_session, page_size=2)]
+
+    # Then
+    assert [[recipient.telegram_id for recipient in page] for page in pages] == [
+        telegram_ids[0:2],
+        telegram_ids[2:4],
+        telegram_ids[4:5],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_all_recipients_continues_after_cursor(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    users = [await create_user(db_session, spec=UserSpec(telegram_id=500_030 + offset)) for offset in range(3)]
+    await db_session.commit()
+
+    # When
+    tail = [page async for page in repo.iter_all_recipients(db_session, after_id=users[1].id)]
+    exhausted = [page async for page in repo.iter_all_recipients(db_session, after_id=users[2].id)]
+
+    # Then
+    assert [[recipient.user_id for recipient in page] for page in tail] == [[users[2].id]]
+    assert exhausted == []
+
+
+@pytest.mark.asyncio
+async def test_iter_all_recipients_raises_on_empty_audience(db_session) -> None:
+    # Given
+    repo = UserRepository()
+
+    # When / Then
+    with pytest.raises(UsersNotFoundError):
+        _ = [page async for page in repo.iter_all_recipients(db_session)]
+
+
+@pytest.mark.asyncio
+async def test_iter_recipients_with_role_and_competence_filter_audience(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    student_user = await create_user(db_session, spec=UserSpec(telegram_id=500_020))
+    admin_user = await create_user(db_session, spec=UserSpec(telegram_id=500_021))
+    role_student = await create_role(db_session, name="Student")
+    role_admin = await create_role(db_session, name="Admin")
+    python_competence = await create_competence(db_session, name="Python")
+    await attach_user_role(db_session, user=student_user, role=role_student)
+    await attach_user_role(db_session, user=admin_user, role=role_admin)
+    await attach_user_competence(db_session, user=admin_user, competence=python_competence)
+    await db_session.commit()
+
+    # When
+    students = [page async for page in repo.iter_recipients_with_role(db_session, "Student")]
+    python_users = [page async for page in repo.iter_recipients_with_competence_id(db_session, python_competence.id)]
+
+    # Then
+    assert students == [[BroadcastRecipient(user_id=student_user.id, telegram_id=student_user.telegram_id)]]
+    assert python_users == [[BroadcastRecipient(user_id=admin_user.id, telegram_id=admin_user.telegram_id)]]
+
+    with pytest.raises(UsersNotFoundError):
+        _ = [page async for page in repo.iter_recipients_with_role(db_session, "Mentor")]
+
+
+@pytest.mark.asyncio
+async def test_count_recipients_matches_streamed_audience_and_bounds(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    users = [await create_user(db_session, spec=UserSpec(telegram_id=500_030 + index)) for index in range(4)]
+    role_student = await create_role(db_session, name="Student")
+    python_competence = await create_competence(db_session, name="Python")
+    for user in users[:3]:
+        await attach_user_role(db_session, user=user, role=role_student)
+    await attach_user_competence(db_session, user=users[0], competence=python_competence)
+    await repo.mark_recipients_unreachable(db_session, [users[3].id])
+    await db_session.commit()
+
+    # When / Then
+    assert await repo.count_all_recipients(db_session) == 3
+    assert await repo.count_all_recipients(db_session, after_id=users[0].id, until_id=users[1].id) == 1
+    assert await repo.count_recipients_with_role(db_session, "Student", after_id=users[1].id) == 1
+    assert await repo.count_recipients_with_role(db_session, "Mentor") == 0
+    assert await repo.count_recipients_with_competence_id(db_session, python_competence.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_split_all_recipients_returns_balanced_id_ranges(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    users = [await create_user(db_session, spec=UserSpec(telegram_id=500_050 + offset)) for offset in range(7)]
+    await db_session.commit()
+
+    # When
+    bounds = await repo.split_all_recipients(db_session, 3)
+    ranges = [
+        [page async for page in repo.iter_all_recipients(db_session, after_id=after_id, until_id=until_id)]
+        for after_id, until_id in zip([0, *bounds[:-1]], bounds, strict=True)
+    ]
+
+    # Then
+    assert bounds == [users[2].id, users[4].id, users[6].id]
+    assert [[recipient.user_id for page in pages for recipient in page] for pages in ranges] == [
+        [user.id for user in users[0:3]],
+        [user.id for user in users[3:5]],
+        [user.id for user in users[5:7]],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_split_recipients_with_role_caps_shards_and_raises_on_empty(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    mentor = await create_user(db_session, spec=UserSpec(telegram_id=500_060))
+    await create_user(db_session, spec=UserSpec(telegram_id=500_061))
+    role_mentor = await create_role(db_session, name="Mentor")
+    await attach_user_role(db_session, user=mentor, role=role_mentor)
+    await db_session.commit()
+
+    # When
+    bounds = await repo.split_recipients_with_role(db_session, "Mentor", 4)
+
+    # Then
+    assert bounds == [mentor.id]
+    with pytest.raises(UsersNotFoundError):
+        await repo.split_recipients_with_role(db_session, "Student", 4)
+
+
+@pytest.mark.asyncio
+async def test_unreachable_recipients_are_excluded_until_marked_reachable(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    reachable = await create_user(db_session, spec=UserSpec(telegram_id=500_070))
+    blocked = await create_user(db_session, spec=UserSpec(telegram_id=500_071))
+    role_student = await create_role(db_session, name="Student")
+    await attach_user_role(db_session, user=reachable, role=role_student)
+    await attach_user_role(db_session, user=blocked, role=role_student)
+    await db_session.commit()
+
+    # When
+    await repo.mark_recipients_unreachable(db_session, [blocked.id])
+    await db_session.commit()
+    audience = [page async for page in repo.iter_all_recipients(db_session)]
+    students = [page async for page in repo.iter_recipients_with_role(db_session, "Student")]
+    bounds = await repo.split_all_recipients(db_session, 2)
+
+    # Then
+    assert audience == [[BroadcastRecipient(user_id=reachable.id, telegram_id=reachable.telegram_id)]]
+    assert students == audience
+    assert bounds == [reachable.id]
+
+    # When
+    await repo.mark_recipients_reachable(db_session, [blocked.id])
+    await db_session.commit()
+    restored = [page async for page in repo.iter_all_recipients(db_session)]
+
+    # Then
+    assert [recipient.user_id for page in restored for recipient in page] == [reachable.id, blocked.id]
+
+
+@pytest.mark.asyncio
+async def test_find_unreachable_recipients_skips_recently_checked(db_session) -> None:
+    # Given
+    repo = UserRepository()
+    stale = await create_user(db_session, spec=UserSpec(telegram_id=500_080))
+    fresh = await create_user(db_session, spec=UserSpec(telegram_id=500_081))
+    await create_user(db_session, spec=UserSpec(telegram_id=500_082))
+    await repo.mark_recipients_unreachable(db_session, [stale.id, fresh.id])
+    await db_session.commit()
+    await db_session.refresh(stale)
+    assert stale.unreachable_since is not None
+    stale.reachability_checked_at = stale.unreachable_since - timedelta(days=8)
+    await db_session.commit()
+    checked_before = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=7)
+
+    # When
+    due = await repo.find_unreachable_recipients(db_session, checked_before=checked_before, limit=10)
+    await repo.touch_reachability_checked(db_session, [stale.id])
+    await db_session.commit()
+    after_touch = await repo.find_unreachable_recipients(db_session, checked_before=checked_before, limit=10)
+
+    # Then
+    assert due == [BroadcastRecipient(user_id=stale.id, telegram_id=stale.telegram_id)]
+    assert after_touch == []
+
+
 @pytest.mark.asyncio
 async def test_find_all_user_competencies_returns_user_competencies(db_session) -> None:
     # Given
@@ -147,34 +369,23 @@ async def test_get_all_users_with_competence_id_filters_and_raises_on_empty(db_s
 
 
 @pytest.mark.asyncio
-async def test_update_user_last_active_sets_value_for_inactive_user(db_session) -> None:
-    # Given
-    repo = UserRepository()
-    user = await create_user(db_session, spec=UserSpec(telegram_id=500_005))
-    await db_session.commit()
-
-    # When
-    await repo.update_user_last_active(db_session, user.id)
-    await db_session.commit()
-    await db_session.refresh(user)
-
-    # Then
-    assert user.last_active_at is not None
-
-
-@pytest.mark.asyncio
-async def test_update_user_last_active_skips_update_when_recent(db_session) -> None:
-    # Given
+async def test_bulk_update_last_active_never_moves_timestamp_backwards(db_session) -> None:
+    # Given: у первого пользователя уже есть более свежая отметка
     repo = UserRepository()
-    user = await create_user(db_session, spec=UserSpec(telegram_id=500_006))
-    original = datetime.now(UTC).replace(tzinfo=None, microsecond=0)
-    user.last_active_at = original
+    ahead = await create_user(db_session, spec=UserSpec(telegram_id=500_041))
+    behind = await create_user(db_session, spec=UserSpec(telegram_id=500_042))
+    ahead.last_active_at = datetime(2026, 2, 1, 12, 0)
     await db_session.commit()
 
     # When
-    await repo.update_user_last_active(db_session, user.id)
+    await repo.bulk_update_last_active(
+        db_session,
+        {ahead.id: datetime(2026, 2, 1, 11, 0), behind.id: datetime(2026, 2, 1, 11, 0)},
+    )
     await db_session.commit()
-    await db_session.refresh(user)
+    await db_session.refresh(ahead)
+    await db_session.refresh(behind)
 
     # Then
-    assert user.last_active_at == original
+    assert ahead.last_active_at == datetime(2026, 2, 1, 12, 0)
+    assert behind.last_active_at == datetime(2026, 2, 1, 11, 0)
@@ -6,7 +6,8 @@ from aiogram.types import InlineKeyboardMarkup
 from dishka import Provider, Scope, provide
 
 from pybot.dto import NotifyDTO
-from pybot.services.ports import NotificationPort
+from pybot.infrastructure.ports import InMemoryBroadcastLock
+from pybot.services.ports import BroadcastLockPort, NotificationPort
 
 __test__ = False
 
@@ -96,6 +97,10 @@ class TestOverridesProvider(Provider):
     def provide_notification_port(self) -> NotificationPort:
         return self._notification_port
 
+    @provide(scope=Scope.APP)
+    def provide_broadcast_lock(self) -> BroadcastLockPort:
+        return InMemoryBroadcastLock()
+
     @provide(scope=Scope.APP)
     def provide_fake_notification_port(self) -> FakeNotificationPort:
         return self._notification_port
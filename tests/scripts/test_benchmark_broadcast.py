@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+import benchmark_broadcast
+from src.pybot.core.config import settings
+
+
+def _quiet_telegram(**overrides: float) -> benchmark_broadcast.SimulatedTelegramConfig:
+    values: dict[str, float] = {
+        "latency_median_ms": 50.0,
+        "latency_sigma": 0.0,
+        "permanent_failure_rate": 0.0,
+        "temporary_error_rate": 0.0,
+        "flood_limit_per_s": 1_000,
+    }
+    values.update(overrides)
+    return benchmark_broadcast.SimulatedTelegramConfig(**values)  # type: ignore[arg-type]
+
+
+def test_run_benchmark_reports_each_scenario_in_virtual_time() -> None:
+    # Given
+    cli_config = benchmark_broadcast.BenchmarkCLIConfig(
+        recipients=(40, 100),
+        bulk_size=20,
+        max_concurrency=5,
+        batch_pause_ms=1_000,
+        pacing=False,
+        telegram=_quiet_telegram(permanent_failure_rate=0.1),
+    )
+
+    # When
+    report = benchmark_broadcast.run_benchmark(cli_config)
+
+    # Then
+    json.dumps(report)
+    assert report["time_mode"] == "virtual"
+    assert report["settings"]["broadcast_bulk_size"] == 20
+    assert [scenario["recipients"] for scenario in report["scenarios"]] == [40, 100]
+    for scenario in report["scenarios"]:
+        result = scenario["result"]
+        assert result["attempted"] == scenario["recipients"]
+        assert result["sent"] + result["failed_permanent"] == scenario["recipients"]
+        assert scenario["requests"] == scenario["recipients"]
+        assert scenario["retries"] == 0
+        assert scenario["latency_ms"]["p50"] == pytest.approx(50.0, abs=0.1)
+        # Пауза между пачками идёт по виртуальным часам: 4 паузы по ~1.1 с на 100 получателей.
+        assert scenario["duration_s"] >= (scenario["recipients"] // 20 - 1) * 1.0
+        assert scenario["harness_wall_s"] < scenario["duration_s"]
+
+
+def test_run_benchmark_counts_flood_control_retries() -> None:
+    # Given
+    cli_config = benchmark_broadcast.BenchmarkCLIConfig(
+        recipients=(60,),
+        bulk_size=20,
+        max_concurrency=10,
+        pacing=False,
+        telegram=_quiet_telegram(flood_limit_per_s=5, flood_retry_after_s=2.0),
+    )
+
+    # When
+    scenario = benchmark_broadcast.run_benchmark(cli_config)["scenarios"][0]
+
+    # Then
+    assert scenario["retry_after_responses"] > 0
+    assert scenario["retries"] == scenario["requests"] - 60
+    # Последняя попытка тоже может получить retry_after: такой получатель уходит в failed_temporary.
+    assert scenario["retries"] + scenario["result"]["failed_temporary"] >= scenario["retry_after_responses"]
+    assert scenario["latency_ms"]["p99"] >= 2_000
+
+
+def test_run_benchmark_with_pacing_stays_under_flood_limit() -> None:
+    # Given
+    cli_config = benchmark_broadcast.BenchmarkCLIConfig(
+        recipients=(100,),
+        pacing=True,
+        global_rate_per_s=10.0,
+        telegram=_quiet_telegram(flood_limit_per_s=16),
+    )
+
+    # When
+    scenario = benchmark_broadcast.run_benchmark(cli_config)["scenarios"][0]
+
+    # Then: темп 10/с плюс burst 5 укладываются в лимит 16 запросов за скользящую секунду.
+    assert scenario["retry_after_responses"] == 0
+    assert scenario["result"]["sent"] == 100
+    assert scenario["messages_per_s"] <= 10.5
+
+
+def test_run_benchmark_restores_settings_overrides() -> None:
+    # Given
+    previous_bulk_size = settings.broadcast_bulk_size
+    cli_config = benchmark_broadcast.BenchmarkCLIConfig(recipients=(5,), bulk_size=3, telegram=_quiet_telegram())
+
+    # When
+    benchmark_broadcast.run_benchmark(cli_config)
+
+    # Then
+    assert settings.broadcast_bulk_size == previous_bulk_size
+
+
+def test_run_benchmark_rejects_non_positive_audience() -> None:
+    with pytest.raises(ValueError, match="recipients"):
+        benchmark_broadcast.run_benchmark(benchmark_broadcast.BenchmarkCLIConfig(recipients=(0,)))
+
+
+def test_latency_percentiles_use_milliseconds() -> None:
+    # Given
+    latencies = [index / 1000 for index in range(1, 101)]
+
+    # When
+    percentiles = benchmark_broadcast.latency_percentiles(latencies)
+
+    # Then
+    assert percentiles == benchmark_broadcast.LatencyPercentiles(p50=50.5, p95=95.1, p99=99.0)
+    assert benchmark_broadcast.latency_percentiles([]) == benchmark_broadcast.LatencyPercentiles(0.0, 0.0, 0.0)
+
+
+def test_parse_cli_args_maps_overrides_and_telegram_options() -> None:
+    # When
+    cli_config = benchmark_broadcast.parse_cli_args(
+        ["--recipients", "1000", "--bulk-size", "25", "--telegram.flood-limit-per-s", "20"]
+    )
+
+    # Then
+    assert cli_config.recipients == (1000,)
+    assert cli_config.telegram.flood_limit_per_s == 20
+    assert benchmark_broadcast.build_settings_overrides(cli_config) == {"broadcast_bulk_size": 25}
+
+
+def test_simulated_telegram_config_validates_rates() -> None:
+    with pytest.raises(ValueError, match="permanent_failure_rate"):
+        benchmark_broadcast.SimulatedTelegramConfig(permanent_failure_rate=1.5)
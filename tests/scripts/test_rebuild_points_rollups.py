@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pybot.core.constants import PointsTypeEnum
+from pybot.db.models import PointsPeriodTotal
+from rebuild_points_rollups import rebuild_points_rollups
+from tests.factories import PointsTransactionSpec, UserSpec, create_points_transaction, create_user
+
+
+@pytest.mark.asyncio
+async def test_rebuild_if_empty_fills_rollup_once(db_session: AsyncSession, test_database_url: str) -> None:
+    # Given: история начислений есть, недельных сумм после миграции ещё нет
+    recipient = await create_user(db_session, spec=UserSpec(telegram_id=532_001))
+    giver = await create_user(db_session, spec=UserSpec(telegram_id=532_002))
+    await create_points_transaction(
+        db_session,
+        spec=PointsTransactionSpec(
+            recipient=recipient,
+            giver=giver,
+            amount=7,
+            points_type=PointsTypeEnum.ACADEMIC,
+            created_at=datetime(2026, 3, 24, 10, 0, 0),
+        ),
+    )
+    await db_session.commit()
+
+    # When: деплой запускает заполнение дважды
+    first = await rebuild_points_rollups(test_database_url, business_tz="Asia/Yekaterinburg", if_empty=True)
+    second = await rebuild_points_rollups(test_database_url, business_tz="Asia/Yekaterinburg", if_empty=True)
+
+    # Then: таблица заполнена первым запуском, второй её не трогает
+    assert (first, second) == (1, None)
+    totals = (await db_session.execute(select(PointsPeriodTotal.user_id, PointsPeriodTotal.total))).all()
+    assert [tuple(row) for row in totals] == [(recipient.id, 7)]
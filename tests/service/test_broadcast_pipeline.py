@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from pybot.core.constants import BroadcastDeliveryStatus
+from pybot.dto import BroadcastRecipient
+from pybot.services.broadcast_pipeline import BroadcastPipeline
+
+
+async def _audience(user_ids: list[int], page_size: int = 3) -> AsyncIterator[list[BroadcastRecipient]]:
+    for index in range(0, len(user_ids), page_size):
+        yield [
+            BroadcastRecipient(user_id=user_id, telegram_id=user_id) for user_id in user_ids[index : index + page_size]
+        ]
+
+
+class FlushRecorder:
+    def __init__(self) -> None:
+        self.flushes: list[tuple[list[int], int | None]] = []
+
+    async def __call__(
+        self,
+        completed: list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]],
+        last_user_id: int | None,
+    ) -> None:
+        self.flushes.append(([recipient.user_id for recipient, _ in completed], last_user_id))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retry_does_not_block_other_recipients() -> None:
+    # Given: первый получатель ждёт повторной попытки, единственный worker свободен для остальных
+    attempts: list[tuple[int, int]] = []
+
+    async def attempt(recipient: BroadcastRecipient, attempt_number: int) -> BroadcastDeliveryStatus | float:
+        attempts.append((recipient.user_id, attempt_number))
+        if recipient.user_id == 1 and attempt_number == 1:
+            return 0.05
+        return BroadcastDeliveryStatus.SENT
+
+    flush = FlushRecorder()
+    pipeline = BroadcastPipeline(attempt, workers=1, window=6, flush_size=2)
+
+    # When
+    await pipeline.run(_audience(list(range(1, 7))), flush)
+
+    # Then: повтор выполнен последним, курсор не обгоняет незавершённого получателя
+    assert attempts[0] == (1, 1)
+    assert attempts[-1] == (1, 2)
+    assert sorted(user_id for user_id, _ in attempts) == [1, 1, 2, 3, 4, 5, 6]
+    assert [last_user_id for _, last_user_id in flush.flushes] == [None, None, 6]
+    assert sorted(user_id for user_ids, _ in flush.flushes for user_id in user_ids) == list(range(1, 7))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_maps_unexpected_worker_error_to_permanent_failure() -> None:
+    # Given
+    async def attempt(recipient: BroadcastRecipient, attempt_number: int) -> BroadcastDeliveryStatus | float:
+        if recipient.user_id == 2:
+            raise RuntimeError("boom")
+        return BroadcastDeliveryStatus.SENT
+
+    statuses: dict[int, BroadcastDeliveryStatus] = {}
+
+    async def flush(completed: list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]], last_user_id: int | None):
+        statuses.update({recipient.user_id: status for recipient, status in completed})
+
+    # When
+    await BroadcastPipeline(attempt, workers=2, window=4, flush_size=2).run(_audience([1, 2, 3]), flush)
+
+    # Then
+    assert statuses == {
+        1: BroadcastDeliveryStatus.SENT,
+        2: BroadcastDeliveryStatus.FAILED_PERMANENT,
+        3: BroadcastDeliveryStatus.SENT,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propagates_flush_error_and_stops_workers() -> None:
+    # Given
+    attempted: list[int] = []
+
+    async def attempt(recipient: BroadcastRecipient, attempt_number: int) -> BroadcastDeliveryStatus | float:
+        attempted.append(recipient.user_id)
+        return BroadcastDeliveryStatus.SENT
+
+    async def flush(completed: list[tuple[BroadcastRecipient, BroadcastDeliveryStatus]], last_user_id: int | None):
+        raise RuntimeError("lease lost")
+
+    # When / Then: окно ограничивает число отправок, которые не успели записаться
+    with pytest.raises(RuntimeError, match="lease lost"):
+        await BroadcastPipeline(attempt, workers=2, window=4, flush_size=2).run(_audience(list(range(1, 50))), flush)
+    assert len(attempted) <= 4
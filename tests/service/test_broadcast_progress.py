@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pybot.core.config import settings
+from pybot.core.constants import BroadcastAudienceKind, BroadcastJobStatus
+from pybot.db.models import BroadcastJob
+from pybot.domain.exceptions import BroadcastJobNotFoundError
+from pybot.infrastructure.broadcast_job_repository import BroadcastJobRepository
+from pybot.services.broadcast_progress import (
+    BroadcastProgressService,
+    BroadcastProgressTracker,
+    LatencyHistogram,
+    broadcast_progress_text,
+    progress_from_job,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mk_job(*, total: int | None = 100, attempted: int = 0, sent: int = 0) -> BroadcastJob:
+    return BroadcastJob(
+        id=1,
+        message="hello",
+        audience_kind=BroadcastAudienceKind.ALL,
+        status=BroadcastJobStatus.RUNNING,
+        last_user_id=0,
+        shard_count=0,
+        total_recipients=total,
+        attempted=attempted,
+        sent=sent,
+        failed_temporary=0,
+        failed_permanent=0,
+        skipped_invalid_user=0,
+        started_at=datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=10),
+    )
+
+
+def _advance(job: BroadcastJob, tracker: BroadcastProgressTracker, clock: FakeClock, seconds: float, sent: int) -> None:
+    clock.now += seconds
+    job.attempted += sent
+    job.sent += sent
+    tracker.record(job.to_result())
+
+
+def test_latency_histogram_reports_cumulative_buckets() -> None:
+    histogram = LatencyHistogram(buckets_ms=(100, 1000))
+
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(0.5)
+    histogram.observe(3.0)
+
+    assert histogram.to_dict() == {"count": 4, "sum_ms": 3650.0, "le_100ms": 2, "le_1000ms": 3}
+
+
+def test_tracker_estimates_rate_and_eta_from_recent_flushes(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: задание на 100 получателей и две пачки по 10 за 2 секунды
+    monkeypatch.setattr(settings, "broadcast_progress_interval_s", 5.0)
+    clock = FakeClock()
+    job = _mk_job()
+    tracker = BroadcastProgressTracker(job, clock=clock)
+    _advance(job, tracker, clock, 1.0, sent=10)
+    _advance(job, tracker, clock, 1.0, sent=10)
+
+    # When: снимок публикуется
+    progress = tracker.publish()
+
+    # Then: скорость 10 сообщений в секунду, осталось 80 получателей на 8 секунд
+    assert progress.rate_per_s == 10.0
+    assert progress.remaining == 80
+    assert progress.eta_s == 8.0
+    assert job.progress is not None
+    assert job.progress["eta_s"] == 8.0
+
+
+def test_tracker_rate_forgets_samples_outside_window() -> None:
+    # Given: быстрый старт, затем замедление из-за flood control
+    clock = FakeClock()
+    job = _mk_job(total=1000)
+    tracker = BroadcastProgressTracker(job, clock=clock)
+    for sent in (100, 100, 100, 10, 10, 10, 10):
+        _advance(job, tracker, clock, 10.0, sent=sent)
+
+    # When / Then: скорость считается только по точкам скользящего окна
+    assert tracker.rate_per_s() == 1.0
+
+
+def test_tracker_throttles_publication(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "broadcast_progress_interval_s", 5.0)
+    clock = FakeClock()
+    tracker = BroadcastProgressTracker(_mk_job(), clock=clock)
+
+    assert tracker.is_due() is True
+    tracker.publish()
+    clock.now += 4.0
+    assert tracker.is_due() is False
+    clock.now += 1.0
+    assert tracker.is_due() is True
+
+
+def test_progress_text_shows_eta_while_running_and_duration_when_finished() -> None:
+    job = _mk_job(attempted=40, sent=40)
+    job.progress = {"rate_per_s": 4.0, "eta_s": 90.0, "elapsed_s": 10.0}
+
+    running_text = broadcast_progress_text(progress_from_job(job))
+    job.status = BroadcastJobStatus.COMPLETED
+    finished_text = broadcast_progress_text(progress_from_job(job))
+
+    assert running_text == "Рассылка #1: выполняется\nОтправлено: 40 из 100, ошибок: 0, пропущено: 0\n" + (
+        "Осталось 60, 4.0 сообщ./с, ещё ~1 мин 30 с"
+    )
+    assert finished_text.endswith("4.0 сообщ./с, заняло 10 с")
+
+
+@pytest.mark.asyncio
+async def test_progress_service_raises_for_unknown_job() -> None:
+    repository = AsyncMock(spec=BroadcastJobRepository)
+    repository.get_by_id.side_effect = BroadcastJobNotFoundError(job_id=404)
+    service = BroadcastProgressService(AsyncMock(spec=AsyncSession), repository)
+
+    with pytest.raises(BroadcastJobNotFoundError):
+        await service.get_progress(404)
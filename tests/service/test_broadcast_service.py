@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict, deque
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 from unittest.mock import AsyncMock
@@ -12,10 +12,26 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from pybot.core.config import settings
-from pybot.db.models import User
-from pybot.dto import BroadcastDTO, CompetenceBroadcastDTO, NotifyDTO, RoleBroadcastDTO
+from pybot.core.constants import (
+    BroadcastAudienceKind,
+    BroadcastDeliveryStatus,
+    BroadcastJobStatus,
+    NotificationPriority,
+)
+from pybot.db.models import BroadcastJob, User
+from pybot.dto import (
+    BroadcastDTO,
+    BroadcastRecipient,
+    BroadcastResult,
+    CompetenceBroadcastDTO,
+    NotifyDTO,
+    RoleBroadcastDTO,
+)
+from pybot.infrastructure.broadcast_job_repository import BroadcastJobRepository
+from pybot.infrastructure.ports import InMemoryBroadcastLock
 from pybot.infrastructure.user_repository import UserRepository
-from pybot.services.broadcast import BroadcastAlreadyRunningError, BroadcastService
+from pybot.domain.exceptions import BroadcastLeaseLostError
+from pybot.services.broadcast import BROADCAST_LOCK_KEY, BroadcastAlreadyRunningError, BroadcastService
 from pybot.services.ports import NotificationPermanentError, NotificationPort, NotificationTemporaryError
 
 
@@ -23,6 +39,7 @@ class DeliveryOutcome(Enum):
     OK = "ok"
     TEMPORARY = "temporary"
     PERMANENT = "permanent"
+    UNREACHABLE = "unreachable"
     UNEXPECTED = "unexpected"
 
 
@@ -31,15 +48,194 @@ class FakeUserRepository(UserRepository):
     users: list[User]
     role_users: dict[str, list[User]] = field(default_factory=dict)
     competence_users: dict[int, list[User]] = field(default_factory=dict)
+    page_size: int | None = None
+    pages_fetched: int = 0
+    unreachable_user_ids: list[int] = field(default_factory=list)
+
+    @staticmethod
+    def _in_range(users: Sequence[User], after_id: int, until_id: int | None) -> list[User]:
+        # В фейке users.id совпадает с telegram_id, чтобы курсор оставался монотонным.
+        return [
+            user for user in users if user.telegram_id > after_id and (until_id is None or user.telegram_id <= until_id)
+        ]
+
+    async def _iter_pages(
+        self,
+        users: Sequence[User],
+        after_id: int,
+        until_id: int | None,
+        page_size: int,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        remaining = self._in_range(users, after_id, until_id)
+        effective_page_size = self.page_size or page_size
+        for index in range(0, len(remaining), effective_page_size):
+            self.pages_fetched += 1
+            yield [
+                BroadcastRecipient(user_id=user.telegram_id, telegram_id=user.telegram_id)
+                for user in remaining[index : index + effective_page_size]
+            ]
+
+    async def iter_all_recipients(
+        self,
+        db: AsyncSession,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        async for page in self._iter_pages(self.users, after_id, until_id, page_size):
+            yield page
+
+    async def iter_recipients_with_role(
+        self,
+        db: AsyncSession,
+        role_name: str,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        async for page in self._iter_pages(self.role_users.get(role_name, []), after_id, until_id, page_size):
+            yield page
+
+    async def iter_recipients_with_competence_id(
+        self,
+        db: AsyncSession,
+        competence_id: int,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[list[BroadcastRecipient]]:
+        async for page in self._iter_pages(self.competence_users.get(competence_id, []), after_id, until_id, page_size):
+            yield page
+
+    async def count_all_recipients(self, db: AsyncSession, *, after_id: int = 0, until_id: int | None = None) -> int:
+        return len(self._in_range(self.users, after_id, until_id))
+
+    async def count_recipients_with_role(
+        self,
+        db: AsyncSession,
+        role_name: str,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+    ) -> int:
+        return len(self._in_range(self.role_users.get(role_name, []), after_id, until_id))
+
+    async def count_recipients_with_competence_id(
+        self,
+        db: AsyncSession,
+        competence_id: int,
+        *,
+        after_id: int = 0,
+        until_id: int | None = None,
+    ) -> int:
+        return len(self._in_range(self.competence_users.get(competence_id, []), after_id, until_id))
+
+    async def split_all_recipients(self, db: AsyncSession, shards: int) -> list[int]:
+        telegram_ids = sorted(user.telegram_id for user in self.users)
+        size = -(-len(telegram_ids) // shards)
+        return [telegram_ids[min(index + size, len(telegram_ids)) - 1] for index in range(0, len(telegram_ids), size)]
 
-    async def get_all_users(self, db: AsyncSession) -> Sequence[User]:
-        return self.users
+    async def mark_recipients_unreachable(self, db: AsyncSession, user_ids: Sequence[int]) -> None:
+        self.unreachable_user_ids.extend(user_ids)
 
-    async def get_all_users_with_role(self, db: AsyncSession, role_name: str) -> Sequence[User]:
-        return self.role_users.get(role_name, [])
 
-    async def get_all_users_with_competence_id(self, db: AsyncSession, competence_id: int) -> Sequence[User]:
-        return self.competence_users.get(competence_id, [])
+class FakeBroadcastJobRepository(BroadcastJobRepository):
+    def __init__(self) -> None:
+        self.jobs: dict[int, BroadcastJob] = {}
+        self.deliveries: dict[int, dict[int, BroadcastDeliveryStatus]] = defaultdict(dict)
+
+    async def create_job(
+        self,
+        db: AsyncSession,
+        *,
+        message: str,
+        audience_kind: BroadcastAudienceKind,
+        role_name: str | None = None,
+        competence_id: int | None = None,
+    ) -> BroadcastJob:
+        job = BroadcastJob(
+            id=len(self.jobs) + 1,
+            message=message,
+            audience_kind=audience_kind,
+            audience_role_name=role_name,
+            audience_competence_id=competence_id,
+            status=BroadcastJobStatus.PENDING,
+            last_user_id=0,
+            shard_count=0,
+            attempted=0,
+            sent=0,
+            failed_temporary=0,
+            failed_permanent=0,
+            skipped_invalid_user=0,
+        )
+        self.jobs[job.id] = job
+        return job
+
+    async def create_shard(
+        self,
+        db: AsyncSession,
+        parent: BroadcastJob,
+        *,
+        after_id: int,
+        until_id: int,
+    ) -> BroadcastJob:
+        shard = await self.create_job(
+            db,
+            message=parent.message,
+            audience_kind=parent.audience_kind,
+            role_name=parent.audience_role_name,
+            competence_id=parent.audience_competence_id,
+        )
+        shard.parent_job_id = parent.id
+        shard.last_user_id = after_id
+        shard.range_end_id = until_id
+        return shard
+
+    async def get_by_id(self, db: AsyncSession, job_id: int) -> BroadcastJob:
+        return self.jobs[job_id]
+
+    async def find_shards(self, db: AsyncSession, parent_job_id: int) -> Sequence[BroadcastJob]:
+        return [job for job in self.jobs.values() if job.parent_job_id == parent_job_id]
+
+    async def find_unfinished_jobs(self, db: AsyncSession) -> Sequence[BroadcastJob]:
+        return [
+            job for job in self.jobs.values() if job.status in {BroadcastJobStatus.PENDING, BroadcastJobStatus.RUNNING}
+        ]
+
+    async def find_recorded_user_ids(self, db: AsyncSession, job_id: int, user_ids: Sequence[int]) -> set[int]:
+        job_deliveries = self.deliveries[job_id]
+        return {user_id for user_id in user_ids if user_id in job_deliveries}
+
+    async def add_deliveries(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        deliveries: Sequence[tuple[int, BroadcastDeliveryStatus]],
+    ) -> None:
+        self.deliveries[job_id].update(deliveries)
+
+
+class LeaseLosingLock(InMemoryBroadcastLock):
+    async def extend(self, key: str, token: str, ttl_seconds: float) -> bool:
+        return False
+
+
+def _mk_service(
+    user_repository: UserRepository,
+    notification_port: NotificationPort,
+    job_repository: BroadcastJobRepository | None = None,
+    broadcast_lock: InMemoryBroadcastLock | None = None,
+) -> BroadcastService:
+    return BroadcastService(
+        AsyncMock(spec=AsyncSession),
+        user_repository,
+        notification_port,
+        job_repository or FakeBroadcastJobRepository(),
+        broadcast_lock or InMemoryBroadcastLock(),
+    )
 
 
 class ScriptedNotificationPort(NotificationPort):
@@ -56,6 +252,8 @@ class ScriptedNotificationPort(NotificationPort):
         self.release_event = release_event
         self.call_counts: dict[int, int] = defaultdict(int)
         self.messages_by_user: dict[int, list[str]] = defaultdict(list)
+        self.edits: list[tuple[int, int, str]] = []
+        self.priorities: set[NotificationPriority] = set()
 
     async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
         return None
@@ -64,6 +262,7 @@ class ScriptedNotificationPort(NotificationPort):
         user_id = message_data.user_id
         self.call_counts[user_id] += 1
         self.messages_by_user[user_id].append(message_data.message)
+        self.priorities.add(message_data.priority)
 
         if self.started_event is not None and not self.started_event.is_set():
             self.started_event.set()
@@ -77,9 +276,14 @@ class ScriptedNotificationPort(NotificationPort):
             raise NotificationTemporaryError("temporary failure", retry_after_seconds=0.0)
         if outcome is DeliveryOutcome.PERMANENT:
             raise NotificationPermanentError("permanent failure")
+        if outcome is DeliveryOutcome.UNREACHABLE:
+            raise NotificationPermanentError("bot was blocked by the user", recipient_unreachable=True)
         if outcome is DeliveryOutcome.UNEXPECTED:
             raise RuntimeError("unexpected failure")
 
+    async def edit_message(self, chat_id: int, message_id: int, text: str) -> None:
+        self.edits.append((chat_id, message_id, text))
+
 
 def _mk_user(telegram_id: int) -> User:
     return User(first_name=f"user-{telegram_id}", telegram_id=telegram_id)
@@ -96,6 +300,7 @@ def _configure_broadcast_settings(
     retry_attempts: int = 5,
     retry_max_wait_s: int = 1,
     max_text_length: int = 4096,
+    pacing_enabled: bool = False,
 ) -> None:
     monkeypatch.setattr(settings, "broadcast_bulk_size", bulk_size)
     monkeypatch.setattr(settings, "broadcast_max_concurrency", max_concurrency)
@@ -105,6 +310,7 @@ def _configure_broadcast_settings(
     monkeypatch.setattr(settings, "broadcast_retry_attempts", retry_attempts)
     monkeypatch.setattr(settings, "broadcast_retry_max_wait_s", retry_max_wait_s)
     monkeypatch.setattr(settings, "broadcast_max_text_length", max_text_length)
+    monkeypatch.setattr(settings, "notification_pacing_enabled", pacing_enabled)
 
 
 @pytest.mark.asyncio
@@ -113,7 +319,7 @@ async def test_broadcast_for_all_happy_path(monkeypatch: pytest.MonkeyPatch) ->
     users = [_mk_user(1), _mk_user(2), _mk_user(3)]
     user_repository = FakeUserRepository(users=users, role_users={})
     notification_port = ScriptedNotificationPort()
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     sleep_mock = AsyncMock()
     monkeypatch.setattr(asyncio, "sleep", sleep_mock)
@@ -138,7 +344,7 @@ async def test_broadcast_for_all_handles_partial_permanent_failure(monkeypatch:
             20: [DeliveryOutcome.PERMANENT],
         }
     )
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
 
@@ -158,7 +364,7 @@ async def test_broadcast_for_all_retries_temporary_then_succeeds(monkeypatch: py
             100: [DeliveryOutcome.TEMPORARY, DeliveryOutcome.OK],
         }
     )
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     sleep_mock = AsyncMock()
     monkeypatch.setattr(asyncio, "sleep", sleep_mock)
@@ -180,7 +386,7 @@ async def test_broadcast_for_all_marks_temporary_failure_when_retry_exhausted(mo
             200: [DeliveryOutcome.TEMPORARY, DeliveryOutcome.TEMPORARY, DeliveryOutcome.OK],
         }
     )
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
 
@@ -198,17 +404,23 @@ async def test_broadcast_for_all_raises_when_already_running(monkeypatch: pytest
     started_event = asyncio.Event()
     release_event = asyncio.Event()
     notification_port = ScriptedNotificationPort(started_event=started_event, release_event=release_event)
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
 
     first_task = asyncio.create_task(service.broadcast_for_all(BroadcastDTO(broadcast_message="hello")))
     await started_event.wait()
 
     with pytest.raises(BroadcastAlreadyRunningError):
-        await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+        await service.broadcast_for_all(BroadcastDTO(broadcast_message="rejected"))
 
     release_event.set()
     await first_task
 
+    # Отклонённое задание не должно уйти позже через resume.
+    assert job_repository.jobs[2].status is BroadcastJobStatus.FAILED
+    assert await service.resume_unfinished_jobs() == []
+    assert notification_port.messages_by_user[300] == ["hello"]
+
 
 @pytest.mark.asyncio
 async def test_broadcast_validates_message(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -231,7 +443,7 @@ async def test_broadcast_for_users_with_role_uses_broadcast_message(monkeypatch:
     users = [_mk_user(350)]
     user_repository = FakeUserRepository(users=[], role_users={"Admin": users})
     notification_port = ScriptedNotificationPort()
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     result = await service.broadcast_for_users_with_role(
         RoleBroadcastDTO(role_name="Admin", broadcast_message="hello role")
@@ -247,7 +459,7 @@ async def test_broadcast_for_users_with_competence_happy_path(monkeypatch: pytes
     users = [_mk_user(400), _mk_user(500), _mk_user(600)]
     user_repository = FakeUserRepository(users=[], competence_users={1: users})
     notification_port = ScriptedNotificationPort()
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     sleep_mock = AsyncMock()
     monkeypatch.setattr(asyncio, "sleep", sleep_mock)
@@ -276,7 +488,7 @@ async def test_broadcast_crops_text_with_ellipsis_when_message_exceeds_limit(mon
     _configure_broadcast_settings(monkeypatch, max_text_length=10)
     user_repository = FakeUserRepository(users=[_mk_user(700)])
     notification_port = ScriptedNotificationPort()
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     await service.broadcast_for_all(BroadcastDTO(broadcast_message="0123456789abcdef"))
 
@@ -288,8 +500,277 @@ async def test_broadcast_keeps_text_as_is_when_message_within_limit(monkeypatch:
     _configure_broadcast_settings(monkeypatch, max_text_length=10)
     user_repository = FakeUserRepository(users=[_mk_user(701)])
     notification_port = ScriptedNotificationPort()
-    service = BroadcastService(AsyncMock(spec=AsyncSession), user_repository, notification_port)
+    service = _mk_service(user_repository, notification_port)
 
     await service.broadcast_for_all(BroadcastDTO(broadcast_message="0123456789"))
 
     assert notification_port.messages_by_user[701] == ["0123456789"]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_rechunks_audience_pages_into_bulks(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=2, max_concurrency=2, jitter_min_ms=80, jitter_max_ms=80)
+    users = [_mk_user(telegram_id) for telegram_id in range(801, 806)]
+    user_repository = FakeUserRepository(users=users, page_size=3)
+    notification_port = ScriptedNotificationPort()
+    service = _mk_service(user_repository, notification_port)
+
+    sleep_mock = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep_mock)
+
+    result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+
+    assert result.attempted == 5
+    assert result.sent == 5
+    assert user_repository.pages_fetched == 2
+    assert sorted(notification_port.call_counts) == list(range(801, 806))
+    assert sleep_mock.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_broadcast_starts_sending_before_audience_is_exhausted(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=1, max_concurrency=1)
+    users = [_mk_user(telegram_id) for telegram_id in range(901, 906)]
+    user_repository = FakeUserRepository(users=users, page_size=1)
+    notification_port = ScriptedNotificationPort()
+    service = _mk_service(user_repository, notification_port)
+    pages_fetched_on_first_send: list[int] = []
+
+    original_send = notification_port.send_message
+
+    async def tracking_send(message_data: NotifyDTO) -> None:
+        if not pages_fetched_on_first_send:
+            pages_fetched_on_first_send.append(user_repository.pages_fetched)
+        await original_send(message_data)
+
+    monkeypatch.setattr(notification_port, "send_message", tracking_send)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+
+    result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+
+    # Конвейер читает аудиторию не дальше своего окна (2 * bulk_size получателей) и одной следующей страницы.
+    assert result.sent == 5
+    assert pages_fetched_on_first_send[0] <= 3
+
+
+@pytest.mark.asyncio
+async def test_broadcast_records_delivery_ledger_and_completes_job(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=2, retry_attempts=1)
+    user_repository = FakeUserRepository(users=[_mk_user(1001), _mk_user(1002), _mk_user(1003)])
+    notification_port = ScriptedNotificationPort(plans={1002: [DeliveryOutcome.PERMANENT]})
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+
+    await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+
+    job = job_repository.jobs[1]
+    assert job.status is BroadcastJobStatus.COMPLETED
+    assert notification_port.priorities == {NotificationPriority.BULK}
+    assert job.last_user_id == 1003
+    assert (job.attempted, job.sent, job.failed_permanent) == (3, 2, 1)
+    assert job_repository.deliveries[1] == {
+        1001: BroadcastDeliveryStatus.SENT,
+        1002: BroadcastDeliveryStatus.FAILED_PERMANENT,
+        1003: BroadcastDeliveryStatus.SENT,
+    }
+
+
+@pytest.mark.asyncio
+async def test_broadcast_publishes_progress_to_job_and_status_message(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: рассылка на трёх пользователей со статус-сообщением администратора
+    _configure_broadcast_settings(monkeypatch, bulk_size=2, retry_attempts=1)
+    user_repository = FakeUserRepository(users=[_mk_user(1), _mk_user(2), _mk_user(3)])
+    notification_port = ScriptedNotificationPort(plans={2: [DeliveryOutcome.PERMANENT]})
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+
+    # When: рассылка выполняется до конца
+    await service.broadcast_for_all(
+        BroadcastDTO(broadcast_message="hello", status_chat_id=500, status_message_id=7),
+    )
+
+    # Then: размер аудитории и снимок прогресса сохранены, а статус-сообщение показывает итог
+    job = job_repository.jobs[1]
+    assert job.total_recipients == 3
+    assert job.progress is not None
+    assert job.progress["timings"]["delivery"]["count"] == 3
+    chat_id, message_id, text = notification_port.edits[-1]
+    assert (chat_id, message_id) == (500, 7)
+    assert "завершена" in text
+    assert "Отправлено: 2 из 3, ошибок: 1" in text
+
+
+@pytest.mark.asyncio
+async def test_broadcast_excludes_unreachable_recipients_from_future_audiences(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: один получатель заблокировал бота, другой упал с обычной постоянной ошибкой
+    _configure_broadcast_settings(monkeypatch, bulk_size=3, retry_attempts=1)
+    user_repository = FakeUserRepository(users=[_mk_user(1001), _mk_user(1002), _mk_user(1003)])
+    notification_port = ScriptedNotificationPort(
+        plans={1002: [DeliveryOutcome.UNREACHABLE], 1003: [DeliveryOutcome.PERMANENT]}
+    )
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+
+    # When: рассылка завершается
+    result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+
+    # Then: недоступный получатель учтён как постоянная ошибка и исключён из аудитории
+    assert (result.sent, result.failed_permanent) == (1, 2)
+    assert job_repository.deliveries[1][1002] is BroadcastDeliveryStatus.RECIPIENT_UNREACHABLE
+    assert job_repository.deliveries[1][1003] is BroadcastDeliveryStatus.FAILED_PERMANENT
+    assert user_repository.unreachable_user_ids == [1002]
+
+
+@pytest.mark.asyncio
+async def test_run_job_resumes_from_checkpoint_and_skips_already_sent(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=2)
+    users = [_mk_user(telegram_id) for telegram_id in range(1101, 1106)]
+    user_repository = FakeUserRepository(users=users)
+    notification_port = ScriptedNotificationPort()
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+
+    job_id = await service.create_job(BroadcastDTO(broadcast_message="hello"))
+    job = job_repository.jobs[job_id]
+    # Состояние после падения: первая пачка зафиксирована, 1103 доставлен, но чекпоинт не успел сдвинуться.
+    job.start()
+    job.checkpoint(last_user_id=1102, result=BroadcastResult(attempted=2, sent=2))
+    job_repository.deliveries[job_id].update(
+        {
+            1101: BroadcastDeliveryStatus.SENT,
+            1102: BroadcastDeliveryStatus.SENT,
+            1103: BroadcastDeliveryStatus.SENT,
+        }
+    )
+
+    result = await service.run_job(job_id)
+
+    assert sorted(notification_port.call_counts) == [1104, 1105]
+    assert result.attempted == 4
+    assert result.sent == 4
+    assert job.status is BroadcastJobStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_run_job_returns_stored_result_for_completed_job(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch)
+    user_repository = FakeUserRepository(users=[_mk_user(1201)])
+    notification_port = ScriptedNotificationPort()
+    service = _mk_service(user_repository, notification_port)
+
+    first = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+    second = await service.run_job(1)
+
+    assert first == second
+    assert notification_port.call_counts[1201] == 1
+
+
+@pytest.mark.asyncio
+async def test_resume_unfinished_jobs_runs_pending_jobs(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch)
+    user_repository = FakeUserRepository(users=[], role_users={"Mentor": [_mk_user(1301)]})
+    notification_port = ScriptedNotificationPort()
+    service = _mk_service(user_repository, notification_port)
+    await service.create_job(RoleBroadcastDTO(role_name="Mentor", broadcast_message="hello mentors"))
+
+    results = await service.resume_unfinished_jobs()
+
+    assert [result.sent for result in results] == [1]
+    assert notification_port.messages_by_user[1301] == ["hello mentors"]
+
+
+@pytest.mark.asyncio
+async def test_resume_unfinished_jobs_skips_job_whose_lease_is_held(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch)
+    user_repository = FakeUserRepository(users=[], role_users={"Mentor": [_mk_user(1311)]})
+    notification_port = ScriptedNotificationPort()
+    broadcast_lock = InMemoryBroadcastLock()
+    service = _mk_service(user_repository, notification_port, broadcast_lock=broadcast_lock)
+    await service.create_job(RoleBroadcastDTO(role_name="Mentor", broadcast_message="hello mentors"))
+    token = await broadcast_lock.acquire(BROADCAST_LOCK_KEY, 60)
+    assert token is not None
+
+    assert await service.resume_unfinished_jobs() == []
+    assert notification_port.call_counts == {}
+
+    await broadcast_lock.release(BROADCAST_LOCK_KEY, token)
+    assert [result.sent for result in await service.resume_unfinished_jobs()] == [1]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_skips_fixed_batch_pause_when_sends_are_paced(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=1, pacing_enabled=True)
+    user_repository = FakeUserRepository(users=[_mk_user(1401), _mk_user(1402), _mk_user(1403)])
+    notification_port = ScriptedNotificationPort()
+    service = _mk_service(user_repository, notification_port)
+
+    sleep_mock = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep_mock)
+
+    result = await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+
+    assert result.sent == 3
+    sleep_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_run_job_stops_when_broadcast_lease_is_lost(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=1)
+    user_repository = FakeUserRepository(users=[_mk_user(1501), _mk_user(1502), _mk_user(1503)])
+    notification_port = ScriptedNotificationPort()
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository, LeaseLosingLock())
+
+    with pytest.raises(BroadcastLeaseLostError):
+        await service.broadcast_for_all(BroadcastDTO(broadcast_message="hello"))
+
+    job = job_repository.jobs[1]
+    assert sorted(notification_port.call_counts) == [1501]
+    assert job.status is BroadcastJobStatus.RUNNING
+    assert job.last_user_id == 1501
+
+
+@pytest.mark.asyncio
+async def test_shard_job_splits_audience_and_last_shard_completes_parent(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch, bulk_size=2)
+    user_repository = FakeUserRepository(users=[_mk_user(telegram_id) for telegram_id in range(1601, 1606)])
+    notification_port = ScriptedNotificationPort(plans={1604: [DeliveryOutcome.PERMANENT]})
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+    job_id = await service.create_job(BroadcastDTO(broadcast_message="hello"))
+
+    shard_ids = await service.shard_job(job_id, 2)
+    assert await service.shard_job(job_id, 2) == shard_ids
+
+    shard_results = [await service.run_job(shard_id) for shard_id in shard_ids]
+
+    parent = job_repository.jobs[job_id]
+    shards = [job_repository.jobs[shard_id] for shard_id in shard_ids]
+    assert [(shard.last_user_id, shard.range_end_id) for shard in shards] == [(1603, 1603), (1605, 1605)]
+    assert [result.sent for result in shard_results] == [3, 1]
+    assert notification_port.call_counts == {1601: 1, 1602: 1, 1603: 1, 1604: 1, 1605: 1}
+    assert parent.status is BroadcastJobStatus.COMPLETED
+    assert (parent.attempted, parent.sent, parent.failed_permanent) == (5, 4, 1)
+    assert await service.run_job(job_id) == parent.to_result()
+
+
+@pytest.mark.asyncio
+async def test_resume_unfinished_jobs_runs_shards_but_not_sharded_parent(monkeypatch: pytest.MonkeyPatch) -> None:
+    _configure_broadcast_settings(monkeypatch)
+    user_repository = FakeUserRepository(users=[_mk_user(1701), _mk_user(1702)])
+    notification_port = ScriptedNotificationPort()
+    job_repository = FakeBroadcastJobRepository()
+    service = _mk_service(user_repository, notification_port, job_repository)
+    job_id = await service.create_job(BroadcastDTO(broadcast_message="hello"))
+    await service.shard_job(job_id, 2)
+
+    results = await service.resume_unfinished_jobs()
+
+    assert [result.sent for result in results] == [1, 1]
+    assert notification_port.call_counts == {1701: 1, 1702: 1}
+    assert job_repository.jobs[job_id].status is BroadcastJobStatus.COMPLETED
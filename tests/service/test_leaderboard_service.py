@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import cast
+from unittest.mock import AsyncMock
 
 import pendulum
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from pybot.core.config import settings
 from pybot.core.constants import PointsTypeEnum
+from pybot.infrastructure import (
+    LeaderboardCache,
+    LeaderboardCacheKey,
+    PointsPeriodTotalRepository,
+    PointsTransactionRepository,
+)
 from pybot.services import LeaderboardService
 from tests.factories import PointsTransactionSpec, UserSpec, create_points_transaction, create_user
 
@@ -59,6 +68,7 @@ async def test_get_previous_calendar_week_leaderboard_uses_previous_week_bounds(
             created_at=datetime(2026, 3, 30, 1, 0, 0),
         ),
     )
+    await PointsPeriodTotalRepository().rebuild(db, business_tz=settings.business_tz)
     await db.commit()
 
     # When
@@ -75,3 +85,82 @@ async def test_get_previous_calendar_week_leaderboard_uses_previous_week_bounds(
     assert leaderboard[1].total_points_delta == 4
     assert leaderboard[0].period_start == datetime(2026, 3, 22, 19, 0, 0)
     assert leaderboard[0].period_end == datetime(2026, 3, 29, 19, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_closed_week_is_served_from_cache_until_warm_refresh(
+    dishka_request_container,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(LeaderboardService)
+    rollups = PointsPeriodTotalRepository()
+    user = await create_user(db, spec=UserSpec(telegram_id=840_101, first_name="Ivan"))
+    week_start = datetime(2026, 3, 22, 19, 0, 0)
+    await rollups.add_amounts(
+        db,
+        points_type=PointsTypeEnum.ACADEMIC,
+        period_start=week_start,
+        amounts={user.id: 5},
+    )
+    await db.commit()
+    monkeypatch.setattr(
+        pendulum,
+        "now",
+        lambda tz=None: pendulum.datetime(2026, 4, 2, 12, 0, 0, tz=tz or "UTC"),
+    )
+    first = await service.get_previous_calendar_week_leaderboard(points_type=PointsTypeEnum.ACADEMIC)
+
+    # When: rollup поменялся в обход сервиса (например, rebuild)
+    await rollups.add_amounts(
+        db,
+        points_type=PointsTypeEnum.ACADEMIC,
+        period_start=week_start,
+        amounts={user.id: 3},
+    )
+    await db.commit()
+    cached = await service.get_previous_calendar_week_leaderboard(points_type=PointsTypeEnum.ACADEMIC)
+    warmed_rows = await service.warm_previous_week()
+    refreshed = await service.get_previous_calendar_week_leaderboard(points_type=PointsTypeEnum.ACADEMIC)
+
+    # Then
+    assert [row.total_points_delta for row in first] == [5]
+    assert cached == first
+    assert warmed_rows == 1
+    assert [row.total_points_delta for row in refreshed] == [8]
+
+
+@pytest.mark.asyncio
+async def test_open_week_is_cached_with_short_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given
+    put_calls: list[float | None] = []
+
+    class RecordingCache:
+        async def get(self, key: LeaderboardCacheKey) -> None:
+            return None
+
+        async def put(self, key: LeaderboardCacheKey, rows: object, *, ttl_s: float | None) -> None:
+            put_calls.append(ttl_s)
+
+    rollups = AsyncMock(spec=PointsPeriodTotalRepository)
+    rollups.find_top_for_period.return_value = []
+    service = LeaderboardService(
+        cast(AsyncSession, object()),
+        AsyncMock(spec=PointsTransactionRepository),
+        rollups,
+        cast(LeaderboardCache, RecordingCache()),
+    )
+    monkeypatch.setattr(settings, "leaderboard_cache_open_ttl_s", 30.0)
+    monkeypatch.setattr(
+        pendulum,
+        "now",
+        lambda tz=None: pendulum.datetime(2026, 4, 2, 12, 0, 0, tz=tz or "UTC"),
+    )
+
+    # When
+    await service.get_calendar_week_leaderboard(points_type=PointsTypeEnum.ACADEMIC, weeks_ago=0)
+    await service.get_calendar_week_leaderboard(points_type=PointsTypeEnum.ACADEMIC, weeks_ago=1)
+
+    # Then
+    assert put_calls == [30.0, None]
@@ -8,6 +8,7 @@ import pytest
 from pybot.core.constants import TaskScheduleKind
 from pybot.domain.exceptions import TaskScheduleError
 from pybot.dto.value_objects import TaskSchedule
+from pybot.dto import NotifyUsersDTO
 from pybot.services.notification_facade import NotificationFacade, NotifyUserDTO
 from pybot.services.ports import NotificationDispatchPort, NotificationTemporaryError
 
@@ -75,3 +76,22 @@ async def test_notification_facade_preserves_temporary_delivery_error() -> None:
 
     assert exc_info.value.message == "temporary failure"
     assert exc_info.value.retry_after_seconds == 7.0
+
+
+@pytest.mark.asyncio
+async def test_notification_facade_notify_users_falls_back_to_per_user_dispatch() -> None:
+    # Given: транспорт без собственной массовой отправки
+    dispatch_port = NotificationDispatchPortSpy()
+    facade = NotificationFacade(dispatch_port=dispatch_port)
+    dto = NotifyUsersDTO(user_ids=[1, 2, 3], message="  weekly sync  ", kind=TaskScheduleKind.IMMEDIATE)
+
+    # When
+    await facade.notify_users(dto)
+
+    # Then
+    assert [(user_id, text) for user_id, text, _ in dispatch_port.calls] == [
+        (1, "weekly sync"),
+        (2, "weekly sync"),
+        (3, "weekly sync"),
+    ]
+    assert all(schedule.kind is TaskScheduleKind.IMMEDIATE for _, _, schedule in dispatch_port.calls)
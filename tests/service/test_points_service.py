@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from pybot.core.constants import PointsTypeEnum
-from pybot.db.models import PointsTransaction, User, UserLevel, Valuation
+from pybot.db.models import PointsPeriodTotal, PointsTransaction, User, UserLevel, Valuation
 from pybot.domain.exceptions import UserNotFoundError, ZeroPointsAdjustmentError
-from pybot.dto import AdjustUserPointsDTO
+from pybot.dto import AdjustUserPointsDTO, AdjustUsersPointsDTO
 from pybot.dto.value_objects import Points
+from pybot.infrastructure import LevelCatalog
 from pybot.services.points import PointsService
 from tests.factories import UserSpec, attach_user_level, create_level, create_user
 
@@ -42,9 +43,8 @@ async def test_change_points_updates_points_level_and_creates_valuation(
     # Then
     assert result.academic_points.value == 110
 
-    levels_stmt = select(UserLevel).where(UserLevel.user_id == recipient.id)
-    user_levels = (await db.execute(levels_stmt)).scalars().all()
-    assert any(link.level_id == level_next.id for link in user_levels)
+    levels_stmt = select(UserLevel.level_id).where(UserLevel.user_id == recipient.id)
+    assert (await db.execute(levels_stmt)).scalars().all() == [level_next.id]
 
     valuations_stmt = select(Valuation).where(Valuation.recipient_id == recipient.id)
     valuations = (await db.execute(valuations_stmt)).scalars().all()
@@ -59,6 +59,12 @@ async def test_change_points_updates_points_level_and_creates_valuation(
     assert transactions[0].points_type == PointsTypeEnum.ACADEMIC
     assert transactions[0].giver_id == giver.id
 
+    totals = (await db.execute(select(PointsPeriodTotal))).scalars().all()
+    assert [(row.user_id, row.points_type, row.total) for row in totals] == [
+        (recipient.id, PointsTypeEnum.ACADEMIC, 20)
+    ]
+    assert totals[0].period_start <= transactions[0].created_at
+
 
 @pytest.mark.asyncio
 async def test_change_points_does_not_allow_negative_total_score(
@@ -94,6 +100,41 @@ async def test_change_points_does_not_allow_negative_total_score(
     assert transactions[0].amount == -5
 
 
+@pytest.mark.asyncio
+async def test_change_points_adds_to_stored_score_not_loaded_one(
+    dishka_request_container,
+) -> None:
+    # Given
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(PointsService)
+    await create_level(db, name="A0", level_type=PointsTypeEnum.ACADEMIC, required_points=0)
+    recipient = await create_user(db, spec=UserSpec(telegram_id=800_016, academic_points=90))
+    giver = await create_user(db, spec=UserSpec(telegram_id=800_017))
+    await db.commit()
+    recipient_id, giver_id = recipient.id, giver.id
+
+    # Параллельное начисление, которое загруженный в сессию объект не видит.
+    concurrent_award = update(User).where(User.id == recipient_id).values(academic_points=User.academic_points + 15)
+    await db.execute(concurrent_award)
+    await db.commit()
+
+    # When
+    result = await service.change_points(
+        AdjustUserPointsDTO(
+            recipient_id=recipient_id,
+            giver_id=giver_id,
+            points=Points(value=20, point_type=PointsTypeEnum.ACADEMIC),
+        )
+    )
+
+    # Then
+    assert result.academic_points.value == 125
+    assert recipient.academic_points == 125
+
+    transactions_stmt = select(PointsTransaction.amount).where(PointsTransaction.recipient_id == recipient_id)
+    assert (await db.execute(transactions_stmt)).scalars().all() == [20]
+
+
 @pytest.mark.asyncio
 async def test_change_points_raises_when_recipient_not_found(
     dishka_request_container,
@@ -178,3 +219,127 @@ async def test_change_points_raises_on_zero_adjustment(
     # When / Then
     with pytest.raises(ZeroPointsAdjustmentError):
         await service.change_points(dto)
+
+
+@pytest.mark.asyncio
+async def test_change_points_reads_levels_only_once_per_process(
+    dishka_request_container,
+) -> None:
+    # Given
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(PointsService)
+    catalog = await dishka_request_container.get(LevelCatalog)
+
+    level_basic = await create_level(db, name="A0", level_type=PointsTypeEnum.ACADEMIC, required_points=0)
+    level_next = await create_level(db, name="A1", level_type=PointsTypeEnum.ACADEMIC, required_points=100)
+    recipient = await create_user(db, spec=UserSpec(telegram_id=800_008, academic_points=40))
+    giver = await create_user(db, spec=UserSpec(telegram_id=800_009))
+    await attach_user_level(db, user=recipient, level=level_basic)
+    await db.commit()
+
+    # When
+    for _ in range(2):
+        await service.change_points(
+            AdjustUserPointsDTO(
+                recipient_id=recipient.id,
+                giver_id=giver.id,
+                points=Points(value=30, point_type=PointsTypeEnum.ACADEMIC),
+                reason="Steady progress",
+            )
+        )
+
+    # Then
+    assert catalog.loads == 1
+    levels_stmt = select(UserLevel.level_id).where(UserLevel.user_id == recipient.id)
+    assert (await db.execute(levels_stmt)).scalars().all() == [level_next.id]
+
+
+@pytest.mark.asyncio
+async def test_change_points_bulk_updates_all_recipients_in_one_commit(
+    dishka_request_container,
+) -> None:
+    # Given
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(PointsService)
+
+    level_basic = await create_level(db, name="A0", level_type=PointsTypeEnum.ACADEMIC, required_points=0)
+    level_next = await create_level(db, name="A1", level_type=PointsTypeEnum.ACADEMIC, required_points=100)
+    rising = await create_user(db, spec=UserSpec(telegram_id=800_010, academic_points=90))
+    steady = await create_user(db, spec=UserSpec(telegram_id=800_011, academic_points=5))
+    without_level = await create_user(db, spec=UserSpec(telegram_id=800_012, academic_points=95))
+    giver = await create_user(db, spec=UserSpec(telegram_id=800_013))
+    await attach_user_level(db, user=rising, level=level_basic)
+    await attach_user_level(db, user=steady, level=level_basic)
+    await db.commit()
+    rising_id, steady_id, without_level_id = rising.id, steady.id, without_level.id
+    basic_level_id, next_level_id = level_basic.id, level_next.id
+    recipient_ids = [rising_id, steady_id, without_level_id]
+
+    # When
+    changes = await service.change_points_bulk(
+        AdjustUsersPointsDTO(
+            recipient_ids=[*recipient_ids, rising_id],
+            giver_id=giver.id,
+            points=Points(value=10, point_type=PointsTypeEnum.ACADEMIC),
+            reason=" Event ",
+        )
+    )
+
+    # Then
+    assert [(change.user_id, change.actual_delta, change.new_score) for change in changes] == [
+        (rising_id, 10, 100),
+        (steady_id, 10, 15),
+        (without_level_id, 10, 105),
+    ]
+
+    db.expire_all()
+    users = (await db.execute(select(User).where(User.id.in_(recipient_ids)).order_by(User.id))).scalars().all()
+    assert [user.academic_points for user in users] == [100, 15, 105]
+
+    links = (await db.execute(select(UserLevel.user_id, UserLevel.level_id).order_by(UserLevel.user_id))).all()
+    assert [tuple(link) for link in links] == [
+        (rising_id, next_level_id),
+        (steady_id, basic_level_id),
+        (without_level_id, next_level_id),
+    ]
+
+    valuations = (await db.execute(select(Valuation).order_by(Valuation.recipient_id))).scalars().all()
+    assert [(row.recipient_id, row.points, row.reason) for row in valuations] == [
+        (recipient_id, 10, "Event") for recipient_id in recipient_ids
+    ]
+    transactions = (await db.execute(select(PointsTransaction))).scalars().all()
+    assert sorted((row.recipient_id, row.amount) for row in transactions) == [
+        (recipient_id, 10) for recipient_id in recipient_ids
+    ]
+    totals = (await db.execute(select(PointsPeriodTotal))).scalars().all()
+    assert sorted((row.user_id, row.total) for row in totals) == [(recipient_id, 10) for recipient_id in recipient_ids]
+
+
+@pytest.mark.asyncio
+async def test_change_points_bulk_writes_nothing_when_a_recipient_is_missing(
+    dishka_request_container,
+) -> None:
+    # Given
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(PointsService)
+    await create_level(db, name="A0", level_type=PointsTypeEnum.ACADEMIC, required_points=0)
+    recipient = await create_user(db, spec=UserSpec(telegram_id=800_014, academic_points=10))
+    giver = await create_user(db, spec=UserSpec(telegram_id=800_015))
+    await db.commit()
+    recipient_id = recipient.id
+
+    # When / Then
+    with pytest.raises(UserNotFoundError):
+        await service.change_points_bulk(
+            AdjustUsersPointsDTO(
+                recipient_ids=[recipient_id, 999_010],
+                giver_id=giver.id,
+                points=Points(value=10, point_type=PointsTypeEnum.ACADEMIC),
+            )
+        )
+    await db.rollback()
+
+    assert (await db.execute(select(Valuation))).scalars().all() == []
+    refreshed_recipient = await db.get(User, recipient_id)
+    assert refreshed_recipient is not None
+    assert refreshed_recipient.academic_points == 10
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from pybot.core.config import settings
+from pybot.dto import NotifyDTO, ReachabilityProbeResult
+from pybot.infrastructure.user_repository import UserRepository
+from pybot.services.ports import NotificationPermanentError, NotificationPort, NotificationTemporaryError
+from pybot.services.recipient_reachability import RecipientReachabilityService
+from tests.factories import UserSpec, create_user
+
+
+class ScriptedProbePort(NotificationPort):
+    def __init__(self, failures: dict[int, Exception]) -> None:
+        self.failures = failures
+        self.probed: list[int] = []
+
+    async def send_role_request_to_admin(self, request_id: int, requester_user_id: int, role_name: str) -> None:
+        return None
+
+    async def send_message(self, message_data: NotifyDTO) -> None:
+        return None
+
+    async def probe_recipient(self, user_id: int) -> None:
+        self.probed.append(user_id)
+        failure = self.failures.get(user_id)
+        if failure is not None:
+            raise failure
+
+
+@pytest.mark.asyncio
+async def test_reprobe_unreachable_restores_recipients_that_answer(db_session, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: три давно недоступных получателя и один, проверенный только что
+    monkeypatch.setattr(settings, "recipient_reprobe_after_hours", 24)
+    monkeypatch.setattr(settings, "recipient_reprobe_batch_size", 2)
+    repo = UserRepository()
+    unblocked = await create_user(db_session, spec=UserSpec(telegram_id=600_001))
+    blocked = await create_user(db_session, spec=UserSpec(telegram_id=600_002))
+    flaky = await create_user(db_session, spec=UserSpec(telegram_id=600_003))
+    fresh = await create_user(db_session, spec=UserSpec(telegram_id=600_004))
+    stale_users = [unblocked, blocked, flaky]
+    await repo.mark_recipients_unreachable(db_session, [user.id for user in [*stale_users, fresh]])
+    await db_session.commit()
+    for user in stale_users:
+        await db_session.refresh(user)
+        assert user.unreachable_since is not None
+        user.reachability_checked_at = user.unreachable_since - timedelta(days=2)
+    await db_session.commit()
+
+    port = ScriptedProbePort(
+        {
+            blocked.telegram_id: NotificationPermanentError("blocked", recipient_unreachable=True),
+            flaky.telegram_id: NotificationTemporaryError("network down"),
+        }
+    )
+    service = RecipientReachabilityService(db_session, repo, port)
+
+    # When
+    result = await service.reprobe_unreachable()
+
+    # Then: ответивший вернулся в аудиторию, остальные ждут следующего окна
+    assert result == ReachabilityProbeResult(probed=3, restored=1, still_unreachable=1, inconclusive=1)
+    assert sorted(port.probed) == sorted(user.telegram_id for user in stale_users)
+    audience = [recipient.user_id async for page in repo.iter_all_recipients(db_session) for recipient in page]
+    assert audience == [unblocked.id]
+    assert await service.reprobe_unreachable() == ReachabilityProbeResult()
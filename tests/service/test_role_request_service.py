@@ -167,6 +167,7 @@ async def test_change_request_status_updates_pending_request(
     role = await create_role(db, name="Mentor")
     request = await create_role_request(db, spec=RoleRequestSpec(user=user, role=role, status=RequestStatus.PENDING))
     await db.commit()
+    cached_context = await service.user_repository.load_user_context(db, user.telegram_id)
 
     # When
     await service.change_request_status(request_id=request.id, new_status=RequestStatus.APPROVED)
@@ -176,6 +177,12 @@ async def test_change_request_status_updates_pending_request(
     updated = (await db.execute(stmt)).scalar_one()
     assert updated.status == RequestStatus.APPROVED
     assert await service.user_repository.has_role(db, user_id=user.id, role_name=role.name)
+    # Закешированный до одобрения контекст сброшен: новая роль видна сразу.
+    assert cached_context is not None
+    assert cached_context.roles == frozenset()
+    refreshed_context = await service.user_repository.load_user_context(db, user.telegram_id)
+    assert refreshed_context is not None
+    assert refreshed_context.roles == frozenset({"Mentor"})
     assert any(
         item.user_id == user.telegram_id and item.message_text == "Ваша заявка на роль Mentor была одобрена."
         for item in notification_service.direct_messages
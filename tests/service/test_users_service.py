@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -241,12 +244,60 @@ async def test_track_activity_updates_last_active_and_returns_user_id(
     await db.commit()
 
     tracked_user_id = await service.track_activity(user.telegram_id)
+    await service.activity_buffer.flush()
 
     refreshed_user = await user_repository.get_by_id(db, user.id)
     assert tracked_user_id == user.id
     assert refreshed_user.last_active_at is not None
 
 
+@pytest.mark.asyncio
+async def test_load_context_skips_activity_update_when_recent(
+    dishka_request_container,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given: пользователь был активен только что
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(UserService)
+    user = await create_user(db, spec=UserSpec(telegram_id=700_778))
+    recent = datetime.now(UTC).replace(tzinfo=None, microsecond=0)
+    user.last_active_at = recent
+    await db.commit()
+    record_mock = Mock()
+    monkeypatch.setattr(service.activity_buffer, "record", record_mock)
+
+    # When
+    context = await service.load_context(user.telegram_id)
+
+    # Then: контекст прочитан, отметка активности не нужна
+    assert context is not None
+    assert context.user_id == user.id
+    assert context.last_active_at == recent
+    record_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_load_context_records_activity_once_per_interval_for_cached_user(
+    dishka_request_container,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Given: пользователь давно не был активен, его контекст попадёт в кеш
+    db = await dishka_request_container.get(AsyncSession)
+    service = await dishka_request_container.get(UserService)
+    user = await create_user(db, spec=UserSpec(telegram_id=700_779))
+    user.last_active_at = datetime(2026, 1, 1, 12, 0)
+    await db.commit()
+    record_mock = Mock()
+    monkeypatch.setattr(service.activity_buffer, "record", record_mock)
+
+    # When: несколько апдейтов подряд
+    for _ in range(3):
+        await service.load_context(user.telegram_id)
+
+    # Then: отметка записана один раз, дальше кеш уже хранит свежее время
+    record_mock.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_add_user_role_raises_when_user_not_found(
     dishka_request_container,